@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.security_compliance_layer.core.access_control.access_control_system import AccessControlSystem
+from src.security_compliance_layer.core.access_control.policy_decision_engine import evaluate_context_factor
+
+ACTIONS = ["read", "write", "execute", "admin", "delete"]
+ZONES = ["plant-a", "plant-b", "plant-c", "remote"]
+NETWORKS = ["corporate", "ot", "vpn", "public"]
+
+def build_system(roles: int, policies: int, resources: int, policies_per_resource: int, seed: int = 17) -> AccessControlSystem:
+    """An access control system with a plant-sized set of roles, policies and resources."""
+    rng = random.Random(seed)
+    acs = AccessControlSystem()
+    acs.access_decisions.ttl = 3600
+    role_names = [f"role-{i}" for i in range(roles)]
+    for name in role_names:
+        acs.create_role(name, "", rng.sample(ACTIONS, rng.randint(1, len(ACTIONS))))
+
+    policy_ids = []
+    for i in range(policies):
+        rules = []
+        for _ in range(rng.randint(1, 5)):
+            conditions = {"context.zone": rng.choice(ZONES)}
+            if rng.random() < 0.5:
+                conditions["resource.criticality"] = rng.choice(["low", "high"])
+            if rng.random() < 0.3:
+                conditions["identity.department"] = "operations"
+            rules.append({"action": rng.choice(ACTIONS), "conditions": conditions})
+        policy_ids.append(acs.create_policy(f"policy-{i}", "", rules, "allow" if rng.random() < 0.8 else "deny"))
+
+    for i in range(resources):
+        acs.register_resource("asset", f"asset-{i}", {
+            "criticality": rng.choice(["low", "high"]),
+            "allowed_roles": {name: rng.sample(ACTIONS, 2) for name in rng.sample(role_names, 8)},
+            "attribute_rules": {action: {"department": ["operations"]} for action in rng.sample(ACTIONS, 3)},
+            "policies": rng.sample(policy_ids, policies_per_resource),
+            "context_rules": {"network": {action: {"in": ["corporate", "ot"]} for action in ACTIONS}}
+        })
+    return acs
+
+def requests(acs: AccessControlSystem, count: int, identities: int, seed: int = 23):
+    """Requests of identities that each work with a few dozen assets from a few places."""
+    resource_ids = sorted({r["resource_id"] for r in acs.resources.values()})
+    working_sets = [random.Random(i).sample(resource_ids, 25) for i in range(identities)]
+    rng = random.Random(seed)
+    flow = []
+    for _ in range(count):
+        identity = rng.randrange(identities)
+        flow.append((f"identity-{identity}", rng.choice(working_sets[identity]), rng.choice(["read", "write", "execute"]),
+                     {"zone": ZONES[identity % len(ZONES)], "network": rng.choice(NETWORKS), "device": "hmi",
+                      "timestamp": datetime.utcnow().isoformat()}))
+    return flow
+
+def legacy_check(acs: AccessControlSystem, identity_id: str, resource_id: str, action: str, context: dict) -> bool:
+    """The previous check_access without its cache: resource scan, then every check in turn."""
+    resources = [r for r in acs.resources.values() if r["resource_id"] == resource_id]
+    if not resources:
+        return False
+    attributes = resources[0]["attributes"]
+    rbac = any(action in actions for actions in attributes.get("allowed_roles", {}).values())
+    abac = len(attributes.get("attribute_rules", {}).get(action, {})) > 0
+    pbac = False
+    for policy_id in attributes.get("policies", []):
+        policy = acs.policies.get(policy_id)
+        if policy is None:
+            continue
+        result = policy["effect"] != "allow"
+        for rule in policy["rules"]:
+            if rule.get("action") != action:
+                continue
+            match = True
+            for key, value in rule.get("conditions", {}).items():
+                if key.startswith("resource."):
+                    match = attributes.get(key[len("resource."):], object()) == value
+                elif key.startswith("context."):
+                    match = context.get(key[len("context."):], object()) == value
+                if not match:
+                    break
+            if match:
+                result = policy["effect"] == "allow"
+                break
+        pbac = pbac or result
+    trust = 0.8 >= acs.trust_thresholds.get(action, acs.config["default_trust_threshold"])
+    context_rules = attributes.get("context_rules", {})
+    matching = {f for f in acs.config["context_factors"]
+                if f in context and action in context_rules.get(f, {})
+                and evaluate_context_factor(context[f], context_rules[f][action])}
+    context_ok = set(context_rules).issubset(matching)
+    return all([rbac, abac, pbac, trust, context_ok])
+
+def run(resources: int, policies: int, roles: int, per_resource: int, count: int, legacy_count: int, identities: int):
+    logging.disable(logging.CRITICAL)
+    print(f"📊 Access decisions: {roles} roles, {policies} policies, {resources} resources "
+          f"({per_resource} policies each), {count} requests from {identities} identities")
+    acs = build_system(roles, policies, resources, per_resource)
+    flow = requests(acs, count, identities)
+
+    legacy_flow = flow[:legacy_count]
+    start = time.perf_counter()
+    legacy_allowed = [legacy_check(acs, *request) for request in legacy_flow]
+    legacy_rate = len(legacy_flow) / (time.perf_counter() - start)
+    print(f"   legacy (scan + every check):        {legacy_rate:10.0f} decisions/s")
+
+    start = time.perf_counter()
+    for resource_id in {request[1] for request in flow}:
+        acs.decision_engine.get_resource(resource_id)
+    print(f"   compiling the requested resources:  {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+    acs.access_decisions.max_size = 0
+    start = time.perf_counter()
+    compiled_allowed = [acs.check_access(*request)["allowed"] for request in flow]
+    compiled_rate = len(flow) / (time.perf_counter() - start)
+    assert compiled_allowed[:legacy_count] == legacy_allowed
+    print(f"   compiled, uncached:                 {compiled_rate:10.0f} decisions/s  ({compiled_rate / legacy_rate:.1f}x)")
+
+    # Warm the cache with one batch of requests, then measure another from the same identities
+    acs.access_decisions.max_size = 100000
+    for request in flow:
+        acs.check_access(*request)
+    next_flow = requests(acs, count, identities, seed=29)
+    start = time.perf_counter()
+    cached = sum(acs.check_access(*request)["cached"] for request in next_flow)
+    cached_rate = len(next_flow) / (time.perf_counter() - start)
+    print(f"   compiled, context-aware cache:      {cached_rate:10.0f} decisions/s  ({cached / len(next_flow):.0%} hits)")
+
+    # JIT checks against many approved grants
+    now = datetime.utcnow().isoformat()
+    for i in range(count):
+        identity_id, resource_id, action, _ = flow[i]
+        request_id = f"jit-{i}"
+        acs.jit_requests[request_id] = {
+            "id": request_id, "identity_id": identity_id, "resource_id": resource_id, "action": "admin",
+            "status": "pending", "expires_at": "2100-01-01T00:00:00", "access_granted": False, "created_at": now
+        }
+        acs.approve_jit_request(request_id, "approver")
+    start = time.perf_counter()
+    for identity_id, resource_id, _, _ in legacy_flow:
+        any(r["identity_id"] == identity_id and r["resource_id"] == resource_id and r["action"] == "admin"
+            and r["status"] == "approved" for r in acs.jit_requests.values())
+    legacy_jit = len(legacy_flow) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for identity_id, resource_id, _, _ in flow:
+        acs.check_jit_access(identity_id, resource_id, "admin")
+    indexed_jit = len(flow) / (time.perf_counter() - start)
+    print(f"   JIT checks over {count} grants: scan {legacy_jit:10.0f}/s, index {indexed_jit:10.0f}/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resources", type=int, default=5000)
+    parser.add_argument("--policies", type=int, default=500)
+    parser.add_argument("--roles", type=int, default=200)
+    parser.add_argument("--policies-per-resource", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--legacy-requests", type=int, default=2000)
+    parser.add_argument("--identities", type=int, default=200)
+    args = parser.parse_args()
+    run(args.resources, args.policies, args.roles, args.policies_per_resource, args.requests,
+        args.legacy_requests, args.identities)
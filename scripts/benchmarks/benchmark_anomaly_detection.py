@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/overseer_system/anomaly_detection")))
+
+from metric_window import StreamingDetector
+
+def run_legacy(values, window_size, min_samples):
+    """The previous ingest: append, re-slice the list, then np.mean/np.std over the window."""
+    points = []
+    for value in values:
+        points.append({"value": value})
+        if len(points) > window_size:
+            points = points[-window_size:]
+        if len(points) >= min_samples:
+            window = [p["value"] for p in points]
+            mean, std = np.mean(window), np.std(window)
+            _ = 0 if std == 0 else abs((value - mean) / std)
+
+def run_streaming(values, window_size, min_samples, batch_size, algorithm="z_score"):
+    detector = StreamingDetector(algorithm, window_size, min_samples)
+    if batch_size == 1:
+        for value in values:
+            detector.update([value])
+    else:
+        for i in range(0, len(values), batch_size):
+            detector.update(values[i:i + batch_size])
+    return detector
+
+def timed(label, fn, n):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:28s}: {n / elapsed:12.0f} points/s")
+    return result
+
+def run(points: int, window_size: int, batch_size: int):
+    rng = np.random.default_rng(0)
+    values = rng.normal(100.0, 5.0, points)
+    print(f"📊 Anomaly scoring: {points} points, window {window_size}")
+    timed("per point, list window", lambda: run_legacy(values.tolist(), window_size, 20), points)
+    timed("per point, running stats", lambda: run_streaming(values.tolist(), window_size, 20, 1), points)
+    timed(f"batches of {batch_size}, z_score", lambda: run_streaming(values, window_size, 20, batch_size), points)
+    detector = timed(f"batches of {batch_size}, dbscan", lambda: run_streaming(values, window_size, 20, batch_size, "dbscan"), points)
+    print(f"   dbscan fits: {detector.fits}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--window-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    run(args.points, args.window_size, args.batch_size)
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.scf.ingestion.atlas_builder import AtlasBuilder
+
+SOURCES = ["the_well_planetswe", "mhd", "active_matter", "plant_a.csv", "plant_b.csv"]
+
+def make_vault(vault_dir: Path, n_fossils: int, per_batch: int):
+    rng = np.random.default_rng(0)
+    line = ('{{"id": "{i:012d}", "source": "{src}", "timestamp": {ts:.3f}, "data": {{}}, '
+            '"meta": {{"thermodynamics": {{"entropy_rate": {e:.5f}}}}}}}\n')
+    for b, start in enumerate(range(0, n_fossils, per_batch)):
+        n = min(per_batch, n_fossils - start)
+        src = rng.integers(0, len(SOURCES), n)
+        ts = 1.7e9 + rng.uniform(0, 86400 * 30, n)
+        ent = rng.uniform(0, 10, n)
+        with open(vault_dir / f"fossil_batch_{b:06d}.ndjson", "w") as f:
+            f.writelines(line.format(i=start + k, src=SOURCES[src[k]], ts=ts[k], e=ent[k]) for k in range(n))
+
+def time_query(fn, repeats: int = 50):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+
+def run(n_fossils: int, per_batch: int, workers: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp) / "vault"
+        vault.mkdir()
+        print(f"📊 Atlas indexing benchmark: {n_fossils:,} synthetic fossils")
+        make_vault(vault, n_fossils, per_batch)
+
+        builder = AtlasBuilder(str(vault), db_path=str(Path(tmp) / "atlas.db"))
+        stats = builder.build_index(workers=workers)
+        print(f"   Full build:  {stats['elapsed_s']:7.2f}s  {stats['fossils_per_sec']:12,.0f} fossils/s")
+        stats = builder.build_index(workers=workers)
+        print(f"   No-op build: {stats['elapsed_s']:7.2f}s  ({stats['files_skipped']} files unchanged)")
+
+        t0 = 1.7e9 + 86400 * 10
+        queries = {
+            "source+time (1h)": lambda: builder.query(source="mhd", start_time=t0, end_time=t0 + 3600, limit=100),
+            "entropy range": lambda: builder.query(min_entropy=1.0, max_entropy=1.01, limit=100),
+            "lowest entropy": lambda: builder.query(limit=10),
+        }
+        for name, fn in queries.items():
+            p50, p99 = time_query(fn)
+            print(f"   {name:<18} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fossils", type=int, default=10_000_000)
+    parser.add_argument("--per-batch", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    run(args.fossils, args.per_batch, args.workers)
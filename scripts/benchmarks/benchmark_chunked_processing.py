@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import resource
+import tempfile
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+CONFIG = {
+    # KNN imputation and mutual information on every row would dominate the batch run
+    "preprocessing": {"imputation_method": "mean", "scaling_method": "standard"},
+    "feature_selection": {"enable_auto_selection": False},
+}
+
+def make_export(path: str, rows: int, sensors: int, seed: int = 0):
+    """A historian export: a timestamp, sensor readings with gaps and an operating state."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2023-01-01")
+    for offset in range(0, rows, 200_000):
+        n = min(200_000, rows - offset)
+        chunk = pd.DataFrame({"timestamp": (start + pd.to_timedelta(np.arange(offset, offset + n), unit="min")).astype(str)})
+        for s in range(sensors):
+            values = rng.normal(50 + s, 5, n)
+            values[rng.random(n) < 0.01] = np.nan
+            chunk[f"sensor_{s}"] = values
+        chunk["state"] = rng.choice(["run", "idle", "fault"], n, p=[0.8, 0.15, 0.05])
+        chunk.to_csv(path, mode="a", header=offset == 0, index=False)
+
+def _run(csv_path: str, base_dir: str, mode: str, chunk_size: int, out: mp.Queue):
+    logging.disable(logging.ERROR)
+    from src.data_layer.src.processing_engine.data_processing_engine import DataProcessingEngine
+    engine = DataProcessingEngine(base_dir=base_dir)
+    config = dict(CONFIG, streaming={"chunk_size": chunk_size, "row_group_size": chunk_size})
+    t0 = time.perf_counter()
+    result = engine.process_dataset(csv_path, f"export_{mode}", config=config, emit_events=False, mode=mode)
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    out.put((result, elapsed, peak_mb, os.path.getsize(result["output_path"]) if result["success"] else 0))
+
+def measure(csv_path: str, base_dir: str, mode: str, chunk_size: int):
+    # A fresh process per run, so peak RSS is that run's alone
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(csv_path, base_dir, mode, chunk_size, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+def run(rows: int, sensors: int, chunk_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "export.csv")
+        make_export(csv_path, rows, sensors)
+        size_mb = os.path.getsize(csv_path) / 1e6
+        print(f"📊 Historian export: {rows} rows x {sensors} sensors ({size_mb:.0f} MB CSV), chunk {chunk_size} rows")
+        for mode in ("batch", "streaming"):
+            result, elapsed, peak_mb, out_size = measure(csv_path, tmp, mode, chunk_size)
+            if not result["success"]:
+                print(f"   {mode:9s}: failed: {result['error']}")
+                continue
+            stats = result["statistics"]
+            print(f"   {mode:9s}: {elapsed:7.1f} s  {rows / elapsed:9.0f} rows/s  peak RSS {peak_mb:7.0f} MB  "
+                  f"{stats['column_count']} columns -> {os.path.basename(result['output_path'])} ({out_size / 1e6:.0f} MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sensors", type=int, default=8)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.rows, args.sensors, args.chunk_size)
@@ -0,0 +1,102 @@
+import os
+import sys
+import re
+import time
+import random
+import argparse
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/protocol_layer/digital_twin/swarm_language")))
+
+from dsl_parser import DTSLLexer, DTSLParser
+
+def make_source(target_bytes: int, seed: int = 3) -> str:
+    """A generated swarm definition: twins, events, actions and rules, then one swarm over them."""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        part = f"""
+// Generated station {i}
+twin Station{i} {{
+    property capacity: number = {rng.randint(10, 500)};
+    property label: string = "station-{i}";
+    sensor temp{i}: thermocouple {{ unit: "C", rate: {rng.uniform(0.5, 10):.2f} }}
+    sensor flow{i}: flowmeter;
+    actuator valve{i}: valve {{ max_open: {rng.randint(50, 100)} }}
+    state idle {{ transition running when temp{i} > {rng.randint(20, 60)}; }}
+    state running {{ transition idle when temp{i} <= {rng.randint(10, 30)} && flow{i} < 5; }}
+}}
+event Overheat{i}(station: string, value: number);
+action cool{i}(target: number) {{
+    /* open the valve until the
+       temperature drops */
+    if (temp{i} > target) {{
+        log("cooling station {i}", temp{i});
+        setpoint = target - {rng.randint(1, 9)};
+    }} else {{
+        alert("station {i} nominal");
+    }}
+}}
+rule guard{i} {{
+    when temp{i} > {rng.randint(70, 95)};
+    then {{ notify(operator, "overheat at station {i}"); }}
+}}
+"""
+        parts.append(part)
+        size += len(part)
+        i += 1
+    parts.append("swarm Plant {\n" + "".join(f"    twin Station{j} as s{j}[{rng.randint(1, 4)}];\n    rule guard{j};\n"
+                                               for j in range(i)) + "}\n")
+    return "".join(parts)
+
+def legacy_tokenize(source: str):
+    """The previous lexer loop: every pattern recompiled and matched against a fresh slice at each token."""
+    tokens = 0
+    pos = 0
+    while pos < len(source):
+        for pattern, token_type in DTSLLexer.PATTERNS:
+            match = re.compile(pattern).match(source[pos:])
+            if match:
+                tokens += 1
+                pos += len(match.group(0))
+                break
+        else:
+            pos += 1
+    return tokens
+
+def run(sizes_kb, legacy_max_kb: int):
+    logging.disable(logging.INFO)
+    print("📊 DTSL lexing and parsing of generated swarm definitions")
+    for size_kb in sizes_kb:
+        source = make_source(size_kb * 1024)
+        t0 = time.perf_counter()
+        tokens, errors = DTSLLexer(source).tokenize()
+        lex_s = time.perf_counter() - t0
+        assert not errors, errors[:3]
+
+        parser = DTSLParser()
+        t0 = time.perf_counter()
+        ast, errors = parser.parse(source)
+        parse_s = time.perf_counter() - t0
+        assert not errors, [str(e) for e in errors[:3]]
+        t0 = time.perf_counter()
+        parser.parse(source)
+        cached_s = time.perf_counter() - t0
+
+        line = (f"   {len(source) / 1e6:6.2f} MB, {len(tokens):8d} tokens: lex {lex_s:6.2f} s "
+                f"({len(source) / 1e6 / lex_s:5.1f} MB/s), parse {parse_s:6.2f} s, cached parse {cached_s * 1e3:7.2f} ms")
+        if size_kb <= legacy_max_kb:
+            t0 = time.perf_counter()
+            legacy_tokenize(source)
+            line += f", previous lexer {time.perf_counter() - t0:7.2f} s"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[64, 256, 1024, 4096, 8192])
+    parser.add_argument("--legacy-max-kb", type=int, default=256,
+                        help="Largest source to also tokenize with the previous, quadratic lexer")
+    args = parser.parse_args()
+    run(args.sizes_kb, args.legacy_max_kb)
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from ebm_lib.priors import DOMAINS
+from ebm_lib.registry import get as load_prior
+from ebm_runtime.samplers.langevin import langevin_sample, langevin_sample_batch
+
+def state_dim(prior, default: int) -> int:
+    shape = getattr(prior, "state_shape", None)
+    return int(np.prod(shape)) if shape else default
+
+def run(chains: int, steps: int, dims: int, sequential_chains: int, only=None):
+    cfg = {"steps": steps, "lr": 1e-3, "noise": 0.01, "seed": 0}
+    print(f"📊 Langevin sampling: {chains} chains x {steps} steps per prior (chain-steps/s)")
+    print(f"   {'prior':<14}{'dims':>6}{'per-chain':>14}{'batched':>14}{'speedup':>10}")
+    totals = [0.0, 0.0]
+    for domain in DOMAINS:
+        if only and domain not in only:
+            continue
+        prior = load_prior(f"{domain}_v1")
+        d = state_dim(prior, dims)
+        x0 = np.random.default_rng(0).normal(size=(chains, d))
+
+        # Previous access pattern: one chain per call, energy + state copy every step
+        start = time.perf_counter()
+        for i in range(sequential_chains):
+            langevin_sample(prior, {"state_vector": x0[i]}, cfg)
+        per_chain = sequential_chains * steps / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        langevin_sample_batch(prior, x0, {**cfg, "trace_every": 10})
+        batched = chains * steps / (time.perf_counter() - start)
+
+        totals[0] += 1.0 / per_chain
+        totals[1] += 1.0 / batched
+        print(f"   {domain:<14}{d:>6}{per_chain:>14.0f}{batched:>14.0f}{batched / per_chain:>9.0f}x")
+    print(f"   overall speedup (time-weighted): {totals[0] / totals[1]:.0f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chains", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--dims", type=int, default=8, help="state width for priors without a fixed layout")
+    parser.add_argument("--sequential-chains", type=int, default=4)
+    parser.add_argument("--priors", nargs="*", help="restrict to these domains")
+    args = parser.parse_args()
+    run(args.chains, args.steps, args.dims, args.sequential_chains, args.priors)
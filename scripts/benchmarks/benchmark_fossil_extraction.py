@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.scf.ingestion.fossilizer import Fossilizer
+
+def make_csv(path: Path, rows: int, cols: int = 8):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(rows, cols)), columns=[f"sensor_{i}" for i in range(cols)])
+    df.to_csv(path, index=False)
+
+def run(rows: int, chunk_rows: int):
+    """
+    Rows/sec of the legacy iterrows + pydantic path vs the columnar path
+    on the same synthetic CSV drop.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        raw = tmp / "raw"
+        raw.mkdir()
+        csv_path = raw / "drop.csv"
+        make_csv(csv_path, rows)
+        print(f"📊 Fossil extraction benchmark: {rows:,} rows")
+
+        results = {}
+        for label, columnar in (("iterrows", False), ("columnar", True)):
+            fossilizer = Fossilizer(str(raw), str(tmp / f"vault_{label}"), caffeinate=False,
+                                    columnar=columnar, chunk_rows=chunk_rows)
+            start = time.perf_counter()
+            fossilizer._fossilize_file(csv_path)
+            elapsed = time.perf_counter() - start
+            results[label] = rows / elapsed
+            print(f"   {label:>9}: {elapsed:7.2f}s  {results[label]:12,.0f} rows/s")
+
+        print(f"   Speedup: {results['columnar'] / results['iterrows']:.1f}x")
+        return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.rows, args.chunk_rows)
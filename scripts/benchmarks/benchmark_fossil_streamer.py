@@ -0,0 +1,50 @@
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from torch.utils.data import DataLoader
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.scf.dataloading.fossil_streamer import FossilStreamer
+
+def make_vault(vault_dir: Path, n_files: int, per_file: int):
+    rng = np.random.default_rng(0)
+    for _ in range(n_files):
+        with open(vault_dir / f"fossil_batch_{uuid.uuid4().hex[:8]}.ndjson", "w") as f:
+            for t, p, e in rng.uniform((-20, 0, 0), (120, 5000, 10), size=(per_file, 3)):
+                f.write(json.dumps({
+                    "id": str(uuid.uuid4()), "source": "bench", "timestamp": time.time(), "data": {},
+                    "meta": {"thermodynamics": {"temperature_c": t, "power_w": p, "entropy_rate": e}}
+                }) + "\n")
+
+def run(n_files: int, per_file: int, workers: list, shuffle_buffer: int):
+    """
+    Samples/sec through a DataLoader for each worker count, to size
+    data-loading hosts.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        make_vault(Path(tmp), n_files, per_file)
+        print(f"📊 FossilStreamer throughput: {n_files * per_file:,} fossils in {n_files} files")
+        for n in workers:
+            dataset = FossilStreamer(tmp, batch_size=256, shuffle_buffer=shuffle_buffer)
+            loader = DataLoader(dataset, batch_size=None, num_workers=n)
+            start = time.perf_counter()
+            samples = sum(len(x) for x, _ in loader)
+            elapsed = time.perf_counter() - start
+            print(f"   workers={n:<2}: {samples / elapsed:12,.0f} samples/s ({samples:,} samples)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--per-file", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--shuffle-buffer", type=int, default=0)
+    args = parser.parse_args()
+    run(args.files, args.per_file, args.workers, args.shuffle_buffer)
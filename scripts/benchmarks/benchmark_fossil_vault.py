@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import resource
+import tempfile
+import multiprocessing as mp
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.scf.ingestion.fossil_vault import convert_vault, columns_path, list_batches
+
+def make_vault(vault_dir: Path, n_fossils: int, per_batch: int):
+    rng = np.random.default_rng(0)
+    for start in range(0, n_fossils, per_batch):
+        n = min(per_batch, n_fossils - start)
+        temps, powers, ents = rng.uniform(-20, 120, n), rng.uniform(0, 5000, n), rng.uniform(0, 10, n)
+        with open(vault_dir / f"fossil_batch_{uuid.uuid4().hex[:8]}.ndjson", "w") as f:
+            for i in range(n):
+                f.write(json.dumps({
+                    "id": str(uuid.uuid4()), "source": "bench", "timestamp": 1.7e9 + start + i,
+                    "data": {"value": float(temps[i])},
+                    "meta": {"type": "raw_observation", "thermodynamics": {
+                        "temperature_c": float(temps[i]), "power_w": float(powers[i]), "entropy_rate": float(ents[i])}}
+                }) + "\n")
+
+def _scan(vault_dir: str, columnar: bool, out: mp.Queue):
+    # Hide sidecars from the NDJSON run so both runs see the same vault
+    if not columnar:
+        for p in list_batches(vault_dir):
+            side = columns_path(p)
+            if side.exists():
+                side.rename(side.with_name(side.name + ".off"))
+    from src.scf.dataloading.fossil_streamer import FossilStreamer
+    start = time.perf_counter()
+    rows = sum(len(x) for x, _ in FossilStreamer(vault_dir, batch_size=256))
+    elapsed = time.perf_counter() - start
+    if not columnar:
+        for side in Path(vault_dir).rglob("*.off"):
+            side.rename(side.with_name(side.name[:-len(".off")]))
+    out.put((rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+def run(n_fossils: int, per_batch: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        make_vault(Path(tmp), n_fossils, per_batch)
+        start = time.perf_counter()
+        convert_vault(tmp)
+        print(f"📊 Vault scan benchmark: {n_fossils:,} fossils "
+              f"(conversion {time.perf_counter() - start:.2f}s)")
+        ctx = mp.get_context("spawn")
+        for label, columnar in (("ndjson", False), ("columnar", True)):
+            q = ctx.Queue()
+            proc = ctx.Process(target=_scan, args=(tmp, columnar, q))
+            proc.start()
+            rows, elapsed, rss_mb = q.get()
+            proc.join()
+            print(f"   {label:>8}: {elapsed:6.2f}s  {rows / elapsed:12,.0f} fossils/s  peak RSS {rss_mb:7.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fossils", type=int, default=500_000)
+    parser.add_argument("--per-batch", type=int, default=50_000)
+    args = parser.parse_args()
+    run(args.fossils, args.per_batch)
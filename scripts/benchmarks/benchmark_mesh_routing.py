@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/workflow_automation_layer")))
+
+from workflow_engine.mesh_topology_manager import (
+    MeshTopologyManager, AgentMeshTopology, AgentMetrics, RoutingStrategy, trust_weighted_score
+)
+
+CAPABILITIES = [f"cap{i}" for i in range(12)]
+
+def populate(manager, agents: int, seed: int = 5):
+    rng = random.Random(seed)
+    for i in range(agents):
+        manager.register_agent(AgentMetrics(
+            agent_id=f"agent{i}", trust_score=rng.uniform(0.3, 1.0), avg_latency_ms=rng.uniform(20, 800),
+            load=rng.uniform(0, 0.9), capabilities=rng.sample(CAPABILITIES, rng.randint(2, 6))
+        ))
+
+def scan_select(manager, required_capabilities, trust_threshold=0.5):
+    """The previous trust-weighted selection: filter every agent, then sort them all."""
+    eligible = [
+        agent for agent in manager.agent_metrics.values()
+        if all(cap in agent.capabilities for cap in required_capabilities)
+        and agent.trust_score >= trust_threshold
+    ]
+    scored = sorted(((agent, trust_weighted_score(agent)) for agent in eligible), key=lambda x: x[1], reverse=True)
+    return scored[0][0].agent_id, [agent.agent_id for agent, _ in scored[1:4]]
+
+def run(agents: int, decisions: int):
+    logging.disable(logging.INFO)
+    manager = MeshTopologyManager()
+    populate(manager, agents)
+    rng = random.Random(9)
+    print(f"📊 Mesh routing: {agents} agents, {len(CAPABILITIES)} capabilities")
+
+    for required in (["cap1"], ["cap1", "cap2"], ["cap1", "cap2", "cap3"]):
+        topology = AgentMeshTopology(routing_strategy=RoutingStrategy.TRUST_WEIGHTED)
+        t0 = time.perf_counter()
+        for _ in range(decisions):
+            scan_select(manager, required)
+        scan_rate = decisions / (time.perf_counter() - t0)
+
+        # Interleave load and outcome updates with routing, as a live mesh does
+        t0 = time.perf_counter()
+        for _ in range(decisions):
+            decision = manager.select_agent("task", required, topology)
+            manager.update_agent_load(decision.selected_agent_id, 0.1)
+            manager.report_agent_success(f"agent{rng.randrange(agents)}", rng.uniform(20, 800))
+        indexed_rate = decisions / (time.perf_counter() - t0)
+        print(f"   requires {len(required)} capabilities : scan {scan_rate:9.0f} decisions/s   "
+              f"index {indexed_rate:9.0f} decisions/s (with 2 metric updates each)")
+
+    results = manager.simulate_routing("task", ["cap1", "cap2"], AgentMeshTopology(), num_simulations=decisions)
+    for strategy, result in results.items():
+        print(f"   simulate_routing {strategy:17s}: {result['decisions_per_second']:9.0f} decisions/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=5000)
+    parser.add_argument("--decisions", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.agents, args.decisions)
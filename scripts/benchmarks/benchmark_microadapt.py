@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import warnings
+
+import numpy as np
+from scipy.cluster.vq import kmeans2
+from scipy.integrate import odeint
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.capsule_layer.services.microadapt_edge.microadapt_service import (
+    MicroAdaptEdgeService, ModelUnit, ModelUnitDynamics
+)
+
+def sensor_stream(samples: int, features: int, segment: int = 500, seed: int = 0) -> np.ndarray:
+    """Noisy oscillations that switch between three regimes every segment samples."""
+    rng = np.random.default_rng(seed)
+    frequencies, amplitudes = [0.05, 0.13, 0.02], [1.0, 0.5, 2.0]
+    stream = np.zeros((samples, features))
+    for t in range(samples):
+        regime = (t // segment) % 3
+        stream[t] = amplitudes[regime] * np.sin(frequencies[regime] * t + np.arange(features))
+    return stream + 0.1 * rng.normal(size=stream.shape)
+
+def legacy_predict(X: np.ndarray, unit: ModelUnit) -> np.ndarray:
+    params = unit.parameters
+    t = np.linspace(0, X.shape[0] - 1, X.shape[0])
+    states = odeint(ModelUnitDynamics.latent_dynamics, params["s_star"], t, args=(params["p"], params["Q"]))
+    return np.array([ModelUnitDynamics.observation_model(s, params["u"], params["V"]) for s in states])
+
+def legacy_update(service: MicroAdaptEdgeService, history: list, units: dict, x: np.ndarray):
+    """The previous update: rebuild every level from the stream, then an odeint-based adaptation."""
+    history.append(x)
+    for h in range(1, service.num_hierarchical_levels + 1):
+        length = service.base_window_length * (2 ** (h - 1))
+        if len(history) >= length:
+            window = np.array(history[-length:])
+            if h > 1:
+                window = service._moving_average(window, 2 * h)
+    X = np.array(history[-service.base_window_length:])
+
+    unit_ids = list(units)
+    if len(unit_ids) > 1:
+        predictions = {unit_id: legacy_predict(X, units[unit_id]) for unit_id in unit_ids}
+        D = np.zeros((len(unit_ids), len(unit_ids)))
+        for i, a in enumerate(unit_ids):
+            for j, b in enumerate(unit_ids):
+                if i != j:
+                    # Both predictions were integrated for every pair
+                    legacy_predict(X, units[a]), legacy_predict(X, units[b])
+                    D[i, j] = np.linalg.norm(predictions[a] - predictions[b])
+        kmeans2(D, min(service.num_regimes, len(unit_ids)), minit="points")
+    if len(units) >= service.max_model_units:
+        fitness = [-np.sum((X - legacy_predict(X, units[unit_id])) ** 2) for unit_id in unit_ids]
+        del units[unit_ids[int(np.argmin(fitness))]]
+    unit_id = f"unit-{len(history)}"
+    units[unit_id] = ModelUnit(unit_id, ModelUnitDynamics.estimate_parameters(X, service.latent_dim),
+                               0.0, -1, None, None)
+
+async def replay(service: MicroAdaptEdgeService, stream: np.ndarray) -> float:
+    start = time.perf_counter()
+    for x in stream:
+        await service.update(x)
+    return len(stream) / (time.perf_counter() - start)
+
+def run(window_lengths, samples: int, features: int, legacy_samples: int, budget_s: float):
+    warnings.filterwarnings("ignore")
+    print(f"📊 MicroAdapt edge updates: {samples} samples of {features} features, regime switch every 500 samples")
+    stream = sensor_stream(samples, features)
+    for base in window_lengths:
+        service = MicroAdaptEdgeService({"base_window_length": base})
+        drift_rate = asyncio.run(replay(service, stream))
+        refits = service.get_statistics()["total_refits"]
+
+        every_update = MicroAdaptEdgeService({"base_window_length": base, "drift_detection": False})
+        every_rate = asyncio.run(replay(every_update, stream[:legacy_samples * 10]))
+
+        legacy_service = MicroAdaptEdgeService({"base_window_length": base})
+        history, units = [], {}
+        start = time.perf_counter()
+        done = 0
+        for x in stream[:legacy_samples]:
+            if time.perf_counter() - start > budget_s:
+                break
+            legacy_update(legacy_service, history, units, x)
+            done += 1
+        legacy_rate = done / (time.perf_counter() - start)
+
+        print(f"   window {base:4d}: legacy {legacy_rate:8.1f} samples/s, incremental refit every update "
+              f"{every_rate:8.1f} samples/s, drift-gated {drift_rate:8.1f} samples/s "
+              f"({refits} refits, {drift_rate / legacy_rate:.0f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--window-lengths", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--features", type=int, default=4)
+    parser.add_argument("--legacy-samples", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=30.0)
+    args = parser.parse_args()
+    run(args.window_lengths, args.samples, args.features, args.legacy_samples, args.budget)
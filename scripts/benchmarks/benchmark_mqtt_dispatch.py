@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+import json
+import random
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/protocol_layer")))
+
+from industrial.adapters.mqtt.topic_trie import TopicTrie
+
+def legacy_topic_matches(subscription_topic: str, message_topic: str) -> bool:
+    """MQTTAdapter._topic_matches before the topic trie."""
+    sub_parts = subscription_topic.split('/')
+    msg_parts = message_topic.split('/')
+    if subscription_topic == '#':
+        return True
+    if len(sub_parts) != len(msg_parts) and '#' not in sub_parts:
+        return False
+    for i, sub_part in enumerate(sub_parts):
+        if sub_part == '#':
+            return True
+        if sub_part == '+':
+            if i == len(sub_parts) - 1 and i == len(msg_parts) - 1:
+                continue
+            elif i < len(msg_parts) - 1:
+                continue
+            else:
+                return False
+        if i >= len(msg_parts) or sub_part != msg_parts[i]:
+            return False
+    return True
+
+def workload(subscriptions: int, topics: int, seed: int = 3):
+    """Per-device subscriptions, a share of them wildcards, and sensor topics of plants/lines/devices."""
+    rng = random.Random(seed)
+    filters, devices = [], []
+    for i in range(subscriptions):
+        plant, line, device = f"plant{rng.randrange(10)}", f"line{rng.randrange(20)}", f"dev{i}"
+        devices.append(f"{plant}/{line}/{device}")
+        filters.append(rng.choice([
+            f"{plant}/{line}/{device}/temp",
+            f"{plant}/{line}/{device}/+",
+            f"{plant}/+/{device}/#",
+        ]))
+    topic_names = [f"{rng.choice(devices)}/{rng.choice(['temp', 'pressure', 'vibration'])}" for _ in range(topics)]
+    payload = json.dumps({"value": 21.5, "unit": "C", "quality": "good"}).encode()
+    return filters, topic_names, payload
+
+def run_legacy(filters, stream, payload):
+    subscriptions = {i: {"broker_id": "b", "topic": f, "callback": None} for i, f in enumerate(filters)}
+    topic_cache = {}
+    events = 0
+    start = time.perf_counter()
+    for topic in stream:
+        try:
+            payload_dict = json.loads(payload.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            payload_dict = None
+        msg = {"broker_id": "b", "topic": topic, "payload": payload_dict, "timestamp": datetime.now().isoformat()}
+        matching = [i for i, s in subscriptions.items() if s["broker_id"] == "b" and legacy_topic_matches(s["topic"], topic)]
+        if matching:
+            events += 1  # one publish_event per message
+        if topic not in topic_cache:
+            topic_cache[topic] = {"first_seen": datetime.now().isoformat(), "message_count": 1,
+                                  "last_payload_type": type(payload_dict).__name__,
+                                  "last_seen": datetime.now().isoformat()}
+        else:
+            topic_cache[topic]["message_count"] += 1
+            topic_cache[topic]["last_payload_type"] = type(payload_dict).__name__
+            topic_cache[topic]["last_seen"] = datetime.now().isoformat()
+    return time.perf_counter() - start, events
+
+def run_trie(filters, stream, payload, batch_size, cache_size=10000):
+    trie = TopicTrie()
+    for i, f in enumerate(filters):
+        trie.add(f, i)
+    tries = {"b": trie}
+    topic_cache = OrderedDict()
+    buffer = []
+    events = 0
+    start = time.perf_counter()
+    for topic in stream:
+        now = time.time()
+        entry = topic_cache.get(topic)
+        if entry is None:
+            entry = topic_cache[topic] = {"first_seen": now, "message_count": 0}
+            if len(topic_cache) > cache_size:
+                topic_cache.popitem(last=False)
+        else:
+            topic_cache.move_to_end(topic)
+        entry["message_count"] += 1
+        entry["last_seen"] = now
+        entry["last_payload"] = payload  # small payloads are kept raw
+        if not tries["b"].match(topic):
+            continue
+        buffer.append({"broker_id": "b", "topic": topic, "payload": payload, "payload_raw": payload,
+                       "timestamp": datetime.fromtimestamp(now).isoformat()})
+        if len(buffer) >= batch_size:
+            for msg in buffer:  # decoded once, when the batch event is built
+                msg["payload"] = json.loads(msg["payload_raw"].decode('utf-8'))
+            buffer = []
+            events += 1
+    return time.perf_counter() - start, events
+
+def run(subscriptions: int, topics: int, messages: int, batch_size: int):
+    filters, topic_names, payload = workload(subscriptions, topics)
+    rng = random.Random(5)
+    stream = [rng.choice(topic_names) for _ in range(messages)]
+    print(f"📊 MQTT dispatch: {subscriptions} subscriptions, {topics} distinct topics, {messages} messages")
+
+    elapsed, events = run_legacy(filters, stream, payload)
+    print(f"   linear scan : {messages / elapsed:10.0f} msg/s, {events} events")
+
+    elapsed, events = run_trie(filters, stream, payload, 1)
+    print(f"   topic trie  : {messages / elapsed:10.0f} msg/s, {events} events (one per message, the default)")
+
+    elapsed, events = run_trie(filters, stream, payload, batch_size)
+    print(f"   topic trie  : {messages / elapsed:10.0f} msg/s, {events} events (event_batch_size={batch_size})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscriptions", type=int, default=5000)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    run(args.subscriptions, args.topics, args.messages, args.batch_size)
@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/overseer_system/intelligence_market")))
+
+from order_book import BUY, SELL, OrderBook
+
+def resting_orders(count: int, seed: int = 5):
+    """Non-crossing bids below 100 and asks above it, with a few sharing each price."""
+    rng = random.Random(seed)
+    orders = []
+    for i in range(count):
+        side = BUY if i % 2 == 0 else SELL
+        offset = round(rng.uniform(0.01, 20.0), 2)
+        orders.append((f"r{i}", side, 100.0 - offset if side == BUY else 100.0 + offset, float(rng.randint(1, 20))))
+    return orders
+
+def order_flow(count: int, resting_ids, seed: int = 9):
+    """Incoming limit orders around the spread, a third of them marketable, mixed with cancels."""
+    rng = random.Random(seed)
+    flow = []
+    for i in range(count):
+        if rng.random() < 0.3:
+            flow.append(("cancel", rng.choice(resting_ids)))
+        else:
+            side = rng.choice([BUY, SELL])
+            offset = round(rng.uniform(-0.5, 1.0), 2)
+            price = 100.0 - offset if side == BUY else 100.0 + offset
+            flow.append(("submit", (f"n{i}", side, price, float(rng.randint(1, 40)))))
+    return flow
+
+def legacy_arrival(buys, sells, order, deadline):
+    """The previous _match_orders: re-sort both sides on every arrival, then scan every pair for a match."""
+    order_id, side, price, quantity = order
+    (buys if side == BUY else sells).append([order_id, price, quantity, True])
+    buy_orders = sorted([b for b in buys if b[3]], key=lambda b: b[1], reverse=True)
+    sell_orders = sorted([s for s in sells if s[3]], key=lambda s: s[1])
+    for buy in buy_orders:
+        if time.perf_counter() > deadline:
+            return False
+        if not buy[3]:
+            continue
+        for sell in sell_orders:
+            if sell[3] and buy[1] >= sell[1] and sell[2] >= buy[2]:
+                buy[3] = sell[3] = False
+                break
+    return True
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+def run(sizes, orders: int, legacy_orders: int, budget_s: float):
+    print(f"📊 Order book replay: {orders} incoming orders and cancels per book size")
+    for size in sizes:
+        prefill = resting_orders(size)
+        flow = order_flow(orders, [order_id for order_id, _, _, _ in prefill])
+
+        book = OrderBook()
+        start = time.perf_counter()
+        for order_id, side, price, quantity in prefill:
+            book.submit(order_id, side, price, quantity, now=0.0)
+        prefill_s = time.perf_counter() - start
+
+        latencies = []
+        fills = 0
+        start = time.perf_counter()
+        for kind, item in flow:
+            t0 = time.perf_counter()
+            if kind == "cancel":
+                book.cancel(item)
+            else:
+                order_id, side, price, quantity = item
+                fills += len(book.submit(order_id, side, price, quantity, now=0.0)[0])
+            latencies.append(time.perf_counter() - t0)
+        replay_s = time.perf_counter() - start
+
+        print(f"   {size:8d} resting: prefill {size / prefill_s:9.0f} orders/s, replay {orders / replay_s:9.0f} orders/s, "
+              f"p50 {percentile(latencies, 0.5) * 1e6:6.1f} µs, p99 {percentile(latencies, 0.99) * 1e6:6.1f} µs, {fills} fills")
+
+        if legacy_orders:
+            buys = [[o, p, q, True] for o, s, p, q in prefill if s == BUY]
+            sells = [[o, p, q, True] for o, s, p, q in prefill if s == SELL]
+            submits = [item for kind, item in flow if kind == "submit"][:legacy_orders]
+            start = time.perf_counter()
+            done = all(legacy_arrival(buys, sells, order, start + budget_s) for order in submits)
+            if done:
+                legacy_s = (time.perf_counter() - start) / len(submits)
+                print(f"   {'':8s}          legacy re-sort: {1 / legacy_s:9.1f} orders/s, {legacy_s * 1e3:8.1f} ms per order")
+            else:
+                print(f"   {'':8s}          legacy re-sort: >{budget_s:.0f} s for {len(submits)} orders")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--legacy-orders", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=10.0)
+    args = parser.parse_args()
+    run(args.sizes, args.orders, args.legacy_orders, args.budget)
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.proof_core.proof_hub.sqlite_repository import SQLiteProofRepository
+from src.proof_core.proof_hub.proof_sink import WriteBehindProofSink
+
+def make_proof(i: int):
+    return {"proof_id": f"bench_{i}", "utid": "UTID:REAL:bench", "domain": "api_request",
+            "inputs": {"path": "/v1/bench", "method": "GET"}, "outputs": {"status_code": 200},
+            "metadata": {"energy_joules": 1.5, "entropy": 0.4}}
+
+def timed(record, n: int):
+    samples = []
+    start = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter()
+        record(make_proof(i))
+        samples.append((time.perf_counter() - t0) * 1e6)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return elapsed, samples[len(samples) // 2], samples[int(0.99 * (len(samples) - 1))]
+
+def run(n: int, overflow: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"📊 Proof persistence: {n} request proofs")
+
+        inline = SQLiteProofRepository(os.path.join(tmp, "inline.db"))
+        elapsed, p50, p99 = timed(inline.store, n)
+        print(f"   inline store : {n / elapsed:10.0f} req/s   p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
+
+        repo = SQLiteProofRepository(os.path.join(tmp, "sink.db"))
+        sink = WriteBehindProofSink(repo, capacity=max(n, 1), overflow=overflow)
+        sink.start()
+        elapsed, p50, p99 = timed(sink.submit, n)
+        t0 = time.perf_counter()
+        sink.flush()
+        drain = time.perf_counter() - t0
+        sink.close()
+        stats = sink.stats()
+        print(f"   write-behind : {n / elapsed:10.0f} req/s   p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
+        print(f"   durable after drain of {drain * 1000:.0f} ms: {stats['persisted']}/{stats['submitted']} "
+              f"in {stats['batches']} batches (max lag {stats['max_lag_s'] * 1000:.0f} ms, dropped {stats['dropped']})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--proofs", type=int, default=5000)
+    parser.add_argument("--overflow", default="drop", choices=["drop", "sample", "block"])
+    args = parser.parse_args()
+    run(args.proofs, args.overflow)
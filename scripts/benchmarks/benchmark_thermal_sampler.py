@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.capsule_layer.services.thermal_sampler.thermal_sampler_service import ThermalSamplerService, ProblemType, Constraint
+
+def make_landscape(service: ThermalSamplerService, dims: int) -> str:
+    return service.create_landscape(
+        ProblemType.MASK_PLACEMENT, dims,
+        [Constraint("center", "equality", 1.0, "", {"target": 0.5}),
+         Constraint("ceiling", "inequality", 2.0, "", {"threshold": 0.8}),
+         Constraint("spacing", "distance", 1.0, "", {"points": [[0.2, 0.2], [0.8, 0.8]], "min_distance": 0.3})],
+    )
+
+def sequential_chain(service: ThermalSamplerService, landscape_id: str, rng) -> int:
+    """The pre-batching loop: one chain, one proposal and one energy call at a time."""
+    landscape = service.landscapes[landscape_id]
+    energy_fn = service.compile_energy_function(landscape_id)
+    state = rng.uniform([b[0] for b in landscape.bounds], [b[1] for b in landscape.bounds])
+    energy = energy_fn(state)
+    temperature = service.initial_temperature
+    proposals = 0
+    while temperature > service.final_temperature:
+        for _ in range(service.samples_per_temp):
+            proposal = state + rng.normal(size=state.shape) * temperature
+            proposal = np.clip(proposal, np.array([b[0] for b in landscape.bounds]),
+                               np.array([b[1] for b in landscape.bounds]))
+            proposed = energy_fn(proposal)
+            delta = proposed - energy
+            if delta < 0 or rng.uniform() < np.exp(-delta / temperature):
+                state, energy = proposal, proposed
+            proposals += 1
+        temperature *= service.cooling_rate
+    return proposals
+
+def run(chains: int, dims: int, sequential_chains: int):
+    service = ThermalSamplerService({"seed": 0})
+    landscape_id = make_landscape(service, dims)
+    print(f"📊 Thermal sampler: {chains} chains, {dims} dimensions")
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    proposals = sum(sequential_chain(service, landscape_id, rng) for _ in range(sequential_chains))
+    elapsed = time.perf_counter() - start
+    print(f"   sequential : {proposals / elapsed:12.0f} proposals/s "
+          f"(~{chains * elapsed / sequential_chains:.1f} s for {chains} chains)")
+
+    solutions = asyncio.run(service.sample(landscape_id, num_samples=chains))
+    run_stats = service.last_run
+    print(f"   batched    : {run_stats['proposals_per_sec']:12.0f} proposals/s "
+          f"({run_stats['elapsed_s']:.2f} s, early stop: {run_stats['stopped_early']})")
+    print(f"   best energy: {min(s.energy for s in solutions):.4f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chains", type=int, default=1000)
+    parser.add_argument("--dims", type=int, default=8)
+    parser.add_argument("--sequential-chains", type=int, default=3)
+    args = parser.parse_args()
+    run(args.chains, args.dims, args.sequential_chains)
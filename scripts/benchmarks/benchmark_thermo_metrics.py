@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.core.energy_atlas.atlas_core import EnergyAtlas
+from src.bridge_api.telemetry.thermo import ThermoMetrics
+
+def make_manifest(path: str, n_nodes: int):
+    nodes = [{
+        "node_id": f"node_{i:05d}", "node_type": "gpu",
+        "electrical": {"capacitance_gate": 1.5e-9, "capacitance_wire": 2.0e-9, "capacitance_fringe": 0.5e-9,
+                       "voltage_min": 0.7, "voltage_max": 1.2, "leakage_current_base": 0.05,
+                       "thermal_resistance": 0.15},
+        "location": {"rack": i // 40, "u": i % 40}, "metadata": {"vendor": "bench"}
+    } for i in range(n_nodes)]
+    with open(path, "w") as f:
+        json.dump({"version": "1.0", "nodes": nodes}, f)
+
+def legacy_request_overhead(atlas: EnergyAtlas, manifest: str):
+    """What ProofMiddleware + AIShieldMiddleware did per request before the snapshot."""
+    # ProofMiddleware -> ThermoMetrics.live_metrics
+    atlas.load_manifest(manifest)
+    energy_map = atlas.get_energy_map()
+    nodes = energy_map["nodes"].values()
+    sum(n.get("electrical", {}).get("thermal_resistance", 0) for n in nodes)
+    # AIShieldMiddleware builds the map again
+    energy_map = atlas.get_energy_map()
+    sum(n.get("electrical", {}).get("thermal_resistance", 0) for n in energy_map["nodes"].values())
+
+def snapshot_request_overhead(thermo: ThermoMetrics):
+    thermo.live_metrics()
+    thermo.refresh()
+    thermo.snapshot()["total_thermal_resistance"]
+
+def percentiles(fn, requests: int):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(0.99 * (len(samples) - 1))]
+
+def run(n_nodes: int, requests: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, "manifest.json")
+        make_manifest(manifest, n_nodes)
+        atlas = EnergyAtlas(use_mock=True)
+        thermo = ThermoMetrics(manifest)
+        print(f"📊 Per-request thermo overhead: {n_nodes} atlas nodes, {requests} requests")
+        for label, fn in (("before", lambda: legacy_request_overhead(atlas, manifest)),
+                          ("after", lambda: snapshot_request_overhead(thermo))):
+            p50, p99 = percentiles(fn, requests)
+            print(f"   {label:>6}: p50 {p50:10.1f} µs   p99 {p99:10.1f} µs")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=256)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    run(args.nodes, args.requests)
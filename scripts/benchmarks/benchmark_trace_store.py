@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/workflow_automation_layer")))
+
+from workflow_engine.capsule_debug_trace_manager import (
+    CapsuleDebugTraceManager, CapsuleDebugTrace, AgentTrace, TraceStorageType
+)
+
+def populate(path: str, traces: int, entries: int, seed: int = 3):
+    rng = random.Random(seed)
+    manager = CapsuleDebugTraceManager(TraceStorageType.FILE, path, cache_max_bytes=0)
+    for i in range(traces):
+        trace = manager.create_trace(f"wf{rng.randrange(20)}", f"exec{i}")
+        trace.agent_trace = [AgentTrace(agent_id=f"agent{rng.randrange(10)}",
+                                        decision=rng.choice(["completed", "completed", "failed"]),
+                                        reason="Task executed successfully")
+                             for _ in range(entries)]
+        manager.complete_trace(trace.execution_id, status=rng.choice(["completed", "failed"]))
+
+def load_all(path: str):
+    """The previous list_traces in FILE mode: hydrate every trace, then filter."""
+    traces = {}
+    for workflow_dir in os.listdir(path):
+        workflow_path = os.path.join(path, workflow_dir)
+        if not os.path.isdir(workflow_path):
+            continue
+        for trace_file in os.listdir(workflow_path):
+            if trace_file.endswith(".json"):
+                with open(os.path.join(workflow_path, trace_file)) as f:
+                    traces[trace_file[:-5]] = CapsuleDebugTrace(**json.load(f))
+    result = [{"execution_id": t.execution_id, "start_time": t.start_time, "agent_count": len(t.agent_trace)}
+              for t in traces.values() if t.workflow_id == "wf3" and t.status == "failed"]
+    result.sort(key=lambda t: t["start_time"], reverse=True)
+    return result[:20], traces
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed * 1000, peak / 1e6
+
+def run(traces: int, entries: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        populate(tmp, traces, entries)
+        print(f"📊 Debug traces: {traces} traces x {entries} agent entries")
+
+        (listing, hydrated), ms, mb = measure(lambda: load_all(tmp))
+        print(f"   list (load all)      : {ms:9.1f} ms   peak {mb:7.1f} MB   {len(hydrated)} traces hydrated")
+        del hydrated
+
+        manager = CapsuleDebugTraceManager(TraceStorageType.FILE, tmp)
+        _, ms, _ = measure(manager.reindex)
+        print(f"   index cold start     : {ms:9.1f} ms (once per process, after external writes)")
+        indexed, ms, mb = measure(lambda: manager.list_traces(workflow_id="wf3", status="failed", limit=20))
+        assert [t["execution_id"] for t in indexed] == [t["execution_id"] for t in listing]
+        print(f"   list (index)         : {ms:9.1f} ms   peak {mb:7.1f} MB   {len(manager.traces)} traces hydrated")
+
+        _, ms, mb = measure(lambda: manager.analyze_trace("exec7"))
+        print(f"   analyze (streamed)   : {ms:9.2f} ms   peak {mb:7.2f} MB")
+        _, ms, mb = measure(lambda: manager.compare_traces("exec7", "exec8"))
+        print(f"   compare (streamed)   : {ms:9.2f} ms   peak {mb:7.2f} MB")
+        print(f"   cache                : {manager.get_cache_stats()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traces", type=int, default=5000)
+    parser.add_argument("--entries", type=int, default=50)
+    args = parser.parse_args()
+    run(args.traces, args.entries)
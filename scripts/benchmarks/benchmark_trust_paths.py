@@ -0,0 +1,79 @@
+import os
+import time
+import random
+import argparse
+import importlib.util
+
+# Loaded from its file: the trust_management package __init__ imports the FastAPI service
+_spec = importlib.util.spec_from_file_location(
+    "trust_path_engine",
+    os.path.join(os.path.dirname(__file__), "../../src/overseer_system/trust_management/trust_path_engine.py"),
+)
+trust_path_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trust_path_engine)
+TrustPathEngine = trust_path_engine.TrustPathEngine
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+def mesh(nodes: int, degree: int, seed: int = 11):
+    """An agent mesh where every entity trusts `degree` random others."""
+    rng = random.Random(seed)
+    edges = []
+    for u in range(nodes):
+        for v in rng.sample([n for n in range(nodes) if n != u], degree):
+            edges.append((f"e{u}", f"e{v}", f"r{len(edges)}", rng.uniform(0.3, 1.0)))
+    return edges
+
+def legacy_query(edges, source, target, max_hops, budget_s):
+    """The previous find_trust_paths: filtered graph copy, then every simple path, sorted."""
+    start = time.perf_counter()
+    graph = nx.DiGraph()
+    for u, v, rel_id, trust in edges:
+        graph.add_edge(u, v, relationship_id=rel_id, trust_score=trust)
+    paths = []
+    for nodes in nx.all_simple_paths(graph, source=source, target=target, cutoff=max_hops):
+        trust = 1.0
+        for u, v in zip(nodes, nodes[1:]):
+            trust *= graph[u][v]["trust_score"]
+        paths.append((trust, nodes))
+        if time.perf_counter() - start > budget_s:
+            return None
+    paths.sort(key=lambda p: p[0], reverse=True)
+    return time.perf_counter() - start
+
+def run(sizes, degrees, max_hops: int, k: int, queries: int, budget_s: float):
+    print(f"📊 Trust path queries: top {k} paths, at most {max_hops} hops, {queries} queries per graph")
+    for nodes in sizes:
+        for degree in degrees:
+            edges = mesh(nodes, degree)
+            engine = TrustPathEngine(cache_size=0)
+            for u, v, rel_id, trust in edges:
+                engine.set_edge(u, v, rel_id, trust, "operational")
+            rng = random.Random(3)
+            pairs = [tuple(f"e{n}" for n in rng.sample(range(nodes), 2)) for _ in range(queries)]
+
+            start = time.perf_counter()
+            for source, target in pairs:
+                engine.find_paths(source, target, max_paths=k, max_hops=max_hops)
+            engine_ms = (time.perf_counter() - start) / queries * 1000
+
+            legacy = "n/a (networkx missing)"
+            if nx is not None:
+                elapsed = legacy_query(edges, pairs[0][0], pairs[0][1], max_hops, budget_s)
+                legacy = f">{budget_s * 1000:.0f} ms" if elapsed is None else f"{elapsed * 1000:.1f} ms"
+            print(f"   {nodes:6d} entities, degree {degree:3d}: engine {engine_ms:8.2f} ms/query, "
+                  f"all simple paths {legacy}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--degrees", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--max-hops", type=int, default=5)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=5.0)
+    args = parser.parse_args()
+    run(args.sizes, args.degrees, args.max_hops, args.k, args.queries, args.budget)
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src/workflow_automation_layer")))
+
+from workflow_engine.workflow_telemetry import WorkflowTelemetry, TelemetryEventType, TelemetryStorageType
+
+def populate(telemetry, executions: int, days: int, seed: int = 1):
+    rng = random.Random(seed)
+    now = datetime.now()
+    # Executions arrive in time order, as live telemetry does
+    offsets = sorted((rng.uniform(0, days * 86400) for _ in range(executions)), reverse=True)
+    for i, offset in enumerate(offsets):
+        start = now - timedelta(seconds=offset)
+        common = {"workflow_id": f"wf{rng.randrange(50)}", "execution_id": f"exec{i}"}
+        telemetry.record_event(TelemetryEventType.WORKFLOW_STARTED, timestamp=start, **common)
+        for t in range(3):
+            telemetry.record_event(TelemetryEventType.TASK_COMPLETED, timestamp=start + timedelta(seconds=t),
+                                   task_id=f"t{t}", agent_id=f"agent{rng.randrange(20)}", duration_ms=900, **common)
+        end = rng.choice([TelemetryEventType.WORKFLOW_COMPLETED] * 4 + [TelemetryEventType.WORKFLOW_FAILED])
+        telemetry.record_event(end, timestamp=start + timedelta(seconds=5), **common)
+
+def scan_events(events, workflow_id=None, execution_id=None, event_type=None, start_time=None, limit=None):
+    """The previous get_events: one list comprehension per filter, then a full sort."""
+    result = events
+    if workflow_id:
+        result = [e for e in result if e.workflow_id == workflow_id]
+    if execution_id:
+        result = [e for e in result if e.execution_id == execution_id]
+    if event_type:
+        result = [e for e in result if e.type == event_type]
+    if start_time:
+        result = [e for e in result if e.timestamp >= start_time]
+    result = sorted(result, key=lambda e: e.timestamp, reverse=True)
+    return result[:limit] if limit else result
+
+def scan_success_rate(events, workflow_id, days):
+    start = datetime.now() - timedelta(days=days)
+    completed = len(scan_events(events, workflow_id, event_type=TelemetryEventType.WORKFLOW_COMPLETED, start_time=start))
+    failed = len(scan_events(events, workflow_id, event_type=TelemetryEventType.WORKFLOW_FAILED, start_time=start))
+    return completed / (completed + failed) * 100 if completed + failed else None
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def run(executions: int, days: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = WorkflowTelemetry(TelemetryStorageType.DATABASE, os.path.join(tmp, "telemetry.db"),
+                                      retention_days=days + 1, hot_partitions=24)
+        t0 = time.perf_counter()
+        populate(telemetry, executions, days)
+        ingest = time.perf_counter() - t0
+        events = telemetry.events
+        stats = telemetry.get_storage_stats()
+        print(f"📊 Workflow telemetry: {stats['events']} events over {days} days "
+              f"({stats['events'] / ingest:.0f} events/s ingest, {stats['partitions']} partitions, "
+              f"{stats['events_in_memory']} in memory)")
+
+        last_day = datetime.now() - timedelta(days=1)
+        queries = [
+            ("execution timeline",
+             lambda: scan_events(events, execution_id="exec123"),
+             lambda: telemetry.get_workflow_execution_timeline("exec123")),
+            ("failures last day, top 100",
+             lambda: scan_events(events, "wf7", event_type=TelemetryEventType.WORKFLOW_FAILED, start_time=last_day, limit=100),
+             lambda: telemetry.get_events(workflow_id="wf7", event_type=TelemetryEventType.WORKFLOW_FAILED,
+                                          start_time=last_day, limit=100)),
+            ("success rate 7d",
+             lambda: scan_success_rate(events, "wf7", 7),
+             lambda: telemetry.get_workflow_success_rate("wf7", 7)),
+            ("performance report 7d",
+             None,
+             lambda: telemetry.generate_workflow_performance_report("wf7", 7)),
+        ]
+        for label, scan, indexed in queries:
+            after = timed(indexed, repeat)
+            before = f"{timed(scan, repeat):9.2f} ms" if scan else "        n/a"
+            print(f"   {label:28s}: scan {before}   store {after:8.3f} ms")
+        telemetry.store.segments.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--executions", type=int, default=40000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.executions, args.days, args.repeat)
@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.capsule_layer.services.world_model.world_model_service import (
+    WorldModelService, DomainType, ResistDiffusionSimulator, PlasmaSimulator, JAX_AVAILABLE, jnp
+)
+from src.capsule_layer.services.world_model.rollout_engine import RolloutEngine
+
+def legacy_rollout(domain: DomainType, grid: np.ndarray, steps: int):
+    """The previous simulation loop: one simulator step per iteration, host copies every 10 steps."""
+    captured = []
+    if domain == DomainType.RESIST_CHEMISTRY:
+        concentration, temperature = jnp.array(grid), jnp.ones_like(jnp.array(grid))
+        for step in range(steps):
+            if step % 10 == 0:
+                captured.append((np.array(concentration), float(jnp.sum(concentration ** 2))))
+            concentration = ResistDiffusionSimulator.step(concentration, temperature, 0.01, 0.1, 0.01)
+        return np.array(concentration), captured
+
+    density = jnp.array(grid)
+    velocity_x, velocity_y, temperature = jnp.zeros_like(density), jnp.zeros_like(density), jnp.ones_like(density)
+    for step in range(steps):
+        if step % 10 == 0:
+            captured.append((np.array(density), np.array(jnp.stack([velocity_x, velocity_y], axis=-1)),
+                             float(0.5 * jnp.sum(density * (velocity_x ** 2 + velocity_y ** 2)) + jnp.sum(temperature))))
+        density, velocity_x, velocity_y, temperature = PlasmaSimulator.step(
+            density, velocity_x, velocity_y, temperature, 0.01, 0.01
+        )
+    return np.array(density), captured
+
+def timed(fn, repeats: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+def run(grid: int, steps: int, samples: int, legacy_samples: int, batch_size: int):
+    print(f"📊 World model rollouts: {grid}x{grid} grid, {steps} steps, captures every 10 steps "
+          f"({'JAX' if JAX_AVAILABLE else 'numpy'} backend)")
+    # The service simulates in float32 with JAX and float64 with numpy
+    dtype = np.float32 if JAX_AVAILABLE else np.float64
+    grids = np.random.default_rng(0).uniform(size=(samples, grid, grid)).astype(dtype)
+    engines = [("vectorized numpy", RolloutEngine(use_jax=False))]
+    if RolloutEngine().use_jax:
+        engines.append(("compiled scan", RolloutEngine()))
+
+    for domain in (DomainType.RESIST_CHEMISTRY, DomainType.PLASMA):
+        print(f"   {domain.value}")
+        legacy_rollout(domain, grids[0], 20)
+        legacy_s = timed(lambda: legacy_rollout(domain, grids[0], steps), 3)
+        print(f"      {'single rollout, legacy loop:':38s}{steps / legacy_s:10.0f} steps/s")
+
+        def batch_rollout(engine, batch):
+            ones, zeros = np.ones_like(batch), np.zeros_like(batch)
+            if domain == DomainType.RESIST_CHEMISTRY:
+                return engine.resist(batch, ones, 0.01, 0.1, 0.01, steps)
+            return engine.plasma(batch, zeros, zeros, ones, 0.01, 0.01, steps)
+
+        for name, engine in engines:
+            # The first call compiles the rollout for this shape
+            batch_rollout(engine, grids[:1])
+            single_s = timed(lambda: batch_rollout(engine, grids[:1]), 3)
+            print(f"      {f'single rollout, {name}:':38s}{steps / single_s:10.0f} steps/s "
+                  f"({legacy_s / single_s:.1f}x)")
+
+        start = time.perf_counter()
+        for grid_sample in grids[:legacy_samples]:
+            legacy_rollout(domain, grid_sample, steps)
+        legacy_rate = legacy_samples / (time.perf_counter() - start)
+        print(f"      {'dataset, legacy one at a time:':38s}{legacy_rate:10.1f} samples/s")
+
+        for name, engine in engines:
+            batch_rollout(engine, grids[:batch_size])
+            start = time.perf_counter()
+            for batch_start in range(0, samples, batch_size):
+                batch_rollout(engine, grids[batch_start:batch_start + batch_size])
+            rate = samples / (time.perf_counter() - start)
+            print(f"      {f'dataset, {name} x{batch_size}:':38s}{rate:10.1f} samples/s "
+                  f"({rate / legacy_rate:.1f}x)")
+
+        try:
+            import h5py
+        except ImportError:
+            continue
+        service = WorldModelService({"dataset_batch_size": batch_size})
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            asyncio.run(service.write_dataset(os.path.join(directory, "dataset.h5"), domain, samples, (grid, grid), steps))
+            rate = samples / (time.perf_counter() - start)
+        print(f"      {'write_dataset to chunked HDF5:':38s}{rate:10.1f} samples/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--legacy-samples", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    run(args.grid, args.steps, args.samples, args.legacy_samples, args.batch_size)
@@ -4,7 +4,7 @@ from typing import List, Optional, Dict, Any
 import uuid
 import time
 
-from src.proof_core.integrity_layer.integrity_manager import IntegrityManager
+from src.proof_core.integrity_layer.integrity_manager import IntegrityManager, get_proof_sink
 from src.proof_core.proof_mesh.mesh_validator import ProofMeshValidator
 from src.proof_core.proof_mesh.mesh_gossip import MeshGossip
 from src.proof_core.proof_economy.proofscore import compute_proof_score
@@ -133,6 +133,11 @@ async def update_proof_status(proof_id: str, request: ProofStatusUpdateRequest):
         raise HTTPException(status_code=404, detail="Proof not found")
     return {"proof_id": proof_id, "status": request.status, "anchors": request.anchors or [], "proof_score": request.proof_score}
 
+@router.get("/sink/stats")
+async def proof_sink_stats():
+    """Write-behind sink counters: persisted, pending, dropped and lag."""
+    return get_proof_sink().stats()
+
 @router.get("/explain")
 async def explain_proof():
     return {"detail": "Not implemented yet"}
@@ -1,8 +1,9 @@
 import asyncio
-from typing import List, Callable, Awaitable
+from typing import List, Callable, Awaitable, Set
 
 class GlobalEventBus:
     _subscribers: List[Callable[[dict], Awaitable[None]]] = []
+    _pending: Set[asyncio.Task] = set()
 
     @classmethod
     async def publish(cls, event: dict):
@@ -13,6 +14,16 @@ class GlobalEventBus:
             except Exception as e:
                 print(f"Error in subscriber: {e}")
 
+    @classmethod
+    def publish_nowait(cls, event: dict):
+        """Fans out in a background task instead of awaiting every subscriber."""
+        if not cls._subscribers:
+            return
+        task = asyncio.get_running_loop().create_task(cls.publish(event))
+        # Hold a reference until done so the task is not garbage collected
+        cls._pending.add(task)
+        task.add_done_callback(cls._pending.discard)
+
     @classmethod
     def subscribe(cls, callback: Callable[[dict], Awaitable[None]]):
         cls._subscribers.append(callback)
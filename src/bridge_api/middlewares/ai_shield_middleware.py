@@ -3,8 +3,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 import time
 from ..event_bus import GlobalEventBus
-from src.core.energy_atlas.atlas_core import EnergyAtlas
-import logging
+from src.bridge_api.telemetry.thermo import thermo_metrics
 from src.bridge_api.ai_shield.policy import should_quarantine, should_throttle, entropy_alert
 from src.bridge_api.ai_shield.actions import quarantine_response, throttle_response
 from src.bridge_api.ai_shield.entropy_tracker import EntropyTracker
@@ -12,11 +11,8 @@ from src.bridge_api.ai_shield.entropy_tracker import EntropyTracker
 class AIShieldMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
-        self.energy_atlas = EnergyAtlas(use_mock=True)
-        try:
-            self.energy_atlas.load_manifest("src/core/energy_atlas/sample_manifest.json")
-        except Exception as e:
-            logging.warning(f"Could not load sample manifest: {e}")
+        # Shared, incrementally maintained snapshot instead of a per-request energy map
+        self.thermo = thermo_metrics
         self.entropy_tracker = EntropyTracker()
 
     async def dispatch(self, request: Request, call_next):
@@ -24,15 +20,16 @@ class AIShieldMiddleware(BaseHTTPMiddleware):
         
         # 1. Substrate Safety Check (Thermodynamic Throttling)
         # Check if any node is overheating
-        energy_map = self.energy_atlas.get_energy_map()
+        self.thermo.refresh()
+        metrics = self.thermo.snapshot()
         # Mock check: if any node > 95C, block
         # In reality, we'd check thermal headroom
         is_overheated = False
         # For demo, we assume safe unless "overheat" is in URL or throttle policy triggers
         if "overheat" in str(request.url):
             is_overheated = True
-        total_power = sum([node.get("electrical", {}).get("total_capacitance", 0) for node in energy_map.get("nodes", {}).values()])
-        entropy = sum([node.get("electrical", {}).get("thermal_resistance", 0) for node in energy_map.get("nodes", {}).values()])
+        total_power = metrics["total_capacitance"]
+        entropy = metrics["total_thermal_resistance"]
         self.entropy_tracker.record(entropy)
         if should_throttle(total_power) or entropy_alert(entropy) or self.entropy_tracker.spike_detected(0.5):
             is_overheated = True
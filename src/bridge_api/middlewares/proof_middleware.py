@@ -1,17 +1,25 @@
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+import asyncio
 import uuid
 
-from src.proof_core.integrity_layer.integrity_manager import IntegrityManager
+from src.proof_core.integrity_layer.integrity_manager import IntegrityManager, get_proof_sink
 from src.bridge_api.ai_shield.policy import should_throttle
 from src.bridge_api.ai_shield.state import shield_state
 from src.bridge_api.event_bus import GlobalEventBus
 
 
 class ProofMiddleware(BaseHTTPMiddleware):
+    """
+    Attaches a proof id to every request and records a proof of its
+    lifecycle. Proofs go through the write-behind sink (see
+    PROOF_SINK_OVERFLOW etc.), so persistence never sits on the request path.
+    """
+
     def __init__(self, app):
         super().__init__(app)
         self.integrity_manager = IntegrityManager()
+        self.sink = get_proof_sink()
 
     async def dispatch(self, request: Request, call_next):
         # Inject a Proof ID context for every request
@@ -47,15 +55,22 @@ class ProofMiddleware(BaseHTTPMiddleware):
                 metadata["energy_joules"] = energy
             if entropy is not None:
                 metadata["entropy"] = entropy
-            await self.integrity_manager.record_action(
+            record = dict(
                 utid=utid,
                 domain="api_request",
                 inputs={"path": request.url.path, "method": request.method},
                 outputs={"status_code": response.status_code},
                 metadata=metadata,
             )
+            if self.sink.overflow == "block":
+                # A full ring may make the producer wait; keep that off the event loop
+                await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: self.integrity_manager.enqueue_action(**record)
+                )
+            else:
+                self.integrity_manager.enqueue_action(**record)
             # Broadcast to Pulse for live thermodynamic visibility
-            await GlobalEventBus.publish(
+            GlobalEventBus.publish_nowait(
                 {
                     "type": "proof_event",
                     "utid": utid,
@@ -198,6 +198,18 @@ from src.twin_sync.bus_emitter import twin_emitter
 async def startup_event():
     twin_emitter.start()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Persist proofs still queued in the write-behind sink
+    import logging
+    from src.proof_core.integrity_layer.integrity_manager import get_proof_sink
+    from src.proof_core.proof_hub.proof_sink import ProofSinkError
+    try:
+        if not get_proof_sink().flush(timeout=5.0):
+            logging.error(f"Proof sink not drained at shutdown: {get_proof_sink().stats()['pending']} proofs pending")
+    except ProofSinkError as e:
+        logging.error(f"Proof sink lost proofs: {e}")
+
 @app.websocket("/ws/pulse")
 async def pulse_websocket(websocket: WebSocket):
     await handle_websocket(websocket)
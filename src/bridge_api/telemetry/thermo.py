@@ -1,5 +1,7 @@
 import os
-from typing import Dict, Any
+import time
+import threading
+from typing import Dict, Any, Tuple
 
 from src.core.energy_atlas.atlas_core import EnergyAtlas
 from src.core.energy_atlas.hardware_loader import HardwareLoader
@@ -8,57 +10,95 @@ from src.core.energy_atlas.hardware_loader import HardwareLoader
 class ThermoMetrics:
     """
     Provides thermodynamic metrics derived from EnergyAtlas manifests.
+
+    Metrics are served from a snapshot kept up to date incrementally: the
+    manifest is re-read only when its mtime changes (checked at most every
+    check_interval_s), and running capacitance / thermal-resistance totals
+    are adjusted per changed node. Readers on the request path are O(1).
     """
 
-    def __init__(self, manifest_path: str = "src/core/energy_atlas/sample_manifest.json"):
+    def __init__(self, manifest_path: str = "src/core/energy_atlas/sample_manifest.json",
+                 check_interval_s: float = 1.0):
         self.manifest_path = os.environ.get("ENERGY_ATLAS_MANIFEST", manifest_path)
         self.atlas = EnergyAtlas(use_mock=True)
         self.loader = HardwareLoader()
-        try:
-            self.atlas.load_manifest(self.manifest_path)
-        except Exception:
-            pass
+        self.check_interval_s = check_interval_s
+
+        self._lock = threading.Lock()
+        self._contributions: Dict[str, Tuple[float, float]] = {}
+        self.total_capacitance = 0.0
+        self.total_thermal_resistance = 0.0
+        self._manifest_mtime = None
+        self._next_check = 0.0
+        self._snapshot = self._build_snapshot()
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reloads the manifest if it changed on disk. Returns True if reloaded.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        with self._lock:
+            self._next_check = now + self.check_interval_s
+            try:
+                mtime = os.stat(self.manifest_path).st_mtime
+            except OSError:
+                return False
+            if not force and mtime == self._manifest_mtime:
+                return False
+            try:
+                nodes = self.loader.load_manifest(self.manifest_path)
+            except Exception:
+                return False
+            for node in nodes:
+                previous = self.atlas.nodes.get(node.node_id)
+                self.atlas.nodes[node.node_id] = node
+                # Only push nodes whose definition changed to the graph
+                if previous is None or previous != node:
+                    self.atlas._sync_node_to_graph(node)
+                self._apply(node.node_id, (node.electrical.total_capacitance,
+                                           node.electrical.thermal_resistance))
+            self._manifest_mtime = mtime
+            self._snapshot = self._build_snapshot()
+            return True
+
+    def _apply(self, node_id: str, contribution: Tuple[float, float]):
+        old_cap, old_res = self._contributions.get(node_id, (0.0, 0.0))
+        self.total_capacitance += contribution[0] - old_cap
+        self.total_thermal_resistance += contribution[1] - old_res
+        self._contributions[node_id] = contribution
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        node_count = len(self._contributions)
+        return {
+            "total_power_watts": self.total_capacitance * 1e9,  # rough heuristic
+            "avg_temperature_c": self.total_thermal_resistance / node_count if node_count else 0,
+            "system_entropy": 0.4 + (node_count * 0.01),
+            "node_count": node_count,
+            "total_capacitance": self.total_capacitance,
+            "total_thermal_resistance": self.total_thermal_resistance,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest metrics snapshot (shared; do not mutate)."""
+        return self._snapshot
 
     def current_metrics(self) -> Dict[str, Any]:
-        try:
-            energy_map = self.atlas.get_energy_map()
-            node_count = energy_map.get("node_count", 0)
-            nodes = energy_map.get("nodes", {})
-            total_cap = sum([n.get("electrical", {}).get("total_capacitance", 0) for n in nodes.values()])
-            avg_temp = sum([n.get("electrical", {}).get("thermal_resistance", 0) for n in nodes.values()]) / node_count if node_count else 0
-            total_power = total_cap * 1e9  # rough heuristic
-            entropy = 0.4 + (node_count * 0.01)
-            return {
-                "total_power_watts": total_power,
-                "avg_temperature_c": avg_temp,
-                "system_entropy": entropy,
-                "node_count": node_count,
-            }
-        except Exception:
-            return {
-                "total_power_watts": 0.0,
-                "avg_temperature_c": 0.0,
-                "system_entropy": 0.0,
-                "node_count": 0,
-            }
+        return dict(self._snapshot)
 
     def summarize_node(self, node_id: str) -> Dict[str, Any]:
-        try:
-            energy_map = self.atlas.get_energy_map()
-            node = energy_map.get("nodes", {}).get(node_id, {})
-            return node
-        except Exception:
-            return {}
+        node = self.atlas.nodes.get(node_id)
+        return node.dict() if node is not None else {}
 
     def live_metrics(self) -> Dict[str, Any]:
         """
-        Simulate live telemetry by reloading manifest; in production, pull from real sensors.
+        Live telemetry: picks up manifest changes, then serves the snapshot.
+        In production, pull from real sensors.
         """
-        try:
-            self.atlas.load_manifest(self.manifest_path)
-            return self.current_metrics()
-        except Exception:
-            return self.current_metrics()
+        self.refresh()
+        return self.current_metrics()
 
 
 thermo_metrics = ThermoMetrics()
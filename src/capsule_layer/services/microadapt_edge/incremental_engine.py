@@ -0,0 +1,363 @@
+"""
+MicroAdapt Incremental Engine
+
+Streaming building blocks for the MicroAdapt edge service:
+1. Ring-buffer windows that add a sample in O(1) and expose the most recent
+   samples as a contiguous array without copying
+2. Hierarchical windows whose smoothed levels keep running centered moving
+   averages, so a sample costs O(levels) instead of rebuilding every level
+3. Running mean and sum of squares of the current window
+4. A Page-Hinkley drift detector on the regime fitting error, so regime
+   parameters are refitted only when the stream drifts
+5. Batched model unit predictions: the linear latent dynamics
+   ds/dt = p + Qs are solved exactly with a matrix exponential per unit, and
+   the trajectories of all units are cached, so the fitting error of every
+   candidate regime is one array operation
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from scipy.linalg import expm
+from scipy.spatial.distance import cdist
+
+# Running sums are recomputed from the buffered samples this often to bound rounding drift
+RESYNC_INTERVAL = 4096
+
+# ============================================================================
+# WINDOWS
+# ============================================================================
+
+class RingWindow:
+    """
+    Fixed-capacity window of d-dimensional samples.
+
+    Every sample is written twice, at i and i + capacity, so the most recent
+    samples are always a contiguous slice of the buffer.
+    """
+
+    def __init__(self, capacity: int, dim: int):
+        self.capacity = max(1, int(capacity))
+        self.dim = dim
+        self._buffer = np.zeros((2 * self.capacity, dim))
+        self._pos = 0
+        self.count = 0
+
+    def push(self, x: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Add a sample.
+
+        Returns:
+            The evicted sample (a copy) once the window is full, else None
+        """
+        evicted = self._buffer[self._pos].copy() if self.count == self.capacity else None
+        self._buffer[self._pos] = x
+        self._buffer[self._pos + self.capacity] = x
+        self._pos = (self._pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        return evicted
+
+    def view(self, length: Optional[int] = None) -> np.ndarray:
+        """Most recent samples, oldest first, as a read-only view that changes with later pushes."""
+        length = self.count if length is None else min(length, self.count)
+        end = self._pos + self.capacity
+        view = self._buffer[end - length:end]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class HierarchicalWindowEngine:
+    """
+    Multi-scale hierarchical windows over a stream, updated in O(levels) per sample.
+
+    Level h holds the last base_length * 2^(h-1) samples. Levels above the
+    first are smoothed with a centered moving average over 2h+1 samples,
+    truncated at the window edges. Interior averages do not depend on where
+    the window starts, so they are kept in a ring per level with a running
+    sum; only the h samples at each edge are averaged when a window is read.
+    """
+
+    def __init__(self, base_length: int, num_levels: int):
+        self.base_length = max(1, int(base_length))
+        self.num_levels = max(1, int(num_levels))
+        self.lengths = {h: self.base_length * (2 ** (h - 1)) for h in range(1, self.num_levels + 1)}
+        self.dim: Optional[int] = None
+        self.total = 0
+
+        self.raw: Optional[RingWindow] = None
+        self._smoothed: Dict[int, RingWindow] = {}
+        self._centered_sums: Dict[int, np.ndarray] = {}
+        # Running sums over the current (first level) window
+        self._sum: Optional[np.ndarray] = None
+        self._sumsq = 0.0
+
+    def _allocate(self, dim: int):
+        self.dim = dim
+        # The raw window also keeps the samples leaving the widest centered average
+        longest = max(self.lengths.values())
+        self.raw = RingWindow(max(longest, 2 * self.num_levels + 2), dim)
+        for h in range(2, self.num_levels + 1):
+            self._smoothed[h] = RingWindow(self.lengths[h], dim)
+            self._centered_sums[h] = np.zeros(dim)
+        self._sum = np.zeros(dim)
+
+    def push(self, x: np.ndarray):
+        """
+        Add a sample to every level.
+
+        Args:
+            x: Sample [features]
+        """
+        if self.raw is None:
+            self._allocate(len(x))
+        elif len(x) != self.dim:
+            raise ValueError(f"Expected {self.dim} features, got {len(x)}")
+
+        self.raw.push(x)
+        self.total += 1
+
+        # Current window statistics
+        base = self.base_length
+        self._sum += x
+        self._sumsq += float(x @ x)
+        if self.total > base:
+            old = self.raw.view(base + 1)[0]
+            self._sum -= old
+            self._sumsq -= float(old @ old)
+
+        # Centered averages that just received their last sample
+        for h, smoothed in self._smoothed.items():
+            span = 2 * h + 1
+            centered_sum = self._centered_sums[h]
+            centered_sum += x
+            if self.total > span:
+                centered_sum -= self.raw.view(span + 1)[0]
+            if self.total >= span:
+                smoothed.push(centered_sum / span)
+
+        if self.total % RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def _resync(self):
+        current = self.raw.view(self.base_length)
+        self._sum = current.sum(axis=0)
+        self._sumsq = float(np.sum(current * current))
+        for h in self._centered_sums:
+            self._centered_sums[h] = self.raw.view(2 * h + 1).sum(axis=0)
+
+    def current_window(self) -> np.ndarray:
+        """First-level window as a read-only view [time_steps, features]."""
+        if self.raw is None:
+            return np.zeros((0, 0))
+        return self.raw.view(self.base_length)
+
+    def current_mean(self) -> np.ndarray:
+        """Mean of the current window per feature."""
+        n = min(self.total, self.base_length)
+        return self._sum / n if n else np.zeros(self.dim or 0)
+
+    def current_sst(self) -> float:
+        """Total sum of squares of the current window around its mean."""
+        n = min(self.total, self.base_length)
+        if n == 0:
+            return 0.0
+        return max(0.0, self._sumsq - float(self._sum @ self._sum) / n)
+
+    def window(self, level: int) -> np.ndarray:
+        """
+        Window at a level [time_steps, features].
+
+        Until the stream fills a level, the level holds the whole stream unsmoothed.
+        """
+        if self.raw is None:
+            return np.zeros((0, 0))
+        length = self.lengths[level]
+        if self.total < length:
+            return self.raw.view(self.total).copy()
+
+        data = self.raw.view(length)
+        if level == 1 or length < 2 * level:
+            return data.copy()
+
+        k = level
+        smoothed = np.empty_like(data)
+        interior = length - 2 * k
+        if interior > 0:
+            smoothed[k:length - k] = self._smoothed[level].view(interior)
+        for i in list(range(min(k, length))) + list(range(max(k, length - k), length)):
+            smoothed[i] = data[max(0, i - k):min(length, i + k + 1)].mean(axis=0)
+        return smoothed
+
+# ============================================================================
+# DRIFT DETECTION
+# ============================================================================
+
+class DriftDetector:
+    """
+    Page-Hinkley test for an upward shift of a signal.
+
+    Drift is signalled once the cumulative deviation of the signal above its
+    running mean (less a tolerance delta) rises more than threshold above its
+    minimum.
+    """
+
+    def __init__(self, delta: float = 0.005, threshold: float = 0.5, min_samples: int = 1):
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = max(1, int(min_samples))
+        self.reset()
+
+    def reset(self):
+        """Start over after a refit."""
+        self.count = 0
+        self.mean = 0.0
+        self.cumulative = 0.0
+        self.minimum = 0.0
+
+    def update(self, value: float) -> bool:
+        """
+        Add an observation of the signal.
+
+        Returns:
+            True if drift is detected
+        """
+        if not np.isfinite(value):
+            return True
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.cumulative += value - self.mean - self.delta
+        self.minimum = min(self.minimum, self.cumulative)
+        return self.count >= self.min_samples and self.cumulative - self.minimum > self.threshold
+
+# ============================================================================
+# BATCHED MODEL UNIT PREDICTIONS
+# ============================================================================
+
+def transition_matrix(p: np.ndarray, Q: np.ndarray) -> np.ndarray:
+    """
+    One-step transition of ds/dt = p + Qs in homogeneous coordinates.
+
+    [s(t+1); 1] = expm([[Q, p], [0, 0]]) @ [s(t); 1] exactly.
+    """
+    k = len(p)
+    A = np.zeros((k + 1, k + 1))
+    A[:k, :k] = Q
+    A[:k, k] = p
+    return expm(A)
+
+
+def propagate(transitions: np.ndarray, states: np.ndarray, steps: int) -> np.ndarray:
+    """
+    Latent trajectories of several units at once.
+
+    Args:
+        transitions: One-step transitions [units, k+1, k+1]
+        states: Initial states in homogeneous coordinates [units, k+1]
+        steps: Number of time points, the initial one included
+
+    Returns:
+        States at t = 0 .. steps-1 [units, steps, k+1]
+    """
+    trajectory = np.empty((states.shape[0], steps, states.shape[1]))
+    if steps == 0:
+        return trajectory
+    trajectory[:, 0] = states
+    with np.errstate(over="ignore", invalid="ignore"):
+        for t in range(1, steps):
+            trajectory[:, t] = np.einsum("mij,mj->mi", transitions, trajectory[:, t - 1])
+    return trajectory
+
+
+class UnitPredictionCache:
+    """
+    Cached predictions x̂(t) = u + Vs(t), t = 0 .. length-1, of model units.
+
+    A unit's prediction over a window only depends on its parameters and the
+    window length, so each unit is integrated once, for the longest window
+    seen, and every window uses a prefix. Predictions are recomputed when a
+    unit's parameters are replaced.
+    """
+
+    def __init__(self, max_stacks: int = 8):
+        self.max_stacks = max_stacks
+        self._units: Dict[str, Tuple[Dict[str, np.ndarray], np.ndarray]] = {}
+        self._stacks: Dict[Tuple[Tuple[str, ...], int], Tuple[List[Dict[str, np.ndarray]], np.ndarray]] = {}
+
+    def _predictions(self, unit_id: str, parameters: Dict[str, np.ndarray], length: int) -> np.ndarray:
+        cached = self._units.get(unit_id)
+        if cached is not None and cached[0] is parameters and cached[1].shape[0] >= length:
+            return cached[1][:length]
+
+        transition = transition_matrix(parameters["p"], parameters["Q"])
+        state = np.append(parameters["s_star"], 1.0)
+        states = propagate(transition[None], state[None], length)[0, :, :-1]
+        with np.errstate(over="ignore", invalid="ignore"):
+            predictions = parameters["u"] + states @ parameters["V"].T
+        self._units[unit_id] = (parameters, predictions)
+        return predictions
+
+    def stack(self, units: Dict[str, "ModelUnit"], length: int) -> np.ndarray:
+        """
+        Predictions of units over a window.
+
+        Args:
+            units: Model units by unit ID, in stacking order
+            length: Window length
+
+        Returns:
+            Predictions [units, length, features]
+        """
+        key = (tuple(units), length)
+        parameters = [unit.parameters for unit in units.values()]
+        cached = self._stacks.get(key)
+        if cached is not None and all(a is b for a, b in zip(cached[0], parameters)):
+            return cached[1]
+
+        stacked = np.stack([
+            self._predictions(unit_id, unit.parameters, length) for unit_id, unit in units.items()
+        ])
+        if len(self._stacks) >= self.max_stacks:
+            self._stacks.clear()
+        self._stacks[key] = (parameters, stacked)
+        return stacked
+
+    def squared_errors(self, units: Dict[str, "ModelUnit"], X: np.ndarray) -> np.ndarray:
+        """
+        Sum of squared errors of each unit over a window [units].
+
+        Diverging units get the largest finite error.
+        """
+        if not units:
+            return np.zeros(0)
+        predictions = self.stack(units, X.shape[0])
+        with np.errstate(over="ignore", invalid="ignore"):
+            sse = np.sum((X[None] - predictions) ** 2, axis=(1, 2))
+        return np.nan_to_num(sse, nan=np.finfo(float).max, posinf=np.finfo(float).max)
+
+    def distances(self, units: Dict[str, "ModelUnit"], length: int) -> np.ndarray:
+        """Pairwise L2 distances between the predictions of units over a window [units, units]."""
+        predictions = self.stack(units, length).reshape(len(units), -1)
+        with np.errstate(over="ignore", invalid="ignore"):
+            distances = cdist(predictions, predictions)
+        return np.nan_to_num(distances, nan=np.finfo(float).max, posinf=np.finfo(float).max)
+
+    def forecast(self, unit: "ModelUnit", start: int, horizon: int) -> np.ndarray:
+        """Predictions of a unit for t = start .. start+horizon-1 [horizon, features]."""
+        parameters = unit.parameters
+        transition = transition_matrix(parameters["p"], parameters["Q"])
+        state = np.append(parameters["s_star"], 1.0)
+        with np.errstate(over="ignore", invalid="ignore"):
+            state = np.linalg.matrix_power(transition, start) @ state
+        states = propagate(transition[None], state[None], horizon)[0, :, :-1]
+        with np.errstate(over="ignore", invalid="ignore"):
+            return parameters["u"] + states @ parameters["V"].T
+
+    def retain(self, units: Dict[str, "ModelUnit"]):
+        """Drop the predictions of units that are no longer in the unit set."""
+        for unit_id in [unit_id for unit_id in self._units if unit_id not in units]:
+            del self._units[unit_id]
+        for key in [key for key in self._stacks if not all(unit_id in units for unit_id in key[0])]:
+            del self._stacks[key]
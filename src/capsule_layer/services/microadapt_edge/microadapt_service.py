@@ -29,9 +29,9 @@ from datetime import datetime
 from enum import Enum
 import json
 import hashlib
-from scipy.spatial.distance import cdist
 from scipy.cluster.vq import kmeans2
-from scipy.integrate import odeint
+
+from .incremental_engine import DriftDetector, HierarchicalWindowEngine, UnitPredictionCache
 
 # ============================================================================
 # TYPES & ENUMS
@@ -223,6 +223,14 @@ class MicroAdaptEdgeService:
         self.num_hierarchical_levels = self.config.get("num_hierarchical_levels", 3)  # H
         self.base_window_length = self.config.get("base_window_length", 100)  # lC
         
+        # Drift gating: refit model units only when the fitting error drifts upwards
+        self.drift_detection = self.config.get("drift_detection", True)
+        self.drift_detector = DriftDetector(
+            delta=self.config.get("drift_delta", 0.005),
+            threshold=self.config.get("drift_threshold", 0.5),
+            min_samples=self.config.get("drift_min_samples", 1)
+        )
+        
         # Model unit set Θ
         self.model_units: Dict[str, ModelUnit] = {}
         
@@ -232,17 +240,30 @@ class MicroAdaptEdgeService:
         # Current regime assignment
         self.current_regime: Optional[RegimeAssignment] = None
         
-        # Hierarchical window
-        self.hierarchical_window: Optional[HierarchicalWindow] = None
-        
-        # Data stream buffer
-        self.data_stream: List[np.ndarray] = []
+        # Hierarchical window over ring buffers, and cached model unit predictions
+        self.window_engine = HierarchicalWindowEngine(self.base_window_length, self.num_hierarchical_levels)
+        self.unit_predictions = UnitPredictionCache()
         self.current_time = 0
         
         # Statistics
         self.total_updates = 0
         self.total_forecasts = 0
         self.regime_transitions = 0
+        self.total_refits = 0
+    
+    @property
+    def hierarchical_window(self) -> Optional[HierarchicalWindow]:
+        """Multi-scale hierarchical current window, materialized on access"""
+        if self.window_engine.total == 0:
+            return None
+        return self._create_hierarchical_window()
+    
+    @property
+    def data_stream(self) -> List[np.ndarray]:
+        """Retained data points, enough for the longest hierarchical window"""
+        if self.window_engine.raw is None:
+            return []
+        return list(self.window_engine.raw.view().copy())
     
     # ========================================================================
     # ALGORITHM 1: MODEL UNIT ADAPTATION
@@ -289,19 +310,10 @@ class MicroAdaptEdgeService:
         if len(self.model_units) == 0:
             return {}, np.zeros((0, self.num_regimes))
         
-        # Compute distance matrix D ∈ R^(M×M)
+        # Compute distance matrix D ∈ R^(M×M) from the cached unit predictions
         unit_ids = list(self.model_units.keys())
         M = len(unit_ids)
-        D = np.zeros((M, M))
-        
-        for i, unit_id_i in enumerate(unit_ids):
-            for j, unit_id_j in enumerate(unit_ids):
-                if i != j:
-                    D[i, j] = self._compute_fitting_error(
-                        X_current,
-                        self.model_units[unit_id_i],
-                        self.model_units[unit_id_j]
-                    )
+        D = self.unit_predictions.distances(self.model_units, X_current.shape[0])
         
         # Perform clustering to find R representative model units
         R = min(self.num_regimes, M)
@@ -356,25 +368,7 @@ class MicroAdaptEdgeService:
         unit: ModelUnit
     ) -> np.ndarray:
         """Generate predictions using a model unit"""
-        params = unit.parameters
-        time_steps = X_data.shape[0]
-        
-        # Integrate latent dynamics
-        t = np.linspace(0, time_steps - 1, time_steps)
-        s_trajectory = odeint(
-            ModelUnitDynamics.latent_dynamics,
-            params["s_star"],
-            t,
-            args=(params["p"], params["Q"])
-        )
-        
-        # Generate observations
-        predictions = np.array([
-            ModelUnitDynamics.observation_model(s, params["u"], params["V"])
-            for s in s_trajectory
-        ])
-        
-        return predictions
+        return self.unit_predictions.stack({unit.unit_id: unit}, X_data.shape[0])[0]
     
     async def _model_unit_replacement(
         self,
@@ -385,19 +379,16 @@ class MicroAdaptEdgeService:
         """
         ModelUnitReplacement: Replace least necessary model unit.
         """
-        # Compute fitness vector (adaptivity vector)
-        fitness_scores = []
+        # Compute fitness vector (adaptivity vector) for all units at once
         unit_ids = list(self.model_units.keys())
         
-        for unit_id in unit_ids:
-            unit = self.model_units[unit_id]
-            # Fitness = cumulative fitting error
-            fitness = self._compute_fitness(X_current, unit)
-            fitness_scores.append(fitness)
-            unit.fitness_score = fitness
+        # Fitness = cumulative fitting error
+        fitness_scores = -self.unit_predictions.squared_errors(self.model_units, X_current)
+        for unit_id, fitness in zip(unit_ids, fitness_scores):
+            self.model_units[unit_id].fitness_score = float(fitness)
         
         # Find least necessary model unit (lowest fitness)
-        if fitness_scores:
+        if len(fitness_scores):
             min_fitness_idx = np.argmin(fitness_scores)
             least_necessary_unit_id = unit_ids[min_fitness_idx]
             
@@ -442,6 +433,7 @@ class MicroAdaptEdgeService:
         )
         
         self.model_units[unit_id] = unit
+        self.unit_predictions.retain(self.model_units)
     
     # ========================================================================
     # ALGORITHM 2: MODEL UNIT SEARCH
@@ -509,12 +501,17 @@ class MicroAdaptEdgeService:
         
         R = len(self.regime_model_units)
         
-        # Compute fitness vector f_C
+        # Compute fitness vector f_C, batched across the regime model units
         fitness_vector = np.zeros(R)
+        regime_units = {
+            unit_id: self.model_units[unit_id]
+            for unit_id in self.regime_model_units.values()
+            if unit_id in self.model_units
+        }
+        regime_fitness = dict(zip(regime_units, -self.unit_predictions.squared_errors(regime_units, X_current)))
         for regime_id, unit_id in self.regime_model_units.items():
-            if unit_id in self.model_units:
-                unit = self.model_units[unit_id]
-                fitness_vector[regime_id] = self._compute_fitness(X_current, unit)
+            if unit_id in regime_fitness:
+                fitness_vector[regime_id] = regime_fitness[unit_id]
         
         # Normalize fitness to [0, 1]
         if np.max(np.abs(fitness_vector)) > 0:
@@ -616,35 +613,9 @@ class MicroAdaptEdgeService:
         forecast_horizon: int
     ) -> np.ndarray:
         """Generate forecast using a model unit"""
-        params = unit.parameters
-        
-        # Start from last latent state
+        # Continue the latent trajectory from the last state of the current window
         current_time_steps = X_current.shape[0]
-        t_current = np.linspace(0, current_time_steps - 1, current_time_steps)
-        s_current = odeint(
-            ModelUnitDynamics.latent_dynamics,
-            params["s_star"],
-            t_current,
-            args=(params["p"], params["Q"])
-        )
-        s_last = s_current[-1]
-        
-        # Forecast future latent states
-        t_future = np.linspace(current_time_steps, current_time_steps + forecast_horizon - 1, forecast_horizon)
-        s_future = odeint(
-            ModelUnitDynamics.latent_dynamics,
-            s_last,
-            t_future,
-            args=(params["p"], params["Q"])
-        )
-        
-        # Generate future observations
-        forecast = np.array([
-            ModelUnitDynamics.observation_model(s, params["u"], params["V"])
-            for s in s_future
-        ])
-        
-        return forecast
+        return self.unit_predictions.forecast(unit, max(current_time_steps - 1, 0), forecast_horizon)
     
     # ========================================================================
     # DYNAMIC DATA COLLECTION
@@ -654,24 +625,37 @@ class MicroAdaptEdgeService:
         """
         Update with new data point (O(1) time complexity).
         
+        The model units are adapted when the normalized fitting error of the
+        best unit drifts upwards (Page-Hinkley test), or on every update with
+        drift_detection disabled.
+        
         Args:
             x_new: New data point [features]
         """
-        # Add to data stream
-        self.data_stream.append(x_new)
+        # Add to the hierarchical window
+        self.window_engine.push(np.asarray(x_new, dtype=float).ravel())
         self.current_time += 1
         
-        # Update hierarchical window
-        self.hierarchical_window = self._create_hierarchical_window()
-        
         # Get current window
-        X_current = self._get_current_window()
+        X_current = self.window_engine.current_window()
         
         # Adapt model units (incremental)
-        await self.adapt_model_units(X_current)
+        if self._drift_detected(X_current):
+            await self.adapt_model_units(X_current)
+            self.drift_detector.reset()
+            self.total_refits += 1
         
         self.total_updates += 1
     
+    def _drift_detected(self, X_current: np.ndarray) -> bool:
+        """Feed the best unit's fitting error, relative to the window variance, to the drift detector"""
+        if not self.drift_detection or not self.model_units:
+            return True
+        
+        sse = self.unit_predictions.squared_errors(self.model_units, X_current)
+        sst = self.window_engine.current_sst()
+        return self.drift_detector.update(float(np.min(sse)) / (sst + 1e-10))
+    
     def _create_hierarchical_window(self) -> HierarchicalWindow:
         """
         Create multi-scale hierarchical current window.
@@ -683,22 +667,10 @@ class MicroAdaptEdgeService:
         window_lengths = {}
         
         for h in range(1, self.num_hierarchical_levels + 1):
-            length = self.base_window_length * (2 ** (h - 1))
-            window_lengths[h] = length
+            window_lengths[h] = self.window_engine.lengths[h]
             
-            # Extract window at this level
-            if len(self.data_stream) >= length:
-                window_data = np.array(self.data_stream[-length:])
-                
-                # Apply moving average for smoothing at higher levels
-                if h > 1:
-                    window_size = 2 * h
-                    window_data = self._moving_average(window_data, window_size)
-                
-                windows[h] = window_data
-            else:
-                # Not enough data yet
-                windows[h] = np.array(self.data_stream)
+            # Levels above the first are smoothed by running moving averages
+            windows[h] = self.window_engine.window(h)
         
         return HierarchicalWindow(
             windows=windows,
@@ -722,10 +694,8 @@ class MicroAdaptEdgeService:
     
     def _get_current_window(self) -> np.ndarray:
         """Get current window for model adaptation"""
-        if self.hierarchical_window and 1 in self.hierarchical_window.windows:
-            return self.hierarchical_window.windows[1]
-        elif self.data_stream:
-            return np.array(self.data_stream[-self.base_window_length:])
+        if self.window_engine.total:
+            return self.window_engine.current_window().copy()
         else:
             return np.array([])
     
@@ -750,7 +720,8 @@ class MicroAdaptEdgeService:
             "num_model_units": len(self.model_units),
             "num_regimes": len(self.regime_model_units),
             "current_time": self.current_time,
-            "data_stream_length": len(self.data_stream),
+            "data_stream_length": self.window_engine.raw.count if self.window_engine.raw else 0,
+            "total_refits": self.total_refits,
             "active_regimes": self.current_regime.active_regimes if self.current_regime else []
         }
     
@@ -25,6 +25,8 @@ from datetime import datetime
 from enum import Enum
 import json
 import hashlib
+import time
+import uuid
 
 # Try to import JAX, fall back to mock if fails
 try:
@@ -51,7 +53,7 @@ except Exception as e:
         def cond(self, pred, true_fun, false_fun, *args):
             if pred: return true_fun(*args)
             else: return false_fun(*args)
-    jax = type('MockJax', (), {'lax': MockLax()})
+    jax = type('MockJax', (), {'lax': MockLax(), 'random': random})
 from typing import Dict, List, Tuple, Optional, Any, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -140,9 +142,18 @@ class ThermalSamplerService:
         self.cooling_rate = self.config.get("cooling_rate", 0.95)
         self.max_iterations = self.config.get("max_iterations", 10000)
         self.samples_per_temp = self.config.get("samples_per_temp", 100)
+        # Early stop: after `convergence_patience` consecutive temperature levels
+        # where the mean chain energy moved by less than convergence_tol
+        # (relative) or the acceptance rate fell below min_acceptance
+        self.convergence_tol = self.config.get("convergence_tol", 1e-6)
+        self.min_acceptance = self.config.get("min_acceptance", 1e-3)
+        self.convergence_patience = self.config.get("convergence_patience", 3)
         
         # JAX setup
         self.rng_key = random.PRNGKey(self.config.get("seed", 42))
+        self.np_rng = np.random.default_rng(self.config.get("seed", 42))
+        self._level_fns: Dict[str, Tuple[EnergyLandscape, Callable]] = {}
+        self.last_run: Dict[str, Any] = {}
         
         # Storage
         self.landscapes: Dict[str, EnergyLandscape] = {}
@@ -279,8 +290,13 @@ class ThermalSamplerService:
                     
                 elif constraint.type == "distance":
                     points = jnp.array(constraint.parameters.get("points", []))
+                    if points.size == 0:
+                        continue
+                    points = points.reshape(len(points), -1)
                     min_dist = constraint.parameters.get("min_distance", 1.0)
-                    total_energy += self._distance_penalty(x, points, min_dist, constraint.weight)
+                    # Read the state as a set of points, as in the batched energy
+                    placed = x.reshape(-1, points.shape[1])
+                    total_energy += self._distance_penalty(placed, points, min_dist, constraint.weight)
             
             # Add regularization
             total_energy += 0.01 * jnp.sum(x ** 2)
@@ -288,6 +304,48 @@ class ThermalSamplerService:
             return total_energy
         
         return jit(energy_fn)
+
+    def compile_batch_energy_function(self, landscape_id: str, xp: Any = np) -> Callable:
+        """
+        Compile a vectorized energy function mapping a (num_chains, dimensions)
+        batch of states to (num_chains,) energies.
+
+        Constraint parameters are converted to arrays once here rather than on
+        every evaluation. xp selects numpy or jax.numpy. For distance
+        constraints each state is read as a set of points in the constraint's
+        coordinate space (dimensions must be a multiple of the point width).
+        """
+        landscape = self.landscapes[landscape_id]
+        terms = []
+        for constraint in landscape.constraints:
+            if constraint.type == "equality":
+                terms.append(("equality", float(constraint.parameters.get("target", 0.0)), constraint.weight))
+            elif constraint.type == "inequality":
+                terms.append(("inequality", float(constraint.parameters.get("threshold", 0.0)), constraint.weight))
+            elif constraint.type == "distance":
+                points = np.asarray(constraint.parameters.get("points", []), dtype=np.float64)
+                if points.size == 0:
+                    continue
+                points = points.reshape(len(points), -1)
+                min_dist = float(constraint.parameters.get("min_distance", 1.0))
+                terms.append(("distance", (xp.asarray(points), min_dist), constraint.weight))
+
+        def energy_batch(X):
+            total = 0.01 * xp.sum(X ** 2, axis=-1)
+            for kind, param, weight in terms:
+                if kind == "equality":
+                    total = total + weight * xp.sum((X - param) ** 2, axis=-1)
+                elif kind == "inequality":
+                    total = total + weight * xp.sum(xp.maximum(0.0, X - param) ** 2, axis=-1)
+                else:
+                    points, min_dist = param
+                    placed = X.reshape(X.shape[0], -1, points.shape[1])
+                    diff = placed[:, :, None, :] - points[None, None, :, :]
+                    distances = xp.sqrt(xp.sum(diff ** 2, axis=-1))
+                    total = total + weight * xp.sum(xp.maximum(0.0, min_dist - distances) ** 2, axis=(1, 2))
+            return total
+
+        return energy_batch
     
     # ========================================================================
     # SIMULATED ANNEALING
@@ -340,6 +398,90 @@ class ThermalSamplerService:
             rng_key
         )
     
+    def _temperature_schedule(self) -> List[float]:
+        levels = []
+        temperature = self.initial_temperature
+        while temperature > self.final_temperature:
+            levels.append(temperature)
+            temperature *= self.cooling_rate
+        return levels
+
+    def _numpy_level_fn(self, energy_batch: Callable, lo: np.ndarray, hi: np.ndarray) -> Callable:
+        """One temperature level: samples_per_temp array-wide Metropolis steps."""
+        rng = self.np_rng
+
+        def run_level(state, energy, accepted, temperature):
+            for _ in range(self.samples_per_temp):
+                proposal = np.clip(state + rng.standard_normal(state.shape) * temperature, lo, hi)
+                proposed = energy_batch(proposal)
+                delta = proposed - energy
+                accept = (delta < 0) | (rng.random(len(energy)) < np.exp(-np.maximum(delta, 0.0) / temperature))
+                state = np.where(accept[:, None], proposal, state)
+                energy = np.where(accept, proposed, energy)
+                accepted = accepted + accept
+            return state, energy, accepted
+
+        return run_level
+
+    def _jax_level_fn(self, energy_batch: Callable, lo: np.ndarray, hi: np.ndarray) -> Callable:
+        """One temperature level as a jitted lax.scan over Metropolis steps."""
+        lo, hi = jnp.asarray(lo), jnp.asarray(hi)
+        steps = self.samples_per_temp
+
+        @jit
+        def scan_level(state, energy, accepted, temperature, key):
+            def step(carry, _):
+                state, energy, accepted, key = carry
+                key, k_prop, k_acc = random.split(key, 3)
+                proposal = jnp.clip(state + random.normal(k_prop, state.shape) * temperature, lo, hi)
+                proposed = energy_batch(proposal)
+                delta = proposed - energy
+                accept = (delta < 0) | (random.uniform(k_acc, energy.shape) < jnp.exp(-jnp.maximum(delta, 0.0) / temperature))
+                state = jnp.where(accept[:, None], proposal, state)
+                energy = jnp.where(accept, proposed, energy)
+                return (state, energy, accepted + accept, key), None
+
+            (state, energy, accepted, _), _ = jax.lax.scan(step, (state, energy, accepted, key), None, length=steps)
+            return state, energy, accepted
+
+        def run_level(state, energy, accepted, temperature):
+            self.rng_key, subkey = random.split(self.rng_key)
+            return scan_level(state, energy, accepted, temperature, subkey)
+
+        return run_level
+
+    def _anneal(self, run_level: Callable, state, energy) -> Tuple[Any, Any, np.ndarray, int, float, bool]:
+        """
+        Cools all chains together, checking for convergence between levels.
+        Returns (state, energy, accepted per chain, proposals per chain,
+        final temperature, stopped early).
+        """
+        accepted = np.zeros(len(energy), dtype=np.int64)
+        if JAX_AVAILABLE:
+            accepted = jnp.asarray(accepted)
+        proposals = 0
+        temperature = self.initial_temperature
+        stable_levels = 0
+        stopped_early = False
+        mean_energy = float(np.mean(energy))
+        for level_temperature in self._temperature_schedule():
+            level_accepted = float(np.sum(accepted))
+            state, energy, accepted = run_level(state, energy, accepted, level_temperature)
+            proposals += self.samples_per_temp
+            temperature = level_temperature * self.cooling_rate
+
+            previous, mean_energy = mean_energy, float(np.mean(energy))
+            level_rate = (float(np.sum(accepted)) - level_accepted) / (len(energy) * self.samples_per_temp)
+            settled = abs(mean_energy - previous) <= self.convergence_tol * (1.0 + abs(mean_energy))
+            if settled or level_rate < self.min_acceptance:
+                stable_levels += 1
+                if stable_levels >= self.convergence_patience:
+                    stopped_early = True
+                    break
+            else:
+                stable_levels = 0
+        return state, energy, np.asarray(accepted), proposals, temperature, stopped_early
+
     async def sample(
         self,
         landscape_id: str,
@@ -348,100 +490,91 @@ class ThermalSamplerService:
     ) -> List[ThermalSolution]:
         """
         Run thermal sampling to find low-energy states.
+
+        All num_samples chains are annealed together: each step proposes a
+        move for every chain and accepts or rejects them array-wide.
         
         Args:
             landscape_id: ID of energy landscape
-            initial_state: Optional starting state
+            initial_state: Optional starting state (shared by all chains)
             num_samples: Number of independent sampling runs
             
         Returns:
             List of thermal solutions
         """
         landscape = self.landscapes[landscape_id]
-        energy_fn = self.compile_energy_function(landscape_id)
-        
-        solutions = []
-        
-        for sample_idx in range(num_samples):
-            # Initialize state
+        if num_samples <= 0:
+            return []
+        lo = np.array([b[0] for b in landscape.bounds], dtype=np.float64)
+        hi = np.array([b[1] for b in landscape.bounds], dtype=np.float64)
+        shape = (num_samples, landscape.dimensions)
+
+        if JAX_AVAILABLE:
+            energy_batch = self.compile_batch_energy_function(landscape_id, jnp)
+            # Reuse the compiled scan while the landscape object is unchanged
+            cached = self._level_fns.get(landscape_id)
+            if cached is None or cached[0] is not landscape:
+                cached = (landscape, self._jax_level_fn(energy_batch, lo, hi))
+                self._level_fns[landscape_id] = cached
+            run_level = cached[1]
             if initial_state is not None:
-                current_state = jnp.array(initial_state)
+                state = jnp.broadcast_to(jnp.asarray(initial_state, dtype=jnp.float32), shape)
             else:
-                # Random initialization within bounds
                 self.rng_key, subkey = random.split(self.rng_key)
-                current_state = random.uniform(
-                    subkey,
-                    shape=(landscape.dimensions,),
-                    minval=jnp.array([b[0] for b in landscape.bounds]),
-                    maxval=jnp.array([b[1] for b in landscape.bounds])
-                )
-            
-            current_energy = energy_fn(current_state)
-            temperature = self.initial_temperature
-            
-            accepted = 0
-            total_proposals = 0
-            
-            # Annealing loop
-            while temperature > self.final_temperature:
-                for _ in range(self.samples_per_temp):
-                    # Propose new state
-                    self.rng_key, subkey = random.split(self.rng_key)
-                    proposal = current_state + random.normal(subkey, shape=current_state.shape) * temperature
-                    
-                    # Clip to bounds
-                    proposal = jnp.clip(
-                        proposal,
-                        jnp.array([b[0] for b in landscape.bounds]),
-                        jnp.array([b[1] for b in landscape.bounds])
-                    )
-                    
-                    proposed_energy = energy_fn(proposal)
-                    
-                    # Metropolis acceptance
-                    accept, self.rng_key = self._metropolis_accept(
-                        current_energy,
-                        proposed_energy,
-                        temperature,
-                        self.rng_key
-                    )
-                    
-                    if accept:
-                        current_state = proposal
-                        current_energy = proposed_energy
-                        accepted += 1
-                    
-                    total_proposals += 1
-                    self.total_samples += 1
-                
-                # Cool down
-                temperature *= self.cooling_rate
-            
-            # Create solution
+                state = random.uniform(subkey, shape=shape, minval=jnp.asarray(lo), maxval=jnp.asarray(hi))
+        else:
+            energy_batch = self.compile_batch_energy_function(landscape_id, np)
+            run_level = self._numpy_level_fn(energy_batch, lo, hi)
+            if initial_state is not None:
+                state = np.broadcast_to(np.asarray(initial_state, dtype=np.float64), shape).copy()
+            else:
+                state = lo + (hi - lo) * self.np_rng.random(shape)
+
+        start = time.perf_counter()
+        state, energy, accepted, proposals, temperature, stopped_early = self._anneal(
+            run_level, state, energy_batch(state)
+        )
+        elapsed = time.perf_counter() - start
+        states, energies = np.asarray(state), np.asarray(energy, dtype=np.float64)
+
+        total_proposals = proposals * num_samples
+        self.total_samples += total_proposals
+        self.last_run = {
+            "landscape_id": landscape_id,
+            "chains": num_samples,
+            "proposals": total_proposals,
+            "elapsed_s": elapsed,
+            "proposals_per_sec": total_proposals / elapsed if elapsed > 0 else 0.0,
+            "stopped_early": stopped_early,
+        }
+
+        solutions = []
+        for sample_idx in range(num_samples):
             solution = ThermalSolution(
                 solution_id=self._generate_solution_id(),
-                state=np.array(current_state),
-                energy=float(current_energy),
+                state=states[sample_idx],
+                energy=float(energies[sample_idx]),
                 temperature=float(temperature),
-                iterations=total_proposals,
-                acceptance_rate=accepted / total_proposals if total_proposals > 0 else 0.0,
+                iterations=proposals,
+                acceptance_rate=float(accepted[sample_idx]) / proposals if proposals > 0 else 0.0,
                 timestamp=datetime.now(),
                 metadata={
                     "landscape_id": landscape_id,
                     "sample_index": sample_idx,
-                    "final_temperature": float(temperature)
+                    "final_temperature": float(temperature),
+                    "stopped_early": stopped_early
                 }
             )
             
             self.solutions[solution.solution_id] = solution
             solutions.append(solution)
-            self.total_energy_computed += float(current_energy)
+        self.total_energy_computed += float(energies.sum())
         
         return solutions
     
     def _generate_solution_id(self) -> str:
         """Generate unique solution ID"""
-        return f"sol-{datetime.now().timestamp()}-{np.random.randint(10000)}"
+        return f"sol-{datetime.now().timestamp()}-{uuid.uuid4().hex[:8]}"
     
     # ========================================================================
     # ENERGY PROOF GENERATION
@@ -513,14 +646,8 @@ class ThermalSamplerService:
         landscape_id: str,
         batch_size: int = 10
     ) -> List[ThermalSolution]:
-        """Run multiple sampling jobs in parallel"""
-        tasks = [
-            self.sample(landscape_id, num_samples=1)
-            for _ in range(batch_size)
-        ]
-        
-        results = await asyncio.gather(*tasks)
-        return [sol for result in results for sol in result]
+        """Run multiple sampling jobs in parallel (as one batch of chains)"""
+        return await self.sample(landscape_id, num_samples=batch_size)
     
     # ========================================================================
     # STATISTICS & MONITORING
@@ -534,7 +661,8 @@ class ThermalSamplerService:
             "total_proofs": len(self.proofs),
             "total_samples": self.total_samples,
             "total_energy_computed": self.total_energy_computed,
-            "average_energy": self.total_energy_computed / max(len(self.solutions), 1)
+            "average_energy": self.total_energy_computed / max(len(self.solutions), 1),
+            "last_proposals_per_sec": self.last_run.get("proposals_per_sec", 0.0)
         }
     
     def get_best_solution(self, landscape_id: str) -> Optional[ThermalSolution]:
@@ -0,0 +1,270 @@
+"""
+World Model Rollout Engine
+
+Batched rollouts of the world model simulators:
+1. With JAX, the whole time loop is compiled: lax.scan over trajectory
+   captures, each advancing the state by the capture stride, vmapped over
+   the initial conditions so a batch of samples is one computation and
+   arrays come back to the host once per rollout
+2. Without JAX, a vectorized numpy loop steps every sample of the batch
+   together and writes captures into preallocated arrays
+3. Both follow the simulator steps of the world model service exactly:
+   states are captured every stride steps, before stepping, with the
+   energy of each captured state
+"""
+
+import numpy as np
+from typing import Callable, Dict, Tuple
+from dataclasses import dataclass
+from functools import partial
+
+try:
+    import jax
+    import jax.numpy as jnp
+    from jax import lax
+    JAX_AVAILABLE = True
+except Exception:
+    JAX_AVAILABLE = False
+
+# ============================================================================
+# SIMULATOR STEPS
+# ============================================================================
+
+# Spatial axes of a single sample, and of a batch of samples
+SAMPLE_AXES = (0, 1)
+BATCH_AXES = (1, 2)
+
+def laplacian(xp, field, axes: Tuple[int, int]):
+    """2D Laplacian by finite differences over the given (y, x) axes"""
+    return (
+        xp.roll(field, 1, axis=axes[0]) +
+        xp.roll(field, -1, axis=axes[0]) +
+        xp.roll(field, 1, axis=axes[1]) +
+        xp.roll(field, -1, axis=axes[1]) -
+        4 * field
+    )
+
+def gradient(xp, field, axes: Tuple[int, int]):
+    """2D gradient by central differences over the given (y, x) axes"""
+    grad_x = (xp.roll(field, -1, axis=axes[1]) - xp.roll(field, 1, axis=axes[1])) / 2.0
+    grad_y = (xp.roll(field, -1, axis=axes[0]) - xp.roll(field, 1, axis=axes[0])) / 2.0
+    return grad_x, grad_y
+
+def resist_step(xp, state, axes, temperature, dt, diffusion_coeff, reaction_rate):
+    """One step of photoresist diffusion; state = (concentration,)"""
+    concentration, = state
+    diffusion = diffusion_coeff * laplacian(xp, concentration, axes)
+    reaction = -reaction_rate * concentration * (1.0 + 0.1 * temperature)
+    new_concentration = concentration + dt * (diffusion + reaction)
+    return (xp.clip(new_concentration, 0.0, 1.0),)
+
+def plasma_step(xp, state, axes, dt, viscosity):
+    """One step of plasma dynamics; state = (density, velocity_x, velocity_y, temperature)"""
+    density, velocity_x, velocity_y, temperature = state
+    grad_density_x, grad_density_y = gradient(xp, density, axes)
+    advection_density = -(velocity_x * grad_density_x + velocity_y * grad_density_y)
+
+    diffusion_vx = viscosity * laplacian(xp, velocity_x, axes)
+    diffusion_vy = viscosity * laplacian(xp, velocity_y, axes)
+
+    grad_temp_x, grad_temp_y = gradient(xp, temperature, axes)
+    pressure_force_x = -0.1 * grad_temp_x
+    pressure_force_y = -0.1 * grad_temp_y
+
+    new_density = density + dt * advection_density
+    new_velocity_x = velocity_x + dt * (diffusion_vx + pressure_force_x)
+    new_velocity_y = velocity_y + dt * (diffusion_vy + pressure_force_y)
+    new_temperature = temperature + dt * 0.05 * laplacian(xp, temperature, axes)
+
+    return (
+        xp.clip(new_density, 0.0, 10.0),
+        new_velocity_x,
+        new_velocity_y,
+        xp.clip(new_temperature, 0.0, 10.0)
+    )
+
+def resist_energy(xp, state, spatial_axes):
+    concentration, = state
+    return xp.sum(concentration ** 2, axis=spatial_axes)
+
+def plasma_energy(xp, state, spatial_axes):
+    density, velocity_x, velocity_y, temperature = state
+    kinetic_energy = 0.5 * xp.sum(density * (velocity_x ** 2 + velocity_y ** 2), axis=spatial_axes)
+    thermal_energy = xp.sum(temperature, axis=spatial_axes)
+    return kinetic_energy + thermal_energy
+
+RESIST_FIELDS = ("concentration",)
+PLASMA_FIELDS = ("density", "velocity_x", "velocity_y", "temperature")
+
+# ============================================================================
+# ROLLOUTS
+# ============================================================================
+
+@dataclass
+class Rollout:
+    """Batched rollout with captured states every stride steps"""
+    fields: Tuple[str, ...]
+    trajectory: Dict[str, np.ndarray]  # {field: [batch, captures, *grid]}
+    final: Dict[str, np.ndarray]  # {field: [batch, *grid]}
+    energy: np.ndarray  # [batch, captures]
+    steps: int
+    stride: int
+
+    @property
+    def capture_steps(self) -> range:
+        return range(0, self.steps, self.stride)
+
+def num_captures(steps: int, stride: int) -> int:
+    return -(-steps // stride) if steps > 0 else 0
+
+def _numpy_rollout(step: Callable, energy: Callable, state: Tuple[np.ndarray, ...], steps: int, stride: int):
+    """Step a batch [batch, *grid] per field in one vectorized loop."""
+    batch = state[0].shape[0]
+    spatial_axes = tuple(range(1, state[0].ndim))
+    captures = num_captures(steps, stride)
+    trajectory = [np.empty((batch, captures) + field.shape[1:], dtype=field.dtype) for field in state]
+    energies = np.empty((batch, captures))
+
+    for t in range(steps):
+        if t % stride == 0:
+            capture = t // stride
+            for field, field_trajectory in zip(state, trajectory):
+                field_trajectory[:, capture] = field
+            energies[:, capture] = energy(np, state, spatial_axes)
+        state = step(np, state, BATCH_AXES)
+
+    return state, trajectory, energies
+
+if JAX_AVAILABLE:
+    def _scan_rollout(step: Callable, energy: Callable, state, steps: int, stride: int):
+        """Compiled rollout of a single sample: scan over captures, each followed by up to stride steps."""
+        spatial_axes = tuple(range(state[0].ndim))
+
+        def advance(state, count):
+            return lax.fori_loop(0, count, lambda _, s: step(jnp, s, SAMPLE_AXES), state)
+
+        def observe(state):
+            return state, energy(jnp, state, spatial_axes)
+
+        def capture_and_advance(state, _):
+            return advance(state, stride), observe(state)
+
+        full, remainder = divmod(steps, stride)
+        parts = []
+        if full:
+            state, captured = lax.scan(capture_and_advance, state, None, length=full)
+            parts.append(captured)
+        if remainder:
+            captured = observe(state)
+            state = advance(state, remainder)
+            parts.append(jax.tree_util.tree_map(lambda x: x[None], captured))
+        if not parts:
+            captured = (
+                tuple(jnp.zeros((0,) + field.shape, field.dtype) for field in state),
+                jnp.zeros((0,), state[0].dtype)
+            )
+        elif len(parts) == 1:
+            captured = parts[0]
+        else:
+            captured = jax.tree_util.tree_map(lambda *xs: jnp.concatenate(xs), *parts)
+
+        trajectory, energies = captured
+        return state, trajectory, energies
+
+    @partial(jax.jit, static_argnames=("steps", "stride"))
+    def _resist_rollout_jax(concentration, temperature, dt, diffusion_coeff, reaction_rate, steps, stride):
+        def single(concentration, temperature):
+            step = partial(resist_step, temperature=temperature, dt=dt,
+                           diffusion_coeff=diffusion_coeff, reaction_rate=reaction_rate)
+            return _scan_rollout(step, resist_energy, (concentration,), steps, stride)
+        return jax.vmap(single)(concentration, temperature)
+
+    @partial(jax.jit, static_argnames=("steps", "stride"))
+    def _plasma_rollout_jax(density, velocity_x, velocity_y, temperature, dt, viscosity, steps, stride):
+        def single(*state):
+            step = partial(plasma_step, dt=dt, viscosity=viscosity)
+            return _scan_rollout(step, plasma_energy, state, steps, stride)
+        return jax.vmap(single)(density, velocity_x, velocity_y, temperature)
+
+class RolloutEngine:
+    """
+    Runs simulator rollouts for a batch of initial conditions.
+
+    Uses the compiled JAX rollouts when JAX is available, else the
+    vectorized numpy rollouts.
+    """
+
+    def __init__(self, use_jax: bool = JAX_AVAILABLE):
+        self.use_jax = use_jax and JAX_AVAILABLE
+
+    def resist(
+        self,
+        concentration: np.ndarray,
+        temperature: np.ndarray,
+        dt: float,
+        diffusion_coeff: float,
+        reaction_rate: float,
+        steps: int,
+        stride: int = 10
+    ) -> Rollout:
+        """
+        Photoresist diffusion rollouts.
+
+        Args:
+            concentration: Initial concentrations [batch, *grid]
+            temperature: Temperatures [batch, *grid]
+        """
+        if self.use_jax:
+            final, trajectory, energy = _resist_rollout_jax(
+                jnp.asarray(concentration), jnp.asarray(temperature),
+                dt, diffusion_coeff, reaction_rate, steps=steps, stride=stride
+            )
+        else:
+            temperature = np.asarray(temperature)
+            step = partial(resist_step, temperature=temperature, dt=dt,
+                           diffusion_coeff=diffusion_coeff, reaction_rate=reaction_rate)
+            final, trajectory, energy = _numpy_rollout(
+                step, resist_energy, (np.asarray(concentration),), steps, stride
+            )
+        return self._rollout(RESIST_FIELDS, final, trajectory, energy, steps, stride)
+
+    def plasma(
+        self,
+        density: np.ndarray,
+        velocity_x: np.ndarray,
+        velocity_y: np.ndarray,
+        temperature: np.ndarray,
+        dt: float,
+        viscosity: float,
+        steps: int,
+        stride: int = 10
+    ) -> Rollout:
+        """
+        Plasma dynamics rollouts.
+
+        Args:
+            density, velocity_x, velocity_y, temperature: Initial fields [batch, *grid]
+        """
+        state = (density, velocity_x, velocity_y, temperature)
+        if self.use_jax:
+            final, trajectory, energy = _plasma_rollout_jax(
+                *(jnp.asarray(field) for field in state), dt, viscosity, steps=steps, stride=stride
+            )
+        else:
+            step = partial(plasma_step, dt=dt, viscosity=viscosity)
+            final, trajectory, energy = _numpy_rollout(
+                step, plasma_energy, tuple(np.asarray(field) for field in state), steps, stride
+            )
+        return self._rollout(PLASMA_FIELDS, final, trajectory, energy, steps, stride)
+
+    @staticmethod
+    def _rollout(fields, final, trajectory, energy, steps, stride) -> Rollout:
+        # One transfer to the host per rollout
+        return Rollout(
+            fields=fields,
+            trajectory={name: np.asarray(values) for name, values in zip(fields, trajectory)},
+            final={name: np.asarray(values) for name, values in zip(fields, final)},
+            energy=np.asarray(energy, dtype=float),
+            steps=steps,
+            stride=stride
+        )
@@ -27,6 +27,10 @@ from enum import Enum
 import json
 import hashlib
 
+from .rollout_engine import (
+    SAMPLE_AXES, Rollout, RolloutEngine, gradient, laplacian, plasma_step, resist_step
+)
+
 # Try to import JAX/Flax, fall back to mock if fails
 try:
     import jax
@@ -187,50 +191,31 @@ else:
 # ============================================================================
 
 class PhysicsSimulator:
-    """Base class for physics simulators"""
+    """Base class for physics simulators; the steps are those of the rollout engine"""
     
     @staticmethod
     def laplacian_2d(field: np.ndarray) -> np.ndarray:
         """Compute 2D Laplacian using finite differences"""
         if JAX_AVAILABLE:
             return PhysicsSimulator._laplacian_2d_jax(field)
-        
-        # Numpy implementation
-        return (
-            np.roll(field, 1, axis=0) +
-            np.roll(field, -1, axis=0) +
-            np.roll(field, 1, axis=1) +
-            np.roll(field, -1, axis=1) -
-            4 * field
-        )
+        return laplacian(np, field, SAMPLE_AXES)
 
     @staticmethod
     @jit
     def _laplacian_2d_jax(field: jnp.ndarray) -> jnp.ndarray:
-        return (
-            jnp.roll(field, 1, axis=0) +
-            jnp.roll(field, -1, axis=0) +
-            jnp.roll(field, 1, axis=1) +
-            jnp.roll(field, -1, axis=1) -
-            4 * field
-        )
+        return laplacian(jnp, field, SAMPLE_AXES)
     
     @staticmethod
     def gradient_2d(field: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Compute 2D gradient using central differences"""
         if JAX_AVAILABLE:
             return PhysicsSimulator._gradient_2d_jax(field)
-            
-        grad_x = (np.roll(field, -1, axis=1) - np.roll(field, 1, axis=1)) / 2.0
-        grad_y = (np.roll(field, -1, axis=0) - np.roll(field, 1, axis=0)) / 2.0
-        return grad_x, grad_y
+        return gradient(np, field, SAMPLE_AXES)
 
     @staticmethod
     @jit
     def _gradient_2d_jax(field: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
-        grad_x = (jnp.roll(field, -1, axis=1) - jnp.roll(field, 1, axis=1)) / 2.0
-        grad_y = (jnp.roll(field, -1, axis=0) - jnp.roll(field, 1, axis=0)) / 2.0
-        return grad_x, grad_y
+        return gradient(jnp, field, SAMPLE_AXES)
 
 class ResistDiffusionSimulator(PhysicsSimulator):
     """Photoresist diffusion simulator"""
@@ -248,24 +233,14 @@ class ResistDiffusionSimulator(PhysicsSimulator):
         """
         if JAX_AVAILABLE:
             return ResistDiffusionSimulator._step_jax(concentration, temperature, dt, diffusion_coeff, reaction_rate)
-
-        # Numpy implementation
-        laplacian = PhysicsSimulator.laplacian_2d(concentration)
-        diffusion = diffusion_coeff * laplacian
-        reaction = -reaction_rate * concentration * (1.0 + 0.1 * temperature)
-        new_concentration = concentration + dt * (diffusion + reaction)
-        new_concentration = np.clip(new_concentration, 0.0, 1.0)
-        return new_concentration
+        concentration, = resist_step(np, (concentration,), SAMPLE_AXES, temperature, dt, diffusion_coeff, reaction_rate)
+        return concentration
 
     @staticmethod
     @jit
     def _step_jax(concentration, temperature, dt, diffusion_coeff, reaction_rate):
-        laplacian = PhysicsSimulator._laplacian_2d_jax(concentration)
-        diffusion = diffusion_coeff * laplacian
-        reaction = -reaction_rate * concentration * (1.0 + 0.1 * temperature)
-        new_concentration = concentration + dt * (diffusion + reaction)
-        new_concentration = jnp.clip(new_concentration, 0.0, 1.0)
-        return new_concentration
+        concentration, = resist_step(jnp, (concentration,), SAMPLE_AXES, temperature, dt, diffusion_coeff, reaction_rate)
+        return concentration
 
 class PlasmaSimulator(PhysicsSimulator):
     """Plasma dynamics simulator"""
@@ -284,58 +259,12 @@ class PlasmaSimulator(PhysicsSimulator):
         """
         if JAX_AVAILABLE:
             return PlasmaSimulator._step_jax(density, velocity_x, velocity_y, temperature, dt, viscosity)
-
-        # Numpy implementation
-        grad_density_x, grad_density_y = PhysicsSimulator.gradient_2d(density)
-        advection_density = -(velocity_x * grad_density_x + velocity_y * grad_density_y)
-        
-        laplacian_vx = PhysicsSimulator.laplacian_2d(velocity_x)
-        laplacian_vy = PhysicsSimulator.laplacian_2d(velocity_y)
-        diffusion_vx = viscosity * laplacian_vx
-        diffusion_vy = viscosity * laplacian_vy
-        
-        grad_temp_x, grad_temp_y = PhysicsSimulator.gradient_2d(temperature)
-        pressure_force_x = -0.1 * grad_temp_x
-        pressure_force_y = -0.1 * grad_temp_y
-        
-        new_density = density + dt * advection_density
-        new_velocity_x = velocity_x + dt * (diffusion_vx + pressure_force_x)
-        new_velocity_y = velocity_y + dt * (diffusion_vy + pressure_force_y)
-        
-        laplacian_temp = PhysicsSimulator.laplacian_2d(temperature)
-        new_temperature = temperature + dt * 0.05 * laplacian_temp
-        
-        new_density = np.clip(new_density, 0.0, 10.0)
-        new_temperature = np.clip(new_temperature, 0.0, 10.0)
-        
-        return new_density, new_velocity_x, new_velocity_y, new_temperature
+        return plasma_step(np, (density, velocity_x, velocity_y, temperature), SAMPLE_AXES, dt, viscosity)
 
     @staticmethod
     @jit
     def _step_jax(density, velocity_x, velocity_y, temperature, dt, viscosity):
-        grad_density_x, grad_density_y = PhysicsSimulator._gradient_2d_jax(density)
-        advection_density = -(velocity_x * grad_density_x + velocity_y * grad_density_y)
-        
-        laplacian_vx = PhysicsSimulator._laplacian_2d_jax(velocity_x)
-        laplacian_vy = PhysicsSimulator._laplacian_2d_jax(velocity_y)
-        diffusion_vx = viscosity * laplacian_vx
-        diffusion_vy = viscosity * laplacian_vy
-        
-        grad_temp_x, grad_temp_y = PhysicsSimulator._gradient_2d_jax(temperature)
-        pressure_force_x = -0.1 * grad_temp_x
-        pressure_force_y = -0.1 * grad_temp_y
-        
-        new_density = density + dt * advection_density
-        new_velocity_x = velocity_x + dt * (diffusion_vx + pressure_force_x)
-        new_velocity_y = velocity_y + dt * (diffusion_vy + pressure_force_y)
-        
-        laplacian_temp = PhysicsSimulator._laplacian_2d_jax(temperature)
-        new_temperature = temperature + dt * 0.05 * laplacian_temp
-        
-        new_density = jnp.clip(new_density, 0.0, 10.0)
-        new_temperature = jnp.clip(new_temperature, 0.0, 10.0)
-        
-        return new_density, new_velocity_x, new_velocity_y, new_temperature
+        return plasma_step(jnp, (density, velocity_x, velocity_y, temperature), SAMPLE_AXES, dt, viscosity)
 
 # ============================================================================
 # WORLD MODEL SERVICE
@@ -358,6 +287,11 @@ class WorldModelService:
         self.resist_simulator = ResistDiffusionSimulator()
         self.plasma_simulator = PlasmaSimulator()
         
+        # Batched rollouts, capturing states every trajectory_stride steps
+        self.rollout_engine = RolloutEngine()
+        self.trajectory_stride = self.config.get("trajectory_stride", 10)
+        self.dataset_batch_size = self.config.get("dataset_batch_size", 32)
+        
         # Neural world model (optional, for learned dynamics)
         self.use_neural_model = self.config.get("use_neural_model", False)
         if self.use_neural_model:
@@ -390,8 +324,6 @@ class WorldModelService:
         Returns:
             SimulationResult with trajectory
         """
-        simulation_id = self._generate_simulation_id()
-        
         # Select simulator based on domain
         if config.domain == DomainType.RESIST_CHEMISTRY:
             final_state, trajectory, energy_traj = await self._simulate_resist(
@@ -404,6 +336,19 @@ class WorldModelService:
         else:
             raise ValueError(f"Unsupported domain: {config.domain}")
         
+        return self._record_result(config, initial_state, final_state, trajectory, energy_traj)
+    
+    def _record_result(
+        self,
+        config: SimulationConfig,
+        initial_state: PhysicsState,
+        final_state: PhysicsState,
+        trajectory: List[PhysicsState],
+        energy_traj: List[float]
+    ) -> SimulationResult:
+        """Store a finished simulation"""
+        simulation_id = self._generate_simulation_id()
+        
         # Compute metrics
         metrics = self._compute_metrics(trajectory, energy_traj)
         
@@ -435,50 +380,8 @@ class WorldModelService:
         initial_state: PhysicsState
     ) -> Tuple[PhysicsState, List[PhysicsState], List[float]]:
         """Simulate photoresist diffusion"""
-        concentration = jnp.array(initial_state.spatial_grid)
-        temperature = jnp.array(initial_state.temperature) if initial_state.temperature is not None else jnp.ones_like(concentration)
-        
-        trajectory = []
-        energy_trajectory = []
-        
-        # Get physics parameters
-        diffusion_coeff = config.physics_params.get("diffusion_coeff", 0.1)
-        reaction_rate = config.physics_params.get("reaction_rate", 0.01)
-        
-        # Time stepping
-        for step in range(config.time_steps):
-            # Store current state
-            if step % 10 == 0:  # Sample every 10 steps
-                state = PhysicsState(
-                    domain=config.domain,
-                    spatial_grid=np.array(concentration),
-                    temperature=np.array(temperature),
-                    metadata={"step": step}
-                )
-                trajectory.append(state)
-                
-                # Compute energy
-                energy = float(jnp.sum(concentration ** 2))
-                energy_trajectory.append(energy)
-            
-            # Simulate one step
-            concentration = self.resist_simulator.step(
-                concentration,
-                temperature,
-                config.dt,
-                diffusion_coeff,
-                reaction_rate
-            )
-        
-        # Final state
-        final_state = PhysicsState(
-            domain=config.domain,
-            spatial_grid=np.array(concentration),
-            temperature=np.array(temperature),
-            metadata={"step": config.time_steps}
-        )
-        
-        return final_state, trajectory, energy_trajectory
+        rollout = self._rollout_batch(config, [initial_state])
+        return self._unpack_rollout(config, rollout, 0, [initial_state])
     
     async def _simulate_plasma(
         self,
@@ -486,59 +389,81 @@ class WorldModelService:
         initial_state: PhysicsState
     ) -> Tuple[PhysicsState, List[PhysicsState], List[float]]:
         """Simulate plasma dynamics"""
-        density = jnp.array(initial_state.spatial_grid)
-        velocity = jnp.array(initial_state.velocity) if initial_state.velocity is not None else jnp.zeros_like(density)
-        velocity_x = velocity[..., 0] if velocity.ndim > 2 else jnp.zeros_like(density)
-        velocity_y = velocity[..., 1] if velocity.ndim > 2 else jnp.zeros_like(density)
-        temperature = jnp.array(initial_state.temperature) if initial_state.temperature is not None else jnp.ones_like(density)
-        
-        trajectory = []
-        energy_trajectory = []
-        
-        # Get physics parameters
-        viscosity = config.physics_params.get("viscosity", 0.01)
+        rollout = self._rollout_batch(config, [initial_state])
+        return self._unpack_rollout(config, rollout, 0, [initial_state])
+    
+    def _rollout_batch(
+        self,
+        config: SimulationConfig,
+        initial_states: List[PhysicsState]
+    ) -> Rollout:
+        """Simulate initial states of one domain as a single batched rollout"""
+        grids = np.stack([np.asarray(state.spatial_grid) for state in initial_states])
+        temperature = np.stack([
+            np.asarray(state.temperature) if state.temperature is not None else np.ones_like(state.spatial_grid)
+            for state in initial_states
+        ])
         
-        # Time stepping
-        for step in range(config.time_steps):
-            # Store current state
-            if step % 10 == 0:
-                velocity_combined = jnp.stack([velocity_x, velocity_y], axis=-1)
-                state = PhysicsState(
+        if config.domain == DomainType.RESIST_CHEMISTRY:
+            return self.rollout_engine.resist(
+                grids,
+                temperature,
+                config.dt,
+                config.physics_params.get("diffusion_coeff", 0.1),
+                config.physics_params.get("reaction_rate", 0.01),
+                config.time_steps,
+                self.trajectory_stride
+            )
+        elif config.domain == DomainType.PLASMA:
+            velocity_x, velocity_y = [], []
+            for state, grid in zip(initial_states, grids):
+                velocity = np.asarray(state.velocity) if state.velocity is not None else np.zeros_like(grid)
+                velocity_x.append(velocity[..., 0] if velocity.ndim > 2 else np.zeros_like(grid))
+                velocity_y.append(velocity[..., 1] if velocity.ndim > 2 else np.zeros_like(grid))
+            return self.rollout_engine.plasma(
+                grids,
+                np.stack(velocity_x),
+                np.stack(velocity_y),
+                temperature,
+                config.dt,
+                config.physics_params.get("viscosity", 0.01),
+                config.time_steps,
+                self.trajectory_stride
+            )
+        raise ValueError(f"Unsupported domain: {config.domain}")
+    
+    def _unpack_rollout(
+        self,
+        config: SimulationConfig,
+        rollout: Rollout,
+        index: int,
+        initial_states: List[PhysicsState]
+    ) -> Tuple[PhysicsState, List[PhysicsState], List[float]]:
+        """Final state, trajectory and energy trajectory of one sample of a batched rollout"""
+        def physics_state(fields: Dict[str, np.ndarray], step: int) -> PhysicsState:
+            if config.domain == DomainType.PLASMA:
+                return PhysicsState(
                     domain=config.domain,
-                    spatial_grid=np.array(density),
-                    velocity=np.array(velocity_combined),
-                    temperature=np.array(temperature),
+                    spatial_grid=fields["density"],
+                    velocity=np.stack([fields["velocity_x"], fields["velocity_y"]], axis=-1),
+                    temperature=fields["temperature"],
                     metadata={"step": step}
                 )
-                trajectory.append(state)
-                
-                # Compute energy (kinetic + thermal)
-                kinetic_energy = 0.5 * jnp.sum(density * (velocity_x ** 2 + velocity_y ** 2))
-                thermal_energy = jnp.sum(temperature)
-                total_energy = float(kinetic_energy + thermal_energy)
-                energy_trajectory.append(total_energy)
-            
-            # Simulate one step
-            density, velocity_x, velocity_y, temperature = self.plasma_simulator.step(
-                density,
-                velocity_x,
-                velocity_y,
-                temperature,
-                config.dt,
-                viscosity
+            initial_state = initial_states[index]
+            temperature = initial_state.temperature if initial_state.temperature is not None else np.ones_like(fields["concentration"])
+            return PhysicsState(
+                domain=config.domain,
+                spatial_grid=fields["concentration"],
+                temperature=np.array(temperature),
+                metadata={"step": step}
             )
         
-        # Final state
-        velocity_combined = jnp.stack([velocity_x, velocity_y], axis=-1)
-        final_state = PhysicsState(
-            domain=config.domain,
-            spatial_grid=np.array(density),
-            velocity=np.array(velocity_combined),
-            temperature=np.array(temperature),
-            metadata={"step": config.time_steps}
-        )
-        
-        return final_state, trajectory, energy_trajectory
+        trajectory = [
+            physics_state({name: values[index, capture] for name, values in rollout.trajectory.items()}, step)
+            for capture, step in enumerate(rollout.capture_steps)
+        ]
+        final_state = physics_state({name: values[index] for name, values in rollout.final.items()}, config.time_steps)
+        return final_state, trajectory, rollout.energy[index].tolist()
     
     # ========================================================================
     # ROLLOUT & PREDICTION
@@ -582,36 +507,119 @@ class WorldModelService:
         """
         Generate synthetic training dataset.
         
-        Creates diverse initial conditions and simulates them.
+        Creates diverse initial conditions and simulates them in batches of
+        dataset_batch_size samples.
         """
+        config = self._dataset_config(domain, grid_size, time_steps)
         dataset = []
         
-        for sample_idx in range(num_samples):
-            # Generate random initial condition
-            self.rng_key, subkey = random.split(self.rng_key)
-            initial_grid = random.uniform(subkey, shape=grid_size)
+        for batch_start in range(0, num_samples, self.dataset_batch_size):
+            count = min(self.dataset_batch_size, num_samples - batch_start)
+            initial_grids = self._initial_conditions(count, grid_size)
+            initial_states = [
+                PhysicsState(
+                    domain=domain,
+                    spatial_grid=initial_grids[i],
+                    metadata={"sample_index": batch_start + i}
+                )
+                for i in range(count)
+            ]
             
-            # Create initial state
-            initial_state = PhysicsState(
-                domain=domain,
-                spatial_grid=np.array(initial_grid),
-                metadata={"sample_index": sample_idx}
-            )
+            rollout = self._rollout_batch(config, initial_states)
+            for i, initial_state in enumerate(initial_states):
+                final_state, trajectory, energy_traj = self._unpack_rollout(config, rollout, i, initial_states)
+                dataset.append(self._record_result(config, initial_state, final_state, trajectory, energy_traj))
+        
+        return dataset
+    
+    async def write_dataset(
+        self,
+        path: str,
+        domain: DomainType,
+        num_samples: int,
+        grid_size: Tuple[int, ...],
+        time_steps: int
+    ) -> Dict[str, Any]:
+        """
+        Generate a synthetic training dataset straight into an HDF5 file.
+        
+        Each batch is written to chunked datasets, one sample per chunk, without
+        keeping results in memory:
+            /initial            [samples, *grid]
+            /trajectory/<field> [samples, captures, *grid]
+            /final/<field>      [samples, *grid]
+            /energy             [samples, captures]
+        """
+        import h5py
+        
+        config = self._dataset_config(domain, grid_size, time_steps)
+        
+        with h5py.File(path, 'w') as f:
+            f.attrs['domain'] = domain.value
+            f.attrs['time_steps'] = time_steps
+            f.attrs['dt'] = config.dt
+            f.attrs['trajectory_stride'] = self.trajectory_stride
+            f.attrs['physics_params'] = json.dumps(config.physics_params)
             
-            # Create config
-            config = SimulationConfig(
-                domain=domain,
-                grid_size=grid_size,
-                time_steps=time_steps,
-                dt=0.01,
-                physics_params=self._get_default_physics_params(domain)
-            )
+            datasets = {}
+            for batch_start in range(0, num_samples, self.dataset_batch_size):
+                count = min(self.dataset_batch_size, num_samples - batch_start)
+                initial_grids = self._initial_conditions(count, grid_size)
+                initial_states = [PhysicsState(domain=domain, spatial_grid=grid) for grid in initial_grids]
+                rollout = self._rollout_batch(config, initial_states)
+                
+                arrays = {"initial": initial_grids, "energy": rollout.energy}
+                for name in rollout.fields:
+                    arrays[f"trajectory/{name}"] = rollout.trajectory[name]
+                    arrays[f"final/{name}"] = rollout.final[name]
+                
+                for name, values in arrays.items():
+                    if name not in datasets:
+                        # One sample per chunk; empty datasets (no time steps) are not chunked
+                        shape = (num_samples,) + values.shape[1:]
+                        datasets[name] = f.create_dataset(
+                            name, shape=shape, dtype=values.dtype,
+                            chunks=(1,) + values.shape[1:] if all(shape) else None
+                        )
+                    datasets[name][batch_start:batch_start + count] = values
             
-            # Run simulation
-            result = await self.simulate(config, initial_state)
-            dataset.append(result)
+            shapes = {name: dataset.shape for name, dataset in datasets.items()}
         
-        return dataset
+        self.total_simulations += num_samples
+        self.total_time_steps += num_samples * time_steps
+        
+        return {
+            "path": path,
+            "domain": domain.value,
+            "num_samples": num_samples,
+            "datasets": shapes
+        }
+    
+    def _dataset_config(
+        self,
+        domain: DomainType,
+        grid_size: Tuple[int, ...],
+        time_steps: int
+    ) -> SimulationConfig:
+        """Simulation config shared by the samples of a dataset"""
+        return SimulationConfig(
+            domain=domain,
+            grid_size=grid_size,
+            time_steps=time_steps,
+            dt=0.01,
+            physics_params=self._get_default_physics_params(domain)
+        )
+    
+    def _initial_conditions(self, count: int, grid_size: Tuple[int, ...]) -> np.ndarray:
+        """Random initial grids [count, *grid], one PRNG key split per sample"""
+        subkeys = []
+        for _ in range(count):
+            self.rng_key, subkey = random.split(self.rng_key)
+            subkeys.append(subkey)
+        
+        if JAX_AVAILABLE:
+            return np.array(vmap(lambda key: random.uniform(key, shape=tuple(grid_size)))(jnp.stack(subkeys)))
+        return np.array(random.uniform(subkeys[0], shape=(count,) + tuple(grid_size)))
     
     def _get_default_physics_params(self, domain: DomainType) -> Dict[str, float]:
         """Get default physics parameters for domain"""
@@ -0,0 +1,199 @@
+"""
+Chunked Processing Helpers for Industriverse Data Layer
+
+This module provides the building blocks of the DataProcessingEngine streaming
+mode, which processes datasets that do not fit in memory chunk by chunk:
+- Sampled datetime column detection
+- Online per-column moments (count, mean, variance, min, max) merged across chunks
+- A row reservoir sample for statistics that cannot be computed online
+  (medians, quantile bins, robust scaling, feature selection)
+- A Parquet writer that appends chunks as row groups under one schema
+"""
+
+import warnings
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def detect_datetime_columns(df: pd.DataFrame, sample_rows: int = 100) -> List[str]:
+    """
+    Detect datetime columns from a sample of each column's values.
+
+    Columns that already have a datetime dtype count as datetime. Text columns
+    count if an evenly spaced sample of their non-null values parses as
+    datetimes. Numeric columns never count, even though pandas would parse
+    them as epoch offsets.
+
+    Args:
+        df: DataFrame (or a leading chunk of one) to inspect
+        sample_rows: Maximum number of values to parse per column
+
+    Returns:
+        Names of the datetime columns, in column order
+    """
+    datetime_cols = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            datetime_cols.append(col)
+            continue
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+
+        values = series.dropna()
+        if values.empty:
+            continue
+        positions = np.linspace(0, len(values) - 1, min(sample_rows, len(values))).astype(int)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                pd.to_datetime(values.iloc[positions])
+            datetime_cols.append(col)
+        except (ValueError, TypeError, OverflowError):
+            # ValueError: invalid date format
+            # TypeError: incompatible type for datetime conversion
+            # OverflowError: out of range values
+            pass
+    return datetime_cols
+
+
+class OnlineMoments:
+    """
+    Per-column moments of numeric data seen chunk by chunk.
+
+    Chunk statistics are merged with the parallel variance formula of Chan et
+    al., so the result matches a single pass over all rows. NaNs are ignored
+    and counted separately.
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k)
+        self.missing = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self._m2 = np.zeros(k)
+        self.min = np.full(k, np.nan)
+        self.max = np.full(k, np.nan)
+
+    def update(self, df: pd.DataFrame):
+        """Merge the statistics of a chunk."""
+        values = df[self.columns].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0)
+        self.missing += len(values) - n
+        if not n.any():
+            return
+
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            chunk_mean = np.where(n > 0, np.nansum(values, axis=0) / n, 0.0)
+            chunk_m2 = np.nansum((values - chunk_mean) ** 2, axis=0)
+            self.min = np.fmin(self.min, np.nanmin(values, axis=0))
+            self.max = np.fmax(self.max, np.nanmax(values, axis=0))
+
+        total = self.count + n
+        safe_total = np.where(total > 0, total, 1)
+        delta = chunk_mean - self.mean
+        self.mean = self.mean + delta * n / safe_total
+        self._m2 = self._m2 + chunk_m2 + delta ** 2 * self.count * n / safe_total
+        self.count = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Population variance per column (NaN for columns with no values)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self._m2 / np.where(self.count > 0, self.count, 1), np.nan)
+
+    def mean_series(self) -> pd.Series:
+        """Column means (NaN for columns with no values) as a Series."""
+        return pd.Series(np.where(self.count > 0, self.mean, np.nan), index=self.columns)
+
+
+class ReservoirSample:
+    """
+    Uniform sample of up to `size` rows from chunks of a DataFrame (Algorithm R).
+
+    Every chunk must have the sample's columns; values are stored as floats.
+    """
+
+    def __init__(self, columns: List[str], size: int, seed: int = 0):
+        self.columns = list(columns)
+        self.size = size
+        self.seen = 0
+        self._rows = np.empty((0, len(self.columns)))
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, df: pd.DataFrame):
+        """Offer the rows of a chunk to the sample."""
+        values = df[self.columns].to_numpy(dtype=float)
+        fill = min(self.size - len(self._rows), len(values))
+        if fill > 0:
+            self._rows = np.vstack([self._rows, values[:fill]])
+        rest = values[fill:]
+        if len(rest):
+            # Row i of the rest is the (seen + fill + i)-th row overall
+            positions = self.seen + fill + np.arange(len(rest))
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.size
+            # Later rows overwrite earlier ones on the same slot, as in sequential Algorithm R
+            self._rows[slots[keep]] = rest[keep]
+        self.seen += len(values)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self._rows, columns=self.columns)
+
+
+class ParquetChunkWriter:
+    """Writes DataFrame chunks to one Parquet file as row groups with the first chunk's schema."""
+
+    def __init__(self, path: str, row_group_size: Optional[int] = None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Streaming mode requires pyarrow to write Parquet output") from e
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.row_groups = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        else:
+            table = table.select(self._schema.names).cast(self._schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self.row_groups = self._pq.ParquetFile(self.path).metadata.num_row_groups
+
+
+def iter_parquet_row_groups(path: str) -> Iterator[pd.DataFrame]:
+    """Read a Parquet file one row group at a time."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Streaming mode requires pyarrow to read Parquet files") from e
+    parquet_file = pq.ParquetFile(path)
+    try:
+        for i in range(parquet_file.num_row_groups):
+            # self_destruct frees the Arrow buffers as they are converted
+            yield parquet_file.read_row_group(i).to_pandas(split_blocks=True, self_destruct=True)
+    finally:
+        parquet_file.close()
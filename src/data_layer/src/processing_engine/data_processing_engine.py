@@ -4,6 +4,10 @@ Data Processing Engine for Industriverse Data Layer
 This module implements a protocol-native data processing engine that handles
 transformation, feature engineering, and preparation of industrial datasets
 for analysis and model training.
+
+Datasets are processed in memory ("batch" mode) or, for CSV files that do not
+fit in memory, chunk by chunk ("streaming" mode) with statistics fitted
+incrementally and output written to Parquet.
 """
 
 import json
@@ -21,6 +25,11 @@ from sklearn.feature_selection import SelectKBest, f_regression, mutual_info_reg
 from sklearn.decomposition import PCA
 from sklearn.pipeline import Pipeline
 
+from .chunked_processing import (
+    OnlineMoments, ParquetChunkWriter, ReservoirSample, detect_datetime_columns,
+    iter_parquet_row_groups
+)
+
 logger = logging.getLogger(__name__)
 
 class DataProcessingEngine:
@@ -74,6 +83,12 @@ class DataProcessingEngine:
                 "method": "mutual_info",       # mutual_info, f_regression, pca
                 "max_features": 50,
                 "variance_threshold": 0.01
+            },
+            "streaming": {
+                "chunk_size": 100000,          # Rows read per chunk
+                "row_group_size": 100000,      # Rows per Parquet row group
+                "sample_size": 50000,          # Reservoir rows for medians, quantiles, robust scaling, feature selection
+                "datetime_sample_rows": 100    # Values parsed per column to detect datetime columns
             }
         }
         
@@ -401,7 +416,8 @@ class DataProcessingEngine:
         dataset_path: str,
         dataset_name: str = "",
         config: Optional[Dict[str, Any]] = None,
-        emit_events: bool = True
+        emit_events: bool = True,
+        mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process a dataset.
@@ -411,6 +427,9 @@ class DataProcessingEngine:
             dataset_name: Name of the dataset
             config: Processing configuration
             emit_events: Whether to emit protocol events
+            mode: "batch" or "streaming" (defaults to the configured default_mode).
+                Streaming applies to CSV time series and tabular datasets and
+                writes Parquet; other datasets are processed in batch mode.
             
         Returns:
             Processing result
@@ -432,9 +451,6 @@ class DataProcessingEngine:
             # Determine dataset type
             dataset_type = self._determine_dataset_type(dataset_path)
             
-            # Load dataset
-            data = self._load_dataset(dataset_path, dataset_type)
-            
             # Merge configuration
             processing_config = self.config.copy()
             if config:
@@ -445,8 +461,22 @@ class DataProcessingEngine:
                     else:
                         processing_config[key] = value
             
+            mode = mode or processing_config.get("default_mode", "batch")
+            streaming = (
+                mode == "streaming"
+                and dataset_type in ["timeseries", "tabular"]
+                and dataset_path.endswith('.csv')
+            )
+            if mode == "streaming" and not streaming:
+                logger.info(f"Streaming mode does not support {dataset_path}, processing in batch mode")
+            
+            # Load dataset (streaming mode reads it chunk by chunk instead)
+            data = None if streaming else self._load_dataset(dataset_path, dataset_type)
+            
             # Process dataset based on type
-            if dataset_type == "timeseries":
+            if streaming:
+                result = self._process_dataset_streaming(dataset_path, dataset_type, dataset_name, processing_config)
+            elif dataset_type == "timeseries":
                 result = self._process_timeseries_dataset(data, dataset_name, processing_config)
             elif dataset_type == "tabular":
                 result = self._process_tabular_dataset(data, dataset_name, processing_config)
@@ -561,16 +591,9 @@ class DataProcessingEngine:
                 sample_df = pd.read_excel(dataset_path, nrows=100)
             
             # Check for datetime columns
-            datetime_cols = []
-            for col in sample_df.columns:
-                try:
-                    pd.to_datetime(sample_df[col])
-                    datetime_cols.append(col)
-                except (ValueError, TypeError, KeyError):
-                    # ValueError: invalid date format
-                    # TypeError: incompatible type for datetime conversion
-                    # KeyError: column doesn't exist
-                    pass
+            datetime_cols = detect_datetime_columns(
+                sample_df, self.config["streaming"]["datetime_sample_rows"]
+            )
             
             if datetime_cols:
                 return "timeseries"
@@ -629,6 +652,32 @@ class DataProcessingEngine:
             with open(dataset_path, 'rb') as f:
                 return f.read()
     
+    def _convert_datetime_columns(self, df: pd.DataFrame, candidates: List[str]) -> List[str]:
+        """
+        Convert detected datetime columns in place.
+        
+        Detection parses only a sample of each column, so a candidate whose
+        full conversion fails is left as is and dropped from the result.
+        
+        Args:
+            df: DataFrame to convert
+            candidates: Columns detected as datetime
+            
+        Returns:
+            The columns that were converted
+        """
+        datetime_cols = []
+        for col in candidates:
+            try:
+                df[col] = pd.to_datetime(df[col])
+                datetime_cols.append(col)
+            except (ValueError, TypeError, KeyError):
+                # ValueError: invalid date format outside the sampled values
+                # TypeError: incompatible type for datetime conversion
+                # KeyError: column doesn't exist
+                pass
+        return datetime_cols
+    
     def _process_timeseries_dataset(
         self,
         data: pd.DataFrame,
@@ -649,17 +698,10 @@ class DataProcessingEngine:
         # Create a copy to avoid modifying the original
         df = data.copy()
         
-        # Identify datetime columns
-        datetime_cols = []
-        for col in df.columns:
-            try:
-                df[col] = pd.to_datetime(df[col])
-                datetime_cols.append(col)
-            except (ValueError, TypeError, KeyError):
-                # ValueError: invalid date format
-                # TypeError: incompatible type for datetime conversion
-                # KeyError: column doesn't exist
-                pass
+        # Identify datetime columns from a sample, then convert only those
+        datetime_cols = self._convert_datetime_columns(
+            df, detect_datetime_columns(df, config["streaming"]["datetime_sample_rows"])
+        )
         
         if not datetime_cols:
             logger.warning(f"No datetime columns found in {dataset_name}")
@@ -742,7 +784,8 @@ class DataProcessingEngine:
     def _engineer_timeseries_features(
         self,
         df: pd.DataFrame,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        max_lag: Optional[int] = None
     ) -> pd.DataFrame:
         """
         Engineer features for time series data.
@@ -750,6 +793,8 @@ class DataProcessingEngine:
         Args:
             df: DataFrame with time series data
             config: Processing configuration
+            max_lag: Largest lag/window to create (defaults to a tenth of the rows,
+                capped by max_lag_features)
             
         Returns:
             DataFrame with engineered features
@@ -787,7 +832,8 @@ class DataProcessingEngine:
         target_cols = [col for col in numeric_cols if col not in exclude_cols]
         
         # Create lag features for selected columns
-        max_lag = min(config["feature_engineering"]["max_lag_features"], len(df) // 10)
+        if max_lag is None:
+            max_lag = self._max_lag(config, len(df))
         
         for col in target_cols[:5]:  # Limit to first 5 numeric columns to avoid explosion
             for lag in [1, 6, 12, 24, 48, 168]:  # Common lags (hour, 6h, 12h, day, 2d, week)
@@ -809,10 +855,23 @@ class DataProcessingEngine:
                     df[f'{col1}_{col2}_interaction'] = df[col1] * df[col2]
         
         # Fill NaN values created by lag/rolling features
-        df = df.fillna(method='bfill').fillna(method='ffill').fillna(0)
+        df = df.bfill().ffill().fillna(0)
         
         return df
     
+    def _max_lag(self, config: Dict[str, Any], row_count: int) -> int:
+        """
+        Get the largest lag/window for time series features.
+        
+        Args:
+            config: Processing configuration
+            row_count: Number of rows in the dataset
+            
+        Returns:
+            Maximum lag in rows
+        """
+        return min(config["feature_engineering"]["max_lag_features"], row_count // 10)
+    
     def _process_tabular_dataset(
         self,
         data: pd.DataFrame,
@@ -896,7 +955,8 @@ class DataProcessingEngine:
     def _engineer_tabular_features(
         self,
         df: pd.DataFrame,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        bin_edges: Optional[Dict[str, np.ndarray]] = None
     ) -> pd.DataFrame:
         """
         Engineer features for tabular data.
@@ -904,6 +964,8 @@ class DataProcessingEngine:
         Args:
             df: DataFrame with tabular data
             config: Processing configuration
+            bin_edges: Quantile bin edges per column, computed beforehand when
+                df is one chunk of a dataset (defaults to quantiles of df)
             
         Returns:
             DataFrame with engineered features
@@ -931,7 +993,16 @@ class DataProcessingEngine:
         # Create binned features for numeric columns
         for col in numeric_cols[:5]:  # Limit to first 5 numeric columns
             # Create 5 bins
-            df[f'{col}_binned'] = pd.qcut(df[col], q=5, labels=False, duplicates='drop')
+            if bin_edges is not None:
+                edges = bin_edges[col]
+                if len(edges) < 2:
+                    # A constant column has no bins, as with qcut
+                    df[f'{col}_binned'] = np.nan
+                else:
+                    df[f'{col}_binned'] = pd.cut(df[col].clip(edges[0], edges[-1]), bins=edges,
+                                                 labels=False, include_lowest=True)
+            else:
+                df[f'{col}_binned'] = pd.qcut(df[col], q=5, labels=False, duplicates='drop')
         
         # Create ratio features
         for i, col1 in enumerate(numeric_cols[:3]):  # Limit to first 3 numeric columns
@@ -1042,6 +1113,329 @@ class DataProcessingEngine:
             "dataset_type": "generic"
         }
     
+    def _process_dataset_streaming(
+        self,
+        dataset_path: str,
+        dataset_type: str,
+        dataset_name: str,
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Process a CSV time series or tabular dataset chunk by chunk.
+        
+        Follows the batch pipeline in three passes that each hold one chunk in memory:
+        1. Scan: detect datetime columns from a sample, count rows and fit the
+           imputation values, categorical levels and tabular quantile bins
+        2. Engineer: impute, encode and engineer features per chunk (lag and
+           rolling features carry the previous chunk's tail), partial_fit the
+           scaler and stage the chunk in a temporary Parquet file
+        3. Transform: scale and select features per staged chunk and write the
+           output Parquet file in row groups
+        
+        Unlike batch mode, KNN imputation uses column means, and medians, quantile
+        bins, robust scaling and feature selection are fitted on a reservoir sample
+        of rows. Time series are sorted within each chunk only, so the input
+        should already be in time order.
+        
+        Args:
+            dataset_path: Path to the CSV file
+            dataset_type: Dataset type (timeseries or tabular)
+            dataset_name: Name of the dataset
+            config: Processing configuration
+            
+        Returns:
+            Processing result
+        """
+        streaming = config["streaming"]
+        plan = self._scan_csv_chunks(dataset_path, dataset_type, config)
+        if plan["row_count"] == 0:
+            raise ValueError(f"No rows to process in {dataset_path}")
+        
+        date_col = plan["date_col"]
+        engineer = config["feature_engineering"]["enable_auto_feature_engineering"]
+        scaling_method = config["preprocessing"]["scaling_method"]
+        scale = scaling_method in self.preprocessing_pipelines and bool(plan["numeric_cols"])
+        select = config["feature_selection"]["enable_auto_selection"]
+        scaler = self.preprocessing_pipelines[scaling_method].named_steps['scaler'] if scale else None
+        incremental = scale and hasattr(scaler, "partial_fit")
+        
+        # Pass 2: engineer features chunk by chunk and stage them
+        staged_path = os.path.join(self.temp_dir, f"{dataset_name}_staged.parquet")
+        # The staged file is removed however passes 2-3 end
+        try:
+            staged = ParquetChunkWriter(staged_path, streaming["row_group_size"])
+            max_lag = self._max_lag(config, plan["row_count"])
+            chunk_size = max(streaming["chunk_size"], max_lag + 2)
+            tail = None
+            feature_cols = None
+            sample = None
+            last_timestamp = None
+            out_of_order = False
+            try:
+                for chunk in pd.read_csv(dataset_path, chunksize=chunk_size, dtype=plan["dtypes"]):
+                    df = self._prepare_chunk(chunk, plan)
+                
+                    if date_col:
+                        if last_timestamp is not None and len(df) and df.index[0] < last_timestamp:
+                            out_of_order = True
+                        last_timestamp = df.index[-1] if len(df) else last_timestamp
+                        if engineer:
+                            # Lag and rolling features see the previous chunk's last max_lag rows
+                            next_tail = df.tail(max_lag)
+                            if tail is not None and len(tail):
+                                df = pd.concat([tail, df])
+                            df = self._engineer_timeseries_features(df, config, max_lag)
+                            df = df.iloc[len(tail) if tail is not None else 0:]
+                            tail = next_tail
+                    elif engineer:
+                        df = self._engineer_tabular_features(df, config, plan["bin_edges"])
+                
+                    if feature_cols is None:
+                        feature_cols = df.select_dtypes(include=['number']).columns.tolist()
+                        if (scale and not incremental) or select:
+                            sample = ReservoirSample(feature_cols, streaming["sample_size"])
+                    if incremental:
+                        scaler.partial_fit(df[feature_cols])
+                    if sample is not None:
+                        sample.update(df)
+                
+                    staged.write(df.reset_index() if date_col else df)
+            finally:
+                staged.close()
+        
+            if out_of_order:
+                logger.warning(f"{dataset_name} is not in time order across chunks; rows were sorted within chunks only")
+        
+            # Fit what could not be fitted incrementally on the sample
+            sample_df = sample.to_frame() if sample is not None else None
+            if scale and not incremental:
+                scaler.fit(sample_df)
+            if scale:
+                scaler_path = os.path.join(self.models_dir, f"{dataset_name}_scaler.pkl")
+                with open(scaler_path, 'wb') as f:
+                    pickle.dump(scaler, f)
+            select_features = None
+            if select:
+                if scale:
+                    sample_df[feature_cols] = scaler.transform(sample_df[feature_cols])
+                select_features = self._fit_streaming_feature_selection(sample_df, config)
+        
+            # Pass 3: scale, select and write the output
+            output_path = os.path.join(self.processed_dir, f"{dataset_name}_processed.parquet")
+            output = ParquetChunkWriter(output_path, streaming["row_group_size"])
+            statistics = {"row_count": 0, "missing_values": 0}
+            start, end = None, None
+            try:
+                for df in iter_parquet_row_groups(staged_path):
+                    if scale:
+                        df[feature_cols] = scaler.transform(df[feature_cols])
+                    if select_features is not None:
+                        df = select_features(df)
+                        if date_col:
+                            df = df[[date_col] + [col for col in df.columns if col != date_col]]
+                
+                    if not statistics["row_count"]:
+                        statistics.update({
+                            "column_count": len(df.columns) - (1 if date_col else 0),
+                            "numeric_columns": len(df.select_dtypes(include=['number']).columns),
+                            "categorical_columns": len(df.select_dtypes(include=['object', 'category']).columns),
+                        })
+                        feature_columns = [col for col in df.columns if col != date_col]
+                    statistics["row_count"] += len(df)
+                    statistics["missing_values"] += int(df.drop(columns=[date_col] if date_col else []).isna().sum().sum())
+                    if date_col and len(df):
+                        start = min(start, df[date_col].min()) if start is not None else df[date_col].min()
+                        end = max(end, df[date_col].max()) if end is not None else df[date_col].max()
+                
+                    output.write(df)
+            finally:
+                output.close()
+        finally:
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+        
+        statistics["chunk_count"] = plan["chunk_count"]
+        statistics["row_groups"] = output.row_groups
+        statistics["input_column_statistics"] = plan["statistics"]
+        result = {
+            "output_path": output_path,
+            "statistics": statistics,
+            "feature_columns": feature_columns,
+            "dataset_type": "timeseries" if date_col else "tabular",
+            "mode": "streaming"
+        }
+        if date_col:
+            statistics["datetime_columns"] = len(plan["datetime_cols"])
+            statistics["time_range"] = {
+                "start": start.strftime('%Y-%m-%d %H:%M:%S') if start is not None else None,
+                "end": end.strftime('%Y-%m-%d %H:%M:%S') if end is not None else None
+            }
+            statistics["time_ordered"] = not out_of_order
+            result["datetime_columns"] = plan["datetime_cols"]
+        return result
+    
+    def _scan_csv_chunks(
+        self,
+        dataset_path: str,
+        dataset_type: str,
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Scan a CSV file chunk by chunk and fit what streaming processing needs up front.
+        
+        Args:
+            dataset_path: Path to the CSV file
+            dataset_type: Dataset type (timeseries or tabular)
+            config: Processing configuration
+            
+        Returns:
+            Processing plan: column roles, read dtypes, row and chunk counts,
+            imputation values, categorical levels and tabular bin edges
+        """
+        streaming = config["streaming"]
+        chunk_size = streaming["chunk_size"]
+        
+        # Column roles come from the first chunk
+        head = pd.read_csv(dataset_path, nrows=chunk_size)
+        datetime_cols = []
+        if dataset_type == "timeseries":
+            datetime_cols = detect_datetime_columns(head, streaming["datetime_sample_rows"])
+            if not datetime_cols:
+                logger.warning(f"No datetime columns found in {dataset_path}")
+        datetime_cols = self._convert_datetime_columns(head, datetime_cols)
+        columns = head.drop(columns=datetime_cols[:1])
+        numeric_cols = columns.select_dtypes(include=['number']).columns.tolist()
+        categorical_cols = columns.select_dtypes(include=['object', 'category']).columns.tolist()
+        
+        plan = {
+            "datetime_cols": datetime_cols,
+            "date_col": datetime_cols[0] if datetime_cols else None,
+            "numeric_cols": numeric_cols,
+            "categorical_cols": categorical_cols,
+            # Read text columns as text in every chunk, whatever a chunk's values look like
+            "dtypes": {col: str for col in datetime_cols + categorical_cols},
+            "row_count": 0,
+            "chunk_count": 0
+        }
+        
+        imputation_method = config["preprocessing"]["imputation_method"]
+        moments = OnlineMoments(numeric_cols)
+        tabular = plan["date_col"] is None and config["feature_engineering"]["enable_auto_feature_engineering"]
+        sample = None
+        if imputation_method == "median" or tabular:
+            sample = ReservoirSample(numeric_cols, streaming["sample_size"])
+        levels = {col: set() for col in categorical_cols}
+        
+        for chunk in pd.read_csv(dataset_path, chunksize=chunk_size, dtype=plan["dtypes"]):
+            plan["row_count"] += len(chunk)
+            plan["chunk_count"] += 1
+            values = chunk[numeric_cols].apply(pd.to_numeric, errors='coerce')
+            moments.update(values)
+            if sample is not None:
+                sample.update(values)
+            for col, seen in levels.items():
+                # Only datasets with fewer than 10 levels are one-hot encoded
+                if seen is not None:
+                    seen.update(chunk[col].fillna('unknown').unique())
+                    if len(seen) >= 10:
+                        levels[col] = None
+        
+        # Imputation values (KNN imputation needs all rows at once, so it uses means)
+        if imputation_method == "median":
+            plan["fill_values"] = sample.to_frame().median()
+        elif imputation_method == "constant":
+            plan["fill_values"] = pd.Series(0.0, index=numeric_cols)
+        else:
+            plan["fill_values"] = moments.mean_series()
+        
+        plan["categories"] = {col: sorted(seen) if seen is not None else None for col, seen in levels.items()}
+        
+        # Quantile bins for the tabular binned features, from the imputed sample
+        plan["bin_edges"] = None
+        if tabular:
+            imputed = sample.to_frame().fillna(plan["fill_values"])
+            plan["bin_edges"] = {
+                col: np.unique(imputed[col].quantile(np.linspace(0, 1, 6)).to_numpy())
+                for col in numeric_cols[:5]
+            }
+        
+        plan["statistics"] = {
+            col: {"mean": moments.mean[i], "std": float(np.sqrt(moments.variance[i])),
+                  "min": moments.min[i], "max": moments.max[i], "missing": int(moments.missing[i])}
+            for i, col in enumerate(numeric_cols)
+        }
+        return plan
+    
+    def _prepare_chunk(self, chunk: pd.DataFrame, plan: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Convert, impute and encode one chunk as batch mode does for a whole dataset.
+        
+        Args:
+            chunk: Raw chunk read from the CSV file
+            plan: Processing plan from _scan_csv_chunks
+            
+        Returns:
+            Prepared chunk, indexed and sorted by the datetime column for time series
+        """
+        df = chunk
+        numeric_cols = plan["numeric_cols"]
+        
+        if plan["date_col"]:
+            for col in plan["datetime_cols"]:
+                df[col] = pd.to_datetime(df[col])
+            df = df.set_index(plan["date_col"]).sort_index()
+        
+        # Handle missing values
+        if numeric_cols:
+            df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce').astype(float)
+            df[numeric_cols] = df[numeric_cols].fillna(plan["fill_values"])
+        
+        # Handle categorical columns with the levels seen across the whole dataset
+        for col in plan["categorical_cols"]:
+            df[col] = df[col].fillna('unknown')
+            categories = plan["categories"][col]
+            if categories is not None:
+                dummies = pd.get_dummies(pd.Categorical(df[col], categories=categories), prefix=col)
+                dummies.index = df.index
+                df = pd.concat([df.drop(col, axis=1), dummies], axis=1)
+        
+        return df
+    
+    def _fit_streaming_feature_selection(
+        self,
+        sample_df: pd.DataFrame,
+        config: Dict[str, Any]
+    ) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        """
+        Fit feature selection on a sample of rows.
+        
+        Args:
+            sample_df: Sample of the (scaled) numeric feature columns
+            config: Processing configuration
+            
+        Returns:
+            Function applying the fitted selection to a chunk
+        """
+        feature_cols = sample_df.columns.tolist()
+        selected = self._perform_feature_selection(sample_df, config)
+        
+        if config["feature_selection"]["method"] == "pca" and "component_0" in selected.columns:
+            pca = self.feature_selection_pipelines["pca"]
+            
+            def select(df: pd.DataFrame) -> pd.DataFrame:
+                components = pd.DataFrame(
+                    pca.transform(df[feature_cols]),
+                    index=df.index,
+                    columns=selected.columns
+                )
+                non_numeric_cols = [col for col in df.columns if col not in feature_cols]
+                return pd.concat([components, df[non_numeric_cols]], axis=1)
+            
+            return select
+        
+        dropped = [col for col in feature_cols if col not in selected.columns]
+        return lambda df: df.drop(columns=dropped)
+    
     def _perform_feature_selection(
         self,
         df: pd.DataFrame,
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Protocol
+from typing import Dict, Any, Callable, Protocol
 import numpy as np
 
 class EnergyPrior(Protocol):
@@ -20,6 +20,42 @@ class EnergyPrior(Protocol):
         """Compute the gradient of the energy function."""
         ...
 
+    def energy_batch(self, X: np.ndarray) -> np.ndarray:
+        """Optional: (N,) energies of a (N, D) batch of state vectors."""
+        ...
+
+    def grad_batch(self, X: np.ndarray) -> np.ndarray:
+        """Optional: (N, D) gradients, analytic where possible."""
+        ...
+
     def validate(self, state: Dict[str, Any]) -> None:
         """Validate that all required fields exist in the state."""
         ...
+
+
+def finite_difference_grad(energy_fn: Callable[[np.ndarray], np.ndarray], X: np.ndarray,
+                           epsilon: float = 1e-4) -> np.ndarray:
+    """
+    Forward-difference gradients of a (N, D) batch, evaluated with a single
+    batched energy_fn call over all N * (D + 1) base and perturbed states.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n, d = X.shape
+    probes = np.repeat(X[:, None, :], d + 1, axis=1)
+    probes[:, 1:, :] += epsilon * np.eye(d)
+    E = np.asarray(energy_fn(probes.reshape(n * (d + 1), d)), dtype=np.float64).reshape(n, d + 1)
+    return (E[:, 1:] - E[:, :1]) / epsilon
+
+
+def energy_batch(prior, X: np.ndarray) -> np.ndarray:
+    """(N,) energies of a (N, D) batch; priors without energy_batch are evaluated row by row."""
+    if hasattr(prior, "energy_batch"):
+        return prior.energy_batch(X)
+    return np.array([prior.energy({"state_vector": x}) for x in np.asarray(X)], dtype=np.float64)
+
+
+def grad_batch(prior, X: np.ndarray) -> np.ndarray:
+    """(N, D) energy gradients; falls back to vectorized finite differences."""
+    if hasattr(prior, "grad_batch"):
+        return prior.grad_batch(X)
+    return finite_difference_grad(lambda Z: energy_batch(prior, Z), X)
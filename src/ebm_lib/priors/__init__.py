@@ -0,0 +1,13 @@
+from ebm_lib.registry import register
+
+# State-vector priors, registered as "<domain>_v1" (modules load lazily on get()).
+# bio_v1 and space_v1 score feature dicts and are used directly, not sampled.
+DOMAINS = [
+    "amrsafety", "apparel", "assembly", "battery", "casting", "chassis", "chem", "cnc",
+    "conveyor", "electronics", "failure", "fusion", "grid", "heat", "lifecycle", "magnet",
+    "matflow", "metal", "microgrid", "motor", "pcbmfg", "pipeline", "polymer", "qctherm",
+    "robotics", "schedule", "sensorint", "surface", "wafer", "workforce",
+]
+
+for _domain in DOMAINS:
+    register(f"{_domain}_v1", f"ebm_lib.priors.{_domain}_v1")
@@ -13,6 +13,11 @@ class FusionPrior(EnergyPrior):
         self.target_field = None # Keep this as it's used in energy method
         # The hdf5_path loading logic is removed from __init__ as per the change.
             
+    @property
+    def state_shape(self):
+        # Calibrated states are full B-field slices
+        return tuple(self.target_field.shape) if self.target_field is not None else None
+
     def load_calibration(self, path):
         """Load real MHD data to set the target stable state."""
         try:
@@ -40,7 +45,10 @@ class FusionPrior(EnergyPrior):
         """
         # If no calibration, fallback to simple potential
         if self.target_field is None:
-            return 0.5 * x.pow(2).sum(dim=-1).mean()
+            # One energy per sample, so batched chains stay independent
+            if x.dim() > 1:
+                return 0.5 * x.pow(2).flatten(start_dim=1).sum(dim=-1)
+            return 0.5 * x.pow(2).sum()
             
         # 1. Deviation from Stable MHD State (Ground Truth)
         target = self.target_field.to(x.device)
@@ -13,15 +13,21 @@ class MagnetPriorV1:
     def validate(self, state):
         pass
 
-    def energy(self, state):
+    @staticmethod
+    def _pred_risk(temp):
+        # Stable sigmoid: saturates outside |x| > 500
+        x_val = np.clip((temp - 350.0) / 10.0, -500.0, 500.0)
+        return 1.0 / (1.0 + np.exp(-x_val))
+
+    def energy_batch(self, X):
         # State vector mapping:
         # 0: Magnetic Field Strength (Tesla)
         # 1: Temperature (K)
         # 2: Demagnetization Risk (0-1)
-        x = state["state_vector"]
-        b_field = x[0]
-        temp = x[1]
-        risk = x[2]
+        X = np.asarray(X, dtype=np.float64)
+        b_field = X[:, 0]
+        temp = X[:, 1]
+        risk = X[:, 2]
         
         # 1. Curie Law / Thermal Degradation
         # Magnetization drops as Temp approaches Curie Temp (Tc).
@@ -39,29 +45,33 @@ class MagnetPriorV1:
         # Risk is high if Temp is high OR if opposing field (not modeled here) is high.
         # Here we link Risk to Temp and B-field stability.
         # PredRisk = Sigmoid((Temp - 350) / 10)
-        # Use stable sigmoid
-        x_val = (temp - 350.0) / 10.0
-        if x_val < -500:
-            pred_risk = 0.0
-        elif x_val > 500:
-            pred_risk = 1.0
-        else:
-            pred_risk = 1.0 / (1.0 + np.exp(-x_val))
-            
-        e_risk = 10.0 * (risk - pred_risk)**2
+        e_risk = 10.0 * (risk - self._pred_risk(temp))**2
         
-        return float(e_thermal + e_optimal + e_risk)
+        return e_thermal + e_optimal + e_risk
+
+    def grad_batch(self, X):
+        """Analytic gradient of energy_batch; dimensions past the third are free."""
+        X = np.asarray(X, dtype=np.float64)
+        b_field = X[:, 0]
+        temp = X[:, 1]
+        risk = X[:, 2]
+        thermal = np.exp((temp - 300.0) / 50.0)
+        pred_risk = self._pred_risk(temp)
+        saturated = np.abs((temp - 350.0) / 10.0) > 500.0
+        d_pred = np.where(saturated, 0.0, pred_risk * (1.0 - pred_risk) / 10.0)
+
+        grad_v = np.zeros_like(X)
+        grad_v[:, 0] = 0.2 * b_field * thermal + 20.0 * (b_field - 1.2)
+        grad_v[:, 1] = 0.1 * b_field**2 * thermal / 50.0 - 20.0 * (risk - pred_risk) * d_pred
+        grad_v[:, 2] = 20.0 * (risk - pred_risk)
+        return grad_v
+
+    def energy(self, state):
+        x = np.asarray(state["state_vector"], dtype=np.float64)
+        return float(self.energy_batch(x[None, :])[0])
 
     def grad(self, state):
-        x = state["state_vector"]
-        epsilon = 1e-4
-        grad_v = np.zeros_like(x)
-        base_energy = self.energy(state)
-        for i in range(len(x)):
-            x_perturb = x.copy()
-            x_perturb[i] += epsilon
-            e_perturb = self.energy({"state_vector": x_perturb})
-            grad_v[i] = (e_perturb - base_energy) / epsilon
-        return {"state_vector": grad_v}
+        x = np.asarray(state["state_vector"], dtype=np.float64)
+        return {"state_vector": self.grad_batch(x[None, :])[0]}
 
 PRIOR = MagnetPriorV1()
@@ -10,4 +10,8 @@ def get(name: str):
     if name not in _registry:
         raise ValueError(f"Energy Prior '{name}' not found in registry.")
     module = importlib.import_module(_registry[name])
-    return module.PRIOR
+    # ebm_lib priors export PRIOR; thermo_sdk-based priors export `prior`
+    return getattr(module, "PRIOR", None) or module.prior
+
+def names():
+    return sorted(_registry)
@@ -3,8 +3,10 @@ import numpy as np
 # import jax
 # import jax.numpy as jnp
 
-def langevin_step_numpy(x, grad, lr, noise_scale):
-    return x - lr * grad + noise_scale * np.random.randn(*x.shape)
+from ebm_lib.base import energy_batch, grad_batch
+
+def langevin_step_numpy(x, grad, lr, noise_scale, rng=np.random):
+    return x - lr * grad + noise_scale * rng.standard_normal(x.shape)
 
 # def langevin_step_torch(x, grad, lr, noise_scale):
 #     return x - lr * grad + noise_scale * torch.randn_like(x)
@@ -13,39 +15,66 @@ def langevin_step_numpy(x, grad, lr, noise_scale):
 # def langevin_step_jax(x, grad, lr, noise_scale, key):
 #     return x - lr * grad + noise_scale * jax.random.normal(key, x.shape)
 
-def langevin_sample(prior, state, cfg):
+def langevin_sample_batch(prior, states, cfg):
+    """
+    Advances N chains together as a (N, D) array.
+
+    cfg:
+        lr, steps, noise: Langevin step size, step count and noise scale
+        trace_every: record energies every k steps (and always the last);
+                     0 records only the final energies
+        record_states: also keep a copy of the states at recorded steps
+        seed: RNG seed for the noise
+    """
     lr = cfg.get("lr", 1e-2)
     steps = cfg.get("steps", 100)
     noise = cfg.get("noise", 0.01)
+    trace_every = cfg.get("trace_every", 10)
+    record_states = cfg.get("record_states", False)
+    rng = np.random.default_rng(cfg.get("seed"))
 
-    backend = cfg.get("backend", "numpy")
-
-    x = state["state_vector"]
-    history = []
+    x = np.array(states, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[None, :]
 
+    trace_steps = []
+    energy_trace = []
+    samples = []
+    energy = None
     for s in range(steps):
-        grad = prior.grad({"state_vector": x})["state_vector"]
-        if backend == "numpy":
-            x = langevin_step_numpy(x, grad, lr, noise)
-        # elif backend == "torch":
-        #     x = torch.tensor(x)
-        #     grad = torch.tensor(grad)
-        #     x = langevin_step_torch(x, grad, lr, noise).detach().numpy()
-        # elif backend == "jax":
-        #     key = jax.random.PRNGKey(s)
-        #     x = np.array(langevin_step_jax(jnp.array(x), jnp.array(grad), lr, noise, key))
-        else:
-             # Fallback to numpy if backend not supported/installed
-             x = langevin_step_numpy(x, grad, lr, noise)
-
-        history.append({
-            "step": s,
-            "energy": prior.energy({"state_vector": x}),
-            "state": x.copy()
-        })
+        x = langevin_step_numpy(x, grad_batch(prior, x), lr, noise, rng)
+        energy = None
+        if trace_every and ((s + 1) % trace_every == 0 or s == steps - 1):
+            energy = energy_batch(prior, x)
+            trace_steps.append(s)
+            energy_trace.append(energy)
+            if record_states:
+                samples.append({"step": s, "energy": energy, "state": x.copy()})
 
+    if energy is None:
+        energy = energy_batch(prior, x)
     return {
-        "samples": history,
+        "samples": samples,
         "final_state": x,
-        "energy_trace": [h["energy"] for h in history]
+        "final_energy": energy,
+        "trace_steps": trace_steps,
+        "energy_trace": np.array(energy_trace).reshape(len(trace_steps), len(x)),
+    }
+
+def langevin_sample(prior, state, cfg):
+    """
+    Single-chain sampler: a batch of one that records every step by default.
+    The backend option is accepted for compatibility; sampling runs on numpy.
+    """
+    cfg = {"trace_every": 1, "record_states": True, **cfg}
+    result = langevin_sample_batch(prior, np.asarray(state["state_vector"], dtype=np.float64)[None, :], cfg)
+
+    history = [
+        {"step": sample["step"], "energy": float(sample["energy"][0]), "state": sample["state"][0]}
+        for sample in result["samples"]
+    ]
+    return {
+        "samples": history,
+        "final_state": result["final_state"][0],
+        "energy_trace": [float(e) for e in result["energy_trace"][:, 0]],
     }
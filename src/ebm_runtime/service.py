@@ -1,11 +1,21 @@
+import numpy as np
+
+import ebm_lib.priors  # registers the prior modules
 from ebm_lib.registry import get as load_prior
-from ebm_runtime.samplers.langevin import langevin_sample
+from ebm_runtime.samplers.langevin import langevin_sample, langevin_sample_batch
 # from ebm_runtime.samplers.diffusion_guided import diffusion_guided_sample # To be implemented
 
 def sample(prior_name, initial_state, sampler):
     prior = load_prior(prior_name)
 
     if sampler["type"] == "langevin":
+        # A (N, D) state_vector or num_chains > 1 selects the batched sampler
+        states = np.asarray(initial_state["state_vector"], dtype=np.float64)
+        num_chains = sampler.get("num_chains", 1)
+        if states.ndim == 2 or num_chains > 1:
+            if states.ndim == 1:
+                states = np.tile(states, (num_chains, 1))
+            return langevin_sample_batch(prior, states, sampler)
         return langevin_sample(prior, initial_state, sampler)
 
     # if sampler["type"] == "diffusion_guided":
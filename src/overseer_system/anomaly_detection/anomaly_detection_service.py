@@ -7,13 +7,19 @@ identifying deviations from normal patterns and triggering appropriate responses
 
 import os
 import json
+import uuid
 import logging
 import asyncio
 import datetime
-from typing import Dict, Any, List, Optional, Union
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, Deque, List, Optional, Union
+import numpy as np
 from fastapi import FastAPI, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, Field
 
+from src.anomaly_detection.metric_window import StreamingDetector
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Overseer Anomaly Detection Service",
@@ -43,6 +49,14 @@ class DataPoint(BaseModel):
     value: float
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+class DataPointBatch(BaseModel):
+    """Batch of data points of one metric, in columns."""
+    source: str
+    metric: str
+    timestamps: List[datetime.datetime]
+    values: List[float]
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
 class AnomalyResult(BaseModel):
     """Result of anomaly detection."""
     timestamp: datetime.datetime
@@ -82,7 +96,8 @@ algorithms = {
         "parameters": {
             "n_estimators": 100,
             "contamination": 0.1,
-            "max_samples": "auto"
+            "max_samples": "auto",
+            "refit_interval": 100
         }
     },
     "lstm_autoencoder": {
@@ -107,15 +122,21 @@ algorithms = {
         "parameters": {
             "eps": 0.5,
             "min_samples": 5,
-            "metric": "euclidean"
+            "metric": "euclidean",
+            "refit_interval": 100
         }
     }
 }
 
-data_points = {}  # source -> metric -> list of data points
-anomalies = {}    # source -> metric -> list of anomalies
-alerts = []       # list of alerts
-configs = {}      # source -> metric -> config
+# Retention of results per source:metric and of alerts
+MAX_RESULTS_PER_METRIC = int(os.environ.get("ANOMALY_MAX_RESULTS_PER_METRIC", "1000"))
+MAX_ALERTS = int(os.environ.get("ANOMALY_MAX_ALERTS", "10000"))
+
+detectors: Dict[str, StreamingDetector] = {}           # source:metric -> window and algorithm state
+detector_locks: Dict[str, asyncio.Lock] = {}           # source:metric -> serializes updates of its detector
+anomalies: Dict[str, Deque[AnomalyResult]] = {}        # source:metric -> most recent results
+alerts: Deque["AnomalyAlert"] = deque(maxlen=MAX_ALERTS)
+configs = {}      # source:metric -> config
 
 # Routes
 @app.get("/health")
@@ -157,42 +178,127 @@ async def get_config(source: str, metric: str):
 @app.post("/data")
 async def ingest_data(data_point: DataPoint):
     """Ingest data for anomaly detection."""
-    # Store data point
     key = f"{data_point.source}:{data_point.metric}"
-    if key not in data_points:
-        data_points[key] = []
+    config = configs.get(key, AnomalyDetectionConfig(algorithm="z_score"))
+    
+    # Check for anomalies once we have enough data points
+    result = await detect_anomaly(data_point, config)
+    if result is None:
+        return {
+            "status": "success", 
+            "message": f"Data point ingested, waiting for more data ({detectors[key].window.count}/{config.min_samples})"
+        }
         
-    data_points[key].append(data_point)
+    record_result(key, result)
+    return result
+
+@app.post("/data/batch")
+async def ingest_data_batch(batch: DataPointBatch):
+    """
+    Ingest a batch of data points of one metric for anomaly detection.
     
-    # Limit data points to window size
+    The points are scored in one vectorized pass, each against the window as
+    it was when the point was added. As with /data, the result of every
+    scored point is recorded; only the anomalous results are returned, with
+    the scores of all points in order (None for points that arrived before
+    min_samples points were collected).
+    """
+    if len(batch.timestamps) != len(batch.values):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Got {len(batch.timestamps)} timestamps for {len(batch.values)} values"
+        )
+        
+    key = f"{batch.source}:{batch.metric}"
     config = configs.get(key, AnomalyDetectionConfig(algorithm="z_score"))
-    if len(data_points[key]) > config.window_size:
-        data_points[key] = data_points[key][-config.window_size:]
+    scores = await score_points(key, config, batch.values)
+    
+    results = []
+    scored = ~np.isnan(scores)
+    for i in np.flatnonzero(scored):
+        result = build_result(batch.timestamps[i], batch.source, batch.metric, batch.values[i],
+                              float(scores[i]), config, batch.metadata)
+        record_result(key, result)
+        if result.is_anomaly:
+            results.append(result)
         
-    # Check for anomalies if we have enough data points
-    if len(data_points[key]) >= config.min_samples:
-        result = await detect_anomaly(data_point, config)
+
+    return {
+        "status": "success",
+        "ingested": len(batch.values),
+        "scored": int(scored.sum()),
+        "scores": np.where(scored, scores, None).tolist(),
+        "anomalies": results
+    }
+
+def get_detector(key: str, config: AnomalyDetectionConfig) -> StreamingDetector:
+    """
+    Get the detector of a source:metric for its current configuration.
+    
+    A detector whose configuration changed is replaced, carrying over the
+    most recent points of its window.
+    """
+    detector = detectors.get(key)
+    if (detector is not None and detector.algorithm == config.algorithm
+            and detector.window.capacity == config.window_size
+            and detector.min_samples == config.min_samples
+            and detector.parameters == config.parameters):
+        return detector
         
-        # Store anomaly result
-        if key not in anomalies:
-            anomalies[key] = []
-            
-        anomalies[key].append(result)
+    new_detector = StreamingDetector(config.algorithm, config.window_size, config.min_samples, config.parameters)
+    if detector is not None:
+        new_detector.window.extend(detector.window.values())
+    detectors[key] = new_detector
+    return new_detector
+
+async def score_points(key: str, config: AnomalyDetectionConfig, values: List[float]) -> np.ndarray:
+    """
+    Add points to the detector of a source:metric and score them.
+    
+    Detectors with a model refit it every refit_interval points, which takes
+    far longer than scoring, so their updates run in the default executor
+    instead of on the event loop. Updates of one source:metric are
+    serialized so its points enter the window in order.
+    """
+    lock = detector_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        detector = get_detector(key, config)
+        if not detector.uses_model:
+            return detector.update(values)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, detector.update, values)
+
+def build_result(timestamp: datetime.datetime, source: str, metric: str, value: float, score: float,
+                 config: AnomalyDetectionConfig, metadata: Dict[str, Any]) -> AnomalyResult:
+    """Build the result of a scored data point."""
+    return AnomalyResult(
+        timestamp=timestamp,
+        source=source,
+        metric=metric,
+        value=value,
+        is_anomaly=score > config.threshold,
+        score=score,
+        threshold=config.threshold,
+        algorithm=config.algorithm,
+        metadata=metadata
+    )
+
+def record_result(key: str, result: AnomalyResult):
+    """Keep a result (bounded per source:metric) and raise an alert if it is anomalous."""
+    if key not in anomalies:
+        anomalies[key] = deque(maxlen=MAX_RESULTS_PER_METRIC)
+    anomalies[key].append(result)
+    
+    if result.is_anomaly:
+        alert = generate_alert(result)
+        alerts.append(alert)
         
-        # Generate alert if anomaly detected
-        if result.is_anomaly:
-            alert = generate_alert(result)
-            alerts.append(alert)
-            
-            # In a real implementation, we would send the alert to the event bus
-            # await event_bus.send("anomaly.alerts", alert.dict())
-            
-        return result
-    else:
-        return {
-            "status": "success", 
-            "message": f"Data point ingested, waiting for more data ({len(data_points[key])}/{config.min_samples})"
-        }
+        # In a real implementation, we would send the alert to the event bus
+        # await event_bus.send("anomaly.alerts", alert.dict())
+
+def _tail(results: Deque[AnomalyResult], limit: int) -> List[AnomalyResult]:
+    """The last `limit` entries of a deque."""
+    return list(islice(results, max(0, len(results) - limit), None))
 
 @app.get("/anomalies")
 async def get_anomalies(source: Optional[str] = None, metric: Optional[str] = None, limit: int = 100):
@@ -202,14 +308,14 @@ async def get_anomalies(source: Optional[str] = None, metric: Optional[str] = No
     if source and metric:
         key = f"{source}:{metric}"
         if key in anomalies:
-            results = anomalies[key][-limit:]
+            results = _tail(anomalies[key], limit)
     elif source:
         for key, values in anomalies.items():
             if key.startswith(f"{source}:"):
-                results.extend(values[-limit:])
+                results.extend(_tail(values, limit))
     else:
         for values in anomalies.values():
-            results.extend(values[-limit:])
+            results.extend(_tail(values, limit))
             
     # Sort by timestamp (newest first)
     results.sort(key=lambda x: x.timestamp, reverse=True)
@@ -222,7 +328,7 @@ async def get_alerts(source: Optional[str] = None, limit: int = 100):
     if source:
         filtered_alerts = [alert for alert in alerts if alert.source == source]
     else:
-        filtered_alerts = alerts
+        filtered_alerts = list(alerts)
         
     # Sort by timestamp (newest first)
     filtered_alerts.sort(key=lambda x: x.timestamp, reverse=True)
@@ -230,138 +336,30 @@ async def get_alerts(source: Optional[str] = None, limit: int = 100):
     return {"alerts": filtered_alerts[:limit]}
 
 # Anomaly detection algorithms
-async def detect_anomaly(data_point: DataPoint, config: AnomalyDetectionConfig) -> AnomalyResult:
+async def detect_anomaly(data_point: DataPoint, config: AnomalyDetectionConfig) -> Optional[AnomalyResult]:
     """
     Detect anomalies in the data.
     
+    The point is added to the window of its source:metric and scored by the
+    window's StreamingDetector: z_score in O(1) from running statistics,
+    isolation_forest and dbscan against their periodically refitted models.
+    lstm_autoencoder and prophet are still scored as z-scores.
+    
     Args:
         data_point: Current data point
         config: Anomaly detection configuration
         
     Returns:
-        Anomaly detection result
+        Anomaly detection result, or None while fewer than min_samples
+        points were collected
     """
     key = f"{data_point.source}:{data_point.metric}"
-    points = data_points[key]
-    
-    # Extract values
-    values = [p.value for p in points]
-    
-    # Detect anomaly based on algorithm
-    if config.algorithm == "z_score":
-        score = z_score_anomaly(values, data_point.value)
-    elif config.algorithm == "isolation_forest":
-        score = isolation_forest_anomaly(values, data_point.value)
-    elif config.algorithm == "lstm_autoencoder":
-        score = lstm_autoencoder_anomaly(values, data_point.value)
-    elif config.algorithm == "prophet":
-        score = prophet_anomaly(values, data_point.value)
-    elif config.algorithm == "dbscan":
-        score = dbscan_anomaly(values, data_point.value)
-    else:
-        # Default to z-score
-        score = z_score_anomaly(values, data_point.value)
-        
-    # Determine if anomaly
-    is_anomaly = score > config.threshold
-    
-    return AnomalyResult(
-        timestamp=data_point.timestamp,
-        source=data_point.source,
-        metric=data_point.metric,
-        value=data_point.value,
-        is_anomaly=is_anomaly,
-        score=score,
-        threshold=config.threshold,
-        algorithm=config.algorithm,
-        metadata=data_point.metadata
-    )
-
-def z_score_anomaly(values: List[float], current_value: float) -> float:
-    """
-    Z-Score based anomaly detection.
-    
-    Args:
-        values: Historical values
-        current_value: Current value
-        
-    Returns:
-        Anomaly score
-    """
-    import numpy as np
-    
-    # Calculate mean and standard deviation
-    mean = np.mean(values)
-    std = np.std(values)
-    
-    # Avoid division by zero
-    if std == 0:
-        return 0
-        
-    # Calculate z-score
-    z_score = abs((current_value - mean) / std)
-    
-    return z_score
-
-def isolation_forest_anomaly(values: List[float], current_value: float) -> float:
-    """
-    Isolation Forest based anomaly detection.
-    
-    Args:
-        values: Historical values
-        current_value: Current value
-        
-    Returns:
-        Anomaly score
-    """
-    # In a real implementation, we would use scikit-learn's IsolationForest
-    # For simplicity, we'll use z-score as a placeholder
-    return z_score_anomaly(values, current_value)
-
-def lstm_autoencoder_anomaly(values: List[float], current_value: float) -> float:
-    """
-    LSTM Autoencoder based anomaly detection.
-    
-    Args:
-        values: Historical values
-        current_value: Current value
-        
-    Returns:
-        Anomaly score
-    """
-    # In a real implementation, we would use TensorFlow/Keras LSTM Autoencoder
-    # For simplicity, we'll use z-score as a placeholder
-    return z_score_anomaly(values, current_value)
-
-def prophet_anomaly(values: List[float], current_value: float) -> float:
-    """
-    Facebook Prophet based anomaly detection.
-    
-    Args:
-        values: Historical values
-        current_value: Current value
-        
-    Returns:
-        Anomaly score
-    """
-    # In a real implementation, we would use Facebook Prophet
-    # For simplicity, we'll use z-score as a placeholder
-    return z_score_anomaly(values, current_value)
-
-def dbscan_anomaly(values: List[float], current_value: float) -> float:
-    """
-    DBSCAN based anomaly detection.
-    
-    Args:
-        values: Historical values
-        current_value: Current value
+    score = float((await score_points(key, config, [data_point.value]))[0])
+    if np.isnan(score):
+        return None
         
-    Returns:
-        Anomaly score
-    """
-    # In a real implementation, we would use scikit-learn's DBSCAN
-    # For simplicity, we'll use z-score as a placeholder
-    return z_score_anomaly(values, current_value)
+    return build_result(data_point.timestamp, data_point.source, data_point.metric, data_point.value,
+                        score, config, data_point.metadata)
 
 def generate_alert(result: AnomalyResult) -> AnomalyAlert:
     """
@@ -0,0 +1,274 @@
+"""
+Streaming metric windows for the Overseer Anomaly Detection Service.
+
+A MetricWindow keeps the last window_size values of one source:metric in a
+numpy ring buffer with running (Welford) mean and variance, so a point is
+added and scored in O(1). A batch of points is scored in one vectorized pass
+with the same result as adding them one at a time.
+
+A StreamingDetector pairs a window with an algorithm. Model-based algorithms
+(isolation_forest, dbscan) are refitted on the window every refit_interval
+points instead of per point, and score new points against the last fit.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from sklearn.cluster import DBSCAN
+    from sklearn.ensemble import IsolationForest
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+logger = logging.getLogger("anomaly_detection_service")
+
+MODEL_ALGORITHMS = ("isolation_forest", "dbscan")
+
+
+class MetricWindow:
+    """Ring buffer of the most recent values of a metric with running mean and variance."""
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the window.
+
+        Args:
+            capacity: Number of most recent values kept
+        """
+        self.capacity = max(1, int(capacity))
+        self._buffer = np.zeros(self.capacity, dtype=np.float64)
+        self._start = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._replacements = 0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the window (np.std)."""
+        if self.count == 0:
+            return 0.0
+        return _clamped_std(self._m2 / self.count, self.mean)
+
+    def values(self) -> np.ndarray:
+        """Values of the window, oldest first (a copy)."""
+        end = self._start + self.count
+        if end <= self.capacity:
+            return self._buffer[self._start:end].copy()
+        return np.concatenate((self._buffer[self._start:], self._buffer[:end - self.capacity]))
+
+    def push(self, value: float) -> float:
+        """
+        Add a value, evicting the oldest once the window is full.
+
+        Returns:
+            Z-score of the value against the window including it (0 if the
+            window has no spread)
+        """
+        value = float(value)
+        if self.count < self.capacity:
+            self._buffer[(self._start + self.count) % self.capacity] = value
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        else:
+            old = self._buffer[self._start]
+            self._buffer[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+            old_mean = self.mean
+            self.mean += (value - old) / self.count
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+            self._replacements += 1
+            # Sliding updates accumulate rounding error; recompute once per window turnover
+            if self._replacements >= self.capacity:
+                self._recompute()
+
+        std = self.std
+        return abs(value - self.mean) / std if std > 0 else 0.0
+
+    def extend(self, values: Iterable[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Add a batch of values, evicting the oldest ones as needed.
+
+        Returns:
+            Per value: mean and standard deviation of the window as it was
+            right after adding that value, and the window's size then
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = len(values)
+        if n == 0:
+            empty = np.zeros(0)
+            return empty, empty, np.zeros(0, dtype=np.int64)
+        if n == 1:
+            self.push(values[0])
+            return np.array([self.mean]), np.array([self.std]), np.array([self.count])
+
+        history = self.values()
+        c = len(history)
+        series = np.concatenate((history, values))
+
+        # Window of the j-th new value: series[max(0, c + j + 1 - capacity) : c + j + 1]
+        ends = np.arange(c + 1, c + n + 1)
+        starts = np.maximum(ends - self.capacity, 0)
+        counts = ends - starts
+
+        # Prefix sums of values shifted by their mean to limit cancellation
+        shift = series.mean()
+        shifted = series - shift
+        s1 = np.concatenate(([0.0], np.cumsum(shifted)))
+        s2 = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+        window_sum = s1[ends] - s1[starts]
+        window_sumsq = s2[ends] - s2[starts]
+        means = window_sum / counts
+        variances = window_sumsq / counts - means * means
+        means += shift
+        stds = _clamped_std(variances, means)
+
+        # Keep the last `capacity` values and their exact statistics
+        tail = series[-self.capacity:]
+        self.count = len(tail)
+        self._buffer[:self.count] = tail
+        self._start = 0
+        self._recompute()
+        return means, stds, counts
+
+    def _recompute(self):
+        values = self.values()
+        self.mean = float(values.mean()) if len(values) else 0.0
+        self._m2 = float(((values - self.mean) ** 2).sum())
+        self._replacements = 0
+
+
+def _clamped_std(variance, mean):
+    """Square root of a variance, with rounding noise around zero spread mapped to 0."""
+    floor = 1e-12 * np.maximum(1.0, np.square(mean))
+    variance = np.where(variance > floor, variance, 0.0)
+    std = np.sqrt(variance)
+    return float(std) if np.ndim(std) == 0 else std
+
+
+class StreamingDetector:
+    """
+    Scores the points of one source:metric as they stream in.
+
+    z_score (and the algorithms still without a model of their own) score a
+    point against the window that includes it. isolation_forest and dbscan
+    fit on the window once min_samples points arrived and every
+    refit_interval points after that, and score new points against the
+    latest fit. Without scikit-learn they fall back to z-scores.
+    """
+
+    def __init__(self, algorithm: str, window_size: int, min_samples: int,
+                 parameters: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the detector.
+
+        Args:
+            algorithm: Anomaly detection algorithm
+            window_size: Number of most recent points kept in the window
+            min_samples: Number of points needed before points are scored
+            parameters: Algorithm parameters; refit_interval (default
+                window_size) applies to the model-based algorithms
+        """
+        self.algorithm = algorithm
+        self.window = MetricWindow(window_size)
+        self.min_samples = max(1, int(min_samples))
+        self.parameters = dict(parameters or {})
+        self.refit_interval = max(1, int(self.parameters.get("refit_interval", window_size)))
+        self.uses_model = algorithm in MODEL_ALGORITHMS and SKLEARN_AVAILABLE
+        if algorithm in MODEL_ALGORITHMS and not SKLEARN_AVAILABLE:
+            logger.warning(f"scikit-learn not available, {algorithm} falls back to z-score")
+
+        self._model: Any = None
+        self._since_fit = 0
+        self.fits = 0
+
+    def update(self, values: Iterable[float]) -> np.ndarray:
+        """
+        Add points to the window and score them.
+
+        Returns:
+            Anomaly score per point; NaN for points that arrived while the
+            window held fewer than min_samples points
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not self.uses_model:
+            means, stds, counts = self.window.extend(values)
+            return self._z_scores(values, means, stds, counts)
+
+        scores = np.empty(len(values))
+        i = 0
+        while i < len(values):
+            if self.window.count < self.min_samples:
+                take = self.min_samples - self.window.count
+            else:
+                take = max(1, self.refit_interval - self._since_fit)
+            segment = values[i:i + take]
+            means, stds, counts = self.window.extend(segment)
+            self._since_fit += len(segment)
+            if self.window.count >= self.min_samples and (self.fits == 0 or self._since_fit >= self.refit_interval):
+                self._fit()
+            if self._model is None:
+                scores[i:i + take] = self._z_scores(segment, means, stds, counts)
+            else:
+                segment_scores = self._model_scores(segment)
+                segment_scores[counts < self.min_samples] = np.nan
+                scores[i:i + take] = segment_scores
+            i += take
+        return scores
+
+    def _z_scores(self, values, means, stds, counts) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(stds > 0, np.abs(values - means) / stds, 0.0)
+        scores[counts < self.min_samples] = np.nan
+        return scores
+
+    def _fit(self):
+        values = self.window.values()
+        self._since_fit = 0
+        self.fits += 1
+        if self.algorithm == "isolation_forest":
+            max_samples = self.parameters.get("max_samples", "auto")
+            model = IsolationForest(
+                n_estimators=int(self.parameters.get("n_estimators", 100)),
+                contamination=self.parameters.get("contamination", 0.1),
+                max_samples=max_samples if max_samples == "auto" else min(max_samples, len(values)),
+                random_state=self.parameters.get("random_state", 0)
+            ).fit(values.reshape(-1, 1))
+            # Scores are standardized against the fitted window's own scores
+            train_scores = -model.score_samples(values.reshape(-1, 1))
+            self._model = (model, float(train_scores.mean()), float(train_scores.std()))
+        else:
+            std = self.window.std
+            if std == 0:
+                self._model = None
+                return
+            scaled = (values - self.window.mean) / std
+            eps = float(self.parameters.get("eps", 0.5))
+            labels = DBSCAN(
+                eps=eps,
+                min_samples=int(self.parameters.get("min_samples", 5)),
+                metric=self.parameters.get("metric", "euclidean")
+            ).fit(scaled.reshape(-1, 1))
+            cores = np.sort(values[labels.core_sample_indices_])
+            self._model = (cores, self.window.mean, std, eps) if len(cores) else None
+
+    def _model_scores(self, values) -> np.ndarray:
+        if self.algorithm == "isolation_forest":
+            model, train_mean, train_std = self._model
+            raw = -model.score_samples(values.reshape(-1, 1))
+            if train_std == 0:
+                return np.where(raw > train_mean, np.inf, 0.0)
+            return (raw - train_mean) / train_std
+
+        # dbscan: distance to the nearest core sample, in standard deviations per eps
+        cores, _, std, eps = self._model
+        idx = np.clip(np.searchsorted(cores, values), 1, len(cores) - 1) if len(cores) > 1 else np.zeros(len(values), dtype=np.int64)
+        nearest = np.abs(values - cores[idx])
+        if len(cores) > 1:
+            nearest = np.minimum(nearest, np.abs(values - cores[idx - 1]))
+        return nearest / std / eps
@@ -18,6 +18,7 @@ from .market_models import (
     AgentProfile, ResourceSpecification, PriceSpecification, AuctionConfig,
     Transaction, create_transaction_from_match
 )
+from .order_book import BUY, SELL, OrderBook, RestingOrder
 
 # Setup logging
 logging.basicConfig(
@@ -38,6 +39,7 @@ class AuctionMechanism:
         """
         self.config = config
         self.bids: List[Bid] = []
+        self.bids_by_id: Dict[str, Bid] = {}
         self.matches: List[BidMatch] = []
         self.transactions: List[Transaction] = []
         self.active = False
@@ -109,8 +111,14 @@ class AuctionMechanism:
         if self.config.max_price and bid.price.amount > self.config.max_price.amount:
             return False, f"Bid price {bid.price.amount} exceeds maximum {self.config.max_price.amount}"
         
+        # Mechanism-specific checks
+        error = self._validate_bid(bid)
+        if error:
+            return False, error
+        
         # Add the bid
         self.bids.append(bid)
+        self.bids_by_id[bid.bid_id] = bid
         logger.info("Added bid %s to auction %s", bid.bid_id, self.config.auction_id)
         
         # Process the bid (to be implemented by subclasses)
@@ -118,6 +126,18 @@ class AuctionMechanism:
         
         return True, None
     
+    def _validate_bid(self, bid: Bid) -> Optional[str]:
+        """
+        Check a bid against mechanism-specific rules before it is stored.
+        
+        Args:
+            bid: The bid to check
+            
+        Returns:
+            Optional[str]: Error message if the bid is not accepted, None otherwise
+        """
+        return None
+    
     def _process_bid(self, bid: Bid) -> None:
         """
         Process a new bid (to be implemented by subclasses).
@@ -127,7 +147,8 @@ class AuctionMechanism:
         """
         raise NotImplementedError("Subclasses must implement _process_bid")
     
-    def _create_match(self, buyer_bid: Bid, seller_bid: Bid, match_price: PriceSpecification) -> BidMatch:
+    def _create_match(self, buyer_bid: Bid, seller_bid: Bid, match_price: PriceSpecification,
+                      resources: Optional[List[ResourceSpecification]] = None) -> BidMatch:
         """
         Create a match between buyer and seller bids.
         
@@ -135,14 +156,16 @@ class AuctionMechanism:
             buyer_bid: The buyer's bid
             seller_bid: The seller's bid
             match_price: The agreed price
+            resources: The agreed resources (the seller's bid resources if None)
             
         Returns:
             BidMatch: The created match
         """
         match_id = f"match-{uuid.uuid4()}"
         
-        # Use the resources from the seller's bid
-        resources = seller_bid.resources
+        # Use the resources from the seller's bid unless agreed otherwise
+        if resources is None:
+            resources = seller_bid.resources
         
         # Create the match
         match = BidMatch(
@@ -184,8 +207,8 @@ class AuctionMechanism:
             Optional[Transaction]: The created transaction, or None if execution failed
         """
         # Find the buyer and seller bids
-        buyer_bid = next((b for b in self.bids if b.bid_id == match.buyer_bid_id), None)
-        seller_bid = next((b for b in self.bids if b.bid_id == match.seller_bid_id), None)
+        buyer_bid = self.bids_by_id.get(match.buyer_bid_id)
+        seller_bid = self.bids_by_id.get(match.seller_bid_id)
         
         if not buyer_bid or not seller_bid:
             logger.error("Could not find buyer or seller bid for match %s", match.match_id)
@@ -614,7 +637,14 @@ class VickreyAuction(AuctionMechanism):
         return True
 
 class ContinuousDoubleAuction(AuctionMechanism):
-    """Continuous double auction mechanism."""
+    """
+    Continuous double auction mechanism.
+    
+    Orders rest in a price-time-priority order book per resource type and
+    currency. A bid with several resources places one order per resource,
+    each filled on its own; the bid stays active until all of them are
+    filled, and every fill is matched and executed for the filled quantity.
+    """
     
     def __init__(self, config: AuctionConfig):
         """
@@ -626,14 +656,24 @@ class ContinuousDoubleAuction(AuctionMechanism):
         super().__init__(config)
         self.buyer_bids: List[Bid] = []
         self.seller_bids: List[Bid] = []
-        self.order_book: Dict[ResourceType, Dict[str, List[Bid]]] = {}
+        # Order books by resource type, then by currency
+        self.order_book: Dict[ResourceType, Dict[str, OrderBook]] = {
+            resource_type: {} for resource_type in config.resource_types
+        }
+    
+    def _validate_bid(self, bid: Bid) -> Optional[str]:
+        """
+        Only buyers and sellers trade in a continuous double auction.
         
-        # Initialize order book for each resource type
-        for resource_type in config.resource_types:
-            self.order_book[resource_type] = {
-                "buy": [],  # Buy orders (bids)
-                "sell": []  # Sell orders (asks)
-            }
+        Args:
+            bid: The bid to check
+            
+        Returns:
+            Optional[str]: Error message if the bid is not accepted, None otherwise
+        """
+        if bid.role not in (MarketRole.BUYER, MarketRole.SELLER):
+            return f"Role {bid.role.value} cannot trade in a continuous double auction"
+        return None
     
     def _process_bid(self, bid: Bid) -> None:
         """
@@ -647,96 +687,154 @@ class ContinuousDoubleAuction(AuctionMechanism):
         # Add to appropriate list
         if bid.role == MarketRole.BUYER:
             self.buyer_bids.append(bid)
-        elif bid.role == MarketRole.SELLER:
+        else:
             self.seller_bids.append(bid)
         
-        # Add to order book for each resource type
-        for resource in bid.resources:
-            resource_type = resource.resource_type
-            if resource_type in self.order_book:
-                order_type = "buy" if bid.role == MarketRole.BUYER else "sell"
-                self.order_book[resource_type][order_type].append(bid)
+        if bid.expires_at and bid.expires_at <= datetime.now():
+            bid.status = BidStatus.EXPIRED
+            return
         
         # Set bid status to active
         bid.status = BidStatus.ACTIVE
         
-        # Try to match orders
-        self._match_orders()
-    
-    def _match_orders(self) -> None:
-        """Match buy and sell orders in the order book."""
-        for resource_type, orders in self.order_book.items():
-            # Sort buy orders by price (descending)
-            buy_orders = sorted(
-                [b for b in orders["buy"] if b.status == BidStatus.ACTIVE],
-                key=lambda b: b.price.amount,
-                reverse=True
+        # Match against the order book and rest the remainder
+        self._match_orders(bid)
+    
+    def _match_orders(self, bid: Bid) -> None:
+        """
+        Match a new bid against the order books of its resources.
+        
+        Args:
+            bid: The new bid to match
+        """
+        side = BUY if bid.role == MarketRole.BUYER else SELL
+        expires_at = bid.expires_at.timestamp() if bid.expires_at else None
+        now = datetime.now().timestamp()
+        
+        fills = []
+        for resource in bid.resources:
+            book = self._get_order_book(resource.resource_type, bid.price.currency)
+            if book is None:
+                continue
+            if bid.bid_id in book:
+                logger.warning("Bid %s already in the %s order book", bid.bid_id, resource.resource_type)
+                continue
+            resource_fills, _ = book.submit(
+                bid.bid_id, side, bid.price.amount, resource.quantity,
+                expires_at=expires_at, payload=bid, now=now
             )
+            fills.extend((resource, fill) for fill in resource_fills)
+        
+        touched = {bid.bid_id: bid}
+        for resource, fill in fills:
+            resting_bid = fill.resting.payload
+            touched[resting_bid.bid_id] = resting_bid
+            if side == BUY:
+                buy_order, sell_order = bid, resting_bid
+            else:
+                buy_order, sell_order = resting_bid, bid
             
-            # Sort sell orders by price (ascending)
-            sell_orders = sorted(
-                [b for b in orders["sell"] if b.status == BidStatus.ACTIVE],
-                key=lambda b: b.price.amount
+            # Determine match price (midpoint)
+            match_price = PriceSpecification(
+                currency=buy_order.price.currency,
+                amount=(buy_order.price.amount + sell_order.price.amount) / 2,
+                unit=buy_order.price.unit
+            )
+            seller_resource = next(
+                (r for r in sell_order.resources if r.resource_type == resource.resource_type), resource
             )
             
-            # Match orders
-            for buy_order in buy_orders:
-                if buy_order.status != BidStatus.ACTIVE:
-                    continue
-                
-                for sell_order in sell_orders:
-                    if sell_order.status != BidStatus.ACTIVE:
-                        continue
-                    
-                    # Check if orders can be matched
-                    if self._can_match_orders(buy_order, sell_order, resource_type):
-                        # Determine match price (midpoint)
-                        match_price = PriceSpecification(
-                            currency=buy_order.price.currency,
-                            amount=(buy_order.price.amount + sell_order.price.amount) / 2,
-                            unit=buy_order.price.unit
-                        )
-                        
-                        # Create a match
-                        match = self._create_match(buy_order, sell_order, match_price)
-                        
-                        # Execute the match
-                        self.execute_match(match)
-                        
-                        # Break inner loop, move to next buy order
-                        break
-    
-    def _can_match_orders(self, buy_order: Bid, sell_order: Bid, resource_type: ResourceType) -> bool:
-        """
-        Check if buy and sell orders can be matched.
+            # Create a match for the filled quantity
+            match = self._create_match(
+                buy_order, sell_order, match_price,
+                resources=[seller_resource.copy(update={"quantity": fill.quantity})]
+            )
+            
+            # Execute the match
+            self.execute_match(match)
+            
+            for filled_bid in (bid, resting_bid):
+                filled = filled_bid.metadata.setdefault("filled_quantity", {})
+                filled[resource.resource_type.value] = filled.get(resource.resource_type.value, 0.0) + fill.quantity
+        
+        # Bids with orders left in the book stay active
+        for touched_bid in touched.values():
+            if self._is_resting(touched_bid):
+                touched_bid.status = BidStatus.ACTIVE
+            elif touched_bid.status == BidStatus.ACTIVE:
+                touched_bid.status = BidStatus.EXECUTED
+    
+    def cancel_bid(self, bid_id: str) -> bool:
+        """
+        Cancel a bid and remove its orders from the order books.
         
         Args:
-            buy_order: The buy order
-            sell_order: The sell order
-            resource_type: The resource type to match
+            bid_id: ID of the bid to cancel
             
         Returns:
-            bool: True if orders can be matched, False otherwise
+            bool: True if the bid had orders in the books, False otherwise
         """
-        # Check price
-        if buy_order.price.amount < sell_order.price.amount:
-            return False
-        
-        # Check currency
-        if buy_order.price.currency != sell_order.price.currency:
-            return False
-        
-        # Check resource quantities
-        buy_resource = next((r for r in buy_order.resources if r.resource_type == resource_type), None)
-        sell_resource = next((r for r in sell_order.resources if r.resource_type == resource_type), None)
-        
-        if not buy_resource or not sell_resource:
-            return False
-        
-        if sell_resource.quantity < buy_resource.quantity:
+        bid = self.bids_by_id.get(bid_id)
+        if not bid or not self._remove_orders(bid):
             return False
         
+        bid.status = BidStatus.CANCELLED
+        logger.info("Cancelled bid %s in auction %s", bid_id, self.config.auction_id)
         return True
+    
+    def get_best_prices(self, resource_type: ResourceType, currency: str) -> Dict[str, Optional[float]]:
+        """
+        Get the best buy and sell prices in an order book.
+        
+        Args:
+            resource_type: Resource type of the order book
+            currency: Currency of the order book
+            
+        Returns:
+            Dict[str, Optional[float]]: Best buy and sell prices (None if no orders)
+        """
+        book = self.order_book.get(resource_type, {}).get(currency)
+        best_bid = book.best_bid() if book else None
+        best_ask = book.best_ask() if book else None
+        return {
+            "buy": best_bid.price if best_bid else None,
+            "sell": best_ask.price if best_ask else None
+        }
+    
+    def _get_order_book(self, resource_type: ResourceType, currency: str) -> Optional[OrderBook]:
+        books = self.order_book.get(resource_type)
+        if books is None:
+            return None
+        book = books.get(currency)
+        if book is None:
+            book = books[currency] = OrderBook(
+                is_live=lambda bid: bid.status == BidStatus.ACTIVE,
+                on_discard=self._on_order_discarded
+            )
+        return book
+    
+    def _on_order_discarded(self, order: RestingOrder, reason: str) -> None:
+        bid = order.payload
+        if reason == "expired" and bid.status == BidStatus.ACTIVE:
+            bid.status = BidStatus.EXPIRED
+            logger.info("Bid %s expired in auction %s", bid.bid_id, self.config.auction_id)
+        # The bid's orders for other resources go with it
+        self._remove_orders(bid)
+    
+    def _remove_orders(self, bid: Bid) -> bool:
+        removed = False
+        for resource in bid.resources:
+            book = self.order_book.get(resource.resource_type, {}).get(bid.price.currency)
+            if book is not None and book.cancel(bid.bid_id) is not None:
+                removed = True
+        return removed
+    
+    def _is_resting(self, bid: Bid) -> bool:
+        for resource in bid.resources:
+            book = self.order_book.get(resource.resource_type, {}).get(bid.price.currency)
+            if book is not None and bid.bid_id in book:
+                return True
+        return False
 
 def create_auction_mechanism(config: AuctionConfig) -> AuctionMechanism:
     """
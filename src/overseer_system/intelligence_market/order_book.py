@@ -0,0 +1,247 @@
+"""
+Order Book Module for the Intelligence Market Phase of the Overseer System.
+
+This module provides the price-time-priority limit order book behind the
+continuous double auction. Each side keeps its orders in price levels, each
+a FIFO queue, with a heap of the level prices, so the best order is found
+without sorting the book. Orders are indexed by ID: a cancel only marks the
+order, and cancelled, expired or no longer live orders are dropped lazily
+when they reach the front of their level. Incoming orders match the best
+opposite orders while prices cross, partially filling them as needed, and
+rest with whatever quantity is left.
+
+Author: Manus AI
+Date: May 25, 2025
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+BUY = "buy"
+SELL = "sell"
+
+# Quantities at or below this are considered filled
+EPSILON = 1e-12
+
+# Cancelled orders left in the levels before a side is compacted
+COMPACT_MIN_DEAD = 1024
+
+
+class RestingOrder:
+    """An order resting in the book."""
+
+    __slots__ = ("order_id", "side", "price", "quantity", "remaining", "expires_at", "payload", "active")
+
+    def __init__(self, order_id: str, side: str, price: float, quantity: float,
+                 expires_at: Optional[float], payload: Any):
+        self.order_id = order_id
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.remaining = quantity
+        self.expires_at = expires_at
+        self.payload = payload
+        self.active = True
+
+    @property
+    def filled(self) -> float:
+        """Quantity filled so far."""
+        return self.quantity - self.remaining
+
+    def __repr__(self) -> str:
+        return (f"RestingOrder({self.order_id!r}, {self.side}, price={self.price}, "
+                f"remaining={self.remaining}/{self.quantity})")
+
+
+class Fill(NamedTuple):
+    """A fill of an incoming order against a resting one, at the resting order's price."""
+    resting: RestingOrder
+    quantity: float
+    price: float
+
+
+class _BookSide:
+    """Price levels of one side of the book."""
+
+    __slots__ = ("is_buy", "levels", "prices", "live", "dead")
+
+    def __init__(self, is_buy: bool):
+        self.is_buy = is_buy
+        self.levels: Dict[float, Deque[RestingOrder]] = {}
+        self.prices: List[float] = []  # heap of level prices, negated for bids
+        self.live = 0
+        self.dead = 0
+
+    def add(self, order: RestingOrder):
+        level = self.levels.get(order.price)
+        if level is None:
+            level = self.levels[order.price] = deque()
+            heapq.heappush(self.prices, -order.price if self.is_buy else order.price)
+        level.append(order)
+        self.live += 1
+
+    def crosses(self, price: float, limit: float) -> bool:
+        """Whether a resting price of this side is acceptable to an opposite order at limit."""
+        return price >= limit if self.is_buy else price <= limit
+
+    def compact(self):
+        for price, level in list(self.levels.items()):
+            kept = deque(order for order in level if order.active)
+            if kept:
+                self.levels[price] = kept
+            else:
+                del self.levels[price]
+        self.prices = [-price if self.is_buy else price for price in self.levels]
+        heapq.heapify(self.prices)
+        self.dead = 0
+
+
+class OrderBook:
+    """
+    Limit order book with price-time priority.
+
+    Expired orders and orders whose payload is no longer live stay in the
+    book, and count in its size, until they reach the front of their level.
+    """
+
+    def __init__(self, is_live: Optional[Callable[[Any], bool]] = None,
+                 on_discard: Optional[Callable[[RestingOrder, str], None]] = None):
+        """
+        Initialize the order book.
+
+        Args:
+            is_live: Predicate on an order's payload; orders failing it are
+                dropped instead of matched (e.g. bids cancelled elsewhere)
+            on_discard: Called with an order and the reason ("expired" or
+                "inactive") when the book drops it without a cancel
+        """
+        self.is_live = is_live
+        self.on_discard = on_discard
+        self._sides = {BUY: _BookSide(True), SELL: _BookSide(False)}
+        self._orders: Dict[str, RestingOrder] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def get(self, order_id: str) -> Optional[RestingOrder]:
+        """Get a resting order by ID."""
+        return self._orders.get(order_id)
+
+    def submit(self, order_id: str, side: str, price: float, quantity: float,
+               expires_at: Optional[float] = None, payload: Any = None,
+               now: Optional[float] = None) -> Tuple[List[Fill], Optional[RestingOrder]]:
+        """
+        Match an incoming order against the book and rest what is left of it.
+
+        Args:
+            order_id: Order ID, unique among resting orders
+            side: BUY or SELL
+            price: Limit price
+            quantity: Order quantity
+            expires_at: Expiration timestamp (seconds since the epoch), if any
+            payload: Object carried by the order
+            now: Current timestamp, for expiration (time.time() if None)
+
+        Returns:
+            Tuple[List[Fill], Optional[RestingOrder]]: Fills in execution
+            order, and the resting remainder of the order, if any
+        """
+        if side not in self._sides:
+            raise ValueError(f"Unknown order side: {side}")
+        if order_id in self._orders:
+            raise ValueError(f"Order {order_id} is already in the book")
+        if now is None:
+            now = time.time()
+
+        own = self._sides[side]
+        opposite = self._sides[SELL if side == BUY else BUY]
+        remaining = float(quantity)
+        fills: List[Fill] = []
+
+        while remaining > EPSILON:
+            best = self._best(opposite, now)
+            if best is None or not opposite.crosses(best.price, price):
+                break
+            fill_quantity = min(remaining, best.remaining)
+            best.remaining -= fill_quantity
+            remaining -= fill_quantity
+            fills.append(Fill(best, fill_quantity, best.price))
+            if best.remaining <= EPSILON:
+                best.remaining = 0.0
+                best.active = False
+                del self._orders[best.order_id]
+                opposite.levels[best.price].popleft()
+                opposite.live -= 1
+
+        resting = None
+        if remaining > EPSILON and (expires_at is None or expires_at > now):
+            resting = RestingOrder(order_id, side, price, remaining, expires_at, payload)
+            resting.quantity = float(quantity)
+            own.add(resting)
+            self._orders[order_id] = resting
+        return fills, resting
+
+    def cancel(self, order_id: str) -> Optional[RestingOrder]:
+        """
+        Cancel a resting order.
+
+        Returns:
+            Optional[RestingOrder]: The cancelled order, or None if not in the book
+        """
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+        order.active = False
+        side = self._sides[order.side]
+        side.live -= 1
+        side.dead += 1
+        if side.dead > max(COMPACT_MIN_DEAD, side.live):
+            side.compact()
+        return order
+
+    def best_bid(self, now: Optional[float] = None) -> Optional[RestingOrder]:
+        """Get the highest priority buy order."""
+        return self._best(self._sides[BUY], time.time() if now is None else now)
+
+    def best_ask(self, now: Optional[float] = None) -> Optional[RestingOrder]:
+        """Get the highest priority sell order."""
+        return self._best(self._sides[SELL], time.time() if now is None else now)
+
+    def depth(self, side: str) -> int:
+        """Number of orders resting on a side."""
+        return self._sides[side].live
+
+    def _best(self, side: _BookSide, now: float) -> Optional[RestingOrder]:
+        prices = side.prices
+        while prices:
+            price = -prices[0] if side.is_buy else prices[0]
+            level = side.levels.get(price)
+            while level:
+                order = level[0]
+                if not order.active:
+                    level.popleft()
+                    side.dead -= 1
+                elif order.expires_at is not None and order.expires_at <= now:
+                    self._discard(side, level, order, "expired")
+                elif self.is_live is not None and not self.is_live(order.payload):
+                    self._discard(side, level, order, "inactive")
+                else:
+                    return order
+            # Empty (or already removed) level
+            if level is not None:
+                del side.levels[price]
+            heapq.heappop(prices)
+        return None
+
+    def _discard(self, side: _BookSide, level: Deque[RestingOrder], order: RestingOrder, reason: str):
+        level.popleft()
+        order.active = False
+        del self._orders[order.order_id]
+        side.live -= 1
+        if self.on_discard is not None:
+            self.on_discard(order, reason)
@@ -0,0 +1,315 @@
+"""
+Trust Path Engine for the Overseer System.
+
+This module provides the path search behind TrustRelationshipGraph.find_trust_paths.
+Relationships are kept in weighted forward and reverse adjacency maps updated
+in place, with -log(trust) as edge weight, so the most trusted path (the
+highest product of trust scores) is the lightest one. The top-k paths are
+found with Yen's algorithm over a hop-bounded A* search, pruned by the
+maximum number of hops, the minimum edge trust and the minimum aggregate
+trust.
+
+Results are kept in an LRU cache. Each entry records the entities that can
+reach the target within the hop limit, the only ones a valid path can pass
+through; a change to a relationship only invalidates the entries that
+recorded one of its entities.
+
+Author: Manus AI
+Date: May 25, 2025
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class TrustEdge(NamedTuple):
+    """A relationship as seen by the path search."""
+    relationship_id: str
+    trust_score: float
+    relationship_type: str
+    weight: float  # -log(trust_score)
+
+
+class TrustPathResult(NamedTuple):
+    """A path found by the engine."""
+    path: Tuple[str, ...]
+    relationships: Tuple[str, ...]
+    aggregate_trust: float
+
+
+_CacheKey = Tuple[str, str, int, int, float, float, Optional[FrozenSet[str]]]
+
+
+class TrustPathEngine:
+    """
+    Weighted adjacency of trust relationships with top-k best-path queries.
+
+    Like the NetworkX DiGraph it mirrors, there is at most one relationship
+    per ordered pair of entities.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        """
+        Initialize the Trust Path Engine.
+
+        Args:
+            cache_size: Maximum number of cached query results
+        """
+        self.adjacency: Dict[str, Dict[str, TrustEdge]] = {}
+        self.reverse_adjacency: Dict[str, Dict[str, TrustEdge]] = {}
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[_CacheKey, Tuple[List[TrustPathResult], Set[str]]]" = OrderedDict()
+        self._cache_by_node: Dict[str, Set[_CacheKey]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # Graph maintenance
+
+    def set_edge(self, source_id: str, target_id: str, relationship_id: str,
+                 trust_score: float, relationship_type: str):
+        """Add or replace the relationship from source to target."""
+        weight = -math.log(trust_score) if trust_score > 0 else math.inf
+        edge = TrustEdge(relationship_id, trust_score, relationship_type, weight)
+        self.adjacency.setdefault(source_id, {})[target_id] = edge
+        self.adjacency.setdefault(target_id, {})
+        self.reverse_adjacency.setdefault(target_id, {})[source_id] = edge
+        self.reverse_adjacency.setdefault(source_id, {})
+        self.invalidate_node(source_id)
+        self.invalidate_node(target_id)
+
+    def remove_edge(self, source_id: str, target_id: str) -> bool:
+        """Remove the relationship from source to target, if any."""
+        if self.adjacency.get(source_id, {}).pop(target_id, None) is None:
+            return False
+        del self.reverse_adjacency[target_id][source_id]
+        self.invalidate_node(source_id)
+        self.invalidate_node(target_id)
+        return True
+
+    def remove_node(self, node_id: str):
+        """Remove an entity and all relationships from or to it."""
+        if node_id not in self.adjacency:
+            return
+        for target_id in self.adjacency.pop(node_id):
+            del self.reverse_adjacency[target_id][node_id]
+            self.invalidate_node(target_id)
+        for source_id in self.reverse_adjacency.pop(node_id):
+            del self.adjacency[source_id][node_id]
+            self.invalidate_node(source_id)
+        self.invalidate_node(node_id)
+
+    def clear(self):
+        """Remove all entities, relationships and cached results."""
+        self.adjacency = {}
+        self.reverse_adjacency = {}
+        self._cache.clear()
+        self._cache_by_node = {}
+
+    def invalidate_node(self, node_id: str):
+        """Drop the cached results that depend on an entity's relationships."""
+        for key in self._cache_by_node.pop(node_id, ()):
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._unindex(key, entry[1], skip=node_id)
+
+    # Queries
+
+    def find_paths(self, source_id: str, target_id: str, max_paths: int = 10, max_hops: int = 5,
+                   min_trust_score: float = 0.0, min_aggregate_trust: float = 0.0,
+                   relationship_types: Optional[Iterable[str]] = None) -> List[TrustPathResult]:
+        """
+        Find the most trusted simple paths between two entities.
+
+        Args:
+            source_id: Source entity ID
+            target_id: Target entity ID
+            max_paths: Maximum number of paths to return
+            max_hops: Maximum number of relationships in a path
+            min_trust_score: Minimum trust score of every relationship on a path
+            min_aggregate_trust: Minimum product of trust scores along a path
+            relationship_types: Relationship types to consider (all if None)
+
+        Returns:
+            List[TrustPathResult]: Paths by aggregate trust, highest first
+        """
+        types = frozenset(relationship_types) if relationship_types else None
+        key = (source_id, target_id, max_paths, max_hops, min_trust_score, min_aggregate_trust, types)
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return list(entry[0])
+        self.cache_misses += 1
+
+        def edge_ok(edge: TrustEdge) -> bool:
+            return (edge.trust_score >= min_trust_score and edge.weight != math.inf
+                    and (types is None or edge.relationship_type in types))
+
+        hops_to_target, weight_to_target = self._reverse_search(target_id, max_hops, edge_ok)
+        paths = []
+        if max_paths >= 1 and source_id != target_id and source_id in hops_to_target:
+            max_weight = -math.log(min_aggregate_trust) if min_aggregate_trust > 0 else math.inf
+            paths = self._yen(source_id, target_id, max_paths, max_hops, max_weight, edge_ok,
+                              hops_to_target, weight_to_target)
+
+        # Every path the query could return runs through entities that reach the target
+        depends_on = set(hops_to_target)
+        depends_on.add(source_id)
+        if self.cache_size > 0:
+            self._cache[key] = (paths, depends_on)
+            for node_id in depends_on:
+                self._cache_by_node.setdefault(node_id, set()).add(key)
+            while len(self._cache) > self.cache_size:
+                old_key, (_, old_depends_on) = self._cache.popitem(last=False)
+                self._unindex(old_key, old_depends_on)
+
+        return list(paths)
+
+    def _reverse_search(self, target_id: str, max_hops: int,
+                        edge_ok: Callable[[TrustEdge], bool]) -> Tuple[Dict[str, int], Dict[str, float]]:
+        """
+        Fewest hops and lightest weight from each entity to the target.
+
+        Only entities reaching the target within max_hops hops are included.
+        Both are lower bounds for every search of the query: the hops prune
+        states that cannot arrive in time, and the weight is a consistent A*
+        heuristic.
+        """
+        if target_id not in self.reverse_adjacency:
+            return {}, {}
+
+        hops_to_target = {target_id: 0}
+        frontier = [target_id]
+        for hops in range(1, max_hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for prev_node, edge in self.reverse_adjacency[node].items():
+                    if prev_node not in hops_to_target and edge_ok(edge):
+                        hops_to_target[prev_node] = hops
+                        next_frontier.append(prev_node)
+            frontier = next_frontier
+
+        weight_to_target: Dict[str, float] = {}
+        heap = [(0.0, target_id)]
+        while heap:
+            weight, node = heapq.heappop(heap)
+            if node in weight_to_target:
+                continue
+            weight_to_target[node] = weight
+            for prev_node, edge in self.reverse_adjacency[node].items():
+                if prev_node in hops_to_target and prev_node not in weight_to_target and edge_ok(edge):
+                    heapq.heappush(heap, (weight + edge.weight, prev_node))
+        return hops_to_target, weight_to_target
+
+    def _yen(self, source_id, target_id, max_paths, max_hops, max_weight, edge_ok,
+             hops_to_target, weight_to_target) -> List[TrustPathResult]:
+        first = self._shortest_path(source_id, target_id, max_hops, max_weight, edge_ok,
+                                    frozenset(), frozenset(), hops_to_target, weight_to_target)
+        if first is None:
+            return []
+
+        found = [first]
+        found_nodes = {first[1]}
+        candidates: List[Tuple[float, int, Tuple[str, ...]]] = []
+        candidate_nodes: Set[Tuple[str, ...]] = set()
+
+        while len(found) < max_paths:
+            _, last = found[-1]
+            root_weight = 0.0
+            for i in range(len(last) - 1):
+                spur_node = last[i]
+                root = last[:i + 1]
+                if i > 0:
+                    root_weight += self.adjacency[last[i - 1]][spur_node].weight
+
+                # Edges leaving the root of paths already found, and the root's own nodes
+                banned_edges = frozenset(
+                    (nodes[i], nodes[i + 1]) for _, nodes in found if nodes[:i + 1] == root
+                )
+                banned_nodes = frozenset(root[:-1])
+                spur = self._shortest_path(spur_node, target_id, max_hops - i, max_weight - root_weight,
+                                           edge_ok, banned_nodes, banned_edges, hops_to_target, weight_to_target)
+                if spur is None:
+                    continue
+                nodes = root[:-1] + spur[1]
+                if nodes in found_nodes or nodes in candidate_nodes:
+                    continue
+                candidate_nodes.add(nodes)
+                heapq.heappush(candidates, (root_weight + spur[0], len(nodes), nodes))
+
+            if not candidates:
+                break
+            weight, _, nodes = heapq.heappop(candidates)
+            candidate_nodes.discard(nodes)
+            found.append((weight, nodes))
+            found_nodes.add(nodes)
+
+        results = []
+        for _, nodes in found:
+            edges = [self.adjacency[u][v] for u, v in zip(nodes, nodes[1:])]
+            aggregate_trust = 1.0
+            for edge in edges:
+                aggregate_trust *= edge.trust_score
+            results.append(TrustPathResult(nodes, tuple(e.relationship_id for e in edges), aggregate_trust))
+        return results
+
+    def _shortest_path(self, source_id, target_id, max_hops, max_weight, edge_ok, banned_nodes,
+                       banned_edges, hops_to_target, weight_to_target) -> Optional[Tuple[float, Tuple[str, ...]]]:
+        """
+        Lightest path of at most max_hops edges, by A* over (node, hops) states.
+
+        A state is dropped when its node was already settled with no more
+        hops, since it can then lead to no lighter path; each node is settled
+        at most max_hops times and the path found is simple.
+        """
+        if max_hops < 1 or source_id not in weight_to_target:
+            return None
+        heap = [(weight_to_target[source_id], 0.0, 0, source_id)]
+        parents: Dict[Tuple[str, int], Optional[Tuple[str, int]]] = {(source_id, 0): None}
+        best: Dict[Tuple[str, int], float] = {(source_id, 0): 0.0}
+        settled_hops: Dict[str, int] = {}
+
+        while heap:
+            _, weight, hops, node = heapq.heappop(heap)
+            if node in settled_hops and settled_hops[node] <= hops:
+                continue
+            settled_hops[node] = hops
+
+            if node == target_id:
+                path = []
+                state = (node, hops)
+                while state is not None:
+                    path.append(state[0])
+                    state = parents[state]
+                return weight, tuple(reversed(path))
+
+            for next_node, edge in self.adjacency[node].items():
+                remaining = weight_to_target.get(next_node)
+                if remaining is None or hops + 1 + hops_to_target[next_node] > max_hops:
+                    continue
+                if next_node in banned_nodes or (node, next_node) in banned_edges or not edge_ok(edge):
+                    continue
+                next_weight = weight + edge.weight
+                if next_weight + remaining > max_weight:
+                    continue
+                next_state = (next_node, hops + 1)
+                if next_node in settled_hops and settled_hops[next_node] <= hops + 1:
+                    continue
+                if next_weight < best.get(next_state, math.inf):
+                    best[next_state] = next_weight
+                    parents[next_state] = (node, hops)
+                    heapq.heappush(heap, (next_weight + remaining, next_weight, hops + 1, next_node))
+        return None
+
+    def _unindex(self, key: _CacheKey, depends_on: Set[str], skip: Optional[str] = None):
+        for node_id in depends_on:
+            if node_id == skip:
+                continue
+            keys = self._cache_by_node.get(node_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cache_by_node[node_id]
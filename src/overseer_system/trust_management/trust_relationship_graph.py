@@ -30,6 +30,9 @@ from ..a2a_integration.a2a_protocol_bridge import A2AProtocolBridge
 # Import event bus
 from ..event_bus.kafka_client import KafkaProducer, KafkaConsumer
 
+# Import path search
+from .trust_path_engine import TrustPathEngine
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -84,6 +87,8 @@ class PathQuery(BaseModel):
     min_trust_score: float = Field(0.0, ge=0.0, le=1.0, description="Minimum trust score for edges")
     max_path_length: int = Field(5, ge=1, description="Maximum path length")
     relationship_types: Optional[List[str]] = Field(None, description="Relationship types to consider")
+    max_paths: int = Field(10, ge=1, description="Maximum number of paths to return")
+    min_aggregate_trust: float = Field(0.0, ge=0.0, le=1.0, description="Minimum aggregate trust score for paths")
 
 class TrustPath(BaseModel):
     """Model for trust paths between entities."""
@@ -127,8 +132,10 @@ class TrustRelationshipGraph:
         self.entities = {}
         self.relationships = {}
         
-        # Cache for computed paths
-        self.path_cache = {}
+        # Weighted adjacency and cached results for path queries
+        self.path_engine = TrustPathEngine(
+            cache_size=int(os.getenv("TRUST_PATH_CACHE_SIZE", "1024"))
+        )
         
         logger.info("Trust Relationship Graph initialized")
     
@@ -298,6 +305,7 @@ class TrustRelationshipGraph:
         
         # Remove from graph
         self.graph.remove_node(entity_id)
+        self.path_engine.remove_node(entity_id)
         
         # Publish event to Kafka
         kafka_producer.produce(
@@ -358,9 +366,10 @@ class TrustRelationshipGraph:
             relationship_type=relationship.relationship_type,
             **relationship_dict
         )
-        
-        # Invalidate path cache
-        self.path_cache = {}
+        self.path_engine.set_edge(
+            source_id, target_id, relationship_id,
+            relationship.trust_score, relationship.relationship_type
+        )
         
         # Publish event to Kafka
         kafka_producer.produce(
@@ -432,6 +441,7 @@ class TrustRelationshipGraph:
         # If source or target changed, remove old edge and add new one
         if source_id != old_source_id or target_id != old_target_id:
             self.graph.remove_edge(old_source_id, old_target_id)
+            self.path_engine.remove_edge(old_source_id, old_target_id)
             self.graph.add_edge(
                 source_id, 
                 target_id, 
@@ -445,8 +455,11 @@ class TrustRelationshipGraph:
             for key, value in relationship_dict.items():
                 self.graph[source_id][target_id][key] = value
         
-        # Invalidate path cache
-        self.path_cache = {}
+        # Update the path search's edge (invalidates the cached paths that used it)
+        self.path_engine.set_edge(
+            source_id, target_id, relationship_id,
+            relationship.trust_score, relationship.relationship_type
+        )
         
         # Publish event to Kafka
         kafka_producer.produce(
@@ -542,9 +555,7 @@ class TrustRelationshipGraph:
         
         # Remove from graph
         self.graph.remove_edge(source_id, target_id)
-        
-        # Invalidate path cache
-        self.path_cache = {}
+        self.path_engine.remove_edge(source_id, target_id)
         
         # Publish event to Kafka
         kafka_producer.produce(
@@ -563,19 +574,21 @@ class TrustRelationshipGraph:
     
     def find_trust_paths(self, query: PathQuery) -> List[TrustPath]:
         """
-        Find trust paths between two entities.
+        Find the most trusted paths between two entities.
+        
+        Paths are searched by the path engine: the top max_paths simple paths
+        by aggregate (multiplicative) trust, with at most max_path_length
+        relationships, each of at least min_trust_score. Results are cached
+        until a relationship the search went through changes.
         
         Args:
             query: The path query parameters
             
         Returns:
-            List[TrustPath]: List of trust paths
+            List[TrustPath]: List of trust paths, most trusted first
         """
         source_id = query.source_id
         target_id = query.target_id
-        min_trust_score = query.min_trust_score
-        max_path_length = query.max_path_length
-        relationship_types = query.relationship_types
         
         # Check if source and target exist
         if source_id not in self.entities:
@@ -584,81 +597,29 @@ class TrustRelationshipGraph:
         if target_id not in self.entities:
             raise ValueError(f"Target entity {target_id} does not exist")
         
-        # Check cache
-        cache_key = f"{source_id}_{target_id}_{min_trust_score}_{max_path_length}_{relationship_types}"
-        if cache_key in self.path_cache:
-            return self.path_cache[cache_key]
-        
-        # Create a filtered graph based on trust score and relationship types
-        filtered_graph = nx.DiGraph()
-        
-        for u, v, data in self.graph.edges(data=True):
-            # Check trust score
-            if data["trust_score"] < min_trust_score:
-                continue
-            
-            # Check relationship type
-            if relationship_types and data["relationship_type"] not in relationship_types:
-                continue
-            
-            # Add edge to filtered graph
-            filtered_graph.add_edge(u, v, **data)
-        
-        # Find all simple paths up to max_path_length
-        paths = []
-        
-        try:
-            # Use NetworkX to find all simple paths
-            simple_paths = list(nx.all_simple_paths(
-                filtered_graph, 
-                source=source_id, 
-                target=target_id, 
-                cutoff=max_path_length
-            ))
-            
-            # Convert to TrustPath objects
-            for i, path_nodes in enumerate(simple_paths):
-                # Get relationships along the path
-                relationships = []
-                aggregate_trust = 1.0  # Start with perfect trust
-                
-                for j in range(len(path_nodes) - 1):
-                    u = path_nodes[j]
-                    v = path_nodes[j + 1]
-                    
-                    # Get relationship data
-                    rel_id = filtered_graph[u][v]["relationship_id"]
-                    trust_score = filtered_graph[u][v]["trust_score"]
-                    
-                    relationships.append(rel_id)
-                    
-                    # Update aggregate trust (multiplicative)
-                    aggregate_trust *= trust_score
-                
-                # Create TrustPath object
-                path = TrustPath(
-                    path_id=f"path-{uuid.uuid4()}",
-                    source_id=source_id,
-                    target_id=target_id,
-                    path=path_nodes,
-                    relationships=relationships,
-                    aggregate_trust=aggregate_trust,
-                    path_length=len(path_nodes) - 1
-                )
-                
-                paths.append(path)
-            
-            # Sort paths by aggregate trust (highest first)
-            paths.sort(key=lambda p: p.aggregate_trust, reverse=True)
-            
-        except nx.NetworkXNoPath:
-            # No path exists
-            pass
-        
-        # Cache the result
-        self.path_cache[cache_key] = paths
+        results = self.path_engine.find_paths(
+            source_id,
+            target_id,
+            max_paths=query.max_paths,
+            max_hops=query.max_path_length,
+            min_trust_score=query.min_trust_score,
+            min_aggregate_trust=query.min_aggregate_trust,
+            relationship_types=query.relationship_types
+        )
         
-        return paths
+        # Convert to TrustPath objects
+        return [
+            TrustPath(
+                path_id=f"path-{uuid.uuid4()}",
+                source_id=source_id,
+                target_id=target_id,
+                path=list(result.path),
+                relationships=list(result.relationships),
+                aggregate_trust=result.aggregate_trust,
+                path_length=len(result.path) - 1
+            )
+            for result in results
+        ]
     
     def get_trust_score(self, source_id: str, target_id: str) -> Optional[float]:
         """
@@ -692,7 +653,8 @@ class TrustRelationshipGraph:
             source_id=source_id,
             target_id=target_id,
             min_trust_score=0.0,
-            max_path_length=5
+            max_path_length=5,
+            max_paths=1
         )
         
         paths = self.find_trust_paths(query)
@@ -986,7 +948,7 @@ class TrustRelationshipGraph:
             self.entities = {}
             self.relationships = {}
             self.graph = nx.DiGraph()
-            self.path_cache = {}
+            self.path_engine.clear()
             
             # Import entities
             for entity_dict in data.get("entities", []):
@@ -1012,7 +974,7 @@ class TrustRelationshipGraph:
                 self.entities = {}
                 self.relationships = {}
                 self.graph = nx.DiGraph()
-                self.path_cache = {}
+                self.path_engine.clear()
                 
                 # Import nodes as entities
                 for node_id in G.nodes():
@@ -1,5 +1,7 @@
 import uuid
 import os
+import atexit
+import threading
 from typing import Any, Dict, Optional
 
 from src.proof_core.proof_hub.proof_normalizer import ProofNormalizer
@@ -8,6 +10,7 @@ from src.proof_core.proof_hub.sqlite_repository import SQLiteProofRepository
 from src.proof_core.proof_hub.postgres_repository import PostgresProofRepository
 from src.proof_core.proof_hub.unified_hub_adapter import UnifiedProofHubAdapter
 from src.proof_core.proof_hub.proof_router import ProofRouter
+from src.proof_core.proof_hub.proof_sink import WriteBehindProofSink, sink_from_env
 
 
 def _build_repository():
@@ -25,6 +28,19 @@ def _build_repository():
 
 
 _proof_repository = _build_repository()
+_proof_sink: Optional[WriteBehindProofSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_proof_sink() -> WriteBehindProofSink:
+    """Process-wide write-behind sink over the proof repository, drained at exit."""
+    global _proof_sink
+    with _sink_lock:
+        if _proof_sink is None:
+            _proof_sink = sink_from_env(_proof_repository)
+            _proof_sink.start()
+            atexit.register(_proof_sink.close)
+        return _proof_sink
 
 
 class IntegrityManager:
@@ -37,18 +53,10 @@ class IntegrityManager:
         self.repository = _proof_repository
         self.router = ProofRouter(adapter=UnifiedProofHubAdapter())
 
-    async def record_action(
-        self,
-        utid: str,
-        domain: str,
-        inputs: Dict[str, Any],
-        outputs: Dict[str, Any],
-        metadata: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        proof_id = uuid.uuid4().hex
-        proof = self.normalizer.normalize(
+    def _normalize(self, utid, domain, inputs, outputs, metadata) -> Dict[str, Any]:
+        return self.normalizer.normalize(
             {
-                "proof_id": proof_id,
+                "proof_id": uuid.uuid4().hex,
                 "utid": utid,
                 "domain": domain,
                 "inputs": inputs,
@@ -56,5 +64,31 @@ class IntegrityManager:
                 "metadata": metadata or {},
             }
         )
+
+    async def record_action(
+        self,
+        utid: str,
+        domain: str,
+        inputs: Dict[str, Any],
+        outputs: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        proof = self._normalize(utid, domain, inputs, outputs, metadata)
         self.repository.store(proof)
         return await self.router.route(proof)
+
+    def enqueue_action(
+        self,
+        utid: str,
+        domain: str,
+        inputs: Dict[str, Any],
+        outputs: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Write-behind variant of record_action for hot paths: the proof is
+        queued on the shared sink and persisted in a later batch. Returns the
+        proof, or None if the sink's overflow policy discarded it.
+        """
+        proof = self._normalize(utid, domain, inputs, outputs, metadata)
+        return proof if get_proof_sink().submit(proof) else None
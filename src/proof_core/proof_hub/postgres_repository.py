@@ -68,6 +68,45 @@ class PostgresProofRepository:
             )
         return item
 
+    def store_many(self, proofs: List[Dict[str, Any]]) -> List[StoredProof]:
+        """Stores proofs in a single transaction."""
+        items = [
+            StoredProof(
+                proof_id=proof.get("proof_id"),
+                utid=proof.get("utid"),
+                domain=proof.get("domain"),
+                inputs=proof.get("inputs", {}),
+                outputs=proof.get("outputs", {}),
+                metadata=proof.get("metadata", {}),
+            )
+            for proof in proofs
+        ]
+        with self.conn, self.conn.cursor() as cur:
+            cur.executemany(
+                """
+                INSERT INTO proofs (proof_id, utid, domain, inputs_json, outputs_json, metadata_json)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (proof_id) DO UPDATE SET
+                    utid = EXCLUDED.utid,
+                    domain = EXCLUDED.domain,
+                    inputs_json = EXCLUDED.inputs_json,
+                    outputs_json = EXCLUDED.outputs_json,
+                    metadata_json = EXCLUDED.metadata_json
+                """,
+                [
+                    (
+                        item.proof_id,
+                        item.utid,
+                        item.domain,
+                        json.dumps(item.inputs),
+                        json.dumps(item.outputs),
+                        json.dumps(item.metadata),
+                    )
+                    for item in items
+                ],
+            )
+        return items
+
     def list(
         self,
         utid: Optional[str] = None,
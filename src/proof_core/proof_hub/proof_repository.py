@@ -41,9 +41,26 @@ class ProofRepository:
         )
         with self._lock:
             self._items.append(item)
-            self._append_to_disk(item)
+            self._append_to_disk([item])
         return item
 
+    def store_many(self, proofs: List[Dict[str, Any]]) -> List[StoredProof]:
+        items = [
+            StoredProof(
+                proof_id=proof.get("proof_id"),
+                utid=proof.get("utid"),
+                domain=proof.get("domain"),
+                inputs=proof.get("inputs", {}),
+                outputs=proof.get("outputs", {}),
+                metadata=proof.get("metadata", {}),
+            )
+            for proof in proofs
+        ]
+        with self._lock:
+            self._items.extend(items)
+            self._append_to_disk(items)
+        return items
+
     def list(
         self,
         utid: Optional[str] = None,
@@ -118,10 +135,10 @@ class ProofRepository:
         if not os.path.exists(self.store_path):
             open(self.store_path, "a").close()
 
-    def _append_to_disk(self, item: StoredProof) -> None:
+    def _append_to_disk(self, items: List[StoredProof]) -> None:
         try:
             with open(self.store_path, "a") as f:
-                f.write(json.dumps(asdict(item)) + "\n")
+                f.write("".join(json.dumps(asdict(item)) + "\n" for item in items))
         except Exception:
             # non-fatal: keep in-memory copy
             pass
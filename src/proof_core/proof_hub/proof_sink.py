@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+OVERFLOW_POLICIES = ("drop", "sample", "block")
+
+
+class ProofSinkError(RuntimeError):
+    """Raised by flush()/close() when proofs could not be persisted since the last report."""
+
+    def __init__(self, failed: int, error: BaseException):
+        super().__init__(f"{failed} proofs failed to persist: {error}")
+        self.failed = failed
+        self.error = error
+
+
+class WriteBehindProofSink:
+    """
+    Bounded in-memory ring of proof records persisted by a background writer.
+
+    Producers call submit() and return immediately; the writer thread drains
+    up to batch_size records at a time into the repository in a single
+    transaction (store_many) and waits at most flush_interval_s to fill a
+    batch. When the ring is full the overflow policy decides:
+
+    - "drop":   the new record is discarded.
+    - "sample": one in sample_every new records displaces the oldest queued
+                record, the rest are discarded, so sustained overload still
+                persists a thinned sample of current traffic.
+    - "block":  the producer waits up to block_timeout_s for space, then the
+                record is discarded.
+
+    Every discarded record is counted, so stats() reports exactly how many
+    accepted requests are durable, pending or lost.
+
+    A batch the repository rejects is retried up to max_retries times with
+    exponential backoff (retry_backoff_s, doubling, capped at
+    max_retry_backoff_s) before its records are counted as failed. Failures
+    are then raised as ProofSinkError from the next flush() or close().
+    """
+
+    def __init__(self, repository, capacity: int = 10_000, batch_size: int = 500,
+                 flush_interval_s: float = 0.05, overflow: str = "drop",
+                 sample_every: int = 10, block_timeout_s: float = 1.0,
+                 max_retries: int = 3, retry_backoff_s: float = 0.1,
+                 max_retry_backoff_s: float = 2.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.repository = repository
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.overflow = overflow
+        self.sample_every = max(1, sample_every)
+        self.block_timeout_s = block_timeout_s
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff_s = retry_backoff_s
+        self.max_retry_backoff_s = max_retry_backoff_s
+
+        self._ring: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._writing = 0
+
+        self.submitted = 0
+        self.persisted = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self.last_flush_s = 0.0
+        self.max_lag_s = 0.0
+        self._overflow_seen = 0
+        # Failures not yet raised from flush()/close()
+        self._unreported_failed = 0
+        self.last_error: Optional[BaseException] = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="proof-sink-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, proof: Dict[str, Any]) -> bool:
+        """Queues a proof for persistence. Returns False if it was discarded."""
+        if self._thread is None:
+            self.start()
+        with self._cond:
+            self.submitted += 1
+            if len(self._ring) >= self.capacity and not self._closed:
+                if self.overflow == "block":
+                    self._cond.wait_for(lambda: len(self._ring) < self.capacity or self._closed,
+                                        timeout=self.block_timeout_s)
+                elif self.overflow == "sample":
+                    self._overflow_seen += 1
+                    if self._overflow_seen % self.sample_every == 0:
+                        self._ring.popleft()
+                        self.evicted += 1
+            if self._closed or len(self._ring) >= self.capacity:
+                self.dropped += 1
+                return False
+            self._ring.append((time.monotonic(), proof))
+            if len(self._ring) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def _take(self) -> List[Tuple[float, Dict[str, Any]]]:
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._ring) >= self.batch_size or self._closed,
+                                timeout=self.flush_interval_s)
+            n = min(self.batch_size, len(self._ring))
+            batch = [self._ring.popleft() for _ in range(n)]
+            self._writing = n
+            if n:
+                # Space was freed for blocked producers
+                self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take()
+            if batch:
+                self._write(batch)
+            with self._cond:
+                self._writing = 0
+                self._cond.notify_all()
+                if self._closed and not self._ring:
+                    return
+
+    def _write(self, batch: List[Tuple[float, Dict[str, Any]]]):
+        proofs = [proof for _, proof in batch]
+        start = time.monotonic()
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._store(proofs)
+                break
+            except Exception as e:
+                if attempt < self.max_retries:
+                    backoff = min(self.retry_backoff_s * 2 ** attempt, self.max_retry_backoff_s)
+                    logging.warning(f"Proof sink failed to persist {len(proofs)} proofs, "
+                                    f"retrying in {backoff:.2f}s: {e}")
+                    with self._cond:
+                        self.retries += 1
+                    time.sleep(backoff)
+                    continue
+                logging.error(f"Proof sink failed to persist {len(proofs)} proofs "
+                              f"after {attempt + 1} attempts: {e}")
+                with self._cond:
+                    self.failed += len(proofs)
+                    self._unreported_failed += len(proofs)
+                    self.last_error = e
+                return
+        done = time.monotonic()
+        with self._cond:
+            self.persisted += len(proofs)
+            self.batches += 1
+            self.last_flush_s = done - start
+            self.max_lag_s = max(self.max_lag_s, done - batch[0][0])
+
+    def _store(self, proofs: List[Dict[str, Any]]):
+        store_many = getattr(self.repository, "store_many", None)
+        if store_many is not None:
+            store_many(proofs)
+        else:
+            for proof in proofs:
+                self.repository.store(proof)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until everything queued so far is persisted (or failed).
+
+        Returns False on timeout. Raises ProofSinkError if proofs failed to
+        persist since the last flush() or close().
+        """
+        with self._cond:
+            self._cond.notify_all()
+            drained = self._cond.wait_for(lambda: not self._ring and not self._writing, timeout=timeout)
+            self._raise_failures()
+            return drained
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """
+        Stops accepting proofs and drains the ring.
+
+        Raises ProofSinkError if proofs failed to persist since the last
+        flush() or close().
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._cond:
+            self._raise_failures()
+
+    def _raise_failures(self):
+        if self._unreported_failed:
+            failed, self._unreported_failed = self._unreported_failed, 0
+            raise ProofSinkError(failed, self.last_error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            pending = len(self._ring) + self._writing
+            oldest = self._ring[0][0] if self._ring else None
+            return {
+                "overflow": self.overflow,
+                "capacity": self.capacity,
+                "pending": pending,
+                "submitted": self.submitted,
+                "persisted": self.persisted,
+                "dropped": self.dropped,
+                "evicted": self.evicted,
+                "failed": self.failed,
+                "retries": self.retries,
+                "last_error": str(self.last_error) if self.last_error is not None else None,
+                "batches": self.batches,
+                "last_flush_s": self.last_flush_s,
+                "max_lag_s": self.max_lag_s,
+                "oldest_pending_age_s": time.monotonic() - oldest if oldest is not None else 0.0,
+            }
+
+
+def sink_from_env(repository) -> WriteBehindProofSink:
+    return WriteBehindProofSink(
+        repository,
+        capacity=int(os.environ.get("PROOF_SINK_CAPACITY", 10_000)),
+        batch_size=int(os.environ.get("PROOF_SINK_BATCH", 500)),
+        flush_interval_s=float(os.environ.get("PROOF_SINK_FLUSH_S", 0.05)),
+        overflow=os.environ.get("PROOF_SINK_OVERFLOW", "drop").lower(),
+        sample_every=int(os.environ.get("PROOF_SINK_SAMPLE_EVERY", 10)),
+        max_retries=int(os.environ.get("PROOF_SINK_RETRIES", 3)),
+        retry_backoff_s=float(os.environ.get("PROOF_SINK_RETRY_BACKOFF_S", 0.1)),
+    )
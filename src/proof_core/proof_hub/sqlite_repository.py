@@ -26,6 +26,8 @@ class SQLiteProofRepository:
 
     def _init_db(self):
         with self._get_conn() as conn:
+            # WAL lets API reads proceed while the proof sink writes batches
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS proofs (
@@ -41,31 +43,41 @@ class SQLiteProofRepository:
             conn.commit()
 
     def store(self, proof: Dict[str, Any]) -> StoredProof:
-        item = StoredProof(
-            proof_id=proof.get("proof_id"),
-            utid=proof.get("utid"),
-            domain=proof.get("domain"),
-            inputs=proof.get("inputs", {}),
-            outputs=proof.get("outputs", {}),
-            metadata=proof.get("metadata", {}),
-        )
+        return self.store_many([proof])[0]
+
+    def store_many(self, proofs: List[Dict[str, Any]]) -> List[StoredProof]:
+        """Stores proofs in a single transaction."""
+        items = [
+            StoredProof(
+                proof_id=proof.get("proof_id"),
+                utid=proof.get("utid"),
+                domain=proof.get("domain"),
+                inputs=proof.get("inputs", {}),
+                outputs=proof.get("outputs", {}),
+                metadata=proof.get("metadata", {}),
+            )
+            for proof in proofs
+        ]
         with self._lock, self._get_conn() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO proofs (proof_id, utid, domain, inputs_json, outputs_json, metadata_json)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    item.proof_id,
-                    item.utid,
-                    item.domain,
-                    json.dumps(item.inputs),
-                    json.dumps(item.outputs),
-                    json.dumps(item.metadata),
-                ),
+                [
+                    (
+                        item.proof_id,
+                        item.utid,
+                        item.domain,
+                        json.dumps(item.inputs),
+                        json.dumps(item.outputs),
+                        json.dumps(item.metadata),
+                    )
+                    for item in items
+                ],
             )
             conn.commit()
-        return item
+        return items
 
     def list(
         self,
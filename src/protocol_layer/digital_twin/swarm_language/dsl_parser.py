@@ -18,6 +18,8 @@ import asyncio
 import logging
 import json
 import re
+import hashlib
+from collections import OrderedDict
 from enum import Enum
 from typing import Dict, List, Any, Optional, Union, Callable, Awaitable, Tuple, Set
 from dataclasses import dataclass, field
@@ -79,9 +81,12 @@ class ParseError:
 class DTSLLexer:
     """
     Lexer for the Digital Twin Swarm Language.
+
+    Tokenizes in a single pass with one precompiled regex that tries the token
+    patterns in order at each offset of the source.
     """
     
-    # Token patterns
+    # Token patterns, tried in order
     PATTERNS = [
         (r'[ \t\r\n]+', TokenType.WHITESPACE),
         (r'//.*$', TokenType.COMMENT),
@@ -91,7 +96,7 @@ class DTSLLexer:
         (r'-?\d+', TokenType.NUMBER),
         (r'"(?:\\.|[^"\\])*"', TokenType.STRING),
         (r"'(?:\\.|[^'\\])*'", TokenType.STRING),
-        (r'==|!=|<=|>=|<|>|\+|-|\*|/|=', TokenType.OPERATOR),
+        (r'==|!=|<=|>=|&&|\|\||<|>|\+|-|\*|/|=|!', TokenType.OPERATOR),
         (r'[{}()\[\],;:]', TokenType.PUNCTUATION),
     ]
     
@@ -103,6 +108,14 @@ class DTSLLexer:
         'alert', 'log', 'notify', 'schedule', 'interval', 'timeout', 'retry'
     }
     
+    # One named group per pattern; alternation keeps the first-match order.
+    # MULTILINE makes '//' comments end at the end of their line.
+    _GROUP_TYPES = {f"{token_type.name}_{i}": token_type for i, (_, token_type) in enumerate(PATTERNS)}
+    _MASTER = re.compile(
+        "|".join(f"(?P<{name}>{pattern})" for name, (pattern, _) in zip(_GROUP_TYPES, PATTERNS)),
+        re.MULTILINE
+    )
+    
     def __init__(self, source: str):
         self.source = source
         self.tokens: List[Token] = []
@@ -113,63 +126,56 @@ class DTSLLexer:
     
     def tokenize(self) -> Tuple[List[Token], List[ParseError]]:
         """Tokenize the source code."""
-        while self.pos < len(self.source):
-            matched = False
+        source = self.source
+        tokens = self.tokens
+        group_types = self._GROUP_TYPES
+        keywords = self.KEYWORDS
+        identifier = TokenType.IDENTIFIER
+        keyword = TokenType.KEYWORD
+        boolean = TokenType.BOOLEAN
+        skipped = (TokenType.WHITESPACE, TokenType.COMMENT)
+        multiline = (TokenType.WHITESPACE, TokenType.COMMENT, TokenType.STRING)
+        pos = self.pos
+        line = self.line
+        line_start = pos - (self.column - 1)  # offset of column 1 on the current line
+        
+        for match in self._MASTER.finditer(source, pos):
+            start = match.start()
+            if pos < start:
+                self.pos = pos
+                self._report_unmatched(start, line, line_start)
             
-            # Try to match a pattern
-            for pattern, token_type in self.PATTERNS:
-                regex = re.compile(pattern)
-                match = regex.match(self.source[self.pos:])
-                
-                if match:
-                    value = match.group(0)
-                    
-                    # Skip whitespace and comments
-                    if token_type not in (TokenType.WHITESPACE, TokenType.COMMENT):
-                        # Check if identifier is a keyword
-                        if token_type == TokenType.IDENTIFIER and value in self.KEYWORDS:
-                            token_type = TokenType.KEYWORD
-                        
+            token_type = group_types[match.lastgroup]
+            value = match.group()
+            
+            # Skip whitespace and comments
+            if token_type not in skipped:
+                # Check if identifier is a keyword
+                if token_type is identifier:
+                    if value in keywords:
+                        token_type = keyword
+                    elif value.lower() in ('true', 'false'):
                         # Handle boolean literals
-                        if token_type == TokenType.IDENTIFIER and value.lower() in ('true', 'false'):
-                            token_type = TokenType.BOOLEAN
-                        
-                        # Create token
-                        token = Token(
-                            type=token_type,
-                            value=value,
-                            line=self.line,
-                            column=self.column
-                        )
-                        self.tokens.append(token)
-                    
-                    # Update position and line/column
-                    for char in value:
-                        if char == '\n':
-                            self.line += 1
-                            self.column = 1
-                        else:
-                            self.column += 1
-                    
-                    self.pos += len(value)
-                    matched = True
-                    break
+                        token_type = boolean
+                tokens.append(Token(token_type, value, line, start - line_start + 1))
             
-            # If no pattern matched, report error and skip character
-            if not matched:
-                error = ParseError(
-                    message=f"Unexpected character: '{self.source[self.pos]}'",
-                    line=self.line,
-                    column=self.column,
-                    context=self._get_context()
-                )
-                self.errors.append(error)
-                
-                self.pos += 1
-                self.column += 1
+            # Only whitespace, comments and strings can span lines
+            if token_type in multiline:
+                newlines = value.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = start + value.rindex('\n') + 1
+            pos = match.end()
+        
+        self.pos = pos
+        if pos < len(source):
+            self._report_unmatched(len(source), line, line_start)
+        
+        self.line = line
+        self.column = self.pos - line_start + 1
         
         # Add EOF token
-        self.tokens.append(Token(
+        tokens.append(Token(
             type=TokenType.EOF,
             value="",
             line=self.line,
@@ -178,6 +184,19 @@ class DTSLLexer:
         
         return self.tokens, self.errors
     
+    def _report_unmatched(self, end: int, line: int, line_start: int) -> None:
+        """Report each character from the current position to end, none of which starts a token."""
+        while self.pos < end:
+            self.line = line
+            self.column = self.pos - line_start + 1
+            self.errors.append(ParseError(
+                message=f"Unexpected character: '{self.source[self.pos]}'",
+                line=self.line,
+                column=self.column,
+                context=self._get_context()
+            ))
+            self.pos += 1
+    
     def _get_context(self) -> str:
         """Get the context around the current position for error reporting."""
         start = max(0, self.pos - 20)
@@ -188,9 +207,9 @@ class DTSLLexer:
         return f"{before}{after}\n{pointer}"
 
 
-class DTSLParser:
+class DTSLSyntaxParser:
     """
-    Parser for the Digital Twin Swarm Language.
+    Recursive descent parser producing the AST of the Digital Twin Swarm Language.
     """
     
     def __init__(self):
@@ -1084,7 +1103,7 @@ class DTSLParser:
     
     def _current_token(self) -> Token:
         """Get the current token."""
-        if self._is_at_end():
+        if self.current >= len(self.tokens):
             return self.tokens[-1]  # EOF token
         return self.tokens[self.current]
     
@@ -1588,14 +1607,48 @@ class DTSLValidator:
 class DTSLParser:
     """
     Main class for parsing Digital Twin Swarm Language.
+
+    Parse results are cached by a hash of the source, so parsing an unchanged
+    definition again returns the cached AST without lexing or parsing it. The
+    cached AST is shared between callers; copy it before modifying it.
     """
     
-    def __init__(self):
-        self.parser = DTSLParser()
+    def __init__(self, cache_size: int = 128):
+        """
+        Initialize the parser.
+        
+        Args:
+            cache_size: Maximum number of parse results to cache (0 disables caching)
+        """
+        self.parser = DTSLSyntaxParser()
         self.validator = DTSLValidator()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], List[ParseError]]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     def parse(self, source: str) -> Tuple[Dict[str, Any], List[ParseError]]:
         """Parse DTSL source code."""
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            ast, errors = cached
+            return ast, list(errors)
+        self.cache_misses += 1
+        
+        ast, errors = self._parse_uncached(source)
+        
+        if self.cache_size > 0:
+            self._cache[key] = (ast, list(errors))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return ast, errors
+    
+    def _parse_uncached(self, source: str) -> Tuple[Dict[str, Any], List[ParseError]]:
+        """Parse and validate DTSL source code."""
         # Parse the source
         ast, parse_errors = self.parser.parse(source)
         
@@ -1608,6 +1661,10 @@ class DTSLParser:
         
         return ast, validation_errors + parse_errors
     
+    def clear_cache(self) -> None:
+        """Drop all cached parse results."""
+        self._cache.clear()
+    
     def parse_file(self, file_path: str) -> Tuple[Dict[str, Any], List[ParseError]]:
         """Parse DTSL from a file."""
         try:
@@ -1620,4 +1677,3 @@ class DTSLParser:
                 line=0,
                 column=0
             )]
-"""
@@ -11,7 +11,7 @@ Features:
 - Support for all Modbus function codes
 - Security integration with EKIS framework
 - Automatic device discovery
-- Polling and event-based data acquisition
+- Coalesced, fixed-rate polling with change-only (deadband) publishing
 - Batch operations for efficient communication
 - Comprehensive error handling and diagnostics
 - Support for custom function codes
@@ -37,6 +37,9 @@ from protocols.discovery_service import DiscoveryService
 from security.ekis.tpm_integration import TPMSecurityProvider
 from security.ekis.security_handler import EKISSecurityHandler
 
+# Import the per-device poll scheduler
+from industrial.adapters.modbus.poll_scheduler import DevicePollScheduler, PollRequest
+
 # Import Modbus library
 try:
     import pymodbus
@@ -102,6 +105,7 @@ class ModbusAdapter(ProtocolComponent):
         # Initialize clients
         self.clients = {}
         self.polling_tasks = {}
+        self.poll_schedulers: Dict[str, DevicePollScheduler] = {}
         
         # Initialize security handler
         self.security_handler = EKISSecurityHandler(
@@ -230,10 +234,7 @@ class ModbusAdapter(ProtocolComponent):
             if device_id:
                 if device_id in self.clients:
                     # Stop any polling tasks
-                    if device_id in self.polling_tasks:
-                        for task_id, task_info in list(self.polling_tasks.items()):
-                            if task_info["device_id"] == device_id:
-                                await self.stop_polling(task_id)
+                    await self._stop_device_polling(device_id)
                     
                     # Disconnect client
                     client = self.clients[device_id]["client"]
@@ -248,10 +249,7 @@ class ModbusAdapter(ProtocolComponent):
                 # Disconnect from all devices
                 for dev_id, client_info in list(self.clients.items()):
                     # Stop any polling tasks
-                    if dev_id in self.polling_tasks:
-                        for task_id, task_info in list(self.polling_tasks.items()):
-                            if task_info["device_id"] == dev_id:
-                                await self.stop_polling(task_id)
+                    await self._stop_device_polling(dev_id)
                     
                     # Disconnect client
                     client = client_info["client"]
@@ -757,10 +755,16 @@ class ModbusAdapter(ProtocolComponent):
             return {"error": str(e)}
     
     async def start_polling(self, device_id: str, register_type: str, address: int, count: int,
-                           interval: float, data_type: Optional[ModbusDataType] = None) -> str:
+                           interval: float, data_type: Optional[ModbusDataType] = None,
+                           deadband: Optional[float] = 0.0) -> str:
         """
         Start polling a register or coil at regular intervals.
         
+        Polls of one device are run by its DevicePollScheduler, which reads
+        requests falling due together with merged register reads on fixed-rate
+        deadlines. Data is published as a modbus_poll_data event when it
+        changed by more than the deadband.
+        
         Args:
             device_id: ID of the device to poll
             register_type: Type of register to poll ('coil', 'discrete_input', 'holding', 'input')
@@ -768,6 +772,8 @@ class ModbusAdapter(ProtocolComponent):
             count: Number of registers/coils to poll
             interval: Polling interval in seconds
             data_type: Optional data type for conversion
+            deadband: Minimum change of the (converted) value to publish;
+                None publishes every poll
             
         Returns:
             str: Polling task ID if successful, empty string otherwise
@@ -775,56 +781,29 @@ class ModbusAdapter(ProtocolComponent):
         if device_id not in self.clients:
             self.logger.error(f"Not connected to Modbus device {device_id}")
             return ""
-            
+        
         # Generate task ID
         task_id = str(uuid.uuid4())
+        request = PollRequest(
+            task_id=task_id,
+            register_type=register_type,
+            address=address,
+            count=count,
+            interval=interval,
+            data_type=data_type,
+            deadband=deadband
+        )
         
-        # Define polling function
-        async def poll_task():
-            try:
-                while True:
-                    # Read based on register type
-                    if register_type == "coil":
-                        result = await self.read_coils(device_id, address, count)
-                    elif register_type == "discrete_input":
-                        result = await self.read_discrete_inputs(device_id, address, count)
-                    elif register_type == "holding":
-                        result = await self.read_holding_registers(device_id, address, count, data_type)
-                    elif register_type == "input":
-                        result = await self.read_input_registers(device_id, address, count, data_type)
-                    else:
-                        self.logger.error(f"Invalid register type: {register_type}")
-                        return
-                        
-                    # Check for error
-                    if "error" in result:
-                        self.logger.error(f"Error polling device {device_id}: {result['error']}")
-                    else:
-                        # Publish event
-                        await self.publish_event(
-                            MessageFactory.create_event(
-                                "modbus_poll_data",
-                                payload={
-                                    "task_id": task_id,
-                                    "device_id": device_id,
-                                    "register_type": register_type,
-                                    "address": address,
-                                    "count": count,
-                                    "data": result
-                                },
-                                priority=MessagePriority.LOW
-                            )
-                        )
-                    
-                    # Wait for next interval
-                    await asyncio.sleep(interval)
-            except asyncio.CancelledError:
-                self.logger.info(f"Polling task {task_id} cancelled")
-            except Exception as e:
-                self.logger.error(f"Error in polling task {task_id}: {str(e)}")
-        
-        # Start polling task
-        task = asyncio.create_task(poll_task())
+        scheduler = self.poll_schedulers.get(device_id)
+        if scheduler is None:
+            scheduler = self._create_poll_scheduler(device_id)
+        try:
+            scheduler.add(request)
+        except ValueError as e:
+            self.logger.error(f"Cannot poll device {device_id}: {str(e)}")
+            return ""
+        self.poll_schedulers[device_id] = scheduler
+        scheduler.start()
         
         # Store task
         self.polling_tasks[task_id] = {
@@ -834,13 +813,68 @@ class ModbusAdapter(ProtocolComponent):
             "count": count,
             "interval": interval,
             "data_type": data_type.value if data_type else None,
-            "task": task,
+            "deadband": deadband,
             "started_at": datetime.now()
         }
         
         self.logger.info(f"Started polling task {task_id} for device {device_id}")
         return task_id
     
+    def _create_poll_scheduler(self, device_id: str) -> DevicePollScheduler:
+        """Create the poll scheduler of a connected device."""
+        async def read(register_type: str, address: int, count: int) -> Dict[str, Any]:
+            if register_type == "coil":
+                return await self.read_coils(device_id, address, count)
+            elif register_type == "discrete_input":
+                return await self.read_discrete_inputs(device_id, address, count)
+            elif register_type == "holding":
+                return await self.read_holding_registers(device_id, address, count)
+            else:
+                return await self.read_input_registers(device_id, address, count)
+        
+        def decode(request: PollRequest, values: List[Any]) -> Any:
+            if request.data_type and request.register_type in ("holding", "input") and values:
+                try:
+                    return self._convert_registers(values, request.data_type)
+                except Exception as e:
+                    self.logger.error(f"Error converting polled registers from device {device_id}: {str(e)}")
+            return values
+        
+        async def publish(request: PollRequest, values: List[Any], value: Any, timestamp: str):
+            data = {
+                "device_id": device_id,
+                "address": request.address,
+                "count": request.count,
+                "values": values,
+                "timestamp": timestamp
+            }
+            if value is not values:
+                data["converted_value"] = value
+                data["data_type"] = request.data_type.value
+            await self.publish_event(
+                MessageFactory.create_event(
+                    "modbus_poll_data",
+                    payload={
+                        "task_id": request.task_id,
+                        "device_id": device_id,
+                        "register_type": request.register_type,
+                        "address": request.address,
+                        "count": request.count,
+                        "data": data
+                    },
+                    priority=MessagePriority.LOW
+                )
+            )
+        
+        return DevicePollScheduler(
+            device_id,
+            read,
+            publish,
+            decode=decode,
+            max_in_flight=self.config.get("poll_max_in_flight", 1),
+            logger=self.logger
+        )
+    
     async def stop_polling(self, task_id: str) -> bool:
         """
         Stop a polling task.
@@ -856,15 +890,15 @@ class ModbusAdapter(ProtocolComponent):
             return False
             
         try:
-            # Get task
-            task_info = self.polling_tasks[task_id]
-            task = task_info["task"]
-            
-            # Cancel task
-            task.cancel()
-            
-            # Remove from polling tasks
-            del self.polling_tasks[task_id]
+            # Remove from polling tasks and from the device's scheduler
+            task_info = self.polling_tasks.pop(task_id)
+            device_id = task_info["device_id"]
+            scheduler = self.poll_schedulers.get(device_id)
+            if scheduler is not None:
+                scheduler.remove(task_id)
+                if not scheduler.requests:
+                    await scheduler.stop()
+                    del self.poll_schedulers[device_id]
             
             self.logger.info(f"Stopped polling task {task_id}")
             return True
@@ -873,16 +907,43 @@ class ModbusAdapter(ProtocolComponent):
             self.logger.error(f"Error stopping polling task {task_id}: {str(e)}")
             return False
     
+    async def _stop_device_polling(self, device_id: str):
+        """Stop every polling task of a device."""
+        for task_id, task_info in list(self.polling_tasks.items()):
+            if task_info["device_id"] == device_id:
+                await self.stop_polling(task_id)
+    
+    def get_polling_stats(self, device_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get polling statistics.
+        
+        Args:
+            device_id: ID of the device to get statistics for.
+                      If None, get statistics for all polled devices.
+                      
+        Returns:
+            Dict mapping device IDs to read, publish and overrun counts,
+            poll jitter and read latency
+        """
+        if device_id is not None:
+            scheduler = self.poll_schedulers.get(device_id)
+            return {device_id: scheduler.stats()} if scheduler else {}
+        return {dev_id: scheduler.stats() for dev_id, scheduler in self.poll_schedulers.items()}
+    
     async def discover_devices(self, start_ip: str, end_ip: str, port: int = 502, 
-                              timeout: float = 0.5) -> List[Dict[str, Any]]:
+                              timeout: float = 0.5, max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Discover Modbus TCP devices on a network.
         
+        Addresses are probed concurrently, at most max_concurrency at a time.
+        
         Args:
             start_ip: Starting IP address
             end_ip: Ending IP address
             port: Port to scan
             timeout: Connection timeout in seconds
+            max_concurrency: Maximum concurrent probes (defaults to the
+                "discovery_concurrency" config value, or 64)
             
         Returns:
             List of discovered devices
@@ -903,11 +964,17 @@ class ModbusAdapter(ProtocolComponent):
             self.logger.error(f"Invalid IP range: {start_ip} - {end_ip}")
             return []
             
-        # Prepare discovery tasks
+        # Prepare discovery tasks, bounded so large ranges do not open every socket at once
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.get("discovery_concurrency", 64))
+        
+        async def check(ip: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._check_device(ip, port, timeout)
+        
         tasks = []
         for ip_int in range(start_int, end_int + 1):
             ip = f"{(ip_int >> 24) & 0xFF}.{(ip_int >> 16) & 0xFF}.{(ip_int >> 8) & 0xFF}.{ip_int & 0xFF}"
-            tasks.append(self._check_device(ip, port, timeout))
+            tasks.append(check(ip))
             
         # Run discovery tasks
         self.logger.info(f"Starting discovery of Modbus TCP devices in range {start_ip} - {end_ip}")
@@ -1210,7 +1277,8 @@ class ModbusAdapter(ProtocolComponent):
                     params.get("address", 0),
                     params.get("count", 1),
                     params.get("interval", 1.0),
-                    data_type
+                    data_type,
+                    params.get("deadband", 0.0)
                 )
                 return MessageFactory.create_response(message, result={"task_id": task_id})
                 
@@ -1218,12 +1286,17 @@ class ModbusAdapter(ProtocolComponent):
                 success = await self.stop_polling(params.get("task_id", ""))
                 return MessageFactory.create_response(message, result={"success": success})
                 
+            elif command == "get_polling_stats":
+                result = self.get_polling_stats(params.get("device_id"))
+                return MessageFactory.create_response(message, result=result)
+                
             elif command == "discover_devices":
                 result = await self.discover_devices(
                     params.get("start_ip", ""),
                     params.get("end_ip", ""),
                     params.get("port", 502),
-                    params.get("timeout", 0.5)
+                    params.get("timeout", 0.5),
+                    params.get("max_concurrency")
                 )
                 return MessageFactory.create_response(message, result=result)
                 
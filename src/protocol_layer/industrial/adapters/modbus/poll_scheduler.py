@@ -0,0 +1,375 @@
+"""
+Modbus Poll Scheduler for Industriverse Protocol Layer
+
+This module schedules the polling of one Modbus device for the ModbusAdapter:
+- Poll requests that fall due together are coalesced, and their overlapping or
+  adjacent address ranges are merged into the fewest reads the Modbus limits
+  allow (125 registers or 2000 coils/discrete inputs per read)
+- Polls run on fixed-rate deadlines (epoch + n * interval), so time spent
+  reading and publishing does not accumulate as drift
+- The number of reads in flight on the device connection is bounded
+- Data is only published when it changed by more than the request's deadband
+- Poll jitter, read latency and missed deadlines are recorded
+- A failing decode or publish callback is logged and counted without
+  stopping the polling of the device
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+# Maximum number of items one Modbus read may return, by register type
+MAX_READ_COUNT = {
+    "coil": 2000,
+    "discrete_input": 2000,
+    "holding": 125,
+    "input": 125,
+}
+
+
+@dataclass
+class PollRequest:
+    """A range of one register type polled at a fixed interval."""
+    task_id: str
+    register_type: str
+    address: int
+    count: int
+    interval: float
+    data_type: Any = None
+    # Publish only when a value moved by more than this; None publishes every poll
+    deadband: Optional[float] = 0.0
+    # Index of the next deadline on the scheduler's grid of this interval
+    next_tick: int = 0
+    last_value: Any = None
+    has_value: bool = False
+
+    @property
+    def end(self) -> int:
+        return self.address + self.count
+
+
+@dataclass
+class ReadBlock:
+    """One Modbus read covering the ranges of one or more poll requests."""
+    register_type: str
+    address: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        return self.address + self.count
+
+
+def plan_reads(requests: List[PollRequest],
+               max_counts: Optional[Dict[str, int]] = None) -> List[ReadBlock]:
+    """
+    Merge the address ranges of poll requests into as few reads as possible.
+
+    Overlapping and adjacent ranges of the same register type are merged, and
+    each merged range is split into reads of at most the Modbus limit.
+
+    Args:
+        requests: The poll requests to cover
+        max_counts: Maximum read size by register type (defaults to MAX_READ_COUNT)
+
+    Returns:
+        Reads ordered by register type and address
+    """
+    max_counts = max_counts or MAX_READ_COUNT
+    ranges_by_type: Dict[str, List[Tuple[int, int]]] = {}
+    for request in requests:
+        ranges_by_type.setdefault(request.register_type, []).append((request.address, request.end))
+
+    blocks = []
+    for register_type in sorted(ranges_by_type):
+        limit = max_counts[register_type]
+        ranges = sorted(ranges_by_type[register_type])
+        merged = [list(ranges[0])]
+        for start, end in ranges[1:]:
+            if start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            for address in range(start, end, limit):
+                blocks.append(ReadBlock(register_type, address, min(limit, end - address)))
+    return blocks
+
+
+def value_changed(previous: Any, value: Any, deadband: float) -> bool:
+    """Whether a polled value differs from the previous one by more than the deadband."""
+    if isinstance(value, (list, tuple)):
+        if not isinstance(previous, (list, tuple)) or len(previous) != len(value):
+            return True
+        return any(value_changed(p, v, deadband) for p, v in zip(previous, value))
+    numeric = (int, float)
+    if (isinstance(value, bool) or isinstance(previous, bool)
+            or not isinstance(value, numeric) or not isinstance(previous, numeric)):
+        return value != previous
+    if math.isnan(value) or math.isnan(previous):
+        return math.isnan(value) != math.isnan(previous)
+    return abs(value - previous) > deadband
+
+
+class TimingStats:
+    """Count, mean and maximum of a duration, with a percentile over recent samples."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        """Milliseconds; p95 is over the recent window."""
+        if not self.count:
+            return {"count": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p95_ms": recent[min(len(recent) - 1, int(0.95 * len(recent)))] * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class _ReadPlan:
+    """The reads for a set of due requests and where each request's values lie in them."""
+
+    def __init__(self, requests: List[PollRequest], max_counts: Optional[Dict[str, int]]):
+        self.blocks = plan_reads(requests, max_counts)
+        starts: Dict[str, List[int]] = {}
+        indices: Dict[str, List[int]] = {}
+        for i, block in enumerate(self.blocks):
+            starts.setdefault(block.register_type, []).append(block.address)
+            indices.setdefault(block.register_type, []).append(i)
+
+        # task_id -> [(block index, start offset, end offset)]
+        self.slices: Dict[str, List[Tuple[int, int, int]]] = {}
+        for request in requests:
+            type_starts = starts[request.register_type]
+            type_indices = indices[request.register_type]
+            k = bisect.bisect_right(type_starts, request.address) - 1
+            parts = []
+            address = request.address
+            while address < request.end:
+                block = self.blocks[type_indices[k]]
+                stop = min(block.end, request.end)
+                parts.append((type_indices[k], address - block.address, stop - block.address))
+                address = stop
+                k += 1
+            self.slices[request.task_id] = parts
+
+
+class DevicePollScheduler:
+    """
+    Polls the registers of one device on fixed-rate deadlines.
+
+    Deadlines of requests with the same interval lie on one grid starting at
+    the scheduler's epoch, so they fall due together and are read together;
+    a new request is first polled at the next point on its grid. When a poll
+    runs past later deadlines, those polls are skipped and counted as overruns.
+    """
+
+    def __init__(self,
+                 device_id: str,
+                 read: Callable[[str, int, int], Awaitable[Dict[str, Any]]],
+                 publish: Callable[[PollRequest, List[Any], Any, str], Awaitable[None]],
+                 decode: Optional[Callable[[PollRequest, List[Any]], Any]] = None,
+                 max_in_flight: int = 1,
+                 max_counts: Optional[Dict[str, int]] = None,
+                 coalesce_window: float = 0.001,
+                 clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            device_id: ID of the polled device
+            read: Coroutine reading (register_type, address, count), returning a
+                dict with "values" or "error" like the adapter's read methods
+            publish: Coroutine called with (request, raw values, decoded value,
+                timestamp) when a request's data should be published
+            decode: Optional function turning a request's raw values into the
+                value compared against its deadband (raw values by default)
+            max_in_flight: Maximum concurrent reads on the device connection
+            max_counts: Maximum read size by register type (defaults to MAX_READ_COUNT)
+            coalesce_window: Requests due within this many seconds of the
+                earliest deadline are polled together with it
+            clock: Monotonic clock in seconds
+            logger: Logger for read, decode and publish errors
+        """
+        self.device_id = device_id
+        self._read = read
+        self._publish = publish
+        self._decode = decode
+        self.max_in_flight = max_in_flight
+        self.max_counts = max_counts
+        self.coalesce_window = coalesce_window
+        self._clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.requests: Dict[str, PollRequest] = {}
+        self._plans: Dict[FrozenSet[str], _ReadPlan] = {}
+        self._epoch = clock()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.counters = {
+            "polls": 0,
+            "reads": 0,
+            "items_read": 0,
+            "read_errors": 0,
+            "published": 0,
+            "suppressed": 0,
+            "publish_errors": 0,
+            "overruns": 0,
+        }
+        self.jitter = TimingStats()
+        self.read_latency = TimingStats()
+
+    def _deadline(self, request: PollRequest) -> float:
+        return self._epoch + request.next_tick * request.interval
+
+    def add(self, request: PollRequest):
+        """Add a poll request, first due at the next point on its interval's grid."""
+        if request.interval <= 0:
+            raise ValueError(f"Polling interval must be positive, got {request.interval}")
+        if request.register_type not in MAX_READ_COUNT:
+            raise ValueError(f"Invalid register type: {request.register_type}")
+        if request.count <= 0:
+            raise ValueError(f"Polled count must be positive, got {request.count}")
+        elapsed = self._clock() - self._epoch - self.coalesce_window
+        request.next_tick = max(0, math.ceil(elapsed / request.interval))
+        self.requests[request.task_id] = request
+        self._plans.clear()
+        self._wakeup.set()
+
+    def remove(self, task_id: str) -> bool:
+        """Remove a poll request; returns False if it was not scheduled."""
+        if self.requests.pop(task_id, None) is None:
+            return False
+        self._plans.clear()
+        self._wakeup.set()
+        return True
+
+    def start(self):
+        """Start the polling loop if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the polling loop, keeping the requests."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                # The loop already died; stopping it still succeeds
+                self.logger.error(f"Polling loop of device {self.device_id} had failed: {e}")
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, poll jitter (start time past the deadline) and read latency."""
+        return {
+            "device_id": self.device_id,
+            "requests": len(self.requests),
+            **self.counters,
+            "jitter": self.jitter.summary(),
+            "read_latency": self.read_latency.summary(),
+        }
+
+    async def _run(self):
+        while self.requests:
+            due_at = min(self._deadline(request) for request in self.requests.values())
+            delay = due_at - self._clock()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            cutoff = due_at + self.coalesce_window
+            due = [request for request in self.requests.values() if self._deadline(request) <= cutoff]
+            self.jitter.add(self._clock() - due_at)
+            await self._poll(due)
+
+            now = self._clock()
+            for request in due:
+                request.next_tick += 1
+                deadline = self._deadline(request)
+                if deadline < now:
+                    missed = math.floor((now - deadline) / request.interval) + 1
+                    request.next_tick += missed
+                    self.counters["overruns"] += missed
+
+    async def _read_block(self, block: ReadBlock) -> Dict[str, Any]:
+        async with self._semaphore:
+            started = self._clock()
+            try:
+                result = await self._read(block.register_type, block.address, block.count)
+            except Exception as e:
+                result = {"error": str(e)}
+            self.read_latency.add(self._clock() - started)
+        return result
+
+    async def _poll(self, due: List[PollRequest]):
+        key = frozenset(request.task_id for request in due)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = _ReadPlan(due, self.max_counts)
+
+        results = await asyncio.gather(*(self._read_block(block) for block in plan.blocks))
+        self.counters["reads"] += len(plan.blocks)
+        for block, result in zip(plan.blocks, results):
+            if "error" in result:
+                self.counters["read_errors"] += 1
+                self.logger.error(f"Error polling device {self.device_id} {block.register_type} "
+                                  f"{block.address}-{block.end - 1}: {result['error']}")
+            else:
+                self.counters["items_read"] += block.count
+
+        timestamp = datetime.now().isoformat()
+        for request in due:
+            # Skip requests removed while their reads were in flight
+            if request.task_id not in self.requests:
+                continue
+            parts = plan.slices[request.task_id]
+            if any("error" in results[i] for i, _, _ in parts):
+                continue
+            values = [v for i, lo, hi in parts for v in results[i]["values"][lo:hi]]
+            self.counters["polls"] += 1
+
+            try:
+                value = self._decode(request, values) if self._decode else values
+                if (request.deadband is not None and request.has_value
+                        and not value_changed(request.last_value, value, request.deadband)):
+                    self.counters["suppressed"] += 1
+                    continue
+                await self._publish(request, values, value, timestamp)
+            except Exception as e:
+                # One bad request must not stop the device's polling loop
+                self.counters["publish_errors"] += 1
+                self.logger.error(f"Error publishing poll {request.task_id} of device {self.device_id}: {e}")
+                continue
+            # Only a published value becomes the deadband reference
+            request.last_value = value
+            request.has_value = True
+            self.counters["published"] += 1
@@ -10,7 +10,7 @@ Features:
 - Support for QoS levels 0, 1, and 2
 - TLS/SSL encryption with certificate validation
 - Authentication (username/password, client certificates)
-- Topic subscription with wildcards
+- Topic subscription with wildcards, dispatched through a per-broker topic trie
 - Message retention and persistence
 - Last Will and Testament (LWT) messages
 - Shared subscriptions
@@ -28,7 +28,9 @@ import asyncio
 import json
 import logging
 import ssl
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple, Union, Callable
@@ -42,6 +44,9 @@ from protocols.discovery_service import DiscoveryService
 from security.ekis.tpm_integration import TPMSecurityProvider
 from security.ekis.security_handler import EKISSecurityHandler
 
+# Import the subscription index
+from industrial.adapters.mqtt.topic_trie import TopicTrie
+
 # Import MQTT library
 try:
     import asyncio_mqtt
@@ -93,7 +98,19 @@ class MQTTAdapter(ProtocolComponent):
         self.clients = {}
         self.subscriptions = {}
         self.message_handlers = {}
-        self.topic_cache = {}
+        self.topic_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.topic_tries: Dict[str, TopicTrie] = {}
+        # Least recently seen topics are evicted beyond topic_cache_size; payloads
+        # larger than topic_cache_payload_bytes are summarized instead of kept
+        self.topic_cache_size = self.config.get("topic_cache_size", 10000)
+        self.topic_cache_payload_bytes = self.config.get("topic_cache_payload_bytes", 1024)
+        
+        # Received messages publish one mqtt_message_received event each;
+        # event_batch_size > 1 opts into batched mqtt_messages_received events
+        self.event_batch_size = self.config.get("event_batch_size", 1)
+        self.event_flush_interval = self.config.get("event_flush_interval", 0.05)
+        self._event_buffer: List[Dict[str, Any]] = []
+        self._event_flush_task: Optional[asyncio.Task] = None
         
         # Initialize security handler
         self.security_handler = EKISSecurityHandler(
@@ -250,6 +267,7 @@ class MQTTAdapter(ProtocolComponent):
                     for sub_id, sub_info in list(self.subscriptions.items()):
                         if sub_info["broker_id"] == broker_id:
                             del self.subscriptions[sub_id]
+                    self.topic_tries.pop(broker_id, None)
                     
                     # Disconnect client
                     await client.disconnect()
@@ -269,6 +287,7 @@ class MQTTAdapter(ProtocolComponent):
                 # Clear clients and subscriptions
                 self.clients = {}
                 self.subscriptions = {}
+                self.topic_tries = {}
                 return True
                 
         except Exception as e:
@@ -360,8 +379,9 @@ class MQTTAdapter(ProtocolComponent):
                 "created_at": datetime.now()
             }
             
-            # Add to client's subscriptions
+            # Add to client's subscriptions and the broker's topic trie
             client_info["subscriptions"].add(topic)
+            self.topic_tries.setdefault(broker_id, TopicTrie()).add(topic, subscription_id)
             
             self.logger.info(f"Subscribed to topic {topic} on broker {broker_id} with ID {subscription_id}")
             return subscription_id
@@ -411,6 +431,9 @@ class MQTTAdapter(ProtocolComponent):
                 
             # Remove subscription
             del self.subscriptions[subscription_id]
+            trie = self.topic_tries.get(broker_id)
+            if trie is not None:
+                trie.remove(subscription_id)
             
             self.logger.info(f"Unsubscribed from topic {topic} on broker {broker_id}")
             return True
@@ -469,75 +492,152 @@ class MQTTAdapter(ProtocolComponent):
         """
         Handle an incoming MQTT message.
         
+        Matching subscriptions are looked up in the broker's topic trie. The
+        payload is decoded as JSON only once something needs it: a matching
+        subscription callback, or the flush of the received-message events.
+        
         Args:
             broker_id: ID of the broker the message came from
             message: MQTT message object
         """
         try:
-            # Extract message details
             topic = message.topic
             payload = message.payload
-            qos = message.qos
-            retain = message.retain
             
-            # Try to decode payload as JSON
-            try:
-                payload_dict = json.loads(payload.decode('utf-8'))
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # Not JSON, keep as bytes
-                payload_dict = None
-                
+            now = time.time()
+            self._update_topic_cache(topic, payload, now)
+            
+            # Find matching subscriptions
+            trie = self.topic_tries.get(broker_id)
+            if trie is None:
+                return
+            matching_ids = trie.match(topic)
+            if not matching_ids:
+                return
+            
             # Format message
             msg = {
                 "broker_id": broker_id,
                 "topic": topic,
-                "payload": payload_dict if payload_dict is not None else payload,
+                "payload": payload,
                 "payload_raw": payload,
-                "qos": qos,
-                "retain": retain,
-                "timestamp": datetime.now().isoformat()
+                "qos": message.qos,
+                "retain": message.retain,
+                "timestamp": datetime.fromtimestamp(now).isoformat()
             }
             
-            # Find matching subscriptions
-            matching_subs = []
-            for sub_id, sub_info in self.subscriptions.items():
-                if sub_info["broker_id"] == broker_id and self._topic_matches(sub_info["topic"], topic):
-                    matching_subs.append((sub_id, sub_info))
-                    
             # Call callbacks for matching subscriptions
-            for sub_id, sub_info in matching_subs:
-                if sub_info["callback"]:
-                    try:
-                        await sub_info["callback"](msg)
-                    except Exception as e:
-                        self.logger.error(f"Error in subscription callback for {sub_id}: {str(e)}")
-                        
-            # Publish event if any subscriptions matched
-            if matching_subs:
-                await self.publish_event(
-                    MessageFactory.create_event(
-                        "mqtt_message_received",
-                        payload=msg,
-                        priority=MessagePriority.LOW
-                    )
-                )
-                
-            # Update topic cache
-            if topic not in self.topic_cache:
-                self.topic_cache[topic] = {
-                    "first_seen": datetime.now().isoformat(),
-                    "message_count": 1,
-                    "last_payload_type": type(payload_dict).__name__ if payload_dict is not None else "bytes",
-                    "last_seen": datetime.now().isoformat()
-                }
-            else:
-                self.topic_cache[topic]["message_count"] += 1
-                self.topic_cache[topic]["last_payload_type"] = type(payload_dict).__name__ if payload_dict is not None else "bytes"
-                self.topic_cache[topic]["last_seen"] = datetime.now().isoformat()
+            for sub_id in matching_ids:
+                sub_info = self.subscriptions.get(sub_id)
+                if sub_info is None or not sub_info["callback"]:
+                    continue
+                self._decode_message_payload(msg)
+                try:
+                    await sub_info["callback"](msg)
+                except Exception as e:
+                    self.logger.error(f"Error in subscription callback for {sub_id}: {str(e)}")
+            
+            await self._queue_message_event(msg)
                 
         except Exception as e:
             self.logger.error(f"Error handling MQTT message: {str(e)}")
     
+    def _update_topic_cache(self, topic: str, payload: bytes, now: float):
+        """
+        Record a message in the topic cache.
+        
+        Small payloads are kept raw and typed only on discovery; larger ones
+        are typed now and not retained. Beyond topic_cache_size topics the
+        least recently seen one is evicted.
+        """
+        entry = self.topic_cache.get(topic)
+        if entry is None:
+            entry = self.topic_cache[topic] = {"first_seen": now, "message_count": 0}
+            if len(self.topic_cache) > self.topic_cache_size:
+                self.topic_cache.popitem(last=False)
+        else:
+            self.topic_cache.move_to_end(topic)
+        entry["message_count"] += 1
+        entry["last_seen"] = now
+        if len(payload) <= self.topic_cache_payload_bytes:
+            entry["last_payload"] = payload
+            entry["last_payload_type"] = None
+        else:
+            entry["last_payload"] = None
+            entry["last_payload_type"] = self._payload_type(payload)
+    
+    @classmethod
+    def _payload_type(cls, payload: bytes) -> str:
+        decoded = cls._decode_payload(payload)
+        return "bytes" if isinstance(decoded, bytes) else type(decoded).__name__
+    
+    @staticmethod
+    def _decode_payload(payload: bytes) -> Any:
+        """Decode a payload as JSON, returning the raw bytes if it is not JSON."""
+        try:
+            return json.loads(payload.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return payload
+    
+    def _decode_message_payload(self, msg: Dict[str, Any]):
+        """Decode a formatted message's payload in place, unless already done."""
+        if msg["payload"] is msg["payload_raw"]:
+            msg["payload"] = self._decode_payload(msg["payload_raw"])
+    
+    async def _queue_message_event(self, msg: Dict[str, Any]):
+        """
+        Publish the event for a received message.
+        
+        With the default batch size of 1 every message is published as its
+        own mqtt_message_received event. A larger event_batch_size buffers
+        messages into one mqtt_messages_received event, flushed when the
+        buffer is full or event_flush_interval seconds after its first message.
+        """
+        if self.event_batch_size <= 1:
+            self._decode_message_payload(msg)
+            await self.publish_event(
+                MessageFactory.create_event(
+                    "mqtt_message_received",
+                    payload=msg,
+                    priority=MessagePriority.LOW
+                )
+            )
+            return
+            
+        self._event_buffer.append(msg)
+        if len(self._event_buffer) >= self.event_batch_size:
+            await self._flush_message_events()
+        elif self._event_flush_task is None:
+            self._event_flush_task = asyncio.create_task(self._flush_message_events_later())
+    
+    async def _flush_message_events_later(self):
+        """Flush the received-message events after event_flush_interval seconds."""
+        await asyncio.sleep(self.event_flush_interval)
+        self._event_flush_task = None
+        await self._flush_message_events()
+    
+    async def _flush_message_events(self):
+        """Publish the buffered received messages as one mqtt_messages_received event."""
+        if self._event_flush_task is not None and self._event_flush_task is not asyncio.current_task():
+            self._event_flush_task.cancel()
+        self._event_flush_task = None
+        if not self._event_buffer:
+            return
+            
+        batch, self._event_buffer = self._event_buffer, []
+        for msg in batch:
+            self._decode_message_payload(msg)
+        try:
+            await self.publish_event(
+                MessageFactory.create_event(
+                    "mqtt_messages_received",
+                    payload={"count": len(batch), "messages": batch},
+                    priority=MessagePriority.LOW
+                )
+            )
+        except Exception as e:
+            self.logger.error(f"Error publishing {len(batch)} received MQTT messages: {str(e)}")
+    
     def _topic_matches(self, subscription_topic: str, message_topic: str) -> bool:
         """
         Check if a message topic matches a subscription topic pattern.
@@ -603,7 +703,7 @@ class MQTTAdapter(ProtocolComponent):
             return []
             
         # Clear topic cache
-        self.topic_cache = {}
+        self.topic_cache = OrderedDict()
         
         # Subscribe to discovery topic
         subscription_id = await self.subscribe(broker_id, base_topic, MQTTQoS.AT_MOST_ONCE)
@@ -622,9 +722,13 @@ class MQTTAdapter(ProtocolComponent):
             # Format results
             results = []
             for topic, metadata in self.topic_cache.items():
+                payload_type = metadata["last_payload_type"] or self._payload_type(metadata["last_payload"])
                 results.append({
                     "topic": topic,
-                    **metadata
+                    "first_seen": datetime.fromtimestamp(metadata["first_seen"]).isoformat(),
+                    "message_count": metadata["message_count"],
+                    "last_payload_type": payload_type,
+                    "last_seen": datetime.fromtimestamp(metadata["last_seen"]).isoformat()
                 })
                 
             self.logger.info(f"Discovered {len(results)} topics on broker {broker_id}")
@@ -866,6 +970,9 @@ class MQTTAdapter(ProtocolComponent):
         """
         self.logger.info(f"Shutting down MQTT Adapter {self.component_id}")
         
+        # Publish any buffered received-message events
+        await self._flush_message_events()
+        
         # Disconnect all clients
         await self.disconnect()
         
@@ -0,0 +1,134 @@
+"""
+MQTT Topic Trie for Industriverse Protocol Layer
+
+This module provides the subscription index behind MQTTAdapter message
+dispatch. Subscription filters are stored level by level in a trie, so
+matching a message topic walks only the branches its levels (or the '+' and
+'#' wildcards) lead to, instead of testing every subscription. Results are
+memoized per topic until the subscriptions change, since sensor topics repeat
+at a high rate.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class _TopicNode:
+    """A topic level: child levels by name (including '+' and '#') and the keys whose filter ends here."""
+
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children: Dict[str, "_TopicNode"] = {}
+        self.keys: Dict[Hashable, int] = {}  # key -> subscription sequence number
+
+
+class TopicTrie:
+    """
+    Wildcard-aware index of MQTT subscription filters.
+
+    Matching follows MQTTAdapter's topic semantics: '+' matches exactly one
+    level (which may be empty) and '#' matches the rest of the topic,
+    including the parent level itself ('a/#' matches 'a').
+    """
+
+    def __init__(self, max_cached_topics: int = 10000):
+        """
+        Initialize the trie.
+
+        Args:
+            max_cached_topics: Maximum number of topics whose matches are
+                memoized; the memo is dropped when it grows past this
+        """
+        self._root = _TopicNode()
+        self._filters: Dict[Hashable, str] = {}
+        self._sequence = 0
+        self.max_cached_topics = max_cached_topics
+        self._match_cache: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._filters)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._filters
+
+    def add(self, topic_filter: str, key: Hashable):
+        """Index a subscription filter under a key, replacing the key's previous filter."""
+        if key in self._filters:
+            self.remove(key)
+        node = self._root
+        for level in topic_filter.split('/'):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        self._sequence += 1
+        node.keys[key] = self._sequence
+        self._filters[key] = topic_filter
+        self._match_cache.clear()
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a key's filter; returns False if the key is not indexed."""
+        topic_filter = self._filters.pop(key, None)
+        if topic_filter is None:
+            return False
+        path = [self._root]
+        for level in topic_filter.split('/'):
+            path.append(path[-1].children[level])
+        del path[-1].keys[key]
+        # Prune levels left without keys or children
+        levels = topic_filter.split('/')
+        for depth in range(len(levels), 0, -1):
+            node = path[depth]
+            if node.keys or node.children:
+                break
+            del path[depth - 1].children[levels[depth - 1]]
+        self._match_cache.clear()
+        return True
+
+    def filter_of(self, key: Hashable) -> Optional[str]:
+        return self._filters.get(key)
+
+    def match(self, topic: str) -> List[Any]:
+        """
+        Keys of the filters matching a topic.
+
+        Returns:
+            Matching keys in the order their filters were added (the list is
+            shared with the memo and must not be modified)
+        """
+        cached = self._match_cache.get(topic)
+        if cached is not None:
+            return cached
+
+        found: Dict[Hashable, int] = {}
+        nodes = [self._root]
+        for level in topic.split('/'):
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if not children:
+                    continue
+                multi = children.get('#')
+                if multi is not None:
+                    found.update(multi.keys)
+                exact = children.get(level)
+                if exact is not None:
+                    next_nodes.append(exact)
+                single = children.get('+')
+                if single is not None:
+                    next_nodes.append(single)
+            nodes = next_nodes
+            if not nodes:
+                break
+        for node in nodes:
+            found.update(node.keys)
+            # '#' also matches the level it follows
+            multi = node.children.get('#')
+            if multi is not None:
+                found.update(multi.keys)
+
+        keys = sorted(found, key=found.__getitem__) if len(found) > 1 else list(found)
+        if len(self._match_cache) >= self.max_cached_topics:
+            self._match_cache.clear()
+        self._match_cache[topic] = keys
+        return keys
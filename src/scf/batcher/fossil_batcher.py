@@ -1,22 +1,85 @@
 import json
 import os
+import heapq
 import pickle
+import hashlib
+import itertools
 import uuid
 from pathlib import Path
-from typing import Iterator, List, Dict, Any
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import torch
 
 from src.scf.config import FOSSIL_VAULT
 
+# Checkpointed read position per vault file plus not-yet-batched fossils
+CURSOR_NAME = ".batcher_cursor.json"
+# Append-only log of 16-byte digests of every fossil already batched
+SEEN_NAME = ".batched_hashes.bin"
+DIGEST_SIZE = 16
+
 class FossilBatcher:
-    def __init__(self, fossils_dir: str = None, batch_dir: str = "data/energy_atlas/fossil_batches", batch_size: int = 250):
+    """
+    Turns vault fossils into training batches incrementally.
+
+    A per-file byte-offset cursor means each daemon tick only reads data
+    appended since the last one, fossils already batched are dropped by
+    hash, and finished batches are saved as compact tensor files (.pt) and
+    queued until build_batch() pops them (FIFO, or by negentropy score with
+    priority="negentropy").
+    """
+    def __init__(self, fossils_dir: str = None, batch_dir: str = "data/energy_atlas/fossil_batches",
+                 batch_size: int = 250, priority: str = "fifo"):
         # Use config path if not provided
         self.fossils_dir = Path(fossils_dir) if fossils_dir else FOSSIL_VAULT
         self.batch_dir = Path(batch_dir)
         self.batch_size = batch_size
+        self.priority = priority
         self.fossils_dir.mkdir(parents=True, exist_ok=True)
         self.batch_dir.mkdir(parents=True, exist_ok=True)
 
+        self.cursor_path = self.batch_dir / CURSOR_NAME
+        self.seen_path = self.batch_dir / SEEN_NAME
+        self.offsets: Dict[str, int] = {}
+        self.pending: List[Dict[str, Any]] = []
+        self.seen = set()
+        self._ready: List[Tuple[float, int, Path]] = []
+        self._seq = itertools.count()
+        # Popped with archive=False and awaiting archive_batch, by batch_id
+        self._leased: Dict[str, Path] = {}
+        self._load_state()
+
+    def _load_state(self):
+        if self.cursor_path.exists():
+            with open(self.cursor_path) as f:
+                state = json.load(f)
+            self.offsets = state.get("offsets", {})
+            self.pending = state.get("pending", [])
+        if self.seen_path.exists():
+            data = self.seen_path.read_bytes()
+            usable = len(data) - len(data) % DIGEST_SIZE
+            self.seen = {data[i:i + DIGEST_SIZE] for i in range(0, usable, DIGEST_SIZE)}
+        self.seen.update(self.fossil_digest(f) for f in self.pending)
+        # Batches saved but not yet consumed go back on the queue, oldest first
+        existing = list(self.batch_dir.glob("*.pt")) + list(self.batch_dir.glob("*.pkl"))
+        for fp in sorted(existing, key=lambda p: p.stat().st_mtime):
+            self._enqueue(fp, 0.0)
+
+    def _save_cursor(self):
+        tmp_path = self.cursor_path.with_name(self.cursor_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"offsets": self.offsets, "pending": self.pending}, f)
+        os.replace(tmp_path, self.cursor_path)
+
+    @staticmethod
+    def fossil_digest(fossil: Dict[str, Any]) -> bytes:
+        """Dedup key: the fossil's signed hash if present, else its canonical JSON."""
+        key = fossil.get("hash") or json.dumps(fossil, sort_keys=True, default=str)
+        return hashlib.blake2b(str(key).encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+    def _vault_files(self) -> List[Path]:
+        files = list(self.fossils_dir.glob("**/*.json")) + list(self.fossils_dir.glob("**/*.ndjson"))
+        return sorted(fp for fp in files if not fp.name.startswith("."))
+
     def load_fossils_stream(self) -> Iterator[Dict[str, Any]]:
         """Yields one fossil at a time (memory safe)."""
         # Supports both individual JSON files and NDJSON streams
@@ -25,7 +88,7 @@ class FossilBatcher:
                 yield json.load(open(fp))
             except Exception:
                 pass
-        
+
         for fp in self.fossils_dir.glob("**/*.ndjson"):
             try:
                 with open(fp) as f:
@@ -35,19 +98,65 @@ class FossilBatcher:
             except Exception:
                 pass
 
+    def _read_new(self, fp: Path) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Yields (fossil, offset after it) for data past the file's cursor.
+        A trailing line without a newline is still being written and is left
+        for the next tick.
+        """
+        key = str(fp)
+        size = fp.stat().st_size
+        offset = self.offsets.get(key, 0)
+        if size < offset:
+            # Truncated or replaced: re-read, dedup drops what was batched
+            offset = 0
+        if size == offset:
+            return
+
+        if fp.suffix == ".json":
+            try:
+                with open(fp) as f:
+                    data = json.load(f)
+            except Exception:
+                return
+            items = data if isinstance(data, list) else [data]
+            for i, item in enumerate(items):
+                if isinstance(item, dict):
+                    # Whole-file granularity: a partial read is redone (and deduped)
+                    yield item, size if i == len(items) - 1 else offset
+            self.offsets[key] = size
+            return
+
+        with open(fp, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+                try:
+                    fossil = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(fossil, dict):
+                    yield fossil, offset
+        # Advance past trailing blank/invalid lines as well
+        self.offsets[key] = offset
+
     def aggregate_batch(self, samples: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Turn raw fossils -> training tensors."""
         # Extract features. If missing, use placeholders (for mock/bootstrap)
         tnn_features = []
         ebdm_features = []
-        
+
         for s in samples:
             # TNN expects entropy gradient or similar physics scalar/vector
             grad = s.get("entropy_gradient", 0.0)
             if isinstance(grad, (float, int)):
                 grad = [grad] # ensure vector
             tnn_features.append(grad)
-            
+
             # EBDM expects energy signature (embedding)
             # Handle potential dicts or lists
             sig = s.get("energy_signature", s.get("features", [0.0]*128))
@@ -56,60 +165,129 @@ class FossilBatcher:
                 sig = list(sig.values())
             if not isinstance(sig, list):
                 sig = [0.0]*128
-            
+
             ebdm_features.append(sig)
 
         tnn_tensor = torch.tensor(tnn_features, dtype=torch.float32)
         ebdm_tensor = torch.tensor(ebdm_features, dtype=torch.float32)
 
+        # Raw fossils stay in the vault; the batch only references them by id
         return {
             "batch_id": uuid.uuid4().hex,
-            "samples": samples, # Keep raw metadata
+            "num_samples": len(samples),
+            "fossil_ids": [str(s.get("id", "")) for s in samples],
             "tnn_ready_tensor": tnn_tensor,
             "ebdm_ready_tensor": ebdm_tensor,
             "negentropy_score": float(tnn_tensor.mean()),
             "entropy_variance": float(tnn_tensor.var()) if tnn_tensor.numel() > 1 else 0.0,
         }
 
-    def build_batches(self):
-        """Reads fossils and writes batch files."""
-        buffer = []
-        count = 0
-        for fossil in self.load_fossils_stream():
-            buffer.append(fossil)
-            if len(buffer) >= self.batch_size:
-                batch = self.aggregate_batch(buffer)
-                self.save_batch(batch)
-                buffer = []
-                count += 1
-        
+    def _emit(self, samples: List[Dict[str, Any]]):
+        batch = self.aggregate_batch(samples)
+        fp = self.save_batch(batch)
+        with open(self.seen_path, "ab") as f:
+            f.write(b"".join(self.fossil_digest(s) for s in samples))
+            f.flush()
+            os.fsync(f.fileno())
+        self._enqueue(fp, batch["negentropy_score"])
+
+    def ingest_stream(self, batch_target_count: Optional[int] = 10) -> int:
+        """
+        Reads fossils appended since the last call and batches them.
+        Stops after batch_target_count batches (None: no limit) so a single
+        daemon tick stays bounded; the cursor resumes from there next time.
+        Returns the number of new fossils consumed.
+        """
+        consumed = 0
+        batches = 0
+        for fp in self._vault_files():
+            if batch_target_count is not None and batches >= batch_target_count:
+                break
+            key = str(fp)
+            for fossil, offset in self._read_new(fp):
+                digest = self.fossil_digest(fossil)
+                if digest in self.seen:
+                    continue
+                self.seen.add(digest)
+                self.pending.append(fossil)
+                consumed += 1
+                if len(self.pending) >= self.batch_size:
+                    self._emit(self.pending)
+                    self.pending = []
+                    batches += 1
+                    # Only checkpoint positions whose fossils are safely batched
+                    self.offsets[key] = offset
+                    self._save_cursor()
+                    if batch_target_count is not None and batches >= batch_target_count:
+                        break
+        self._save_cursor()
+        return consumed
+
+    def build_batches(self, flush: bool = True) -> int:
+        """Batches all new fossils in the vault; returns the number of batches written."""
+        before = len(self._ready)
+        self.ingest_stream(batch_target_count=None)
         # Flush remaining
-        if buffer:
-            batch = self.aggregate_batch(buffer)
-            self.save_batch(batch)
-            count += 1
-        return count
-
-    def save_batch(self, batch: Dict[str, Any]):
-        fp = self.batch_dir / f"batch_{batch['batch_id']}.pkl"
-        with open(fp, "wb") as f:
-            pickle.dump(batch, f)
-
-    # Helper for the Daemon to ingest a stream and return count
-    def ingest_stream(self, batch_target_count=10) -> int:
-        # In a real system, this would track processed files to avoid re-ingestion.
-        # For now, we just run build_batches which processes everything found.
-        # To make it "stream" in a daemon, we'd move processed files to an archive.
-        return self.build_batches()
+        if flush and self.pending:
+            self._emit(self.pending)
+            self.pending = []
+            self._save_cursor()
+        return len(self._ready) - before
+
+    def save_batch(self, batch: Dict[str, Any]) -> Path:
+        fp = self.batch_dir / f"batch_{batch['batch_id']}.pt"
+        tmp_path = self.batch_dir / f".{fp.name}.tmp"
+        torch.save(batch, tmp_path)
+        os.replace(tmp_path, fp)
+        return fp
+
+    def _enqueue(self, fp: Path, negentropy: float):
+        # heapq is a min-heap: FIFO orders by sequence, "negentropy" by highest score first
+        rank = -negentropy if self.priority == "negentropy" else 0.0
+        heapq.heappush(self._ready, (rank, next(self._seq), fp))
 
     def ready_for_training(self) -> bool:
-        return any(self.batch_dir.glob("*.pkl"))
-
-    def build_batch(self) -> Dict[str, Any]:
-        # Return a single batch for immediate training (mocking the queue pop)
-        # In prod, this would pop from a queue or pick a random file
-        files = list(self.batch_dir.glob("*.pkl"))
-        if not files:
-            return None
-        with open(files[0], "rb") as f:
-            return pickle.load(f)
+        return bool(self._ready)
+
+    def build_batch(self, archive: bool = True) -> Dict[str, Any]:
+        """
+        Pops the next ready batch. With archive=True its file moves to consumed/
+        at once; with archive=False it stays in place until archive_batch(), so
+        a batch whose training fails (or is interrupted) is picked up again on
+        the next start.
+        """
+        while self._ready:
+            _, _, fp = heapq.heappop(self._ready)
+            try:
+                if fp.suffix == ".pkl":
+                    with open(fp, "rb") as f:
+                        batch = pickle.load(f)
+                else:
+                    batch = torch.load(fp, weights_only=True)
+            except (OSError, EOFError, pickle.UnpicklingError, RuntimeError):
+                continue
+            batch.setdefault("num_samples", len(batch.get("samples", [])))
+            if archive:
+                self._archive(fp)
+            else:
+                batch.setdefault("batch_id", fp.stem)
+                self._leased[batch["batch_id"]] = fp
+            return batch
+        return None
+
+    def archive_batch(self, batch: Dict[str, Any]) -> bool:
+        """Moves a batch popped with archive=False to consumed/ once it has been trained on."""
+        fp = self._leased.pop(batch.get("batch_id"), None)
+        if fp is None:
+            return False
+        self._archive(fp)
+        return True
+
+    def release_batch(self, batch: Dict[str, Any]):
+        """Gives up a batch popped with archive=False; its file is queued again on the next start."""
+        self._leased.pop(batch.get("batch_id"), None)
+
+    def _archive(self, fp: Path):
+        consumed_dir = self.batch_dir / "consumed"
+        consumed_dir.mkdir(exist_ok=True)
+        os.replace(fp, consumed_dir / fp.name)
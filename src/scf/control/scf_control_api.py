@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +11,20 @@ class SCFControlAPI:
     def __init__(self, control_file_path: str):
         self.control_file = Path(control_file_path)
         self.control_file.parent.mkdir(parents=True, exist_ok=True)
+        # Daemon status (gear + pipeline stage metrics), refreshed every poll
+        self.status_file = self.control_file.with_name("status.json")
+
+    def publish_status(self, daemon_instance: Any):
+        status = {
+            "time": time.time(),
+            "gear": getattr(daemon_instance, "gear", None),
+            "heartbeat": getattr(daemon_instance, "heartbeat", None),
+        }
+        if hasattr(daemon_instance, "pipeline_metrics"):
+            status["pipeline"] = daemon_instance.pipeline_metrics()
+        tmp_path = self.status_file.with_name(self.status_file.name + ".tmp")
+        tmp_path.write_text(json.dumps(status, indent=2))
+        tmp_path.replace(self.status_file)
 
     async def start_listener(self, daemon_instance: Any):
         """
@@ -28,6 +43,11 @@ class SCFControlAPI:
                         self.control_file.unlink()
                 except Exception as e:
                     LOG.error("Error processing control file: %s", e)
+
+            try:
+                self.publish_status(daemon_instance)
+            except Exception as e:
+                LOG.error("Error publishing status: %s", e)
             
             await asyncio.sleep(1) # Poll interval
 
@@ -46,5 +66,7 @@ class SCFControlAPI:
             await daemon.loop_once()
         elif command == "RELEASE_MODEL":
             daemon.releaser.attempt_release()
+        elif command == "STATUS":
+            self.publish_status(daemon)
         else:
             LOG.warning("Unknown command: %s", command)
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+LOG = logging.getLogger("SCF.Pipeline")
+
+class StageMetrics:
+    """Counters and a rolling latency window for one pipeline stage."""
+    def __init__(self, window: int = 256):
+        self.processed = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, latency_s: float):
+        self.processed += 1
+        self.latencies.append(latency_s)
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PipelineStage:
+    """
+    A bounded queue drained by a fixed number of workers.
+
+    Synchronous work functions run in the given executor so file I/O and
+    training never block the event loop; coroutine functions are awaited.
+    on_result forwards results downstream and may await a full queue, which
+    is how backpressure propagates upstream.
+    """
+    def __init__(self, name: str, fn: Callable[[Any], Any], executor: Optional[Executor] = None,
+                 workers: int = 1, maxsize: int = 1,
+                 on_result: Optional[Callable[[Any], Awaitable[None]]] = None):
+        self.name = name
+        self.fn = fn
+        self.executor = executor
+        self.workers = workers
+        self.on_result = on_result
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.metrics = StageMetrics()
+        self.in_flight = 0
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def put(self, item: Any):
+        """Enqueues, waiting while the stage is saturated."""
+        await self.queue.put(item)
+
+    def offer(self, item: Any) -> bool:
+        """Enqueues without waiting; a full queue coalesces the request."""
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.metrics.coalesced += 1
+            return False
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                if asyncio.iscoroutinefunction(self.fn):
+                    result = await self.fn(item)
+                else:
+                    result = await loop.run_in_executor(self.executor, self.fn, item)
+                self.metrics.record(time.perf_counter() - start)
+                if self.on_result is not None:
+                    await self.on_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.errors += 1
+                LOG.error("Stage %s failed: %s", self.name, e)
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+
+    async def join(self):
+        await self.queue.join()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def snapshot(self) -> Dict[str, Any]:
+        m = self.metrics
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "in_flight": self.in_flight,
+            "processed": m.processed,
+            "errors": m.errors,
+            "coalesced": m.coalesced,
+            "latency_last_s": m.latencies[-1] if m.latencies else 0.0,
+            "latency_p50_s": m.percentile(0.5),
+            "latency_p99_s": m.percentile(0.99),
+        }
+
+
+class StagedPipeline:
+    """Ordered collection of stages started and stopped together."""
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = {stage.name: stage for stage in stages}
+
+    def __getitem__(self, name: str) -> PipelineStage:
+        return self.stages[name]
+
+    def start(self):
+        for stage in self.stages.values():
+            stage.start()
+
+    async def drain(self):
+        """Waits until every queued item has passed through every stage."""
+        for stage in self.stages.values():
+            await stage.join()
+
+    async def stop(self):
+        for stage in self.stages.values():
+            await stage.stop()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.scf.trunk.trifecta_master_loop import TrifectaMasterLoop
 from src.scf.control.operator_auth import OperatorAuth
@@ -13,12 +14,13 @@ from src.scf.audit.audit_logger import AuditLogger
 from src.core.energy_atlas.atlas_core import EnergyAtlas
 from src.scf.roots.pulse_connector import PulseConnector
 from src.scf.integration.sovereign_bridge import EnergyContext
+from src.scf.daemon.pipeline import PipelineStage, StagedPipeline
 
 logger = logging.getLogger("SCF_Daemon")
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 class SCFSovereignDaemon:
-    def __init__(self, control_json_path="data/scf/control.json"):
+    def __init__(self, control_json_path="data/scf/control.json", max_training_in_flight: int = 2):
         self.master_loop = TrifectaMasterLoop()
         self.control_api = SCFControlAPI(control_json_path)
         self.auth = OperatorAuth()
@@ -36,6 +38,104 @@ class SCFSovereignDaemon:
         self.heartbeat = 5  # seconds, overridden by gears
         self._running = False
 
+        # Pipeline stages run off the event loop. The batcher is not thread-safe,
+        # so ingest and batch share one thread; training is serialized on its own.
+        self.max_training_in_flight = max_training_in_flight
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scf-batcher")
+        self._train_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scf-train")
+        self._release_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scf-release")
+        self.pipeline: StagedPipeline = None
+        self._training_slots: asyncio.Semaphore = None
+
+    def _build_pipeline(self) -> StagedPipeline:
+        """
+        ingest -> batch -> train, plus an independent release stage.
+        Ingest/release requests coalesce while their stage is busy. A batch is
+        only popped once a training slot is free, so at most
+        max_training_in_flight batches are queued or training and the rest stay
+        in the batcher's on-disk queue. Batch files are archived after training
+        succeeds.
+        """
+        self._training_slots = asyncio.Semaphore(self.max_training_in_flight)
+        train = PipelineStage("train", self._train_stage, maxsize=self.max_training_in_flight)
+        batch = PipelineStage("batch", self._batch_stage, on_result=self._on_batch)
+        ingest = PipelineStage("ingest", self._ingest, self._io_pool,
+                               on_result=self._on_ingest)
+        release = PipelineStage("release", self._maybe_release, self._release_pool)
+        return StagedPipeline([ingest, batch, train, release])
+
+    def _ensure_pipeline(self):
+        # Created lazily: stages need a running event loop
+        if self.pipeline is None:
+            self.pipeline = self._build_pipeline()
+            self.pipeline.start()
+
+    # --- stage work (runs in executor threads) ---
+    def _ingest(self, context):
+        return context, self.batcher.ingest_stream(batch_target_count=10)
+
+    def _pop_batch(self):
+        if not self.batcher.ready_for_training():
+            return None
+        return self.batcher.build_batch(archive=False)
+
+    def _train_batch(self, item):
+        batch, context = item
+        # train_on_batch is a coroutine doing blocking torch work; give it its own loop
+        return asyncio.run(self.trainer.train_on_batch(batch, context))
+
+    def _maybe_release(self, _):
+        if self.releaser.should_try_release():
+            self.releaser.attempt_release()
+
+    # --- stage coroutines (run on the event loop, work in the pools) ---
+    async def _batch_stage(self, context):
+        # Waiting for a slot is the backpressure: the batch stays on disk meanwhile
+        await self._training_slots.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            batch = await loop.run_in_executor(self._io_pool, self._pop_batch)
+        except Exception:
+            self._training_slots.release()
+            raise
+        if not batch:
+            self._training_slots.release()
+        return context, batch
+
+    async def _train_stage(self, item):
+        batch, _ = item
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._train_pool, self._train_batch, item)
+        except Exception:
+            # Left unarchived, so it is trained again after a restart
+            await loop.run_in_executor(self._io_pool, self.batcher.release_batch, batch)
+            raise
+        finally:
+            self._training_slots.release()
+        await loop.run_in_executor(self._io_pool, self.batcher.archive_batch, batch)
+        return result
+
+    # --- stage hand-offs (run on the event loop) ---
+    async def _on_ingest(self, result):
+        context, new = result
+        if new:
+            logger.info("Ingested %d fossils", new)
+            self.audit.record("FOSSIL_INGEST", {"count": new})
+        self.pipeline["batch"].offer(context)
+
+    async def _on_batch(self, result):
+        context, batch = result
+        if batch:
+            logger.info("Built batch with %d fossils", batch["num_samples"])
+            self.audit.record("BATCH_CREATED", {"size": batch["num_samples"]})
+            # Holds a training slot, so the train queue always has room
+            await self.pipeline["train"].put((batch, context))
+
+    def pipeline_metrics(self):
+        """Per-stage queue depth, in-flight count and latency percentiles."""
+        return self.pipeline.metrics() if self.pipeline else {}
+
     def set_gear(self, gear):
         logger.info("⚙️ SHIFTING GEARS: %s -> %s", self.gear, gear)
         self.audit.record("SHIFT_GEAR", {"from": self.gear, "to": gear})
@@ -66,28 +166,16 @@ class SCFSovereignDaemon:
             daemon_gear=self.gear
         )
 
-        # 1) ingest small batch of fossils (non-blocking)
-        # In a real run, we might limit this to avoid IO blocking the loop too long
-        new = self.batcher.ingest_stream(batch_target_count=10)
-        if new:
-            logger.info("Ingested %d fossils", new)
-            self.audit.record("FOSSIL_INGEST", {"count": new})
+        self._ensure_pipeline()
 
-        # 2) check if training should run
-        if self.batcher.ready_for_training():
-            batch = self.batcher.build_batch()
-            if batch:
-                logger.info("Built batch with %d fossils", len(batch["samples"]))
-                self.audit.record("BATCH_CREATED", {"size": len(batch["samples"])})
-                # schedule training asynchronously, passing context
-                asyncio.create_task(self.trainer.train_on_batch(batch, context))
+        # 1-2) ingest fossils, then pop a ready batch into training (off-loop stages)
+        self.pipeline["ingest"].offer(context)
 
         # 3) run one master loop cycle (orchestrates intent->build->verify->deploy)
         await self.master_loop.cycle(context)
 
         # 4) evaluate for release (run daily gate)
-        if self.releaser.should_try_release():
-            self.releaser.attempt_release()
+        self.pipeline["release"].offer(None)
 
     async def start(self):
         logger.info("🟢 Starting SCF Sovereign Daemon")
@@ -113,6 +201,10 @@ class SCFSovereignDaemon:
             logger.info("🛑 SCF Sovereign Daemon Stopped.")
             self.audit.record("DAEMON_STOP", {"time": str(datetime.utcnow())})
             control_task.cancel()
+            if self.pipeline is not None:
+                await self.pipeline.stop()
+            for pool in (self._io_pool, self._train_pool, self._release_pool):
+                pool.shutdown(wait=False)
             await self.pulse.close()
             self.atlas.close()
 
@@ -5,14 +5,18 @@ from torch.utils.data import Dataset, DataLoader
 
 class FossilBatchDataset(Dataset):
     def __init__(self, batch_dir: str):
-        self.batch_files = list(Path(batch_dir).glob("*.pkl"))
+        self.batch_files = list(Path(batch_dir).glob("*.pt")) + list(Path(batch_dir).glob("*.pkl"))
 
     def __len__(self):
         return len(self.batch_files)
 
     def __getitem__(self, idx):
-        with open(self.batch_files[idx], "rb") as f:
-            batch = pickle.load(f)
+        path = self.batch_files[idx]
+        if path.suffix == ".pt":
+            batch = torch.load(path, weights_only=True)
+        else:
+            with open(path, "rb") as f:
+                batch = pickle.load(f)
         return (
             batch["tnn_ready_tensor"],
             batch["ebdm_ready_tensor"],
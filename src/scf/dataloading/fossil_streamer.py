@@ -1,25 +1,109 @@
 import json
 import os
+import numpy as np
 import torch
+import torch.distributed as dist
 from pathlib import Path
-from torch.utils.data import IterableDataset
-from typing import Iterator, Dict, Any, List
+from torch.utils.data import IterableDataset, get_worker_info
+from typing import Iterator, Dict, Any, List, Optional, Tuple
+
+from src.scf.ingestion.fossil_vault import list_batches, open_columns
+
+# Rows tokenized per slice of a memory-mapped columnar batch / NDJSON chunk
+COLUMN_BLOCK_ROWS = 65536
+NDJSON_CHUNK_LINES = 8192
+
+def tokenize_columns(temp: np.ndarray, power: np.ndarray, entropy: np.ndarray,
+                     timestamp: np.ndarray) -> np.ndarray:
+    """
+    Vectorized form of FossilStreamer._extract_features for a whole block.
+    NaN (missing) values take the same defaults as the per-fossil path.
+    Returns int64 array of shape (n, 4).
+    """
+    temp = np.nan_to_num(np.asarray(temp, dtype=np.float64), nan=25.0)
+    power = np.nan_to_num(np.asarray(power, dtype=np.float64), nan=0.0)
+    entropy = np.nan_to_num(np.asarray(entropy, dtype=np.float64), nan=0.0)
+    timestamp = np.nan_to_num(np.asarray(timestamp, dtype=np.float64), nan=0.0)
+
+    tokens = np.empty((temp.shape[0], 4), dtype=np.int64)
+    tokens[:, 0] = np.clip(np.trunc((temp + 50) / 200 * 1000), 0, 1000)
+    tokens[:, 1] = np.clip(np.trunc(power / 5000 * 2000) + 1001, 1001, 3000)
+    tokens[:, 2] = np.clip(np.trunc(entropy / 10.0 * 1000) + 3001, 3001, 4000)
+    ts_norm = (timestamp % 86400) / 86400.0
+    tokens[:, 3] = np.clip(np.trunc(ts_norm * 1000) + 4001, 4001, 5000)
+    return tokens
+
+def _thermo_arrays(fossils: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pulls the tokenized fields out of a chunk of parsed fossils in one pass."""
+    n = len(fossils)
+    temp = np.full(n, np.nan)
+    power = np.full(n, np.nan)
+    entropy = np.full(n, np.nan)
+    timestamp = np.zeros(n)
+    for i, fossil in enumerate(fossils):
+        try:
+            meta = fossil.get('meta') or {}
+            thermo = meta.get('thermodynamics') or {}
+            timestamp[i] = fossil.get('timestamp', 0.0)
+            temp[i] = thermo.get('temperature_c', np.nan)
+            power[i] = thermo.get('power_w', np.nan)
+            entropy[i] = thermo.get('entropy_rate', np.nan)
+        except (TypeError, ValueError, AttributeError):
+            # Non-numeric values keep their defaults
+            continue
+    return temp, power, entropy, timestamp
+
+def _shard_id() -> Tuple[int, int]:
+    """
+    (shard, num_shards) for this DataLoader worker on this rank, so every
+    file is read by exactly one worker across the whole job.
+    """
+    if dist.is_available() and dist.is_initialized():
+        rank, world_size = dist.get_rank(), dist.get_world_size()
+    else:
+        rank = int(os.environ.get("RANK", 0))
+        world_size = int(os.environ.get("WORLD_SIZE", 1))
+    info = get_worker_info()
+    worker_id, num_workers = (info.id, info.num_workers) if info is not None else (0, 1)
+    return rank * num_workers + worker_id, world_size * num_workers
 
 class FossilStreamer(IterableDataset):
     """
     Streams fossils from NDJSON files in the Vault.
     Designed for infinite streaming or single-pass over massive datasets.
+
+    Files are sharded across DataLoader workers and distributed ranks, so
+    num_workers > 1 does not duplicate samples. Fossils are tokenized in
+    chunks with numpy; shuffle_buffer > 0 enables an approximate shuffle over
+    that many samples (file order is also shuffled per epoch).
     """
-    def __init__(self, vault_dir: str, batch_size: int = 32, max_files: int = None):
+    def __init__(self, vault_dir: str, batch_size: int = 32, max_files: int = None,
+                 shuffle_buffer: int = 0, seed: int = 0):
         self.vault_dir = Path(vault_dir)
         self.batch_size = batch_size
         self.max_files = max_files
-        # Filter out AppleDouble files (._*) and ensure .ndjson extension
-        self.files = sorted([f for f in self.vault_dir.rglob("*.ndjson") if not f.name.startswith("._")])
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.epoch = 0
+        # Filter out AppleDouble (._*) and hidden files and ensure .ndjson extension
+        self.files = list_batches(self.vault_dir)
         if self.max_files:
             self.files = self.files[:self.max_files]
         print(f"🌊 FossilStreamer: Found {len(self.files)} batch files in {vault_dir}")
 
+    def set_epoch(self, epoch: int):
+        """Varies the shuffle order between epochs (same on every worker/rank)."""
+        self.epoch = epoch
+
+    def _shard_files(self) -> List[Path]:
+        files = list(self.files)
+        if self.shuffle_buffer:
+            # Same permutation on every shard, then a disjoint slice each
+            order = np.random.default_rng(self.seed + self.epoch).permutation(len(files))
+            files = [files[i] for i in order]
+        shard, num_shards = _shard_id()
+        return files[shard::num_shards]
+
     def _parse_line(self, line: str) -> Dict[str, Any]:
         try:
             return json.loads(line)
@@ -62,35 +146,69 @@ class FossilStreamer(IterableDataset):
         
         return torch.tensor([t_token, p_token, e_token, ts_token], dtype=torch.long)
 
-    def __iter__(self) -> Iterator[torch.Tensor]:
-        """
-        Yields batches of tensors.
-        """
-        buffer = []
-        
-        for file_path in self.files:
+    def _iter_token_blocks(self, files: List[Path]) -> Iterator[np.ndarray]:
+        """Yields (n, 4) token blocks for the given batch files."""
+        for file_path in files:
+            # Fast path: memory-mapped columnar sidecar
+            cols = open_columns(file_path)
+            if cols is not None:
+                for start in range(0, len(cols), COLUMN_BLOCK_ROWS):
+                    block = cols[start:start + COLUMN_BLOCK_ROWS]
+                    yield tokenize_columns(
+                        block['temperature_c'], block['power_w'], block['entropy_rate'], block['timestamp']
+                    )
+                continue
+
             try:
                 with open(file_path, 'r') as f:
+                    chunk = []
                     for line in f:
                         fossil = self._parse_line(line)
-                        if not fossil: continue
-                        
-                        features = self._extract_features(fossil)
-                        buffer.append(features)
-                        
-                        if len(buffer) >= self.batch_size:
-                            # Yield a batch
-                            batch = torch.stack(buffer)
-                            # Target is next state (self-supervised for now, or same state for autoencoder)
-                            # For EBDM, let's try to predict the *same* state (denoising) or next state.
-                            # Let's use same state for reconstruction loss task initially.
-                            yield batch, batch 
-                            buffer = []
+                        if not isinstance(fossil, dict): continue
+                        chunk.append(fossil)
+                        if len(chunk) >= NDJSON_CHUNK_LINES:
+                            yield tokenize_columns(*_thermo_arrays(chunk))
+                            chunk = []
+                    if chunk:
+                        yield tokenize_columns(*_thermo_arrays(chunk))
             except Exception as e:
                 print(f"⚠️ Error reading {file_path}: {e}")
                 continue
-                
+
+    def _shuffled(self, blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Approximate shuffle: keeps up to shuffle_buffer samples resident and
+        releases a random selection whenever the pool overflows.
+        """
+        rng = np.random.default_rng((self.seed, self.epoch, *_shard_id()))
+        pool = np.empty((0, 4), dtype=np.int64)
+        for block in blocks:
+            pool = np.concatenate([pool, block])
+            if len(pool) >= self.shuffle_buffer + self.batch_size:
+                pool = pool[rng.permutation(len(pool))]
+                yield pool[self.shuffle_buffer:]
+                pool = pool[:self.shuffle_buffer]
+        if len(pool):
+            yield pool[rng.permutation(len(pool))]
+
+    def __iter__(self) -> Iterator[torch.Tensor]:
+        """
+        Yields batches of tensors.
+        """
+        blocks = self._iter_token_blocks(self._shard_files())
+        if self.shuffle_buffer:
+            blocks = self._shuffled(blocks)
+
+        carry = np.empty((0, 4), dtype=np.int64)
+        for block in blocks:
+            tokens = np.concatenate([carry, block]) if len(carry) else block
+            n_full = len(tokens) - len(tokens) % self.batch_size
+            for batch in torch.from_numpy(np.ascontiguousarray(tokens[:n_full])).split(self.batch_size):
+                # Target is the same state (reconstruction loss task for EBDM)
+                yield batch, batch
+            carry = tokens[n_full:]
+
         # Yield remaining
-        if buffer:
-            batch = torch.stack(buffer)
+        if len(carry):
+            batch = torch.from_numpy(np.ascontiguousarray(carry))
             yield batch, batch
@@ -1,22 +1,93 @@
 import sqlite3
 import json
 import os
+import time
+from multiprocessing import Pool
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from src.scf.ingestion.fossil_vault import open_columns
+
+# Rows written per transaction by the single writer
+WRITE_CHUNK_ROWS = 200_000
+# Upper bound on batch files handed to a parser worker at once
+MAX_PARSE_CHUNK = 16
+
+# Secondary indexes; dropped during an initial bulk load and rebuilt after
+SECONDARY_INDEXES = {
+    'idx_timestamp': 'atlas_index (timestamp)',
+    'idx_entropy': 'atlas_index (entropy_rate)',
+    'idx_source_time': 'atlas_index (source, timestamp)',
+    'idx_file': 'atlas_index (file_path)',
+}
+
+AtlasRow = Tuple[str, str, float, float, str]
+
+def parse_batch_file(file_path: str) -> List[AtlasRow]:
+    """
+    Extracts (fossil_id, source, timestamp, entropy_rate, file_path) rows
+    from one vault batch. Uses the columnar sidecar when available.
+    Runs in parser worker processes.
+    """
+    path = Path(file_path)
+    cols = open_columns(path)
+    if cols is not None:
+        entropy = np.nan_to_num(cols['entropy_rate'].astype(np.float64), nan=0.0)
+        return list(zip([i.decode('utf-8') for i in cols['id']],
+                        [s.decode('utf-8') for s in cols['source']],
+                        cols['timestamp'].tolist(),
+                        entropy.tolist(),
+                        [file_path] * len(cols)))
+
+    rows = []
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip(): continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            # Try to get entropy from metadata
+            entropy = 0.0
+            meta = data.get('meta', {})
+            thermo = meta.get('thermodynamics', {}) if isinstance(meta, dict) else {}
+            if isinstance(thermo, dict):
+                entropy = thermo.get('entropy_rate', 0.0)
+            rows.append((data.get('id'), data.get('source'), data.get('timestamp', 0.0), entropy, file_path))
+    return rows
 
 class AtlasBuilder:
     """
     Constructs the Spatio-Temporal Index (Energy Atlas) from the Fossil Vault.
     Enables fast querying of physics states (Entropy, Power, Time).
+
+    Indexing is incremental (batch files are tracked by mtime/size), parsing
+    fans out over worker processes, and a single WAL-mode writer inserts
+    rows with executemany in large transactions.
     """
     def __init__(self, vault_dir: str, db_path: str = "energy_atlas.db"):
         self.vault_dir = Path(vault_dir)
         self.db_path = db_path
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-262144')  # 256 MiB page cache
+        return conn
+
+    @staticmethod
+    def _create_indexes(conn: sqlite3.Connection):
+        for name, target in SECONDARY_INDEXES.items():
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+
     def _init_db(self):
         """Initialize SQLite database schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         # Create Index Table
         c.execute('''CREATE TABLE IF NOT EXISTS atlas_index (
@@ -26,73 +97,162 @@ class AtlasBuilder:
                         entropy_rate REAL,
                         file_path TEXT
                     )''')
+        # Batch files already indexed, for incremental rebuilds
+        c.execute('''CREATE TABLE IF NOT EXISTS indexed_files (
+                        file_path TEXT PRIMARY KEY,
+                        mtime REAL,
+                        size INTEGER,
+                        fossils INTEGER
+                    )''')
         # Create Indices for fast lookup
-        c.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON atlas_index (timestamp)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_entropy ON atlas_index (entropy_rate)')
+        self._create_indexes(conn)
         conn.commit()
         conn.close()
 
-    def build_index(self):
+    def _pending_files(self, conn: sqlite3.Connection) -> Tuple[List[Tuple[str, float, int]], int, List[str]]:
         """
-        Scans the Vault and populates the SQLite index.
-        Idempotent: Skips existing IDs.
+        Batch files that are new or changed since they were last indexed, the
+        number unchanged, and indexed files that no longer exist.
         """
-        print(f"🗺️  Building Energy Atlas from {self.vault_dir}...")
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        count = 0
+        known = {path: (mtime, size) for path, mtime, size in
+                 conn.execute('SELECT file_path, mtime, size FROM indexed_files')}
+        pending, skipped, present = [], 0, set()
         for root, _, files in os.walk(self.vault_dir):
             for file in files:
-                if file.endswith(".ndjson"):
-                    file_path = Path(root) / file
-                    self._index_file(file_path, c)
-                    conn.commit() # Commit per file to be safe
-                    count += 1
-                    print(f"   Indexed {file}...", end="\r")
-                    
-        conn.close()
-        print(f"\n✅ Atlas Built. Indexed {count} batch files.")
+                if not file.endswith(".ndjson") or file.startswith("."):
+                    continue
+                file_path = str(Path(root) / file)
+                present.add(file_path)
+                st = os.stat(file_path)
+                if known.get(file_path) == (st.st_mtime, st.st_size):
+                    skipped += 1
+                    continue
+                pending.append((file_path, st.st_mtime, st.st_size))
+        return pending, skipped, [path for path in known if path not in present]
 
-    def _index_file(self, file_path: Path, cursor):
-        """Reads an NDJSON batch and inserts metadata."""
+    @staticmethod
+    def _purge_files(conn: sqlite3.Connection, paths: List[str]):
+        """Drops the rows of batch files removed from the vault."""
+        with conn:
+            conn.executemany('DELETE FROM atlas_index WHERE file_path = ?', [(p,) for p in paths])
+            conn.executemany('DELETE FROM indexed_files WHERE file_path = ?', [(p,) for p in paths])
+
+    def build_index(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Scans the Vault and populates the SQLite index.
+        Idempotent: Skips unchanged batch files and existing IDs, and drops
+        rows of batch files that are gone from the vault.
+        workers=None uses one parser process per core; 0 parses in-process.
+        Returns indexing stats including fossils/sec.
+        """
+        print(f"🗺️  Building Energy Atlas from {self.vault_dir}...")
+        start = time.time()
+        conn = self._connect()
+        pending, skipped, removed = self._pending_files(conn)
+        if removed:
+            self._purge_files(conn, removed)
+        workers = os.cpu_count() if workers is None else workers
+
+        # Loading into an empty atlas: build secondary indexes once at the end
+        # instead of maintaining them row by row (and nothing needs deleting)
+        bulk = bool(pending) and conn.execute('SELECT 1 FROM atlas_index LIMIT 1').fetchone() is None
+        if bulk:
+            with conn:
+                for name in SECONDARY_INDEXES:
+                    conn.execute(f'DROP INDEX IF EXISTS {name}')
+
+        fossils = 0
+        indexed = 0
+        buffered: List[AtlasRow] = []
+        done_files: List[Tuple[str, float, int, int]] = []
+
+        def flush():
+            # One transaction covers the rows and the files they came from
+            with conn:
+                if not bulk:
+                    conn.executemany('DELETE FROM atlas_index WHERE file_path = ?',
+                                     [(f[0],) for f in done_files])
+                conn.executemany('''INSERT OR IGNORE INTO atlas_index
+                                    (fossil_id, source, timestamp, entropy_rate, file_path)
+                                    VALUES (?, ?, ?, ?, ?)''', buffered)
+                conn.executemany('INSERT OR REPLACE INTO indexed_files VALUES (?, ?, ?, ?)', done_files)
+            buffered.clear()
+            done_files.clear()
+
+        if workers and len(pending) > 1:
+            # Results stream back as files finish; small chunks keep workers
+            # from each holding many parsed files at once
+            pool = Pool(processes=workers)
+            chunksize = min(MAX_PARSE_CHUNK, max(1, len(pending) // (workers * 8)))
+            results = pool.imap_unordered(_parse_pending, pending, chunksize=chunksize)
+        else:
+            pool = None
+            results = map(_parse_pending, pending)
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    if not line.strip(): continue
-                    data = json.loads(line)
-                    
-                    # Extract Key Metrics
-                    f_id = data.get('id')
-                    source = data.get('source')
-                    timestamp = data.get('timestamp', 0.0)
-                    
-                    # Try to get entropy from metadata
-                    entropy = 0.0
-                    meta = data.get('meta', {})
-                    thermo = meta.get('thermodynamics', {})
-                    if isinstance(thermo, dict):
-                        entropy = thermo.get('entropy_rate', 0.0)
-                    
-                    # Insert (Ignore if exists)
-                    cursor.execute('''INSERT OR IGNORE INTO atlas_index 
-                                      (fossil_id, source, timestamp, entropy_rate, file_path)
-                                      VALUES (?, ?, ?, ?, ?)''',
-                                   (f_id, source, timestamp, entropy, str(file_path)))
-        except Exception as e:
-            print(f"   ⚠️ Error indexing {file_path.name}: {e}")
-
-    def query(self, min_entropy: float = None, max_entropy: float = None, limit: int = 10) -> List[Dict[str, Any]]:
+            for (file_path, mtime, size), rows in results:
+                if rows is None:
+                    continue
+                buffered.extend(rows)
+                done_files.append((file_path, mtime, size, len(rows)))
+                fossils += len(rows)
+                indexed += 1
+                if len(buffered) >= WRITE_CHUNK_ROWS:
+                    flush()
+            flush()
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            if bulk:
+                with conn:
+                    self._create_indexes(conn)
+            conn.close()
+
+        elapsed = time.time() - start
+        stats = {
+            "files_indexed": indexed,
+            "files_skipped": skipped,
+            "files_removed": len(removed),
+            "fossils": fossils,
+            "elapsed_s": elapsed,
+            "fossils_per_sec": fossils / elapsed if elapsed > 0 else 0.0,
+        }
+        print(f"✅ Atlas Built. Indexed {indexed} batch files ({fossils} fossils, "
+              f"{stats['fossils_per_sec']:.0f}/s), {skipped} unchanged, {len(removed)} removed.")
+        return stats
+
+    def _index_file(self, file_path: Path, cursor):
+        """Reads a vault batch and inserts metadata."""
+        rows = _safe_parse(str(file_path))
+        if rows:
+            cursor.executemany('''INSERT OR IGNORE INTO atlas_index
+                                  (fossil_id, source, timestamp, entropy_rate, file_path)
+                                  VALUES (?, ?, ?, ?, ?)''', rows)
+
+    def query(self, min_entropy: float = None, max_entropy: float = None, limit: int = 10,
+              source: str = None, start_time: float = None, end_time: float = None) -> List[Dict[str, Any]]:
         """
         Find fossils matching constraints.
         """
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
-        
+
         query = "SELECT * FROM atlas_index WHERE 1=1"
         params = []
-        
+
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+
+        if start_time is not None:
+            query += " AND timestamp >= ?"
+            params.append(start_time)
+
+        if end_time is not None:
+            query += " AND timestamp <= ?"
+            params.append(end_time)
+
         if min_entropy is not None:
             query += " AND entropy_rate >= ?"
             params.append(min_entropy)
@@ -100,16 +260,27 @@ class AtlasBuilder:
         if max_entropy is not None:
             query += " AND entropy_rate <= ?"
             params.append(max_entropy)
-            
+
         query += " ORDER BY entropy_rate ASC LIMIT ?" # Prefer lower entropy (more ordered)
         params.append(limit)
-        
+
         c.execute(query, params)
         rows = c.fetchall()
         conn.close()
-        
+
         return [dict(row) for row in rows]
 
+def _safe_parse(file_path: str) -> Optional[List[AtlasRow]]:
+    try:
+        return parse_batch_file(file_path)
+    except Exception as e:
+        print(f"   ⚠️ Error indexing {Path(file_path).name}: {e}")
+        return None
+
+def _parse_pending(item: Tuple[str, float, int]) -> Tuple[Tuple[str, float, int], Optional[List[AtlasRow]]]:
+    """Parses one pending batch file, returning it with its rows (results arrive unordered)."""
+    return item, _safe_parse(item[0])
+
 if __name__ == "__main__":
     # Example Usage
     import sys
@@ -0,0 +1,99 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def iter_frames(file_path: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Yields a tabular file as DataFrame chunks so it is never fully materialized.
+    CSV and Parquet (with pyarrow) stream; JSON is read whole unless it is
+    line-delimited.
+    """
+    suffix = file_path.suffix
+    if suffix == '.csv':
+        yield from pd.read_csv(file_path, chunksize=chunk_rows)
+    elif suffix == '.parquet':
+        if pq is None:
+            yield pd.read_parquet(file_path)
+            return
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif suffix in ('.ndjson', '.jsonl'):
+        yield from pd.read_json(file_path, lines=True, chunksize=chunk_rows)
+    elif suffix == '.json':
+        yield pd.read_json(file_path)
+    else:
+        raise ValueError(f"Unsupported tabular type: {suffix}")
+
+
+def generate_ids(n: int) -> List[str]:
+    """
+    UUID4-formatted IDs for a whole block from a single urandom draw.
+    """
+    raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    # Set RFC 4122 version (4) and variant bits, as uuid.uuid4() does
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    h = raw.tobytes().hex()
+    return [f"{h[i:i+8]}-{h[i+8:i+12]}-{h[i+12:i+16]}-{h[i+16:i+20]}-{h[i+20:i+32]}"
+            for i in range(0, 32 * n, 32)]
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Row dicts with native Python scalars and NaN mapped to None, so the stored
+    JSON and the hashed payload agree.
+    """
+    df = df.rename(columns=str)
+    if df.isna().values.any():
+        df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient='records')
+
+
+def fossil_lines(df: pd.DataFrame, source: str, meta: Dict[str, Any],
+                 timestamp: float, prev_hash: Optional[str] = None) -> List[str]:
+    """
+    Converts a DataFrame block into signed NDJSON fossil lines in bulk.
+
+    Produces the same hash as Fossil.sign() without building a pydantic model
+    per row: the block-constant parts of the canonical (sort_keys) payload are
+    serialized once and only the row data is dumped per fossil.
+    """
+    n = len(df)
+    if n == 0:
+        return []
+    ids = generate_ids(n)
+    records = _records(df)
+
+    meta_sorted = json.dumps(meta, sort_keys=True, default=str)
+    source_json = json.dumps(source)
+    ts_json = json.dumps(float(timestamp))
+    prev_json = json.dumps(prev_hash)
+    # Canonical payload layout of Fossil.compute_hash (keys sorted)
+    head = '{"data": '
+    tail = (f', "meta": {meta_sorted}, "prev_hash": {prev_json}, '
+            f'"source": {source_json}, "timestamp": {ts_json}}}')
+    # The stored line reuses the canonical row dump, so each row is encoded once
+    out_mid = f'"source": {source_json}, "timestamp": {ts_json}, "data": '
+    out_tail = f', "meta": {meta_sorted}, "prev_hash": {prev_json}, "hash": "'
+
+    sha256 = hashlib.sha256
+    encode = json.JSONEncoder(sort_keys=True, default=str).encode
+    lines = []
+    for fid, row in zip(ids, records):
+        row_json = encode(row)
+        digest = sha256(f'{head}{row_json}, "id": "{fid}"{tail}'.encode('utf-8')).hexdigest()
+        lines.append(f'{{"id": "{fid}", {out_mid}{row_json}{out_tail}{digest}"}}')
+    return lines
@@ -0,0 +1,144 @@
+import os
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+import numpy as np
+
+# Numeric meta.thermodynamics fields kept in the columnar encoding
+THERMO_FIELDS = ('temperature_c', 'power_w', 'entropy_rate', 'spectral_entropy', 'delta_temp', 'delta_power')
+# Sidecar suffix: fossil_batch_ab12cd34.ndjson -> fossil_batch_ab12cd34.cols.npy
+COLUMNS_SUFFIX = ".cols.npy"
+
+
+def columns_dtype(id_width: int = 36, source_width: int = 32) -> np.dtype:
+    """
+    Record layout of a columnar vault file. Missing thermodynamic values are NaN.
+    """
+    return np.dtype(
+        [('id', f'S{id_width}'), ('source', f'S{source_width}'), ('timestamp', 'f8')]
+        + [(name, 'f4') for name in THERMO_FIELDS]
+    )
+
+
+def columns_path(ndjson_path: Path) -> Path:
+    return ndjson_path.with_name(ndjson_path.name[:-len(".ndjson")] + COLUMNS_SUFFIX)
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def columns_from_records(records: List[Dict[str, Any]]) -> np.ndarray:
+    """Packs fossil dicts into a columnar record array."""
+    ids = [str(r.get('id', '')).encode('utf-8') for r in records]
+    sources = [str(r.get('source', '')).encode('utf-8') for r in records]
+    dtype = columns_dtype(max([len(i) for i in ids] + [1]), max([len(s) for s in sources] + [1]))
+    cols = np.empty(len(records), dtype=dtype)
+    cols['id'] = ids
+    cols['source'] = sources
+    cols['timestamp'] = [_as_float(r.get('timestamp', 0.0)) for r in records]
+    thermos = []
+    for r in records:
+        meta = r.get('meta') or {}
+        thermo = meta.get('thermodynamics') if isinstance(meta, dict) else None
+        thermos.append(thermo if isinstance(thermo, dict) else {})
+    for name in THERMO_FIELDS:
+        cols[name] = [_as_float(t.get(name)) for t in thermos]
+    return cols
+
+
+def columns_from_ndjson(ndjson_path: Path) -> np.ndarray:
+    """Parses an NDJSON batch into the columnar layout (skipping bad lines)."""
+    records = []
+    with open(ndjson_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return columns_from_records(records)
+
+
+def convert_ndjson(ndjson_path: Path) -> Path:
+    """
+    Writes the columnar sidecar for one NDJSON batch (temp file + rename).
+    """
+    ndjson_path = Path(ndjson_path)
+    out_path = columns_path(ndjson_path)
+    cols = columns_from_ndjson(ndjson_path)
+    tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, cols, allow_pickle=False)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def is_converted(ndjson_path: Path) -> bool:
+    """True if a sidecar exists and is at least as new as its NDJSON batch."""
+    sidecar = columns_path(ndjson_path)
+    try:
+        return sidecar.stat().st_mtime >= ndjson_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def convert_vault(vault_dir: str, force: bool = False) -> int:
+    """
+    Converts every NDJSON batch in the vault lacking an up-to-date sidecar.
+    Returns the number of batches converted.
+    """
+    converted = 0
+    for ndjson_path in list_batches(vault_dir):
+        if not force and is_converted(ndjson_path):
+            continue
+        try:
+            convert_ndjson(ndjson_path)
+            converted += 1
+        except Exception as e:
+            print(f"   ⚠️ Could not convert {ndjson_path.name}: {e}")
+    return converted
+
+
+def list_batches(vault_dir: str) -> List[Path]:
+    """NDJSON batches in the vault, ignoring hidden and AppleDouble (._*) files."""
+    return sorted(f for f in Path(vault_dir).rglob("*.ndjson") if not f.name.startswith("."))
+
+
+def open_columns(ndjson_path: Path) -> Optional[np.ndarray]:
+    """
+    Memory-maps the columnar sidecar of a batch, or returns None if there is
+    no up-to-date sidecar (callers then fall back to NDJSON).
+    """
+    ndjson_path = Path(ndjson_path)
+    if not is_converted(ndjson_path):
+        return None
+    try:
+        return np.load(columns_path(ndjson_path), mmap_mode='r', allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+
+
+def load_columns(ndjson_path: Path) -> np.ndarray:
+    """Columnar view of a batch: the memory-mapped sidecar if present, else parsed NDJSON."""
+    cols = open_columns(ndjson_path)
+    return cols if cols is not None else columns_from_ndjson(ndjson_path)
+
+
+def iter_vault_columns(vault_dir: str) -> Iterator[Tuple[Path, np.ndarray]]:
+    for ndjson_path in list_batches(vault_dir):
+        yield ndjson_path, load_columns(ndjson_path)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        n = convert_vault(sys.argv[1], force="--force" in sys.argv)
+        print(f"✅ Converted {n} batches to columnar format.")
+    else:
+        print("Usage: python fossil_vault.py <vault_dir> [--force]")
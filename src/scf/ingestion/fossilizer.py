@@ -2,15 +2,23 @@ import os
 import json
 import uuid
 import time
+import hashlib
 import pandas as pd
 import numpy as np
 import h5py
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional, Tuple
 from src.scf.ingestion.energy_signature import EnergySignature
 from src.scf.ingestion.fossil_schema import Fossil
+from src.scf.ingestion.columnar import iter_frames, fossil_lines, DEFAULT_CHUNK_ROWS
+from src.scf.ingestion.ingest_manifest import IngestManifest, ManifestEntry, IngestStats, file_digest
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, ALL_COMPLETED, wait
 import subprocess
 
+# Deliberately not *.ndjson/*.json so vault consumers never mistake it for a fossil batch
+MANIFEST_NAME = ".fossil_manifest.jsonl"
+COLUMNAR_SUFFIXES = ('.csv', '.parquet', '.json', '.ndjson', '.jsonl')
+
 def auto_caffeinate():
     """
     Prevents system sleep during long processes by spawning a background caffeinate process.
@@ -26,22 +34,26 @@ class Fossilizer:
     The Digestive System of the Sovereign Daemon.
     Ingests raw data and converts it into 'Fossils' (Standardized NDJSON).
     """
-    def __init__(self, raw_dir: str, vault_dir: str):
+    def __init__(self, raw_dir: str, vault_dir: str, caffeinate: bool = True,
+                 columnar: bool = True, chunk_rows: int = DEFAULT_CHUNK_ROWS):
         self.raw_dir = Path(raw_dir)
         self.vault_dir = Path(vault_dir)
         self.vault_dir.mkdir(parents=True, exist_ok=True)
-        self.vault_dir.mkdir(parents=True, exist_ok=True)
+        # Columnar path streams tabular files in chunks; False restores the per-row path
+        self.columnar = columnar
+        self.chunk_rows = chunk_rows
         self.energy_sig = EnergySignature()
-        auto_caffeinate()
+        # Batch names of the file being fossilized: <source key>_<index>
+        self._source_key: Optional[str] = None
+        self._batch_index = 0
+        if caffeinate:
+            auto_caffeinate()
         print(f"🦖 Fossilizer Online. Watching: {self.raw_dir}")
 
-    def process_all(self):
+    def _iter_raw_files(self) -> Iterator[Path]:
         """
-        Process all files in raw_ingest, following symlinks.
+        Walks raw_ingest, following symlinks, yielding candidate files.
         """
-        print(f"   Scanning {self.raw_dir}...")
-        file_count = 0
-        
         for root, dirs, files in os.walk(self.raw_dir, followlinks=True):
             # Skip already processed datasets
             if "MHD_256" in root or "active_matter" in root:
@@ -51,40 +63,159 @@ class Fossilizer:
                 if name.startswith('.'): continue
                 if name == "README.txt": continue
                 
-                file_path = Path(root) / name
-                self._fossilize_file(file_path)
-                file_count += 1
+                yield Path(root) / name
+
+    def process_all(self):
+        """
+        Process all files in raw_ingest, following symlinks.
+        """
+        print(f"   Scanning {self.raw_dir}...")
+        file_count = 0
+        
+        for file_path in self._iter_raw_files():
+            self._fossilize_file(file_path)
+            file_count += 1
                 
         print(f"   Processed {file_count} files.")
 
-    def _fossilize_file(self, file_path: Path):
+    def process_parallel(self, max_workers: Optional[int] = None, manifest_path: Optional[str] = None,
+                         full_digest: bool = False) -> IngestStats:
+        """
+        Process-pool ingestion with a persistent manifest.
+
+        Files whose (size, mtime, digest) match the manifest are skipped, so a
+        re-run only touches new or changed data. Changed files have their old
+        batches removed before being re-fossilized. The manifest is journaled
+        after every completed file, making an interrupted run resumable.
+        Largest files are dispatched first to balance the shards.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        manifest = IngestManifest(manifest_path or str(self.vault_dir / MANIFEST_NAME))
+        stats = IngestStats()
+
+        print(f"   Scanning {self.raw_dir} ({max_workers} workers)...")
+        pending: List[Tuple[int, float, Path]] = []
+        for file_path in self._iter_raw_files():
+            stats.files_seen += 1
+            try:
+                st = file_path.stat()
+            except OSError as e:
+                print(f"   ⚠️ Cannot stat {file_path}: {e}")
+                stats.files_failed += 1
+                continue
+            if manifest.is_current(file_path, st.st_size, st.st_mtime, full_digest):
+                stats.files_skipped += 1
+                continue
+            pending.append((st.st_size, st.st_mtime, file_path))
+        pending.sort(key=lambda item: item[0], reverse=True)
+        print(f"   {len(pending)} new/changed files, {stats.files_skipped} unchanged.")
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_worker,
+                                     initargs=(str(self.raw_dir), str(self.vault_dir),
+                                               self.columnar, self.chunk_rows)) as pool:
+                # Bound in-flight work so huge vaults don't queue every path up front
+                in_flight = {}
+                queue = iter(pending)
+                for size, mtime, file_path in queue:
+                    self._drop_stale_batches(manifest.lookup(file_path))
+                    in_flight[pool.submit(_fossilize_worker, str(file_path), full_digest)] = (size, mtime, file_path)
+                    if len(in_flight) >= max_workers * 2:
+                        in_flight = self._drain(in_flight, manifest, stats, FIRST_COMPLETED)
+                self._drain(in_flight, manifest, stats)
+        finally:
+            stats.elapsed_s = time.time() - stats.started_at
+            manifest.compact()
+            manifest.close()
+
+        print(f"   Processed {stats.files_processed} files "
+              f"({stats.files_per_sec:.1f} files/s, {stats.bytes_per_sec / 1e6:.1f} MB/s), "
+              f"skipped {stats.files_skipped}, failed {stats.files_failed}.")
+        return stats
+
+    def _drain(self, in_flight: Dict, manifest: IngestManifest, stats: IngestStats,
+               return_when: str = ALL_COMPLETED) -> Dict:
+        """Waits on worker futures and journals completed files into the manifest."""
+        done, not_done = wait(in_flight, return_when=return_when)
+        for future in done:
+            size, mtime, file_path = in_flight[future]
+            try:
+                digest, batches, n_fossils = future.result()
+            except Exception as e:
+                print(f"   ❌ Worker failed on {file_path.name}: {e}")
+                self._record_failure(manifest, stats, file_path, size, mtime, "", str(e))
+                continue
+            if not batches:
+                # Nothing written (unsupported or unreadable); retried on the next run
+                self._record_failure(manifest, stats, file_path, size, mtime, digest,
+                                     "no fossils written")
+                continue
+            manifest.record(ManifestEntry(
+                path=str(file_path), size=size, mtime=mtime, digest=digest,
+                batches=batches, fossils=n_fossils, ingested_at=time.time()
+            ))
+            stats.files_processed += 1
+            stats.bytes_processed += size
+            stats.fossils_written += n_fossils
+        return {f: in_flight[f] for f in not_done}
+
+    @staticmethod
+    def _record_failure(manifest: IngestManifest, stats: IngestStats, file_path: Path,
+                        size: int, mtime: float, digest: str, error: str):
+        manifest.record(ManifestEntry(
+            path=str(file_path), size=size, mtime=mtime, digest=digest,
+            ingested_at=time.time(), status="error", error=error
+        ))
+        stats.files_failed += 1
+
+    def _drop_stale_batches(self, entry: Optional[ManifestEntry]):
+        """Removes batches produced by a previous version of a changed file."""
+        if entry is None:
+            return
+        for name in entry.batches:
+            try:
+                (self.vault_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _as_written(out_path: Optional[Path]) -> List[Path]:
+        return [out_path] if out_path is not None else []
+
+    def _fossilize_file(self, file_path: Path, digest: Optional[str] = None) -> List[Path]:
+        """
+        Fossilizes a single raw file. Returns the batch files written.
+
+        Batches are named after the file's path and content digest, numbered
+        in write order, so re-fossilizing an unchanged file (e.g. after a run
+        was killed before the manifest recorded it) overwrites its batches
+        instead of duplicating them.
+        """
         print(f"   Processing {file_path.name}...")
         try:
+            self._begin_source(file_path, digest)
             # Special Handlers
             if "slice100k" in str(file_path).lower():
-                self._handle_slice100k(file_path)
-                return
+                return self._as_written(self._handle_slice100k(file_path))
             elif "energyflow" in str(file_path).lower():
-                self._handle_energyflow(file_path)
-                return
+                return self._as_written(self._handle_energyflow(file_path))
             elif "active_matter" in str(file_path).lower():
-                self._handle_active_matter(file_path)
-                return
+                return self._as_written(self._handle_active_matter(file_path))
             elif "gray_scott" in str(file_path).lower():
-                self._handle_gray_scott(file_path)
-                return
+                return self._as_written(self._handle_gray_scott(file_path))
             elif "mhd" in str(file_path).lower():
-                self._handle_mhd(file_path)
-                return
+                return self._as_written(self._handle_mhd(file_path))
             elif "the_well" in str(file_path).lower() or "datasets/raw/datasets" in str(file_path):
                 # Catch-all for The Well datasets (checking path structure)
-                self._handle_the_well_universal(file_path)
-                return
+                return self._as_written(self._handle_the_well_universal(file_path))
             elif file_path.suffix in ['.h5', '.hdf5']:
-                self._handle_generic_hdf5(file_path)
-                return
+                return self._as_written(self._handle_generic_hdf5(file_path))
 
             # Generic Handlers
+            if self.columnar and file_path.suffix in COLUMNAR_SUFFIXES:
+                return self._fossilize_columnar(file_path)
+
             if file_path.suffix == '.csv':
                 df = pd.read_csv(file_path)
             elif file_path.suffix == '.json':
@@ -93,14 +224,15 @@ class Fossilizer:
                 df = pd.read_parquet(file_path)
             else:
                 print(f"   ⚠️ Skipping unsupported type: {file_path.suffix}")
-                return
+                return []
 
             # Extract Features
             fossils = self._extract_fossils(df, file_path.name)
-            self._write_batch(fossils)
+            return self._as_written(self._write_batch(fossils))
             
         except Exception as e:
             print(f"   ❌ Error processing {file_path.name}: {e}")
+        return []
 
     def _handle_active_matter(self, file_path: Path):
         print(f"   🦠 Ingesting Active Matter: {file_path.name}")
@@ -128,7 +260,7 @@ class Fossilizer:
                         "thermodynamics": signature
                     }
                 }
-                self._write_batch([fossil])
+                return self._write_batch([fossil])
         except Exception as e:
             print(f"   ❌ Failed to read HDF5: {e}")
 
@@ -144,7 +276,7 @@ class Fossilizer:
                     "data": {"filename": file_path.name, "keys": keys, "type": "reaction_diffusion"},
                     "meta": {"domain": "chemical_kinetics"}
                 }
-                self._write_batch([fossil])
+                return self._write_batch([fossil])
         except Exception as e:
             print(f"   ❌ Failed to read HDF5: {e}")
 
@@ -193,7 +325,7 @@ class Fossilizer:
                         "thermodynamics": signature
                     }
                 }
-                self._write_batch([fossil])
+                return self._write_batch([fossil])
         except Exception as e:
             print(f"   ❌ Failed to read MHD HDF5: {e}")
 
@@ -257,7 +389,7 @@ class Fossilizer:
                         "thermodynamics": signature
                     }
                 }
-                self._write_batch([fossil])
+                return self._write_batch([fossil])
         except Exception as e:
             print(f"   ❌ Failed to read The Well HDF5: {e}")
 
@@ -279,7 +411,7 @@ class Fossilizer:
                     },
                     "meta": {"type": "pointer_fossil", "format": "hdf5"}
                 }
-                self._write_batch([fossil])
+                return self._write_batch([fossil])
         except Exception as e:
             print(f"   ❌ Failed to read HDF5: {e}")
 
@@ -294,7 +426,7 @@ class Fossilizer:
             "data": {"filename": file_path.name, "type": "additive_layer"},
             "meta": {"domain": "manufacturing"}
         }
-        self._write_batch([fossil])
+        return self._write_batch([fossil])
 
     def _handle_energyflow(self, file_path: Path):
         # EnergyFlow is often HDF5 or NumPy
@@ -307,10 +439,10 @@ class Fossilizer:
             "data": {"filename": file_path.name, "type": "particle_collision"},
             "meta": {"domain": "physics"}
         }
-        self._write_batch([fossil])
+        return self._write_batch([fossil])
 
-    def _write_batch(self, fossils: List[Dict[str, Any]]):
-        if not fossils: return
+    def _write_batch(self, fossils: List[Dict[str, Any]]) -> Optional[Path]:
+        if not fossils: return None
         
         # Convert dicts to Fossil objects and sign them
         validated_fossils = []
@@ -323,14 +455,56 @@ class Fossilizer:
                 print(f"   ⚠️ Invalid Fossil: {e}")
                 continue
                 
-        if not validated_fossils: return
+        if not validated_fossils: return None
+
+        return self._write_lines([fossil.model_dump_json() for fossil in validated_fossils])
+
+    def _begin_source(self, file_path: Path, digest: Optional[str] = None):
+        digest = digest or file_digest(file_path)
+        # Keyed on the path too, so two copies of the same bytes don't share batches
+        self._source_key = hashlib.blake2b(f"{file_path}\0{digest}".encode("utf-8"), digest_size=8).hexdigest()
+        self._batch_index = 0
 
-        batch_id = uuid.uuid4().hex[:8]
+    def _write_lines(self, lines: List[str]) -> Optional[Path]:
+        """Writes pre-serialized fossil lines as the next batch of the current source file."""
+        if not lines: return None
+
+        if self._source_key is None:
+            batch_id = uuid.uuid4().hex[:8]
+        else:
+            batch_id = f"{self._source_key}_{self._batch_index:04d}"
+            self._batch_index += 1
         out_path = self.vault_dir / f"fossil_batch_{batch_id}.ndjson"
-        with open(out_path, 'w') as f:
-            for fossil in validated_fossils:
-                f.write(fossil.model_dump_json() + "\n")
-        print(f"   ✅ Created {len(validated_fossils)} fossils -> {out_path.name}")
+        # Write aside and rename so a crash never leaves a torn batch in the vault
+        tmp_path = self.vault_dir / f".{out_path.name}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+        os.replace(tmp_path, out_path)
+        print(f"   ✅ Created {len(lines)} fossils -> {out_path.name}")
+        return out_path
+
+    def _fossilize_columnar(self, file_path: Path) -> List[Path]:
+        """
+        Streams a tabular file in chunks of chunk_rows and converts each block
+        to signed fossils in bulk (one batch file per chunk). The physics
+        signature is computed per chunk, i.e. per window.
+        """
+        written = []
+        try:
+            for chunk in iter_frames(file_path, self.chunk_rows):
+                meta = {
+                    "type": "raw_observation",
+                    "thermodynamics": self.compute_entropy_gradients(chunk)
+                }
+                lines = fossil_lines(chunk, file_path.name, meta, time.time())
+                written.extend(self._as_written(self._write_lines(lines)))
+        except Exception:
+            # A file is fossilized whole or not at all; earlier chunks would be orphaned otherwise
+            for batch in written:
+                batch.unlink(missing_ok=True)
+            raise
+        return written
 
     def compute_entropy_gradients(self, df: pd.DataFrame) -> Dict[str, float]:
         """
@@ -378,11 +552,34 @@ class Fossilizer:
             
         return fossils
 
+# Per-process Fossilizer used by process_parallel workers
+_WORKER: Optional[Fossilizer] = None
+
+def _init_worker(raw_dir: str, vault_dir: str, columnar: bool = True, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    global _WORKER
+    _WORKER = Fossilizer(raw_dir, vault_dir, caffeinate=False, columnar=columnar, chunk_rows=chunk_rows)
+
+def _fossilize_worker(path: str, full_digest: bool = False) -> Tuple[str, List[str], int]:
+    """
+    Runs in a pool process. Returns (digest, batch names, fossil count).
+    """
+    file_path = Path(path)
+    digest = file_digest(file_path, full=full_digest)
+    batches = _WORKER._fossilize_file(file_path, digest)
+    n_fossils = 0
+    for batch in batches:
+        with open(batch, 'rb') as f:
+            n_fossils += sum(1 for _ in f)
+    return digest, [b.name for b in batches], n_fossils
+
 if __name__ == "__main__":
     # Example Usage
     import sys
-    if len(sys.argv) > 2:
+    if len(sys.argv) > 3:
+        fossilizer = Fossilizer(sys.argv[1], sys.argv[2])
+        fossilizer.process_parallel(max_workers=int(sys.argv[3]))
+    elif len(sys.argv) > 2:
         fossilizer = Fossilizer(sys.argv[1], sys.argv[2])
         fossilizer.process_all()
     else:
-        print("Usage: python fossilizer.py <raw_dir> <vault_dir>")
+        print("Usage: python fossilizer.py <raw_dir> <vault_dir> [workers]")
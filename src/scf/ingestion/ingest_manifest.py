@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import hashlib
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Bytes hashed from each end of a file for the sampled fingerprint.
+SAMPLE_BYTES = 1 << 20
+
+
+def file_digest(path: Path, full: bool = False, sample_bytes: int = SAMPLE_BYTES) -> str:
+    """
+    Content digest of a raw file.
+
+    By default only the head and tail blocks (plus the size) are hashed, which
+    keeps re-runs over multi-TB HDF5 vaults cheap. Pass full=True to hash the
+    whole file.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    size = path.stat().st_size
+    h.update(str(size).encode("utf-8"))
+    with open(path, "rb") as f:
+        if full or size <= 2 * sample_bytes:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        else:
+            h.update(f.read(sample_bytes))
+            f.seek(size - sample_bytes)
+            h.update(f.read(sample_bytes))
+    return h.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    size: int
+    mtime: float
+    digest: str
+    batches: List[str] = field(default_factory=list)
+    fossils: int = 0
+    ingested_at: float = 0.0
+    # "error" marks a file that produced no fossils; it is kept for reporting and retried on the next run
+    status: str = "ok"
+    error: str = ""
+
+
+class IngestManifest:
+    """
+    Persistent record of raw files already fossilized.
+    Stored as an append-only NDJSON journal so a crash mid-run loses at most
+    the file that was in flight; the last entry for a path wins on reload.
+    """
+    def __init__(self, manifest_path: str):
+        self.manifest_path = Path(manifest_path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._load()
+        self._journal = open(self.manifest_path, "a", encoding="utf-8")
+
+    def _load(self):
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = ManifestEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    # Torn final line from an interrupted write
+                    continue
+                self.entries[entry.path] = entry
+
+    def lookup(self, path: Path) -> Optional[ManifestEntry]:
+        return self.entries.get(str(path))
+
+    def is_current(self, path: Path, size: int, mtime: float, full_digest: bool = False) -> bool:
+        """
+        True if the file was ingested and its content is unchanged.
+        Size/mtime match is trusted; otherwise the digest decides (e.g. a touched
+        or re-copied file with identical bytes is still skipped). Failed files
+        are never current: the failure may have been transient (a flaky read, a
+        broken worker pool).
+        """
+        entry = self.lookup(path)
+        if entry is None or entry.status == "error":
+            return False
+        if entry.size == size and entry.mtime == mtime:
+            return True
+        if entry.size != size:
+            return False
+        if file_digest(path, full=full_digest) == entry.digest:
+            # Refresh stat so the next run takes the fast path
+            self.record(ManifestEntry(**{**asdict(entry), "mtime": mtime}))
+            return True
+        return False
+
+    def record(self, entry: ManifestEntry):
+        self.entries[entry.path] = entry
+        self._journal.write(json.dumps(asdict(entry)) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def compact(self):
+        """Rewrites the journal with a single line per path."""
+        self._journal.close()
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(asdict(entry)) + "\n")
+        os.replace(tmp_path, self.manifest_path)
+        self._journal = open(self.manifest_path, "a", encoding="utf-8")
+
+    def close(self):
+        if not self._journal.closed:
+            self._journal.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+@dataclass
+class IngestStats:
+    files_seen: int = 0
+    files_processed: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    bytes_processed: int = 0
+    fossils_written: int = 0
+    started_at: float = field(default_factory=time.time)
+    elapsed_s: float = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files_processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes_processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["files_per_sec"] = self.files_per_sec
+        d["bytes_per_sec"] = self.bytes_per_sec
+        return d
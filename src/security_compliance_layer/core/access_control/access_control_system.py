@@ -23,6 +23,8 @@ import hashlib
 from typing import Dict, List, Optional, Tuple, Union, Any
 from datetime import datetime, timedelta
 
+from src.security_compliance_layer.core.access_control.policy_decision_engine import PolicyDecisionEngine
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,6 +46,20 @@ class AccessControlSystem:
     - Context-Aware Access Decisions
     """
     
+    # Access checks in evaluation order, cheapest first: (factor name, config flag, check)
+    _decision_checks = (
+        ("trust", "trust_based_enabled",
+         lambda self, identity_id, resource, action, context: self._check_trust_based_access(identity_id, action)),
+        ("rbac", "rbac_enabled",
+         lambda self, identity_id, resource, action, context: resource.check_rbac(action)),
+        ("abac", "abac_enabled",
+         lambda self, identity_id, resource, action, context: resource.check_abac(action)),
+        ("context", "context_aware_enabled",
+         lambda self, identity_id, resource, action, context: resource.check_context(action, context)),
+        ("pbac", "pbac_enabled",
+         lambda self, identity_id, resource, action, context: resource.check_pbac(action, context))
+    )
+    
     def __init__(self, config_path: str = None):
         """
         Initialize the Access Control System with configuration.
@@ -56,10 +72,21 @@ class AccessControlSystem:
         self.permissions = {}
         self.policies = {}
         self.resources = {}
-        self.access_decisions = {}
         self.jit_requests = {}
         self.trust_thresholds = {}
         
+        # Compiled roles, policies and resources, decision cache and JIT grant index
+        self.decision_engine = PolicyDecisionEngine(
+            self.roles,
+            self.permissions,
+            self.policies,
+            self.resources,
+            self.config["context_factors"],
+            cache_size=self.config["decision_cache_size"],
+            cache_ttl=self.config["decision_cache_ttl"]
+        )
+        self.access_decisions = self.decision_engine.decision_cache
+        
         # Initialize from configuration
         self._initialize_from_config()
         
@@ -84,6 +111,7 @@ class AccessControlSystem:
             "trust_based_enabled": True,
             "context_aware_enabled": True,
             "decision_cache_ttl": 300,  # 5 minutes
+            "decision_cache_size": 10000,
             "jit_request_ttl": 3600,    # 1 hour
             "default_trust_threshold": 0.7,
             "permission_levels": ["read", "write", "execute", "admin"],
@@ -164,6 +192,7 @@ class AccessControlSystem:
         }
         
         self.roles[role_id] = role
+        self.decision_engine.invalidate_roles()
         
         logger.info(f"Created role {name} with ID {role_id}")
         
@@ -198,6 +227,7 @@ class AccessControlSystem:
             role["permissions"] = permissions
         
         role["updated_at"] = datetime.utcnow().isoformat()
+        self.decision_engine.invalidate_roles()
         
         logger.info(f"Updated role {role_id}")
         
@@ -218,6 +248,7 @@ class AccessControlSystem:
             return False
         
         del self.roles[role_id]
+        self.decision_engine.invalidate_roles()
         
         logger.info(f"Deleted role {role_id}")
         
@@ -247,6 +278,19 @@ class AccessControlSystem:
         """
         return [role for role in self.roles.values() if role["name"] == name]
     
+    def role_has_permission(self, role_ids: List[str], permission: str) -> bool:
+        """
+        Check if any of the given roles grants a permission.
+        
+        Args:
+            role_ids: Role IDs
+            permission: Permission ID or name
+            
+        Returns:
+            True if a role grants the permission, False otherwise
+        """
+        return self.decision_engine.role_permissions.has_permission(role_ids, permission)
+    
     def create_permission(self, name: str, description: str, resource_type: str) -> str:
         """
         Create a new permission.
@@ -271,6 +315,7 @@ class AccessControlSystem:
         }
         
         self.permissions[permission_id] = permission
+        self.decision_engine.invalidate_roles()
         
         logger.info(f"Created permission {name} with ID {permission_id}")
         
@@ -305,6 +350,7 @@ class AccessControlSystem:
             permission["resource_type"] = resource_type
         
         permission["updated_at"] = datetime.utcnow().isoformat()
+        self.decision_engine.invalidate_roles()
         
         logger.info(f"Updated permission {permission_id}")
         
@@ -330,6 +376,7 @@ class AccessControlSystem:
         for role in self.roles.values():
             if permission_id in role["permissions"]:
                 role["permissions"].remove(permission_id)
+        self.decision_engine.invalidate_roles()
         
         logger.info(f"Deleted permission {permission_id}")
         
@@ -385,6 +432,7 @@ class AccessControlSystem:
         }
         
         self.policies[policy_id] = policy
+        self.decision_engine.invalidate_policies()
         
         logger.info(f"Created policy {name} with ID {policy_id}")
         
@@ -423,6 +471,7 @@ class AccessControlSystem:
             policy["effect"] = effect
         
         policy["updated_at"] = datetime.utcnow().isoformat()
+        self.decision_engine.invalidate_policies()
         
         logger.info(f"Updated policy {policy_id}")
         
@@ -443,6 +492,7 @@ class AccessControlSystem:
             return False
         
         del self.policies[policy_id]
+        self.decision_engine.invalidate_policies()
         
         logger.info(f"Deleted policy {policy_id}")
         
@@ -496,6 +546,7 @@ class AccessControlSystem:
         }
         
         self.resources[registration_id] = resource
+        self.decision_engine.resource_registered(registration_id)
         
         logger.info(f"Registered resource {resource_id} of type {resource_type} with registration ID {registration_id}")
         
@@ -523,6 +574,7 @@ class AccessControlSystem:
             resource["attributes"][key] = value
         
         resource["updated_at"] = datetime.utcnow().isoformat()
+        self.decision_engine.invalidate_resource(resource["resource_id"])
         
         logger.info(f"Updated resource with registration ID {registration_id}")
         
@@ -542,7 +594,8 @@ class AccessControlSystem:
             logger.warning(f"Resource with registration ID {registration_id} not found")
             return False
         
-        del self.resources[registration_id]
+        resource = self.resources.pop(registration_id)
+        self.decision_engine.resource_unregistered(registration_id, resource["resource_id"])
         
         logger.info(f"Unregistered resource with registration ID {registration_id}")
         
@@ -612,26 +665,22 @@ class AccessControlSystem:
             if "timestamp" not in context:
                 context["timestamp"] = datetime.utcnow().isoformat()
         
-        # Check cache for recent decision
-        cache_key = f"{identity_id}:{resource_id}:{action}"
-        if cache_key in self.access_decisions:
-            cached_decision = self.access_decisions[cache_key]
-            cache_time = datetime.fromisoformat(cached_decision["timestamp"])
-            if (datetime.utcnow() - cache_time).total_seconds() < self.config["decision_cache_ttl"]:
-                # Return cached decision with new decision ID
-                decision = cached_decision.copy()
-                decision["id"] = decision_id
-                decision["cached"] = True
-                return decision
-        
-        # Find resources matching the resource ID
-        resources = self.get_resources_by_id(resource_id)
-        if not resources:
+        # Find the compiled form of the resource
+        resource = self.decision_engine.get_resource(resource_id)
+        if resource is None:
             logger.warning(f"Resource {resource_id} not found")
             return self._create_access_denied_decision(decision_id, identity_id, resource_id, action, context, "Resource not found")
         
-        # For simplicity, use the first matching resource
-        resource = resources[0]
+        # Check cache for recent decision, keyed by the context values the resource's rules read
+        fingerprint = resource.context_fingerprint(context)
+        cache_key = (identity_id, resource_id, action, fingerprint)
+        cached_decision = self.access_decisions.get(cache_key) if fingerprint is not None else None
+        if cached_decision is not None:
+            # Return cached decision with new decision ID
+            decision = cached_decision.copy()
+            decision["id"] = decision_id
+            decision["cached"] = True
+            return decision
         
         # Initialize decision factors
         decision_factors = {
@@ -642,50 +691,20 @@ class AccessControlSystem:
             "context": {"allowed": False, "factors": {}}
         }
         
-        # Check RBAC if enabled
-        if self.config["rbac_enabled"]:
-            rbac_decision = self._check_rbac_access(identity_id, resource, action)
-            decision_factors["rbac"] = rbac_decision
-        
-        # Check ABAC if enabled
-        if self.config["abac_enabled"]:
-            abac_decision = self._check_abac_access(identity_id, resource, action, context)
-            decision_factors["abac"] = abac_decision
-        
-        # Check PBAC if enabled
-        if self.config["pbac_enabled"]:
-            pbac_decision = self._check_pbac_access(identity_id, resource, action, context)
-            decision_factors["pbac"] = pbac_decision
-        
-        # Check trust-based access if enabled
-        if self.config["trust_based_enabled"]:
-            trust_decision = self._check_trust_based_access(identity_id, action)
-            decision_factors["trust"] = trust_decision
-        
-        # Check context-aware access if enabled
-        if self.config["context_aware_enabled"]:
-            context_decision = self._check_context_aware_access(identity_id, resource, action, context)
-            decision_factors["context"] = context_decision
-        
-        # Determine final decision
-        # If default deny, all checks must pass
-        # If not default deny, any check can pass
-        if self.config["default_deny"]:
-            allowed = all([
-                not self.config["rbac_enabled"] or decision_factors["rbac"]["allowed"],
-                not self.config["abac_enabled"] or decision_factors["abac"]["allowed"],
-                not self.config["pbac_enabled"] or decision_factors["pbac"]["allowed"],
-                not self.config["trust_based_enabled"] or decision_factors["trust"]["allowed"],
-                not self.config["context_aware_enabled"] or decision_factors["context"]["allowed"]
-            ])
-        else:
-            allowed = any([
-                self.config["rbac_enabled"] and decision_factors["rbac"]["allowed"],
-                self.config["abac_enabled"] and decision_factors["abac"]["allowed"],
-                self.config["pbac_enabled"] and decision_factors["pbac"]["allowed"],
-                self.config["trust_based_enabled"] and decision_factors["trust"]["allowed"],
-                self.config["context_aware_enabled"] and decision_factors["context"]["allowed"]
-            ])
+        # Evaluate the enabled checks, cheapest first, until one decides the outcome:
+        # if default deny, all checks must pass and the first denial decides;
+        # if not default deny, any check can pass and the first grant decides
+        default_deny = self.config["default_deny"]
+        decided = False
+        for factor_name, config_flag, check in self._decision_checks:
+            if not self.config[config_flag]:
+                continue
+            if decided:
+                decision_factors[factor_name]["skipped"] = True
+                continue
+            decision_factors[factor_name] = check(self, identity_id, resource, action, context)
+            decided = decision_factors[factor_name]["allowed"] != default_deny
+        allowed = not default_deny if decided else default_deny
         
         # Create decision
         decision = {
@@ -701,7 +720,8 @@ class AccessControlSystem:
         }
         
         # Cache decision
-        self.access_decisions[cache_key] = decision
+        if fingerprint is not None:
+            self.access_decisions.put(cache_key, decision)
         
         # Log decision
         if allowed:
@@ -711,167 +731,6 @@ class AccessControlSystem:
         
         return decision
     
-    def _check_rbac_access(self, identity_id: str, resource: Dict, action: str) -> Dict:
-        """
-        Check access using Role-Based Access Control.
-        
-        Args:
-            identity_id: Identity ID
-            resource: Resource information
-            action: Action to perform
-            
-        Returns:
-            Dict containing RBAC decision
-        """
-        # In a production implementation, this would retrieve roles assigned to the identity
-        # For demonstration, we assume roles are stored in the resource attributes
-        allowed_roles = resource["attributes"].get("allowed_roles", {})
-        
-        # Check if identity has any of the allowed roles for the action
-        identity_roles = []  # This would be retrieved from identity store
-        
-        # For demonstration, we assume the identity has a role if it's in the allowed roles
-        for role_name, actions in allowed_roles.items():
-            if action in actions:
-                identity_roles.append(role_name)
-        
-        allowed = len(identity_roles) > 0
-        
-        return {
-            "allowed": allowed,
-            "roles": identity_roles
-        }
-    
-    def _check_abac_access(self, identity_id: str, resource: Dict, action: str, context: Dict) -> Dict:
-        """
-        Check access using Attribute-Based Access Control.
-        
-        Args:
-            identity_id: Identity ID
-            resource: Resource information
-            action: Action to perform
-            context: Access context
-            
-        Returns:
-            Dict containing ABAC decision
-        """
-        # In a production implementation, this would retrieve identity attributes
-        # and evaluate them against resource attributes and access rules
-        
-        # For demonstration, we assume attribute rules are stored in the resource attributes
-        attribute_rules = resource["attributes"].get("attribute_rules", {})
-        
-        # Check if any attribute rule allows the action
-        matching_attributes = {}
-        
-        # For demonstration, we assume the identity attributes match if they're in the rules
-        for attr_name, attr_values in attribute_rules.get(action, {}).items():
-            # This would check if the identity has the attribute with one of the allowed values
-            # For demonstration, we assume it does if the attribute is in the rules
-            matching_attributes[attr_name] = attr_values
-        
-        allowed = len(matching_attributes) > 0
-        
-        return {
-            "allowed": allowed,
-            "attributes": matching_attributes
-        }
-    
-    def _check_pbac_access(self, identity_id: str, resource: Dict, action: str, context: Dict) -> Dict:
-        """
-        Check access using Policy-Based Access Control.
-        
-        Args:
-            identity_id: Identity ID
-            resource: Resource information
-            action: Action to perform
-            context: Access context
-            
-        Returns:
-            Dict containing PBAC decision
-        """
-        # In a production implementation, this would evaluate all applicable policies
-        
-        # For demonstration, we assume policies are stored in the resource attributes
-        policy_references = resource["attributes"].get("policies", [])
-        
-        # Check if any policy allows the action
-        matching_policies = []
-        
-        for policy_id in policy_references:
-            if policy_id in self.policies:
-                policy = self.policies[policy_id]
-                
-                # Check if policy applies to this action
-                if self._evaluate_policy(policy, identity_id, resource, action, context):
-                    matching_policies.append(policy["name"])
-        
-        allowed = len(matching_policies) > 0
-        
-        return {
-            "allowed": allowed,
-            "policies": matching_policies
-        }
-    
-    def _evaluate_policy(self, policy: Dict, identity_id: str, resource: Dict, action: str, context: Dict) -> bool:
-        """
-        Evaluate a policy for an access request.
-        
-        Args:
-            policy: Policy information
-            identity_id: Identity ID
-            resource: Resource information
-            action: Action to perform
-            context: Access context
-            
-        Returns:
-            True if policy allows access, False otherwise
-        """
-        # In a production implementation, this would evaluate policy rules
-        # against the identity, resource, action, and context
-        
-        # For demonstration, we assume a simple rule format
-        for rule in policy["rules"]:
-            if rule.get("action") == action:
-                # Check if rule conditions match
-                conditions_match = True
-                
-                for condition_key, condition_value in rule.get("conditions", {}).items():
-                    # Check identity attributes
-                    if condition_key.startswith("identity."):
-                        attr_name = condition_key[len("identity."):]
-                        # This would check identity attributes
-                        # For demonstration, we assume it matches
-                        pass
-                    
-                    # Check resource attributes
-                    elif condition_key.startswith("resource."):
-                        attr_name = condition_key[len("resource."):]
-                        if attr_name in resource["attributes"]:
-                            if resource["attributes"][attr_name] != condition_value:
-                                conditions_match = False
-                                break
-                        else:
-                            conditions_match = False
-                            break
-                    
-                    # Check context attributes
-                    elif condition_key.startswith("context."):
-                        attr_name = condition_key[len("context."):]
-                        if attr_name in context:
-                            if context[attr_name] != condition_value:
-                                conditions_match = False
-                                break
-                        else:
-                            conditions_match = False
-                            break
-                
-                if conditions_match:
-                    return policy["effect"] == "allow"
-        
-        # If no rule matches, use the opposite of the policy effect
-        return policy["effect"] != "allow"
-    
     def _check_trust_based_access(self, identity_id: str, action: str) -> Dict:
         """
         Check access using Trust-Based Access Control.
@@ -898,86 +757,6 @@ class AccessControlSystem:
             "threshold": threshold
         }
     
-    def _check_context_aware_access(self, identity_id: str, resource: Dict, action: str, context: Dict) -> Dict:
-        """
-        Check access using Context-Aware Access Control.
-        
-        Args:
-            identity_id: Identity ID
-            resource: Resource information
-            action: Action to perform
-            context: Access context
-            
-        Returns:
-            Dict containing context-aware decision
-        """
-        # In a production implementation, this would evaluate context factors
-        # against access rules
-        
-        # For demonstration, we assume context rules are stored in the resource attributes
-        context_rules = resource["attributes"].get("context_rules", {})
-        
-        # Check if context satisfies the rules for the action
-        matching_factors = {}
-        
-        for factor_name in self.config["context_factors"]:
-            if factor_name in context:
-                # Check if factor has rules for this action
-                if action in context_rules.get(factor_name, {}):
-                    factor_rules = context_rules[factor_name][action]
-                    
-                    # Check if context value satisfies the rules
-                    if self._evaluate_context_factor(factor_name, context[factor_name], factor_rules):
-                        matching_factors[factor_name] = context[factor_name]
-        
-        # For demonstration, we require all defined factors to match
-        required_factors = set(context_rules.keys())
-        matching_factor_names = set(matching_factors.keys())
-        
-        allowed = required_factors.issubset(matching_factor_names)
-        
-        return {
-            "allowed": allowed,
-            "factors": matching_factors
-        }
-    
-    def _evaluate_context_factor(self, factor_name: str, factor_value: Any, factor_rules: Dict) -> bool:
-        """
-        Evaluate a context factor against rules.
-        
-        Args:
-            factor_name: Factor name
-            factor_value: Factor value
-            factor_rules: Factor rules
-            
-        Returns:
-            True if factor satisfies rules, False otherwise
-        """
-        # In a production implementation, this would evaluate different types of rules
-        # based on the factor type
-        
-        # For demonstration, we assume simple equality or range rules
-        if "equals" in factor_rules:
-            return factor_value == factor_rules["equals"]
-        
-        if "in" in factor_rules:
-            return factor_value in factor_rules["in"]
-        
-        if "range" in factor_rules:
-            min_value = factor_rules["range"].get("min")
-            max_value = factor_rules["range"].get("max")
-            
-            if min_value is not None and factor_value < min_value:
-                return False
-            
-            if max_value is not None and factor_value > max_value:
-                return False
-            
-            return True
-        
-        # If no rule type matches, default to allow
-        return True
-    
     def _create_access_denied_decision(self, decision_id: str, identity_id: str, resource_id: str, action: str, context: Dict, reason: str) -> Dict:
         """
         Create an access denied decision.
@@ -1104,6 +883,7 @@ class AccessControlSystem:
         request["approver_id"] = approver_id
         request["approval_time"] = datetime.utcnow().isoformat()
         request["access_granted"] = True
+        self.decision_engine.jit_grants.add(request)
         
         logger.info(f"Approved JIT access request {request_id} by approver {approver_id}")
         
@@ -1153,24 +933,8 @@ class AccessControlSystem:
         Returns:
             True if JIT access is granted, False otherwise
         """
-        # Find active JIT requests for the identity, resource, and action
-        for request in self.jit_requests.values():
-            if (request["identity_id"] == identity_id and
-                request["resource_id"] == resource_id and
-                request["action"] == action and
-                request["status"] == "approved" and
-                request["access_granted"]):
-                
-                # Check if request is still valid
-                expires_at = datetime.fromisoformat(request["expires_at"])
-                if expires_at >= datetime.utcnow():
-                    return True
-                else:
-                    # Mark request as expired
-                    request["status"] = "expired"
-                    request["access_granted"] = False
-        
-        return False
+        # Approved requests for the identity, resource, and action, soonest to expire first
+        return self.decision_engine.jit_grants.check(identity_id, resource_id, action, datetime.utcnow())
     
     def get_jit_request(self, request_id: str) -> Optional[Dict]:
         """
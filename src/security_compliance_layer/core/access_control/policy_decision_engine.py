@@ -0,0 +1,442 @@
+"""
+Policy Decision Engine Module for the Security & Compliance Layer of Industriverse.
+
+This module compiles the roles, policies and registered resources of the Access
+Control System into structures that access decisions can reuse:
+- Role-to-permission bitsets
+- Per-resource decision tables indexed by action: allowed roles, attribute
+  rules, applicable policy rules (with resource conditions already resolved)
+  and context rules
+- A bounded, context-aware decision cache
+- An index of approved Just-In-Time grants by identity, ordered by expiry
+
+Compiled structures are dropped when the roles, policies or resources they were
+compiled from change, together with every cached decision.
+"""
+
+import heapq
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Sentinel for context keys absent from a request
+_MISSING = object()
+
+
+def evaluate_context_factor(factor_value: Any, factor_rules: Dict) -> bool:
+    """
+    Evaluate a context factor against rules.
+
+    Args:
+        factor_value: Factor value
+        factor_rules: Factor rules (equals, in or range)
+
+    Returns:
+        True if factor satisfies rules, False otherwise
+    """
+    if "equals" in factor_rules:
+        return factor_value == factor_rules["equals"]
+
+    if "in" in factor_rules:
+        return factor_value in factor_rules["in"]
+
+    if "range" in factor_rules:
+        min_value = factor_rules["range"].get("min")
+        max_value = factor_rules["range"].get("max")
+
+        if min_value is not None and factor_value < min_value:
+            return False
+
+        if max_value is not None and factor_value > max_value:
+            return False
+
+        return True
+
+    # If no rule type matches, default to allow
+    return True
+
+
+class RolePermissionIndex:
+    """Permissions of each role as a bitset over all permissions in use."""
+
+    def __init__(self, roles: Dict[str, Dict], permissions: Dict[str, Dict]):
+        """
+        Compile the role permissions.
+
+        Roles may list permissions by ID or by name; both are indexed.
+
+        Args:
+            roles: Roles by role ID
+            permissions: Permissions by permission ID
+        """
+        self.bits: Dict[str, int] = {}
+        self.role_masks: Dict[str, int] = {}
+
+        for role_id, role in roles.items():
+            mask = 0
+            for permission in role.get("permissions", []):
+                mask |= self._bit(permission)
+                if permission in permissions:
+                    mask |= self._bit(permissions[permission]["name"])
+            self.role_masks[role_id] = mask
+
+    def _bit(self, permission: str) -> int:
+        bit = self.bits.get(permission)
+        if bit is None:
+            bit = self.bits[permission] = 1 << len(self.bits)
+        return bit
+
+    def mask(self, permissions: Iterable[str]) -> int:
+        """Bitset of permissions (IDs or names); unknown permissions are ignored."""
+        mask = 0
+        for permission in permissions:
+            mask |= self.bits.get(permission, 0)
+        return mask
+
+    def has_permission(self, role_ids: Iterable[str], permission: str) -> bool:
+        """Check if any of the roles grants a permission."""
+        bit = self.bits.get(permission, 0)
+        if not bit:
+            return False
+        return any(self.role_masks.get(role_id, 0) & bit for role_id in role_ids)
+
+    def has_all_permissions(self, role_ids: Iterable[str], permissions: Iterable[str]) -> bool:
+        """Check if the roles together grant every one of the permissions."""
+        required = 0
+        for permission in permissions:
+            bit = self.bits.get(permission)
+            if bit is None:
+                return False
+            required |= bit
+        granted = 0
+        for role_id in role_ids:
+            granted |= self.role_masks.get(role_id, 0)
+        return granted & required == required
+
+
+class CompiledResource:
+    """Decision tables of one registered resource, indexed by action."""
+
+    def __init__(self, resource: Dict, policies: Dict[str, Dict], context_factors: List[str]):
+        """
+        Compile a resource.
+
+        Args:
+            resource: Registered resource
+            policies: Policies by policy ID
+            context_factors: Context factors evaluated by context-aware access
+        """
+        self.resource = resource
+        attributes = resource["attributes"]
+
+        # RBAC: role names allowed per action
+        self.roles_by_action: Dict[str, Tuple[str, ...]] = {}
+        for role_name, actions in attributes.get("allowed_roles", {}).items():
+            for action in set(actions):
+                self.roles_by_action[action] = self.roles_by_action.get(action, ()) + (role_name,)
+
+        # ABAC: attribute rules per action
+        self.attribute_rules: Dict[str, Dict] = attributes.get("attribute_rules", {})
+
+        # PBAC: per referenced policy, rules per action with resource conditions resolved
+        context_keys = set()
+        self._policies: List[Tuple[str, bool, Dict[str, List[Tuple[Tuple[str, Any], ...]]]]] = []
+        for policy_id in attributes.get("policies", []):
+            policy = policies.get(policy_id)
+            if policy is None:
+                continue
+            rules_by_action: Dict[str, List[Tuple[Tuple[str, Any], ...]]] = {}
+            for rule in policy["rules"]:
+                context_conditions = self._compile_conditions(rule.get("conditions", {}), attributes)
+                if context_conditions is None:
+                    # A resource condition fails, the rule can never match
+                    continue
+                context_keys.update(key for key, _ in context_conditions)
+                rules_by_action.setdefault(rule.get("action"), []).append(context_conditions)
+            self._policies.append((policy["name"], policy["effect"] == "allow", rules_by_action))
+
+        # Context-aware: rules per action for the evaluated factors
+        context_rules = attributes.get("context_rules", {})
+        self.required_factors = frozenset(context_rules)
+        self.factor_rules_by_action: Dict[str, List[Tuple[str, Dict]]] = {}
+        for factor_name in context_factors:
+            for action, factor_rules in context_rules.get(factor_name, {}).items():
+                self.factor_rules_by_action.setdefault(action, []).append((factor_name, factor_rules))
+                context_keys.add(factor_name)
+
+        # Context keys the decisions depend on, for the decision cache
+        self.context_keys = tuple(sorted(context_keys))
+
+    @staticmethod
+    def _compile_conditions(conditions: Dict, attributes: Dict) -> Optional[Tuple[Tuple[str, Any], ...]]:
+        """Resolve resource conditions; returns the context conditions left, or None if one fails."""
+        context_conditions = []
+        for condition_key, condition_value in conditions.items():
+            if condition_key.startswith("resource."):
+                attr_name = condition_key[len("resource."):]
+                if attr_name not in attributes or attributes[attr_name] != condition_value:
+                    return None
+            elif condition_key.startswith("context."):
+                context_conditions.append((condition_key[len("context."):], condition_value))
+            # Identity conditions are not evaluated yet and always match
+        return tuple(context_conditions)
+
+    def context_fingerprint(self, context: Dict) -> Optional[Hashable]:
+        """Values of the context keys the decisions depend on, or None if not hashable."""
+        fingerprint = tuple(context.get(key, _MISSING) for key in self.context_keys)
+        try:
+            hash(fingerprint)
+        except TypeError:
+            return None
+        return fingerprint
+
+    def check_rbac(self, action: str) -> Dict:
+        """Check access using Role-Based Access Control."""
+        roles = list(self.roles_by_action.get(action, ()))
+        return {
+            "allowed": len(roles) > 0,
+            "roles": roles
+        }
+
+    def check_abac(self, action: str) -> Dict:
+        """Check access using Attribute-Based Access Control."""
+        matching_attributes = dict(self.attribute_rules.get(action, {}))
+        return {
+            "allowed": len(matching_attributes) > 0,
+            "attributes": matching_attributes
+        }
+
+    def check_pbac(self, action: str, context: Dict) -> Dict:
+        """Check access using Policy-Based Access Control."""
+        matching_policies = []
+        for name, allow, rules_by_action in self._policies:
+            rules = rules_by_action.get(action)
+            if not rules:
+                # If no rule matches, the policy has the opposite of its effect
+                if not allow:
+                    matching_policies.append(name)
+                continue
+            matched = any(
+                all(context.get(key, _MISSING) == value for key, value in conditions)
+                for conditions in rules
+            )
+            if matched == allow:
+                matching_policies.append(name)
+        return {
+            "allowed": len(matching_policies) > 0,
+            "policies": matching_policies
+        }
+
+    def check_context(self, action: str, context: Dict) -> Dict:
+        """Check access using Context-Aware Access Control."""
+        matching_factors = {}
+        for factor_name, factor_rules in self.factor_rules_by_action.get(action, ()):
+            if factor_name in context and evaluate_context_factor(context[factor_name], factor_rules):
+                matching_factors[factor_name] = context[factor_name]
+        return {
+            "allowed": self.required_factors.issubset(matching_factors),
+            "factors": matching_factors
+        }
+
+
+class DecisionCache:
+    """Least recently used access decisions, each valid for a time-to-live."""
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Initialize the decision cache.
+
+        Args:
+            max_size: Maximum number of cached decisions
+            ttl: Seconds a decision stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Get a decision that is still valid."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, decision: Dict):
+        """Cache a decision, evicting the least recently used ones over the maximum size."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, decision)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached decisions."""
+        self._entries.clear()
+
+
+class JITGrantIndex:
+    """Approved Just-In-Time requests by identity, resource and action, soonest to expire first."""
+
+    def __init__(self):
+        """Initialize the JIT grant index."""
+        self._grants: Dict[str, Dict[Tuple[str, str], List[Tuple[datetime, int, Dict]]]] = {}
+        self._sequence = 0
+
+    def add(self, request: Dict):
+        """
+        Index an approved JIT request.
+
+        Args:
+            request: JIT request information
+        """
+        self._sequence += 1
+        grants = self._grants.setdefault(request["identity_id"], {})
+        heapq.heappush(
+            grants.setdefault((request["resource_id"], request["action"]), []),
+            (datetime.fromisoformat(request["expires_at"]), self._sequence, request)
+        )
+
+    def check(self, identity_id: str, resource_id: str, action: str, now: datetime) -> bool:
+        """
+        Check if an identity holds an active grant, expiring lapsed grants on the way.
+
+        Grants that lapsed are marked expired, and grants no longer approved
+        are dropped, as they reach the front of their queue.
+
+        Args:
+            identity_id: Identity ID
+            resource_id: Resource ID
+            action: Action to perform
+            now: Current UTC time
+
+        Returns:
+            True if JIT access is granted, False otherwise
+        """
+        grants = self._grants.get(identity_id)
+        queue = grants.get((resource_id, action)) if grants else None
+        while queue:
+            expires_at, _, request = queue[0]
+            if request["status"] == "approved" and request["access_granted"]:
+                if expires_at >= now:
+                    return True
+                # Mark request as expired
+                request["status"] = "expired"
+                request["access_granted"] = False
+            heapq.heappop(queue)
+
+        if queue is not None:
+            del grants[(resource_id, action)]
+            if not grants:
+                del self._grants[identity_id]
+        return False
+
+
+class PolicyDecisionEngine:
+    """
+    Compiled view of the roles, policies and resources of an Access Control System.
+
+    The engine holds references to the system's role, permission, policy and
+    resource dictionaries and compiles from them on demand; the system reports
+    changes through the invalidate methods.
+    """
+
+    def __init__(self, roles: Dict[str, Dict], permissions: Dict[str, Dict], policies: Dict[str, Dict],
+                 resources: Dict[str, Dict], context_factors: List[str],
+                 cache_size: int = 10000, cache_ttl: float = 300):
+        """
+        Initialize the Policy Decision Engine.
+
+        Args:
+            roles: Roles by role ID
+            permissions: Permissions by permission ID
+            policies: Policies by policy ID
+            resources: Registered resources by registration ID
+            context_factors: Context factors evaluated by context-aware access
+            cache_size: Maximum number of cached decisions
+            cache_ttl: Seconds a cached decision stays valid
+        """
+        self.roles = roles
+        self.permissions = permissions
+        self.policies = policies
+        self.resources = resources
+        self.context_factors = list(context_factors)
+        self.decision_cache = DecisionCache(cache_size, cache_ttl)
+        self.jit_grants = JITGrantIndex()
+
+        self._role_permissions: Optional[RolePermissionIndex] = None
+        self._compiled: Dict[str, CompiledResource] = {}
+        # First registration of each resource ID
+        self._registrations: Dict[str, str] = {}
+        for registration_id, resource in resources.items():
+            self._registrations.setdefault(resource["resource_id"], registration_id)
+
+    @property
+    def role_permissions(self) -> RolePermissionIndex:
+        """Role-to-permission bitsets, compiled on first use after a change."""
+        if self._role_permissions is None:
+            self._role_permissions = RolePermissionIndex(self.roles, self.permissions)
+        return self._role_permissions
+
+    def get_resource(self, resource_id: str) -> Optional[CompiledResource]:
+        """
+        Get the compiled form of the first resource registered under an ID.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            Compiled resource if found, None otherwise
+        """
+        compiled = self._compiled.get(resource_id)
+        if compiled is None:
+            registration_id = self._registrations.get(resource_id)
+            if registration_id is None:
+                return None
+            compiled = CompiledResource(self.resources[registration_id], self.policies, self.context_factors)
+            self._compiled[resource_id] = compiled
+        return compiled
+
+    def resource_registered(self, registration_id: str):
+        """Index a newly registered resource."""
+        resource_id = self.resources[registration_id]["resource_id"]
+        if resource_id not in self._registrations:
+            self._registrations[resource_id] = registration_id
+            self.invalidate_resource(resource_id)
+
+    def resource_unregistered(self, registration_id: str, resource_id: str):
+        """Drop an unregistered resource, falling back to the next registration of its ID."""
+        if self._registrations.get(resource_id) != registration_id:
+            return
+        del self._registrations[resource_id]
+        for other_id, resource in self.resources.items():
+            if resource["resource_id"] == resource_id:
+                self._registrations[resource_id] = other_id
+                break
+        self.invalidate_resource(resource_id)
+
+    def invalidate_resource(self, resource_id: str):
+        """Recompile a resource on next use and drop cached decisions."""
+        self._compiled.pop(resource_id, None)
+        self.decision_cache.clear()
+
+    def invalidate_roles(self):
+        """Recompile role permissions on next use and drop cached decisions."""
+        self._role_permissions = None
+        self.decision_cache.clear()
+
+    def invalidate_policies(self):
+        """Recompile all resources on next use and drop cached decisions."""
+        self._compiled.clear()
+        self.decision_cache.clear()
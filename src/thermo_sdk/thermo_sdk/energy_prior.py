@@ -7,6 +7,8 @@ PRIOR_REGISTRY = {}
 
 class EnergyPrior:
     name = "base_prior"
+    # Per-sample tensor layout for flattened (N, D) batches; None keeps (N, D)
+    state_shape = None
     
     def __init__(self):
         self.ground_truth = None
@@ -33,5 +35,23 @@ class EnergyPrior:
         g = torch.autograd.grad(e, x)[0]
         return g
 
+    def _batch_tensor(self, X) -> torch.Tensor:
+        X = np.asarray(X, dtype=np.float32)
+        if self.state_shape is not None:
+            X = X.reshape((X.shape[0],) + tuple(self.state_shape))
+        return torch.from_numpy(np.ascontiguousarray(X))
+
+    def energy_batch(self, X: np.ndarray) -> np.ndarray:
+        """(N,) energies of a (N, D) batch of flattened states."""
+        with torch.no_grad():
+            e = self.energy(self._batch_tensor(X))
+        return np.broadcast_to(e.numpy().astype(np.float64), (len(X),)).copy()
+
+    def grad_batch(self, X: np.ndarray) -> np.ndarray:
+        """(N, D) analytic gradients: one autograd pass over the whole batch."""
+        x = self._batch_tensor(X).requires_grad_(True)
+        g = torch.autograd.grad(self.energy(x).sum(), x)[0]
+        return g.reshape(len(X), -1).numpy().astype(np.float64)
+
     def register(self):
         PRIOR_REGISTRY[self.name] = self
@@ -1,6 +1,6 @@
 import os
 import numpy as np
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Any
 import logging
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from workflow_engine.capsule_debug_trace_manager import (
+    CapsuleDebugTraceManager, CapsuleDebugTrace, AgentTrace, TraceStorageType
+)
+from workflow_engine.trace_store import read_trace_header
+
+
+def _record(manager, workflow_id, execution_id, agents, decisions, status="completed"):
+    manager.create_trace(workflow_id, execution_id)
+    for agent_id, decision in zip(agents, decisions):
+        manager.add_agent_trace(execution_id, AgentTrace(agent_id=agent_id, decision=decision))
+    manager.update_capsule_memory(execution_id, {"line": execution_id}, state="running")
+    if status:
+        manager.complete_trace(execution_id, status=status)
+
+
+class TestCapsuleTraceStore(unittest.TestCase):
+    """Test cases for indexed file storage of debug traces."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        self.memory = CapsuleDebugTraceManager()
+        self.files = CapsuleDebugTraceManager(TraceStorageType.FILE, self.path)
+        for i in range(30):
+            agents = [f"agent{(i + k) % 4}" for k in range(i % 5 + 1)]
+            decisions = ["completed" if (i + k) % 3 else "failed" for k in range(len(agents))]
+            status = None if i % 10 == 9 else ("failed" if i % 4 == 0 else "completed")
+            for manager in (self.memory, self.files):
+                _record(manager, f"wf{i % 3}", f"exec{i}", agents, decisions, status)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _strip(self, listing):
+        return [(t["execution_id"], t["status"], t["agent_count"]) for t in listing]
+
+    def test_listing_uses_index_without_loading_traces(self):
+        reopened = CapsuleDebugTraceManager(TraceStorageType.FILE, self.path)
+        cutoff = datetime.now() + timedelta(days=1)
+        for filters in ({}, {"workflow_id": "wf1"}, {"status": "failed"},
+                        {"end_time": cutoff}, {"workflow_id": "wf2", "limit": 3}):
+            self.assertEqual(sorted(self._strip(reopened.list_traces(**filters))),
+                             sorted(self._strip(self.memory.list_traces(**filters))))
+        self.assertEqual(len(reopened.traces), 0)
+
+    def test_trace_files_stay_valid_json(self):
+        trace_path = os.path.join(self.path, "wf1", "exec4.json")
+        with open(trace_path) as f:
+            trace = CapsuleDebugTrace(**json.load(f))
+        self.assertEqual(trace, self.files.get_trace("exec4"))
+        header, entries = read_trace_header(trace_path)
+        self.assertNotIn("agent_trace", header)
+        self.assertEqual(len(list(entries)), len(trace.agent_trace))
+
+    def test_analysis_streams_agent_trace(self):
+        reopened = CapsuleDebugTraceManager(TraceStorageType.FILE, self.path)
+        self.assertEqual(reopened.analyze_trace("exec7"), self.files.analyze_trace("exec7"))
+        comparison = reopened.compare_traces("exec3", "exec8")
+        expected = self.files.compare_traces("exec3", "exec8")
+        for key in ("common_agents", "unique_agents1", "unique_agents2"):
+            self.assertEqual(sorted(comparison.pop(key)), sorted(expected.pop(key)))
+        self.assertEqual(comparison, expected)
+        self.assertEqual(len(reopened.traces), 0)
+
+    def test_external_and_legacy_files_are_indexed(self):
+        legacy = CapsuleDebugTrace(workflow_id="wf9", execution_id="legacy1",
+                                   agent_trace=[AgentTrace(agent_id="a"), AgentTrace(agent_id="b")],
+                                   end_time=datetime.now().isoformat(), status="completed")
+        os.makedirs(os.path.join(self.path, "wf9"))
+        with open(os.path.join(self.path, "wf9", "legacy1.json"), "w") as f:
+            f.write(legacy.model_dump_json(indent=2))
+
+        listing = self.files.list_traces(workflow_id="wf9")
+        self.assertEqual(self._strip(listing), [("legacy1", "completed", 2)])
+        self.assertEqual(self.files.analyze_trace("legacy1")["agent_counts"], {"a": 1, "b": 1})
+
+    def test_rewritten_and_deleted_files_are_reconciled(self):
+        reopened = CapsuleDebugTraceManager(TraceStorageType.FILE, self.path)
+        reopened.list_traces()
+        trace_path = os.path.join(self.path, "wf1", "exec4.json")
+        with open(trace_path) as f:
+            trace = CapsuleDebugTrace(**json.load(f))
+        trace.status = "cancelled"
+        # Rewritten in place: the workflow directory's mtime does not change
+        with open(trace_path, "w") as f:
+            f.write(trace.model_dump_json())
+        st = os.stat(trace_path)
+        os.utime(trace_path, (st.st_atime, st.st_mtime + 10))
+        os.remove(os.path.join(self.path, "wf2", "exec5.json"))
+
+        listing = {t["execution_id"]: t["status"] for t in reopened.list_traces()}
+        self.assertEqual(listing["exec4"], "cancelled")
+        self.assertNotIn("exec5", listing)
+        self.assertEqual(len(listing), 29)
+
+    def test_cache_is_bounded(self):
+        small = CapsuleDebugTraceManager(TraceStorageType.FILE, self.path, cache_max_bytes=2000)
+        for i in range(30):
+            self.assertEqual(small.get_trace(f"exec{i}").execution_id, f"exec{i}")
+        stats = small.get_cache_stats()
+        self.assertLessEqual(stats["bytes"], 2000)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertLess(stats["traces"], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from workflow_engine import mesh_routing_index
+from workflow_engine.mesh_topology_manager import (
+    MeshTopologyManager, AgentMeshTopology, AgentMetrics, CongestionBehavior, RoutingStrategy,
+    trust_weighted_score, latency_weighted_score, fallback_linear_score
+)
+
+CAPABILITIES = ["vision", "nlp", "planning", "control", "edge"]
+
+SCORERS = {
+    RoutingStrategy.TRUST_WEIGHTED: trust_weighted_score,
+    RoutingStrategy.LATENCY_WEIGHTED: latency_weighted_score,
+    RoutingStrategy.FALLBACK_LINEAR: fallback_linear_score,
+}
+
+
+def _reference_ranking(manager, strategy, required_capabilities, trust_threshold=None, exclude=None):
+    """Full scan and stable sort, as selection worked before the routing index."""
+    eligible = [
+        agent for agent in manager.agent_metrics.values()
+        if all(cap in agent.capabilities for cap in required_capabilities)
+        and (trust_threshold is None or agent.trust_score >= trust_threshold)
+        and agent.agent_id != exclude
+    ]
+    scored = [(agent.agent_id, SCORERS[strategy](agent)) for agent in eligible]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:4]
+
+
+class TestMeshRoutingIndex(unittest.TestCase):
+    """Test cases for indexed agent selection in the MeshTopologyManager."""
+
+    def setUp(self):
+        self.rng = random.Random(11)
+        self.manager = MeshTopologyManager()
+        for i in range(300):
+            self.manager.register_agent(AgentMetrics(
+                agent_id=f"agent{i}",
+                # Coarse values so that score ties are common
+                trust_score=self.rng.choice([0.4, 0.6, 0.8, 0.9, 1.0]),
+                avg_latency_ms=self.rng.choice([50.0, 100.0, 400.0, 1200.0]),
+                load=self.rng.choice([0.0, 0.2, 0.5]),
+                capabilities=self.rng.sample(CAPABILITIES, self.rng.randint(0, 4))
+            ))
+
+    def _mutate(self, steps):
+        for _ in range(steps):
+            agent_id = f"agent{self.rng.randrange(300)}"
+            action = self.rng.randrange(5)
+            if action == 0:
+                self.manager.report_agent_success(agent_id, self.rng.uniform(10, 900))
+            elif action == 1:
+                self.manager.report_agent_failure(agent_id)
+            elif action == 2:
+                self.manager.update_agent_load(agent_id, self.rng.choice([-0.3, 0.1, 0.4]))
+            elif action == 3:
+                self.manager.update_agent_metrics(agent_id, trust_score=self.rng.choice([0.3, 0.7, 0.9]))
+            else:
+                self.manager.update_agent_metrics(
+                    agent_id, capabilities=self.rng.sample(CAPABILITIES, self.rng.randint(0, 4)))
+
+    def test_selection_matches_full_scan(self):
+        self._check_selection()
+
+    def test_selection_without_capability_groups_matches_full_scan(self):
+        with patch.object(mesh_routing_index, "MAX_CAPABILITY_GROUPS", 0):
+            self._check_selection()
+
+    def _check_selection(self):
+        requirements = [[], ["vision"], ["nlp", "planning"], ["vision", "control", "edge"], ["unknown"]]
+        for _ in range(20):
+            self._mutate(50)
+            for strategy in RoutingStrategy:
+                topology = AgentMeshTopology(routing_strategy=strategy)
+                for required in requirements:
+                    for threshold in (0.5, 0.85):
+                        expected = _reference_ranking(self.manager, strategy, required, threshold)
+                        decision = self.manager.select_agent("task", required, topology, trust_threshold=threshold)
+                        if not expected:
+                            self.assertEqual(decision.selected_agent_id, "workflow_fallback_agent")
+                            continue
+                        self.assertEqual(decision.selected_agent_id, expected[0][0])
+                        self.assertEqual(decision.fallback_agent_ids, [agent_id for agent_id, _ in expected[1:]])
+                        self.assertEqual(decision.score, expected[0][1])
+
+    def test_direct_metric_changes_need_reindex(self):
+        topology = AgentMeshTopology(routing_strategy=RoutingStrategy.FALLBACK_LINEAR)
+        agent = self.manager.agent_metrics["agent7"]
+        agent.trust_score = 2.0
+        agent.capabilities = ["vision"]
+        self.manager.reindex_agent("agent7")
+        self.assertEqual(self.manager.select_agent("task", ["vision"], topology).selected_agent_id, "agent7")
+
+    def test_congestion_reroute_excludes_congested_agent(self):
+        topology = AgentMeshTopology(routing_strategy=RoutingStrategy.LATENCY_WEIGHTED,
+                                     congestion_behavior=CongestionBehavior.REROUTE)
+        congested = self.manager.select_agent("task", ["nlp"], topology).selected_agent_id
+        self.manager.update_agent_load(congested, 1.0)
+        expected = _reference_ranking(self.manager, RoutingStrategy.LATENCY_WEIGHTED, ["nlp"], exclude=congested)
+        decision = self.manager.handle_congestion(congested, topology, "task", ["nlp"])
+        self.assertEqual(decision.selected_agent_id, expected[0][0])
+        self.assertEqual(decision.fallback_agent_ids, [agent_id for agent_id, _ in expected[1:]])
+
+    def test_routing_history_is_bounded(self):
+        manager = MeshTopologyManager(max_history_size=50)
+        for i in range(5):
+            manager.register_agent(AgentMetrics(agent_id=f"agent{i}", capabilities=["vision"]))
+        results = manager.simulate_routing("task", ["vision"], AgentMeshTopology(), num_simulations=40)
+        self.assertEqual(len(manager.routing_history), 50)
+        for strategy in results.values():
+            self.assertEqual(sum(strategy["selections"].values()), 40)
+            self.assertGreater(strategy["decisions_per_second"], 0)
+
+        history = manager.get_routing_history(limit=10)
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history[0].timestamp, manager.routing_history[-1].timestamp)
+        stats = manager.get_agent_selection_stats()
+        self.assertEqual(sum(s["total_selections"] for s in stats.values()), 50)
+
+        manager.max_history_size = 20
+        self.assertEqual(len(manager.routing_history), 20)
+        self.assertEqual(history[0].timestamp, manager.routing_history[-1].timestamp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from workflow_engine.workflow_runtime import WorkflowRuntime, WorkflowStatus
+from workflow_engine.workflow_manifest_parser import TaskDefinition
+from workflow_engine.workflow_registry import WorkflowRegistry
+from workflow_engine.workflow_telemetry import WorkflowTelemetry
+from workflow_engine.task_graph import TaskGraph
+
+
+def _task(task_id, inputs=(), outputs=(), **kwargs):
+    return {
+        "id": task_id,
+        "name": task_id,
+        "type": kwargs.pop("type", "sleep"),
+        "inputs": [{"name": name, "type": "string"} for name in inputs],
+        "outputs": [{"name": name, "type": "string"} for name in outputs],
+        **kwargs
+    }
+
+
+class TestTaskGraph(unittest.TestCase):
+    """Test cases for the TaskGraph class."""
+
+    def test_dependencies_from_inputs_outputs_and_next_tasks(self):
+        tasks = [TaskDefinition(**t) for t in [
+            _task("fetch", outputs=["raw"]),
+            _task("clean", inputs=["raw"], outputs=["clean"]),
+            _task("audit"),
+            _task("report", inputs=["clean", "external"], next_tasks=["end"]),
+        ]]
+        tasks[2].next_tasks = ["report"]
+        graph = TaskGraph(tasks)
+
+        self.assertEqual(graph.dependencies["clean"], {"fetch"})
+        self.assertEqual(graph.dependencies["report"], {"clean", "audit"})
+        self.assertEqual(graph.ready_tasks(set(), set()), ["fetch", "audit"])
+
+        path, seconds = graph.critical_path({"fetch": 1.0, "clean": 2.0, "audit": 0.5, "report": 1.0})
+        self.assertEqual(path, ["fetch", "clean", "report"])
+        self.assertAlmostEqual(seconds, 4.0)
+
+    def test_cycle_rejected(self):
+        tasks = [TaskDefinition(**t) for t in [
+            _task("a", inputs=["y"], outputs=["x"]),
+            _task("b", inputs=["x"], outputs=["y"]),
+        ]]
+        with self.assertRaises(ValueError):
+            TaskGraph(tasks)
+
+
+class TestWorkflowScheduler(unittest.TestCase):
+    """Test cases for DAG-parallel execution in WorkflowRuntime."""
+
+    def setUp(self):
+        self.runtime = WorkflowRuntime(WorkflowRegistry(), WorkflowTelemetry(), max_parallel_tasks=4)
+        self.running = 0
+        self.peak = 0
+        self.attempts = {}
+
+        async def sleep_handler(task, context):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(task.config.get("seconds", 0.05))
+            finally:
+                self.running -= 1
+            self.attempts[task.id] = self.attempts.get(task.id, 0) + 1
+            if self.attempts[task.id] <= task.config.get("fail_times", 0):
+                raise RuntimeError("transient failure")
+            return {output.name: task.id for output in task.outputs}
+
+        self.runtime.register_task_handler("sleep", sleep_handler)
+
+    def _run(self, tasks, **manifest):
+        async def run():
+            workflow_id = await self.runtime.create_workflow(
+                {"id": "wf", "name": "wf", "tasks": tasks, **manifest})
+            workflows = self.runtime.active_workflows
+            execution_id = await self.runtime.start_workflow(workflow_id)
+            while workflows[execution_id].status in (WorkflowStatus.PENDING, WorkflowStatus.RUNNING):
+                await asyncio.sleep(0.005)
+            return workflows[execution_id]
+        return asyncio.run(run())
+
+    def test_independent_tasks_run_concurrently(self):
+        start = time.monotonic()
+        context = self._run([_task(f"t{i}", config={"seconds": 0.1}) for i in range(4)])
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(context.status, WorkflowStatus.COMPLETED)
+        self.assertEqual(self.peak, 4)
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(sorted(context.completed_tasks), ["t0", "t1", "t2", "t3"])
+
+    def test_dependencies_respected_and_critical_path_reported(self):
+        context = self._run([
+            _task("fetch", outputs=["raw"], config={"seconds": 0.05}),
+            _task("side", config={"seconds": 0.01}),
+            _task("clean", inputs=["raw"], outputs=["clean"], config={"seconds": 0.05}),
+        ])
+
+        self.assertEqual(context.status, WorkflowStatus.COMPLETED)
+        self.assertEqual(context.variables["clean"], "clean")
+        self.assertLess(context.completed_tasks.index("fetch"), context.completed_tasks.index("clean"))
+        self.assertEqual(context.critical_path, ["fetch", "clean"])
+        self.assertGreaterEqual(context.critical_path_seconds, 0.1)
+
+    def test_per_workflow_limit(self):
+        context = self._run([_task(f"t{i}", config={"seconds": 0.02}) for i in range(6)],
+                            max_parallel_tasks=2)
+
+        self.assertEqual(context.status, WorkflowStatus.COMPLETED)
+        self.assertEqual(self.peak, 2)
+
+    def test_retry_with_backoff(self):
+        retry_config = {"max_retries": 2, "initial_delay": 0.01, "backoff_factor": 2}
+        context = self._run([_task("flaky", on_failure="retry", retry_config=retry_config,
+                                   config={"seconds": 0, "fail_times": 2})])
+
+        self.assertEqual(context.status, WorkflowStatus.COMPLETED)
+        self.assertEqual(context.task_timings["flaky"]["attempts"], 3)
+        self.assertGreaterEqual(context.task_timings["flaky"]["duration_seconds"], 0.03)
+
+    def test_exhausted_retries_fail_workflow_and_skip_dependents(self):
+        retry_config = {"max_retries": 1, "initial_delay": 0.01}
+        context = self._run([
+            _task("flaky", outputs=["x"], on_failure="retry", retry_config=retry_config,
+                  config={"seconds": 0, "fail_times": 5}),
+            _task("after", inputs=["x"]),
+        ])
+
+        self.assertEqual(context.status, WorkflowStatus.FAILED)
+        self.assertEqual(self.attempts["flaky"], 2)
+        self.assertNotIn("after", self.attempts)
+
+    def test_resume_skips_completed_tasks(self):
+        async def run():
+            workflow_id = await self.runtime.create_workflow({"id": "wf", "name": "wf", "tasks": [
+                _task("prepare", outputs=["draft"]),
+                _task("approve", type="human_approval", inputs=["draft"], outputs=["approved"]),
+                _task("publish", inputs=["approved"]),
+            ]})
+            execution_id = await self.runtime.start_workflow(workflow_id)
+            context = self.runtime.active_workflows[execution_id]
+            while context.status in (WorkflowStatus.PENDING, WorkflowStatus.RUNNING):
+                await asyncio.sleep(0.005)
+            self.assertEqual(context.status, WorkflowStatus.PAUSED)
+            self.assertEqual(context.completed_tasks, ["prepare", "approve"])
+
+            await self.runtime.resume_workflow(execution_id)
+            while context.status in (WorkflowStatus.PENDING, WorkflowStatus.RUNNING):
+                await asyncio.sleep(0.005)
+            return context
+
+        context = asyncio.run(run())
+        self.assertEqual(context.status, WorkflowStatus.COMPLETED)
+        self.assertEqual(self.attempts, {"prepare": 1, "publish": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
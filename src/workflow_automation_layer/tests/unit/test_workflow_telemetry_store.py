@@ -0,0 +1,160 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from workflow_engine.workflow_telemetry import (
+    WorkflowTelemetry, TelemetryEventType, TelemetryStorageType
+)
+
+
+def _populate(telemetry, n=3000, days=10, seed=7):
+    """Random executions spread over the last `days` days; returns the recorded events."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    for i in range(n):
+        start = now - timedelta(seconds=rng.uniform(60, days * 86400))
+        workflow_id = f"wf{rng.randrange(5)}"
+        agent_id = f"agent{rng.randrange(4)}"
+        execution_id = f"exec{i}"
+        telemetry.record_event(TelemetryEventType.WORKFLOW_STARTED, timestamp=start,
+                               workflow_id=workflow_id, execution_id=execution_id)
+        telemetry.record_event(TelemetryEventType.AGENT_SELECTED, timestamp=start,
+                               workflow_id=workflow_id, execution_id=execution_id, agent_id=agent_id)
+        if rng.random() < 0.2:
+            telemetry.record_event(TelemetryEventType.AGENT_FAILED, timestamp=start,
+                                   workflow_id=workflow_id, execution_id=execution_id, agent_id=agent_id)
+        if rng.random() < 0.3:
+            telemetry.record_event(TelemetryEventType.ESCALATION_TRIGGERED, timestamp=start,
+                                   workflow_id=workflow_id, execution_id=execution_id,
+                                   metadata={"reason": rng.choice(["timeout", "low_trust", "error"])})
+        if rng.random() < 0.2:
+            telemetry.record_event(TelemetryEventType.HUMAN_INTERVENTION_COMPLETED, timestamp=start,
+                                   workflow_id=workflow_id, execution_id=execution_id,
+                                   duration_ms=rng.randrange(1000, 60000))
+        end_type = rng.choice([TelemetryEventType.WORKFLOW_COMPLETED] * 3 + [TelemetryEventType.WORKFLOW_FAILED])
+        telemetry.record_event(end_type, timestamp=start + timedelta(seconds=rng.uniform(1, 30)),
+                               workflow_id=workflow_id, execution_id=execution_id)
+
+
+def _reference_success_rate(events, workflow_id, days):
+    start = datetime.now() - timedelta(days=days)
+    window = [e for e in events if e.workflow_id == workflow_id and e.timestamp >= start]
+    completed = sum(e.type == TelemetryEventType.WORKFLOW_COMPLETED for e in window)
+    failed = sum(e.type == TelemetryEventType.WORKFLOW_FAILED for e in window)
+    return completed / (completed + failed) * 100 if completed + failed else None
+
+
+class TestTelemetryEventStore(unittest.TestCase):
+    """Test cases for the partitioned, indexed telemetry store."""
+
+    def setUp(self):
+        self.telemetry = WorkflowTelemetry()
+        _populate(self.telemetry)
+        self.all_events = self.telemetry.events
+
+    def test_get_events_matches_full_scan(self):
+        start = datetime.now() - timedelta(days=3)
+        expected = sorted(
+            (e for e in self.all_events
+             if e.workflow_id == "wf1" and e.type == TelemetryEventType.WORKFLOW_FAILED and e.timestamp >= start),
+            key=lambda e: e.timestamp, reverse=True)
+        events = self.telemetry.get_events(workflow_id="wf1", event_type=TelemetryEventType.WORKFLOW_FAILED,
+                                           start_time=start)
+        self.assertEqual([e.id for e in events], [e.id for e in expected])
+        limited = self.telemetry.get_events(agent_id="agent2", limit=10)
+        expected = sorted((e for e in self.all_events if e.agent_id == "agent2"),
+                          key=lambda e: e.timestamp, reverse=True)[:10]
+        self.assertEqual([e.id for e in limited], [e.id for e in expected])
+
+    def test_rolling_counters_match_full_scan(self):
+        for days in (1, 3, 7):
+            for workflow_id in ("wf0", "wf3"):
+                self.assertAlmostEqual(self.telemetry.get_workflow_success_rate(workflow_id, days),
+                                       _reference_success_rate(self.all_events, workflow_id, days))
+
+        start = datetime.now() - timedelta(days=7)
+        window = [e for e in self.all_events if e.timestamp >= start]
+        durations = [e.duration_ms for e in window if e.type == TelemetryEventType.HUMAN_INTERVENTION_COMPLETED]
+        self.assertAlmostEqual(self.telemetry.get_average_human_intervention_duration(),
+                               sum(durations) / len(durations))
+
+        selected = sum(e.type == TelemetryEventType.AGENT_SELECTED and e.agent_id == "agent1" for e in window)
+        failed = sum(e.type == TelemetryEventType.AGENT_FAILED and e.agent_id == "agent1" for e in window)
+        self.assertAlmostEqual(self.telemetry.get_agent_success_rate("agent1"),
+                               (selected - failed) / selected * 100)
+
+        report = self.telemetry.generate_workflow_performance_report("wf2", 7)
+        ends = [e for e in window if e.workflow_id == "wf2" and e.type in (
+            TelemetryEventType.WORKFLOW_COMPLETED, TelemetryEventType.WORKFLOW_FAILED)]
+        expected = [self.telemetry.get_workflow_execution_duration(e.execution_id) for e in ends]
+        self.assertEqual(report["total_executions"], len(ends))
+        self.assertAlmostEqual(report["avg_duration_ms"], sum(expected) / len(expected))
+        escalations = sum(r["count"] for r in self.telemetry.get_top_escalation_reasons("wf2", 7, limit=10))
+        self.assertEqual(report["escalations"], escalations)
+
+    def test_cleanup_evicts_expired_events(self):
+        self.telemetry.retention_days = 4
+        self.telemetry.cleanup_old_events()
+        cutoff = datetime.now() - timedelta(days=4)
+        remaining = self.telemetry.events
+        self.assertEqual(len(remaining), sum(e.timestamp >= cutoff for e in self.all_events))
+        self.assertTrue(all(e.timestamp >= cutoff for e in remaining))
+        self.assertEqual(self.telemetry.get_workflow_success_rate("wf0", 7),
+                         _reference_success_rate(remaining, "wf0", 7))
+
+    def test_rolling_retention_prunes_execution_bounds(self):
+        telemetry = WorkflowTelemetry(retention_days=2)
+        _populate(telemetry, n=500)
+        # Opening a newer partition rolls the retention window
+        telemetry.record_event(TelemetryEventType.WORKFLOW_STARTED, timestamp=datetime.now() + timedelta(hours=2),
+                               workflow_id="wf0", execution_id="late")
+        cutoff = (datetime.now() - timedelta(days=2, hours=1)).timestamp()
+        starts = telemetry.store._execution_starts
+        self.assertLess(len(starts), 500)
+        self.assertTrue(all(ts >= cutoff for ts in starts.values()))
+        self.assertTrue(all(ts >= cutoff for ts in telemetry.store._execution_ends.values()))
+
+
+class TestTelemetrySegments(unittest.TestCase):
+    """Test cases for partitions spilled to SQLite segments."""
+
+    def test_spilled_partitions_remain_queryable(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = WorkflowTelemetry()
+            spilled = WorkflowTelemetry(TelemetryStorageType.DATABASE, os.path.join(tmp, "telemetry.db"),
+                                        hot_partitions=4)
+            _populate(memory, n=1000)
+            _populate(spilled, n=1000)
+
+            stats = spilled.get_storage_stats()
+            self.assertGreater(stats["spilled_partitions"], 0)
+            self.assertLess(stats["events_in_memory"], stats["events"])
+
+            start = datetime.now() - timedelta(days=6)
+            self.assertEqual(
+                [(e.type, e.execution_id) for e in spilled.get_events(workflow_id="wf4", start_time=start)],
+                [(e.type, e.execution_id) for e in memory.get_events(workflow_id="wf4", start_time=start)])
+            self.assertEqual(len(spilled.get_events(limit=50)), 50)
+            for days in (1, 5, 9):
+                self.assertAlmostEqual(spilled.get_workflow_success_rate("wf1", days),
+                                       memory.get_workflow_success_rate("wf1", days))
+            self.assertEqual(spilled.generate_workflow_performance_report("wf3", 9)["avg_duration_ms"],
+                             memory.generate_workflow_performance_report("wf3", 9)["avg_duration_ms"])
+
+            spilled.retention_days = 2
+            spilled.cleanup_old_events()
+            memory.retention_days = 2
+            memory.cleanup_old_events()
+            self.assertEqual(spilled.get_storage_stats()["events"], memory.get_storage_stats()["events"])
+            self.assertEqual(len(spilled.events), len(memory.events))
+            spilled.store.segments.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
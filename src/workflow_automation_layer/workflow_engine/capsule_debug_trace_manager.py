@@ -16,11 +16,13 @@ import json
 import os
 import uuid
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 
 from pydantic import BaseModel, Field
 
+from .trace_store import INDEX_FILENAME, TraceCache, TraceIndex, dump_trace, read_trace_header
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -90,23 +92,32 @@ class CapsuleDebugTraceManager:
     pattern detection, and forensic analysis.
     """
     
-    def __init__(self, storage_type: TraceStorageType = TraceStorageType.MEMORY, storage_path: Optional[str] = None):
+    def __init__(self,
+                 storage_type: TraceStorageType = TraceStorageType.MEMORY,
+                 storage_path: Optional[str] = None,
+                 cache_max_bytes: int = 64 * 1024 * 1024):
         """
         Initialize the CapsuleDebugTraceManager.
         
         Args:
             storage_type: The type of storage to use for debug traces
             storage_path: The path to use for file storage (if applicable)
+            cache_max_bytes: With file storage, the approximate size of traces
+                kept hydrated in memory (least recently used are dropped)
         """
         self.storage_type = storage_type
         self.storage_path = storage_path
-        
-        # In-memory storage
-        self.traces: Dict[str, CapsuleDebugTrace] = {}
+        self.index: Optional[TraceIndex] = None
         
         # Initialize storage
         if storage_type == TraceStorageType.FILE and storage_path:
             os.makedirs(storage_path, exist_ok=True)
+            self.index = TraceIndex(os.path.join(storage_path, INDEX_FILENAME))
+            # Hydrated traces; the files and the index are the source of truth
+            self.traces = TraceCache(cache_max_bytes)
+        else:
+            # In-memory storage
+            self.traces = TraceCache()
         
         logger.info(f"CapsuleDebugTraceManager initialized with {storage_type} storage")
     
@@ -128,7 +139,7 @@ class CapsuleDebugTraceManager:
         )
         
         # Store the trace
-        self.traces[execution_id] = trace
+        self.traces.put(execution_id, trace)
         
         # Save to storage
         if self.storage_type == TraceStorageType.FILE:
@@ -148,15 +159,16 @@ class CapsuleDebugTraceManager:
             The CapsuleDebugTrace if found, None otherwise
         """
         # Check in-memory cache first
-        if execution_id in self.traces:
-            return self.traces[execution_id]
+        trace = self.traces.get(execution_id)
+        if trace is not None:
+            return trace
         
         # If not in memory and using file storage, try to load from file
         if self.storage_type == TraceStorageType.FILE and self.storage_path:
             trace = self._load_trace_from_file(execution_id)
             if trace:
                 # Cache in memory
-                self.traces[execution_id] = trace
+                self.traces.put(execution_id, trace, self._file_size(execution_id))
                 return trace
         
         return None
@@ -306,10 +318,17 @@ class CapsuleDebugTraceManager:
             workflow_dir = os.path.join(self.storage_path, trace.workflow_id)
             os.makedirs(workflow_dir, exist_ok=True)
             
-            # Save trace to file
+            # Save trace to file, one agent trace entry per line
             trace_path = os.path.join(workflow_dir, f"{trace.execution_id}.json")
+            data = trace.model_dump(mode="json")
+            content = dump_trace(data)
             with open(trace_path, "w") as f:
-                f.write(trace.json(indent=2))
+                f.write(content)
+            
+            # Keep the metadata index and the cache size estimate current
+            self.index.upsert(data, len(trace.agent_trace), trace_path)
+            if trace.execution_id in self.traces:
+                self.traces.put(trace.execution_id, trace, len(content))
             
             logger.debug(f"Saved debug trace to {trace_path}")
             return True
@@ -333,6 +352,11 @@ class CapsuleDebugTraceManager:
             return None
         
         try:
+            trace_path = self._trace_path(execution_id)
+            if trace_path:
+                with open(trace_path, "r") as f:
+                    return CapsuleDebugTrace(**json.load(f))
+            
             # Search for the trace file in all workflow directories
             for workflow_dir in os.listdir(self.storage_path):
                 workflow_path = os.path.join(self.storage_path, workflow_dir)
@@ -352,6 +376,19 @@ class CapsuleDebugTraceManager:
             logger.error(f"Failed to load debug trace from file: {e}")
             return None
     
+    def _trace_path(self, execution_id: str) -> Optional[str]:
+        """Path of a trace file according to the index."""
+        if not self.index:
+            return None
+        trace_path = self.index.path(execution_id)
+        if trace_path is None and self.index.reconcile(self.storage_path):
+            trace_path = self.index.path(execution_id)
+        return trace_path if trace_path and os.path.exists(trace_path) else None
+    
+    def _file_size(self, execution_id: str) -> int:
+        trace_path = self._trace_path(execution_id)
+        return os.path.getsize(trace_path) if trace_path else 0
+    
     def list_traces(self, 
                    workflow_id: Optional[str] = None,
                    status: Optional[str] = None,
@@ -371,11 +408,12 @@ class CapsuleDebugTraceManager:
         Returns:
             A list of dictionaries with basic trace information
         """
-        result = []
+        # File storage is listed from the metadata index, without opening traces
+        if self.index:
+            self.index.reconcile(self.storage_path)
+            return self.index.query(workflow_id, status, start_time, end_time, limit)
         
-        # If using file storage, load all traces from files
-        if self.storage_type == TraceStorageType.FILE and self.storage_path:
-            self._load_all_traces_from_files()
+        result = []
         
         # Filter and collect traces
         for trace in self.traces.values():
@@ -418,40 +456,37 @@ class CapsuleDebugTraceManager:
         
         return result
     
-    def _load_all_traces_from_files(self):
-        """Load all debug traces from files into memory."""
-        if not self.storage_path or not os.path.exists(self.storage_path):
-            return
+    def reindex(self) -> int:
+        """
+        Index trace files written or changed outside this manager.
         
-        try:
-            # Iterate through workflow directories
-            for workflow_dir in os.listdir(self.storage_path):
-                workflow_path = os.path.join(self.storage_path, workflow_dir)
-                if not os.path.isdir(workflow_path):
-                    continue
-                
-                # Iterate through trace files
-                for trace_file in os.listdir(workflow_path):
-                    if not trace_file.endswith(".json"):
-                        continue
-                    
-                    trace_path = os.path.join(workflow_path, trace_file)
-                    execution_id = trace_file[:-5]  # Remove .json extension
-                    
-                    # Skip if already loaded
-                    if execution_id in self.traces:
-                        continue
-                    
-                    # Load trace
-                    try:
-                        with open(trace_path, "r") as f:
-                            trace_data = json.load(f)
-                            self.traces[execution_id] = CapsuleDebugTrace(**trace_data)
-                    except Exception as e:
-                        logger.error(f"Failed to load debug trace from {trace_path}: {e}")
+        Returns:
+            The number of trace files (re)indexed
+        """
+        if not self.index:
+            return 0
+        return self.index.reconcile(self.storage_path)
+    
+    def _stream_trace(self, execution_id: str) -> Tuple[CapsuleDebugTrace, Iterator[AgentTrace]]:
+        """
+        Get a trace's fields and an iterator over its agent trace entries.
         
-        except Exception as e:
-            logger.error(f"Failed to load debug traces from files: {e}")
+        Traces not already in memory are streamed from their file without
+        being hydrated or cached; the returned trace has an empty agent_trace.
+        
+        Raises:
+            ValueError: If the trace doesn't exist
+        """
+        trace = self.traces.get(execution_id)
+        if trace is None and self.storage_type == TraceStorageType.FILE:
+            trace_path = self._trace_path(execution_id)
+            if trace_path:
+                header, entries = read_trace_header(trace_path)
+                return CapsuleDebugTrace(**header), (AgentTrace(**entry) for entry in entries)
+            trace = self.get_trace(execution_id)
+        if not trace:
+            raise ValueError(f"Debug trace for execution {execution_id} not found")
+        return trace, iter(trace.agent_trace)
     
     def analyze_trace(self, execution_id: str) -> Dict[str, Any]:
         """
@@ -466,9 +501,7 @@ class CapsuleDebugTraceManager:
         Raises:
             ValueError: If the trace doesn't exist
         """
-        trace = self.get_trace(execution_id)
-        if not trace:
-            raise ValueError(f"Debug trace for execution {execution_id} not found")
+        trace, agent_trace = self._stream_trace(execution_id)
         
         # Calculate basic metrics
         agent_counts = {}
@@ -476,7 +509,7 @@ class CapsuleDebugTraceManager:
         state_durations = {}
         
         # Analyze agent trace
-        for entry in trace.agent_trace:
+        for entry in agent_trace:
             # Count by agent
             agent_counts[entry.agent_id] = agent_counts.get(entry.agent_id, 0) + 1
             
@@ -549,14 +582,8 @@ class CapsuleDebugTraceManager:
         Raises:
             ValueError: If either trace doesn't exist
         """
-        trace1 = self.get_trace(execution_id1)
-        trace2 = self.get_trace(execution_id2)
-        
-        if not trace1:
-            raise ValueError(f"Debug trace for execution {execution_id1} not found")
-        
-        if not trace2:
-            raise ValueError(f"Debug trace for execution {execution_id2} not found")
+        trace1, agent_trace1 = self._stream_trace(execution_id1)
+        trace2, agent_trace2 = self._stream_trace(execution_id2)
         
         # Compare basic properties
         same_workflow = trace1.workflow_id == trace2.workflow_id
@@ -581,16 +608,14 @@ class CapsuleDebugTraceManager:
             duration_diff = duration2 - duration1
         
         # Compare agent traces
-        agents1 = set(entry.agent_id for entry in trace1.agent_trace)
-        agents2 = set(entry.agent_id for entry in trace2.agent_trace)
+        agents1, decisions1, agent_count1 = self._summarize_agent_trace(agent_trace1)
+        agents2, decisions2, agent_count2 = self._summarize_agent_trace(agent_trace2)
         
         common_agents = agents1.intersection(agents2)
         unique_agents1 = agents1 - agents2
         unique_agents2 = agents2 - agents1
         
         # Compare decisions
-        decisions1 = [entry.decision for entry in trace1.agent_trace if entry.decision]
-        decisions2 = [entry.decision for entry in trace2.agent_trace if entry.decision]
         
         different_decisions = []
         for i in range(min(len(decisions1), len(decisions2))):
@@ -629,12 +654,34 @@ class CapsuleDebugTraceManager:
             "common_agents": list(common_agents),
             "unique_agents1": list(unique_agents1),
             "unique_agents2": list(unique_agents2),
-            "agent_count1": len(trace1.agent_trace),
-            "agent_count2": len(trace2.agent_trace),
+            "agent_count1": agent_count1,
+            "agent_count2": agent_count2,
             "different_decisions": different_decisions,
             "different_states": different_states
         }
     
+    @staticmethod
+    def _summarize_agent_trace(agent_trace: Iterator[AgentTrace]) -> Tuple[set, List[str], int]:
+        """Agents involved, decisions in order and entry count, in one pass."""
+        agents = set()
+        decisions = []
+        count = 0
+        for entry in agent_trace:
+            agents.add(entry.agent_id)
+            if entry.decision:
+                decisions.append(entry.decision)
+            count += 1
+        return agents, decisions, count
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the hydrated trace cache.
+        
+        Returns:
+            A dictionary with cache size, hit and eviction counts
+        """
+        return self.traces.stats()
+    
     def export_trace_to_json(self, execution_id: str, file_path: str) -> bool:
         """
         Export a debug trace to a JSON file.
@@ -655,7 +702,7 @@ class CapsuleDebugTraceManager:
         
         try:
             with open(file_path, "w") as f:
-                f.write(trace.json(indent=2))
+                f.write(trace.model_dump_json(indent=2))
             
             logger.info(f"Exported debug trace for execution {execution_id} to {file_path}")
             return True
@@ -682,7 +729,7 @@ class CapsuleDebugTraceManager:
                 trace_data = json.load(f)
             
             trace = CapsuleDebugTrace(**trace_data)
-            self.traces[trace.execution_id] = trace
+            self.traces.put(trace.execution_id, trace)
             
             # Save to storage if using file storage
             if self.storage_type == TraceStorageType.FILE:
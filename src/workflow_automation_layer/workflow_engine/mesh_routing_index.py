@@ -0,0 +1,239 @@
+"""
+Mesh Routing Index Module for Industriverse Workflow Automation Layer
+
+This module keeps the data structures behind MeshTopologyManager agent selection
+so a routing decision does not scan and sort every registered agent:
+- An inverted capability index mapping each capability to a bitset of agents
+- One max-heap per routing strategy, keyed by the agent's score under that
+  strategy and updated incrementally as agent metrics change, both over all
+  agents and over the agents satisfying each frequently ranked set of
+  required capabilities
+
+Agents get a slot in registration order. Slots are the bit positions in the
+capability bitsets and break score ties, so ranking matches a stable sort of
+the agents in registration order.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+# Candidate sets at most this large (or this fraction of all agents) are
+# scored directly instead of walking a strategy heap
+DIRECT_RANK_MAX = 32
+DIRECT_RANK_FRACTION = 8
+
+# Maximum number of capability requirement sets given their own heaps
+MAX_CAPABILITY_GROUPS = 64
+
+
+class ScoreHeap:
+    """
+    Max-heap of agent scores with lazy invalidation.
+
+    Updating or discarding a score invalidates the agent's previous entry,
+    which is skipped when read and dropped when the heap is compacted.
+    """
+
+    def __init__(self, scores: Optional[Dict[int, float]] = None):
+        """
+        Initialize the heap.
+
+        Args:
+            scores: Optional initial scores by slot
+        """
+        self._version = 0
+        self._scores: Dict[int, Tuple[float, int]] = {}  # slot -> (score, version)
+        for slot, score in (scores or {}).items():
+            self._scores[slot] = (score, self._version)
+        self._heap: List[Tuple[float, int, int]] = [  # (-score, slot, version)
+            (-score, slot, version) for slot, (score, version) in self._scores.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, slot: int) -> bool:
+        return slot in self._scores
+
+    def score(self, slot: int) -> float:
+        return self._scores[slot][0]
+
+    def _is_current(self, entry: Tuple[float, int, int]) -> bool:
+        current = self._scores.get(entry[1])
+        return current is not None and current[1] == entry[2]
+
+    def update(self, slot: int, score: float):
+        previous = self._scores.get(slot)
+        if previous is not None and previous[0] == score:
+            return
+        self._version += 1
+        self._scores[slot] = (score, self._version)
+        heapq.heappush(self._heap, (-score, slot, self._version))
+        if len(self._heap) > 2 * len(self._scores) + 64:
+            self._heap = [(-score, slot, version) for slot, (score, version) in self._scores.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, slot: int):
+        self._scores.pop(slot, None)
+
+    def top(self, k: int, accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """
+        The k best accepted slots, best first, without reordering the heap.
+
+        Walks the heap array best-first, so only entries scoring at least as
+        well as the k-th accepted slot (and their direct children) are visited.
+        Stale entries at the root are popped first.
+        """
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            return []
+        result = []
+        frontier = [(heap[0], 0)]
+        while frontier and len(result) < k:
+            entry, i = heapq.heappop(frontier)
+            if self._is_current(entry) and (accept is None or accept(entry[1])):
+                result.append((entry[1], -entry[0]))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
+
+
+class AgentRoutingIndex:
+    """
+    Capability bitsets and per-strategy score heaps over registered agents.
+
+    Besides the heaps over all agents, each capability requirement set that
+    has been ranked with many candidates gets heaps over just the agents that
+    satisfy it, so ranking never walks past agents lacking a capability.
+    """
+
+    def __init__(self, scorers: Dict[Any, Callable[[Any], float]]):
+        """
+        Initialize the index.
+
+        Args:
+            scorers: Maps each routing strategy to a function that scores an
+                agent's metrics under it (higher is better)
+        """
+        self.scorers = scorers
+        self.heaps: Dict[Any, ScoreHeap] = {strategy: ScoreHeap() for strategy in scorers}
+        self.slots: Dict[str, int] = {}
+        self.agent_ids: List[str] = []
+        self.all_agents = 0
+        self._capability_bits: Dict[str, int] = {}
+        self._capabilities: Dict[int, FrozenSet[str]] = {}
+        # Requirement set -> per-strategy heaps over the agents satisfying it
+        self._groups: Dict[FrozenSet[str], Dict[Any, ScoreHeap]] = {}
+
+    def update(self, agent: Any):
+        """Index a new agent, or re-index the capabilities and scores of a known one."""
+        slot = self.slots.get(agent.agent_id)
+        if slot is None:
+            slot = len(self.agent_ids)
+            self.slots[agent.agent_id] = slot
+            self.agent_ids.append(agent.agent_id)
+            self.all_agents |= 1 << slot
+
+        capabilities = frozenset(agent.capabilities)
+        previous = self._capabilities.get(slot, frozenset())
+        if capabilities != previous:
+            bit = 1 << slot
+            for capability in previous - capabilities:
+                self._capability_bits[capability] &= ~bit
+            for capability in capabilities - previous:
+                self._capability_bits[capability] = self._capability_bits.get(capability, 0) | bit
+            for required, heaps in self._groups.items():
+                if not required <= capabilities:
+                    for heap in heaps.values():
+                        heap.discard(slot)
+        self._capabilities[slot] = capabilities
+
+        self.rescore(agent)
+
+    def rescore(self, agent: Any):
+        """Refresh an indexed agent's score under every strategy."""
+        slot = self.slots[agent.agent_id]
+        scores = {strategy: scorer(agent) for strategy, scorer in self.scorers.items()}
+        for strategy, score in scores.items():
+            self.heaps[strategy].update(slot, score)
+        if self._groups:
+            capabilities = self._capabilities[slot]
+            for required, heaps in self._groups.items():
+                if required <= capabilities:
+                    for strategy, score in scores.items():
+                        heaps[strategy].update(slot, score)
+
+    def capable(self, required_capabilities: Iterable[str]) -> int:
+        """Bitset of the agents that have every required capability."""
+        bits = self.all_agents
+        for capability in required_capabilities:
+            bits &= self._capability_bits.get(capability, 0)
+            if not bits:
+                break
+        return bits
+
+    @staticmethod
+    def _iter_slots(bits: int) -> Iterator[int]:
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def _group_heaps(self, required: FrozenSet[str], bits: int) -> Optional[Dict[Any, ScoreHeap]]:
+        """The heaps over agents satisfying a requirement set, built on first use."""
+        if not required:
+            return self.heaps
+        heaps = self._groups.get(required)
+        if heaps is None and len(self._groups) < MAX_CAPABILITY_GROUPS:
+            slots = list(self._iter_slots(bits))
+            heaps = {
+                strategy: ScoreHeap({slot: heap.score(slot) for slot in slots})
+                for strategy, heap in self.heaps.items()
+            }
+            self._groups[required] = heaps
+        return heaps
+
+    def rank(self,
+             strategy: Any,
+             required_capabilities: List[str],
+             k: int,
+             accept: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        The k best agents for a strategy among those with the required capabilities.
+
+        Args:
+            strategy: The routing strategy whose scores to rank by
+            required_capabilities: Capabilities every returned agent must have
+            k: Maximum number of agents to return
+            accept: Optional further filter on agent IDs
+
+        Returns:
+            (agent_id, score) pairs, best first; equal scores keep registration order
+        """
+        required = frozenset(required_capabilities)
+        bits = self.capable(required)
+        if not bits:
+            return []
+        agent_ids = self.agent_ids
+        candidates = bin(bits).count("1")
+
+        if candidates <= DIRECT_RANK_MAX or candidates * DIRECT_RANK_FRACTION <= len(agent_ids):
+            heap = self.heaps[strategy]
+            scored = ((-heap.score(slot), slot) for slot in self._iter_slots(bits)
+                      if accept is None or accept(agent_ids[slot]))
+            return [(agent_ids[slot], -neg_score) for neg_score, slot in heapq.nsmallest(k, scored)]
+
+        heaps = self._group_heaps(required, bits)
+        if heaps is not None:
+            accept_slot = None if accept is None else (lambda slot: accept(agent_ids[slot]))
+            return [(agent_ids[slot], score) for slot, score in heaps[strategy].top(k, accept_slot)]
+
+        # Too many distinct requirement sets: walk the heap over all agents
+        def accept_capable(slot: int) -> bool:
+            return (bits >> slot) & 1 and (accept is None or accept(agent_ids[slot]))
+
+        return [(agent_ids[slot], score) for slot, score in self.heaps[strategy].top(k, accept_capable)]
@@ -0,0 +1,112 @@
+"""
+Task Graph Module for Industriverse Workflow Automation Layer
+
+This module derives the dependency DAG of a workflow's tasks so the runtime can
+execute independent tasks concurrently. A task depends on:
+- every other task that declares one of its inputs as an output
+- every task that lists it in next_tasks
+
+Inputs that no task produces are expected in the workflow variables.
+"""
+
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+from .workflow_manifest_parser import TaskDefinition
+
+
+class TaskGraph:
+    """Dependency DAG over the tasks of one workflow manifest."""
+
+    def __init__(self, tasks: List[TaskDefinition]):
+        """
+        Build the graph.
+
+        Args:
+            tasks: The manifest tasks, in declaration order
+
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        self.tasks: Dict[str, TaskDefinition] = {task.id: task for task in tasks}
+        self.order = [task.id for task in tasks]
+        self.dependencies: Dict[str, Set[str]] = {task_id: set() for task_id in self.order}
+        self.dependents: Dict[str, Set[str]] = {task_id: set() for task_id in self.order}
+
+        producers: Dict[str, List[str]] = {}
+        for task in tasks:
+            for output in task.outputs:
+                producers.setdefault(output.name, []).append(task.id)
+
+        for task in tasks:
+            for task_input in task.inputs:
+                for producer in producers.get(task_input.name, []):
+                    if producer != task.id:
+                        self._add_edge(producer, task.id)
+            for next_task in task.next_tasks:
+                if next_task in self.tasks and next_task != task.id:
+                    self._add_edge(task.id, next_task)
+
+        self.topological_order()
+
+    def _add_edge(self, before: str, after: str):
+        self.dependencies[after].add(before)
+        self.dependents[before].add(after)
+
+    def topological_order(self) -> List[str]:
+        """
+        Kahn's algorithm, ties broken by declaration order.
+
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        position = {task_id: i for i, task_id in enumerate(self.order)}
+        remaining = {task_id: len(deps) for task_id, deps in self.dependencies.items()}
+        ready = deque(task_id for task_id in self.order if remaining[task_id] == 0)
+        ordered = []
+        while ready:
+            task_id = ready.popleft()
+            ordered.append(task_id)
+            for dependent in sorted(self.dependents[task_id], key=position.get):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(ordered) != len(self.order):
+            cyclic = [task_id for task_id in self.order if remaining[task_id] > 0]
+            raise ValueError(f"Task dependencies contain a cycle involving: {', '.join(cyclic)}")
+        return ordered
+
+    def ready_tasks(self, done: Set[str], started: Set[str]) -> List[str]:
+        """Tasks not yet started whose dependencies are all done, in declaration order."""
+        return [
+            task_id for task_id in self.order
+            if task_id not in started and self.dependencies[task_id] <= done
+        ]
+
+    def critical_path(self, durations: Dict[str, float]) -> Tuple[List[str], float]:
+        """
+        Longest duration-weighted dependency chain.
+
+        Args:
+            durations: Seconds spent per task; tasks missing from it count as 0
+
+        Returns:
+            The task ids on the critical path and its total duration
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, str] = {}
+        for task_id in self.topological_order():
+            start = 0.0
+            for dependency in self.dependencies[task_id]:
+                if finish[dependency] > start:
+                    start = finish[dependency]
+                    previous[task_id] = dependency
+            finish[task_id] = start + durations.get(task_id, 0.0)
+
+        if not finish:
+            return [], 0.0
+        last = max(self.order, key=lambda task_id: finish[task_id])
+        path = [last]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        return path[::-1], finish[last]
@@ -0,0 +1,465 @@
+"""
+Telemetry Store Module for Industriverse Workflow Automation Layer
+
+This module provides the storage engine behind WorkflowTelemetry:
+- Time partitions (one per partition_seconds) so time-bounded queries and
+  retention only touch the partitions they cover
+- Per-partition secondary indexes on event type, workflow, execution, task and agent
+- Pre-aggregated rolling counters per partition (event counts, durations,
+  execution durations and metadata tallies) so success rates and reports
+  sum a handful of counters instead of scanning events
+- Optional SQLite segments holding partitions that have left the in-memory
+  hot window
+
+The store is agnostic of the event model: events are objects exposing the
+indexed fields, a `type` and a `timestamp`; SQLite segments rebuild them
+with the event_factory they are given.
+"""
+
+import bisect
+import json
+import logging
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+INDEXED_FIELDS = ("type", "workflow_id", "execution_id", "task_id", "agent_id")
+
+# Dimensions rolling counters are kept for (None = all events)
+COUNTER_DIMENSIONS = (None, "workflow_id", "agent_id")
+
+EXECUTION_START_TYPE = "workflow_started"
+EXECUTION_END_TYPES = ("workflow_completed", "workflow_failed", "workflow_cancelled")
+
+# Metadata values tallied per event type
+TALLIED_METADATA = {
+    "execution_mode_changed": "to_mode",
+    "escalation_triggered": "reason",
+}
+
+
+def _key(value: Any) -> Any:
+    """Index key of a field value; enum members index by their value."""
+    return getattr(value, "value", value)
+
+
+class RollingCounters:
+    """Pre-aggregated statistics of a set of events, keyed by event type."""
+
+    __slots__ = ("counts", "durations", "execution_durations", "tallies")
+
+    def __init__(self):
+        self.counts: Dict[str, int] = defaultdict(int)
+        # type -> [sum of duration_ms, number of events with a duration]
+        self.durations: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        # type -> [sum of execution durations in ms, number of executions]
+        self.execution_durations: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        self.tallies: Dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, event: Any, execution_ms: Optional[int] = None):
+        event_type = _key(event.type)
+        self.counts[event_type] += 1
+        if event.duration_ms is not None:
+            total = self.durations[event_type]
+            total[0] += event.duration_ms
+            total[1] += 1
+        if execution_ms is not None:
+            total = self.execution_durations[event_type]
+            total[0] += execution_ms
+            total[1] += 1
+        tallied = TALLIED_METADATA.get(event_type)
+        if tallied is not None:
+            self.tallies[event_type][event.metadata.get(tallied, "unknown")] += 1
+
+    def merge(self, other: "RollingCounters"):
+        for event_type, count in other.counts.items():
+            self.counts[event_type] += count
+        for source, target in ((other.durations, self.durations),
+                               (other.execution_durations, self.execution_durations)):
+            for event_type, (total, n) in source.items():
+                target[event_type][0] += total
+                target[event_type][1] += n
+        for event_type, tally in other.tallies.items():
+            self.tallies[event_type].update(tally)
+
+    def average_duration(self, *event_types: str) -> Optional[float]:
+        total = sum(self.durations[t][0] for t in event_types if t in self.durations)
+        n = sum(self.durations[t][1] for t in event_types if t in self.durations)
+        return total / n if n else None
+
+    def average_execution_duration(self, *event_types: str) -> Optional[float]:
+        total = sum(self.execution_durations[t][0] for t in event_types if t in self.execution_durations)
+        n = sum(self.execution_durations[t][1] for t in event_types if t in self.execution_durations)
+        return total / n if n else None
+
+
+class _Partition:
+    """Events of one time slot with their indexes and rolling counters."""
+
+    __slots__ = ("key", "events", "timestamps", "execution_ms", "index", "counters", "size", "spilled")
+
+    def __init__(self, key: int):
+        self.key = key
+        self.events: List[Any] = []
+        self.timestamps: List[float] = []
+        self.execution_ms: Dict[int, int] = {}
+        self.index: Dict[str, Dict[Any, List[int]]] = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        self.counters: Dict[Tuple[Optional[str], Any], RollingCounters] = {}
+        self.size = 0
+        self.spilled = False
+
+    def add(self, event: Any, timestamp: float, execution_ms: Optional[int]):
+        position = len(self.events)
+        self.events.append(event)
+        self.timestamps.append(timestamp)
+        if execution_ms is not None:
+            self.execution_ms[position] = execution_ms
+        for field in INDEXED_FIELDS:
+            value = getattr(event, field)
+            if value is not None:
+                self.index[field][_key(value)].append(position)
+        self.count(event, execution_ms)
+
+    def count(self, event: Any, execution_ms: Optional[int]):
+        self.size += 1
+        for dimension in COUNTER_DIMENSIONS:
+            value = getattr(event, dimension) if dimension else None
+            if dimension and value is None:
+                continue
+            counters = self.counters.get((dimension, value))
+            if counters is None:
+                counters = self.counters[(dimension, value)] = RollingCounters()
+            counters.add(event, execution_ms)
+
+    def positions(self, filters: Dict[str, Any]) -> Iterable[int]:
+        """Candidate positions from the most selective index among the filters."""
+        best = None
+        for field, value in filters.items():
+            postings = self.index[field].get(_key(value), ())
+            if best is None or len(postings) < len(best):
+                best = postings
+        return range(len(self.events)) if best is None else best
+
+    def select(self, filters: Dict[str, Any], start_ts: Optional[float],
+               end_ts: Optional[float]) -> List[Tuple[Any, Optional[int]]]:
+        """Matching (event, execution_ms) pairs, newest first."""
+        matched = []
+        for position in self.positions(filters):
+            timestamp = self.timestamps[position]
+            if start_ts is not None and timestamp < start_ts:
+                continue
+            if end_ts is not None and timestamp > end_ts:
+                continue
+            event = self.events[position]
+            if all(_key(getattr(event, field)) == _key(value) for field, value in filters.items()):
+                matched.append(position)
+        matched.sort(key=self.timestamps.__getitem__, reverse=True)
+        return [(self.events[p], self.execution_ms.get(p)) for p in matched]
+
+    def drop_events(self):
+        """Releases the in-memory events, keeping the counters."""
+        self.events = []
+        self.timestamps = []
+        self.execution_ms = {}
+        self.index = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        self.spilled = True
+
+
+class SQLiteTelemetrySegments:
+    """
+    On-disk segments for partitions that left the in-memory hot window.
+
+    Rows carry the indexed fields as columns and the full event as JSON.
+    """
+
+    def __init__(self, db_path: str, event_factory: Callable[[Dict[str, Any]], Any]):
+        """
+        Initialize the segment database.
+
+        Args:
+            db_path: Path of the SQLite database
+            event_factory: Rebuilds an event from its dict form
+        """
+        self.db_path = db_path
+        self.event_factory = event_factory
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS telemetry_events (
+                                    partition INTEGER,
+                                    ts REAL,
+                                    type TEXT,
+                                    workflow_id TEXT,
+                                    execution_id TEXT,
+                                    task_id TEXT,
+                                    agent_id TEXT,
+                                    execution_ms INTEGER,
+                                    payload TEXT
+                                )''')
+            for field in INDEXED_FIELDS:
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS idx_telemetry_{field} '
+                                  f'ON telemetry_events ({field}, partition)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_telemetry_partition '
+                              'ON telemetry_events (partition, ts)')
+
+    def write(self, partition: _Partition):
+        rows = []
+        for position, event in enumerate(partition.events):
+            payload = event.dict()
+            rows.append((
+                partition.key,
+                partition.timestamps[position],
+                *(_key(getattr(event, field)) for field in INDEXED_FIELDS),
+                partition.execution_ms.get(position),
+                json.dumps(payload, default=str)
+            ))
+        with self.conn:
+            self.conn.executemany('INSERT INTO telemetry_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def select(self, first_key: int, last_key: int, filters: Dict[str, Any], start_ts: Optional[float],
+               end_ts: Optional[float], limit: Optional[int]) -> List[Tuple[Any, Optional[int]]]:
+        """Matching (event, execution_ms) pairs in a partition range, newest first."""
+        query = "SELECT payload, execution_ms FROM telemetry_events WHERE partition BETWEEN ? AND ?"
+        params: List[Any] = [first_key, last_key]
+        for field, value in filters.items():
+            query += f" AND {field} = ?"
+            params.append(_key(value))
+        if start_ts is not None:
+            query += " AND ts >= ?"
+            params.append(start_ts)
+        if end_ts is not None:
+            query += " AND ts <= ?"
+            params.append(end_ts)
+        query += " ORDER BY ts DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [(self.event_factory(json.loads(payload)), execution_ms)
+                for payload, execution_ms in self.conn.execute(query, params)]
+
+    def delete(self, before_key: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM telemetry_events WHERE partition < ?", (before_key,))
+
+    def delete_partition(self, key: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM telemetry_events WHERE partition = ?", (key,))
+
+    def close(self):
+        self.conn.close()
+
+
+class TelemetryEventStore:
+    """
+    Time-partitioned, indexed telemetry event store.
+
+    Queries visit only the partitions overlapping their time range, newest
+    first, and stop once a limit is satisfied; within a partition they start
+    from the smallest matching index. Windowed aggregates sum the rolling
+    counters of whole partitions and scan only the partition containing the
+    window start.
+    """
+
+    def __init__(self,
+                 partition_seconds: int = 3600,
+                 retention_seconds: Optional[float] = None,
+                 hot_partitions: int = 48,
+                 segments: Optional[SQLiteTelemetrySegments] = None):
+        """
+        Initialize the TelemetryEventStore.
+
+        Args:
+            partition_seconds: Width of a time partition
+            retention_seconds: Partitions older than this are evicted as new ones open (None keeps all)
+            hot_partitions: Partitions kept in memory when segments are configured
+            segments: Optional on-disk segments for older partitions
+        """
+        self.partition_seconds = partition_seconds
+        self.retention_seconds = retention_seconds
+        self.hot_partitions = hot_partitions
+        self.segments = segments
+
+        self._partitions: Dict[int, _Partition] = {}
+        self._keys: List[int] = []
+        self._execution_starts: Dict[str, float] = {}
+        self._execution_ends: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return sum(partition.size for partition in self._partitions.values())
+
+    def _partition_key(self, timestamp: float) -> int:
+        return int(timestamp // self.partition_seconds)
+
+    def append(self, event: Any, now: Optional[float] = None):
+        """
+        Add an event.
+
+        Args:
+            event: The event to store
+            now: Current time for retention; when given, opening a new latest
+                partition evicts expired partitions and spills old ones
+        """
+        timestamp = event.timestamp.timestamp()
+        with self._lock:
+            execution_ms = self._track_execution(event, timestamp)
+            key = self._partition_key(timestamp)
+            partition = self._partitions.get(key)
+            if partition is None:
+                partition = self._partitions[key] = _Partition(key)
+                bisect.insort(self._keys, key)
+                if now is not None and key == self._keys[-1]:
+                    self._roll(now)
+            if partition.spilled:
+                # Late event for a partition already on disk
+                partition.events, partition.timestamps = [event], [timestamp]
+                partition.execution_ms = {0: execution_ms} if execution_ms is not None else {}
+                self.segments.write(partition)
+                partition.drop_events()
+                partition.count(event, execution_ms)
+            else:
+                partition.add(event, timestamp, execution_ms)
+
+    def _track_execution(self, event: Any, timestamp: float) -> Optional[int]:
+        """Tracks execution bounds; returns the execution duration for terminal events."""
+        execution_id = event.execution_id
+        if not execution_id:
+            return None
+        event_type = _key(event.type)
+        if event_type == EXECUTION_START_TYPE:
+            if timestamp < self._execution_starts.get(execution_id, float("inf")):
+                self._execution_starts[execution_id] = timestamp
+        elif event_type in EXECUTION_END_TYPES:
+            if timestamp < self._execution_ends.get(execution_id, float("inf")):
+                self._execution_ends[execution_id] = timestamp
+            start = self._execution_starts.get(execution_id)
+            if start is not None:
+                return int((timestamp - start) * 1000)
+        return None
+
+    def execution_duration_ms(self, execution_id: str) -> Optional[int]:
+        """Time from the first start to the first end event of an execution."""
+        start = self._execution_starts.get(execution_id)
+        end = self._execution_ends.get(execution_id)
+        if start is None or end is None:
+            return None
+        return int((end - start) * 1000)
+
+    def _roll(self, now: float):
+        if self.retention_seconds is not None:
+            before_key = self._partition_key(now - self.retention_seconds)
+            self._evict_partitions(before_key)
+            self._prune_executions(before_key * self.partition_seconds)
+        if self.segments is not None:
+            for key in self._keys[:-self.hot_partitions]:
+                partition = self._partitions[key]
+                if not partition.spilled:
+                    self.segments.write(partition)
+                    partition.drop_events()
+
+    def _evict_partitions(self, before_key: int):
+        while self._keys and self._keys[0] < before_key:
+            del self._partitions[self._keys.pop(0)]
+        if self.segments is not None:
+            self.segments.delete(before_key)
+
+    def evict_before(self, cutoff: float):
+        """Removes every event older than cutoff (epoch seconds)."""
+        with self._lock:
+            key = self._partition_key(cutoff)
+            self._evict_partitions(key)
+            boundary = self._partitions.get(key)
+            if boundary is not None:
+                kept = [pair for pair in self._select_partition(boundary, {}, None, None)
+                        if pair[0].timestamp.timestamp() >= cutoff]
+                if len(kept) != boundary.size:
+                    rebuilt = _Partition(key)
+                    for event, execution_ms in reversed(kept):
+                        rebuilt.add(event, event.timestamp.timestamp(), execution_ms)
+                    if boundary.spilled:
+                        self.segments.delete_partition(key)
+                        self.segments.write(rebuilt)
+                        rebuilt.drop_events()
+                    self._partitions[key] = rebuilt
+            self._prune_executions(cutoff)
+
+    def _prune_executions(self, cutoff: float):
+        """Forgets execution bounds recorded before cutoff, along with their events."""
+        for bounds in (self._execution_starts, self._execution_ends):
+            for execution_id in [e for e, ts in bounds.items() if ts < cutoff]:
+                del bounds[execution_id]
+
+    def _select_partition(self, partition: _Partition, filters: Dict[str, Any], start_ts: Optional[float],
+                          end_ts: Optional[float], limit: Optional[int] = None) -> List[Tuple[Any, Optional[int]]]:
+        if partition.spilled:
+            return self.segments.select(partition.key, partition.key, filters, start_ts, end_ts, limit)
+        return partition.select(filters, start_ts, end_ts)
+
+    def query(self, filters: Dict[str, Any], start_ts: Optional[float] = None,
+              end_ts: Optional[float] = None, limit: Optional[int] = None) -> List[Any]:
+        """
+        Events matching all filters (field -> value) within [start_ts, end_ts], newest first.
+        """
+        with self._lock:
+            lo = 0 if start_ts is None else bisect.bisect_left(self._keys, self._partition_key(start_ts))
+            hi = len(self._keys) if end_ts is None else bisect.bisect_right(self._keys, self._partition_key(end_ts))
+            keys = self._keys[lo:hi]
+            results: List[Any] = []
+            i = len(keys) - 1
+            while i >= 0 and not (limit and len(results) >= limit):
+                partition = self._partitions[keys[i]]
+                if partition.spilled:
+                    # One query for the whole run of consecutive on-disk partitions
+                    j = i
+                    while j > 0 and self._partitions[keys[j - 1]].spilled:
+                        j -= 1
+                    remaining = limit - len(results) if limit else None
+                    pairs = self.segments.select(keys[j], keys[i], filters, start_ts, end_ts, remaining)
+                    i = j - 1
+                else:
+                    pairs = partition.select(filters, start_ts, end_ts)
+                    i -= 1
+                results.extend(event for event, _ in pairs)
+            return results[:limit] if limit else results
+
+    def totals(self, start_ts: Optional[float] = None, dimension: Optional[str] = None,
+               value: Any = None) -> RollingCounters:
+        """
+        Rolling counters for events since start_ts, optionally restricted to
+        events whose dimension ("workflow_id" or "agent_id") equals value.
+        """
+        if dimension not in COUNTER_DIMENSIONS:
+            raise ValueError(f"No rolling counters for dimension {dimension}")
+        result = RollingCounters()
+        with self._lock:
+            first_key = None if start_ts is None else self._partition_key(start_ts)
+            for key in self._keys:
+                if first_key is not None and key < first_key:
+                    continue
+                partition = self._partitions[key]
+                if key == first_key:
+                    # Only part of the boundary partition is inside the window
+                    filters = {dimension: value} if dimension else {}
+                    for event, execution_ms in self._select_partition(partition, filters, start_ts, None):
+                        result.add(event, execution_ms)
+                    continue
+                counters = partition.counters.get((dimension, value))
+                if counters is not None:
+                    result.merge(counters)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            spilled = [p for p in self._partitions.values() if p.spilled]
+            return {
+                "partitions": len(self._partitions),
+                "spilled_partitions": len(spilled),
+                "events": len(self),
+                "events_in_memory": sum(len(p.events) for p in self._partitions.values()),
+                "tracked_executions": len(self._execution_starts),
+            }
@@ -0,0 +1,286 @@
+"""
+Trace Store Module for Industriverse Workflow Automation Layer
+
+This module provides the file storage pieces behind CapsuleDebugTraceManager:
+- A streamable trace file layout: valid JSON whose first line holds every
+  field except agent_trace, followed by one agent trace entry per line, so
+  headers and entries can be read without parsing the whole document
+- A SQLite metadata index (workflow, status, start/end time, agent count,
+  file path) so listing and filtering traces never opens trace files
+- A size-capped LRU cache of hydrated traces
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "_trace_index.sqlite"
+
+# Ends the first line of a streamable trace file
+AGENT_TRACE_MARKER = ', "agent_trace": ['
+
+
+def _timestamp(iso_time: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(iso_time).timestamp() if iso_time else None
+
+
+def dump_trace(data: Dict[str, Any]) -> str:
+    """
+    Serialize a trace dict in the streamable layout.
+
+    Args:
+        data: The trace as a dict, including agent_trace
+
+    Returns:
+        The file contents
+    """
+    data = dict(data)
+    agent_trace = data.pop("agent_trace", [])
+    header = json.dumps(data, default=str)
+    entries = ",\n".join(json.dumps(entry, default=str) for entry in agent_trace)
+    return f"{header[:-1]}{AGENT_TRACE_MARKER}\n{entries}\n]}}\n"
+
+
+def read_trace_header(path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Read the header of a trace file and stream its agent trace entries.
+
+    Args:
+        path: The trace file
+
+    Returns:
+        The trace fields other than agent_trace, and an iterator over the
+        agent trace entries (which owns the open file). Files written in the
+        older single-document layout are parsed whole.
+    """
+    f = open(path, "r")
+    try:
+        first = f.readline().rstrip("\n")
+        if first.endswith(AGENT_TRACE_MARKER):
+            header = json.loads(first[:-len(AGENT_TRACE_MARKER)] + "}")
+            # The iterator closes the file once exhausted
+            return header, _iter_entries(f)
+        f.seek(0)
+        data = json.load(f)
+    except Exception:
+        f.close()
+        raise
+    f.close()
+    entries = data.pop("agent_trace", [])
+    return data, iter(entries)
+
+
+def _iter_entries(f) -> Iterator[Dict[str, Any]]:
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line or line == "]}":
+                continue
+            yield json.loads(line.rstrip(","))
+
+
+class TraceIndex:
+    """
+    SQLite index of trace metadata for a file trace store.
+
+    Besides the listing fields it records each file's mtime and size, so
+    files written by other processes can be picked up incrementally.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: Path of the SQLite index database
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._lock = threading.Lock()
+        with self.conn:
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS traces (
+                                    execution_id TEXT PRIMARY KEY,
+                                    workflow_id TEXT,
+                                    status TEXT,
+                                    start_time TEXT,
+                                    end_time TEXT,
+                                    start_ts REAL,
+                                    end_ts REAL,
+                                    agent_count INTEGER,
+                                    path TEXT,
+                                    mtime REAL,
+                                    size INTEGER
+                                )''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_traces_start ON traces (start_ts)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_traces_workflow ON traces (workflow_id, start_ts)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_traces_status ON traces (status, start_ts)')
+
+    def upsert(self, header: Dict[str, Any], agent_count: int, path: str):
+        """Record a trace's metadata from its header fields and file."""
+        st = os.stat(path)
+        with self._lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO traces VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+                header["execution_id"], header["workflow_id"], header.get("status"),
+                header.get("start_time"), header.get("end_time"),
+                _timestamp(header.get("start_time")), _timestamp(header.get("end_time")),
+                agent_count, path, st.st_mtime, st.st_size
+            ))
+
+    def path(self, execution_id: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute('SELECT path FROM traces WHERE execution_id = ?', (execution_id,)).fetchone()
+        return row[0] if row else None
+
+    def reconcile(self, storage_path: str) -> int:
+        """
+        Index trace files that are new or changed since they were indexed.
+
+        Each file's own mtime and size are compared with the index, so
+        in-place rewrites by other processes are picked up; rows of files
+        that no longer exist are removed.
+
+        Returns:
+            The number of files (re)indexed
+        """
+        if not os.path.isdir(storage_path):
+            return 0
+        with self._lock:
+            known = {path: (mtime, size) for path, mtime, size in
+                     self.conn.execute('SELECT path, mtime, size FROM traces')}
+        indexed = 0
+        present = set()
+        for workflow_dir in os.scandir(storage_path):
+            if not workflow_dir.is_dir():
+                continue
+            for trace_file in os.scandir(workflow_dir.path):
+                if not trace_file.name.endswith(".json"):
+                    continue
+                path = trace_file.path
+                try:
+                    st = trace_file.stat()
+                except FileNotFoundError:
+                    continue
+                present.add(path)
+                if known.get(path) == (st.st_mtime, st.st_size):
+                    continue
+                try:
+                    header, entries = read_trace_header(path)
+                    agent_count = sum(1 for _ in entries)
+                    self.upsert(header, agent_count, path)
+                    indexed += 1
+                except Exception as e:
+                    logger.error(f"Failed to index debug trace {path}: {e}")
+        removed = [(path,) for path in known if path not in present]
+        if removed:
+            with self._lock, self.conn:
+                self.conn.executemany('DELETE FROM traces WHERE path = ?', removed)
+        return indexed
+
+    def query(self,
+              workflow_id: Optional[str] = None,
+              status: Optional[str] = None,
+              start_time: Optional[datetime] = None,
+              end_time: Optional[datetime] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Trace summaries matching the filters, newest start time first."""
+        query = ("SELECT workflow_id, execution_id, start_time, end_time, status, agent_count "
+                 "FROM traces WHERE 1=1")
+        params: List[Any] = []
+        if workflow_id:
+            query += " AND workflow_id = ?"
+            params.append(workflow_id)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        if start_time:
+            query += " AND start_ts >= ?"
+            params.append(start_time.timestamp())
+        if end_time:
+            # Running traces have no end time and never match
+            query += " AND end_ts <= ?"
+            params.append(end_time.timestamp())
+        query += " ORDER BY start_ts DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        columns = ("workflow_id", "execution_id", "start_time", "end_time", "status", "agent_count")
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+class TraceCache:
+    """
+    LRU cache of hydrated traces, bounded by their approximate size.
+
+    Sizes are the serialized sizes of the traces. max_bytes=None makes the
+    cache unbounded, which is what in-memory trace storage uses.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, execution_id: str) -> bool:
+        return execution_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, execution_id: str) -> Any:
+        trace = self.get(execution_id)
+        if trace is None:
+            raise KeyError(execution_id)
+        return trace
+
+    def get(self, execution_id: str) -> Optional[Any]:
+        entry = self._entries.get(execution_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(execution_id)
+        return entry[0]
+
+    def put(self, execution_id: str, trace: Any, size: int = 0):
+        previous = self._entries.pop(execution_id, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        self._entries[execution_id] = (trace, size)
+        self.bytes += size
+        if self.max_bytes is not None:
+            # Keep the newest entry even if it alone exceeds the cap
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def values(self) -> List[Any]:
+        return [trace for trace, _ in self._entries.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "traces": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -138,6 +138,7 @@ class WorkflowManifest(BaseModel):
     agent_mesh_topology: Optional[AgentMeshTopology] = None
     human_interaction: Optional[HumanInteraction] = None
     escalation_protocol: Optional[EscalationProtocol] = None
+    max_parallel_tasks: Optional[int] = None  # Overrides the runtime's per-workflow limit
     
     # Tasks
     tasks: List[TaskDefinition] = Field(default_factory=list)
@@ -14,6 +14,7 @@ across the Industriverse ecosystem.
 
 import asyncio
 import logging
+import time
 import uuid
 from datetime import datetime
 from enum import Enum
@@ -30,10 +31,19 @@ from .workflow_telemetry import WorkflowTelemetry
 from .execution_mode_manager import ExecutionModeManager, ExecutionMode
 from .mesh_topology_manager import MeshTopologyManager, RoutingStrategy
 from .capsule_debug_trace_manager import CapsuleDebugTraceManager, AgentTrace
+from .task_graph import TaskGraph
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Used for tasks with on_failure "retry"; overridden per task by retry_config
+DEFAULT_RETRY_CONFIG = {
+    "max_retries": 3,
+    "initial_delay": 1.0,
+    "backoff_factor": 2.0,
+    "max_delay": 60.0,
+}
+
 
 class WorkflowStatus(str, Enum):
     """Enum representing the possible states of a workflow."""
@@ -63,6 +73,10 @@ class WorkflowExecutionContext(BaseModel):
     parent_execution_id: Optional[str] = None
     human_intervention_required: bool = False
     error_message: Optional[str] = None
+    completed_tasks: List[str] = Field(default_factory=list)
+    task_timings: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    critical_path: List[str] = Field(default_factory=list)
+    critical_path_seconds: Optional[float] = None
 
 
 class WorkflowRuntime:
@@ -73,16 +87,27 @@ class WorkflowRuntime:
     handles state transitions, and provides monitoring and telemetry.
     """
     
-    def __init__(self, registry: WorkflowRegistry, telemetry: WorkflowTelemetry):
+    def __init__(
+        self,
+        registry: WorkflowRegistry,
+        telemetry: WorkflowTelemetry,
+        max_parallel_tasks: int = 8,
+        max_concurrent_tasks: int = 64
+    ):
         """
         Initialize the WorkflowRuntime.
         
         Args:
             registry: The workflow registry for workflow lookup and registration
             telemetry: The telemetry service for monitoring and metrics
+            max_parallel_tasks: Default limit on concurrently running tasks per workflow execution
+            max_concurrent_tasks: Limit on concurrently running tasks across all executions
         """
         self.registry = registry
         self.telemetry = telemetry
+        self.max_parallel_tasks = max_parallel_tasks
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self._task_slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
         self.execution_mode_manager = ExecutionModeManager()
         self.mesh_topology_manager = MeshTopologyManager()
         self.debug_trace_manager = CapsuleDebugTraceManager()
@@ -236,6 +261,11 @@ class WorkflowRuntime:
         """
         Execute a workflow.
         
+        Tasks run as a dependency DAG (see TaskGraph): every task whose
+        dependencies have completed is started, bounded by the per-workflow
+        and global concurrency limits. Tasks completed by an earlier run of
+        this execution (before a pause) are not run again.
+        
         Args:
             execution_id: The execution ID of the workflow to execute
         """
@@ -256,111 +286,101 @@ class WorkflowRuntime:
             context.error_message = f"Workflow {context.workflow_id} not found"
             return
         
+        running: Dict[asyncio.Task, TaskDefinition] = {}
         try:
-            # Execute tasks in sequence (this will be enhanced for parallel execution)
-            for task in manifest.tasks:
-                context.current_task_id = task.id
+            graph = TaskGraph(manifest.tasks)
+            workflow_slots = asyncio.Semaphore(manifest.max_parallel_tasks or self.max_parallel_tasks)
+            done = set(context.completed_tasks)
+            started = set(done)
+            failure: Optional[Tuple[TaskDefinition, Exception]] = None
+            
+            while True:
+                # Launch every ready task unless the workflow is stopping
+                if (failure is None and context.status == WorkflowStatus.RUNNING
+                        and not context.human_intervention_required):
+                    for task_id in graph.ready_tasks(done, started):
+                        started.add(task_id)
+                        task = graph.tasks[task_id]
+                        running[asyncio.create_task(self._run_task(task, context, workflow_slots))] = task
                 
-                # Log task start
-                logger.info(f"Executing task {task.id} in workflow {context.execution_id}")
-                self._emit_event("task_started", {
-                    "execution_id": context.execution_id, 
-                    "task_id": task.id
-                })
+                if not running:
+                    break
                 
-                # Record in debug trace
-                trace_entry = AgentTrace(
-                    agent_id=task.agent_id if hasattr(task, 'agent_id') else "workflow_runtime",
-                    input_received=True,
-                    time=datetime.now().isoformat()
-                )
-                context.agent_trace.append(trace_entry)
-                
-                # Execute the task
-                try:
-                    # Get the appropriate handler for this task type
-                    handler = self.task_handlers.get(task.type)
-                    if not handler:
-                        raise ValueError(f"No handler registered for task type {task.type}")
-                    
-                    # Execute the task
-                    result = await handler(task, context)
-                    
-                    # Update the context with the result
-                    if result and isinstance(result, dict):
-                        context.variables.update(result)
-                    
-                    # Update trace with success
-                    trace_entry.decision = "completed"
-                    trace_entry.reason = "Task executed successfully"
-                    
-                    # Log task completion
-                    logger.info(f"Task {task.id} completed in workflow {context.execution_id}")
-                    self._emit_event("task_completed", {
-                        "execution_id": context.execution_id, 
-                        "task_id": task.id,
-                        "result": result
-                    })
-                    
-                except Exception as e:
-                    # Update trace with failure
-                    trace_entry.decision = "failed"
-                    trace_entry.reason = str(e)
-                    
-                    # Log task failure
-                    logger.error(f"Task {task.id} failed in workflow {context.execution_id}: {e}")
-                    self._emit_event("task_failed", {
-                        "execution_id": context.execution_id, 
-                        "task_id": task.id,
-                        "error": str(e)
-                    })
-                    
-                    # Handle task failure based on task configuration
-                    if hasattr(task, 'on_failure') and task.on_failure:
-                        if task.on_failure == "continue":
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    error = future.exception()
+                    if error is None or task.on_failure == "continue":
+                        if error is not None:
                             logger.info(f"Continuing workflow {context.execution_id} despite task failure")
-                            continue
-                        elif task.on_failure == "retry":
-                            # Implement retry logic
-                            pass
-                        elif task.on_failure == "escalate":
-                            context.status = WorkflowStatus.ESCALATED
-                            context.human_intervention_required = True
-                            self._emit_event("workflow_escalated", {
-                                "execution_id": context.execution_id,
-                                "task_id": task.id,
-                                "error": str(e)
-                            })
-                            return
-                    
-                    # Default behavior is to fail the workflow
-                    context.status = WorkflowStatus.FAILED
-                    context.error_message = f"Task {task.id} failed: {e}"
-                    context.end_time = datetime.now()
-                    
-                    self._emit_event("workflow_failed", {
-                        "execution_id": context.execution_id,
-                        "error": str(e)
-                    })
-                    return
+                        done.add(task.id)
+                        context.completed_tasks.append(task.id)
+                    elif failure is None:
+                        failure = (task, error)
                 
-                # Check if human intervention is required
-                if context.human_intervention_required:
-                    logger.info(f"Workflow {context.execution_id} paused for human intervention")
-                    context.status = WorkflowStatus.PAUSED
-                    self._emit_event("workflow_paused", {
+                # A failed or cancelled workflow abandons its in-flight tasks;
+                # an escalated or paused one lets them finish
+                abort = context.status == WorkflowStatus.CANCELLED or (
+                    failure is not None and failure[0].on_failure != "escalate"
+                )
+                if abort and running:
+                    for future in running:
+                        future.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                    running.clear()
+            
+            self._record_critical_path(context, graph)
+            
+            if failure is not None:
+                task, error = failure
+                if task.on_failure == "escalate":
+                    context.status = WorkflowStatus.ESCALATED
+                    context.human_intervention_required = True
+                    self._emit_event("workflow_escalated", {
                         "execution_id": context.execution_id,
-                        "reason": "Human intervention required"
+                        "task_id": task.id,
+                        "error": str(error)
                     })
                     return
+                
+                # Default behavior is to fail the workflow
+                context.status = WorkflowStatus.FAILED
+                context.error_message = f"Task {task.id} failed: {error}"
+                context.end_time = datetime.now()
+                
+                self._emit_event("workflow_failed", {
+                    "execution_id": context.execution_id,
+                    "error": str(error)
+                })
+                return
+            
+            # Cancelled or paused through the API while tasks were running
+            if context.status != WorkflowStatus.RUNNING:
+                return
+            
+            # Check if human intervention is required
+            if context.human_intervention_required:
+                logger.info(f"Workflow {context.execution_id} paused for human intervention")
+                context.status = WorkflowStatus.PAUSED
+                self._emit_event("workflow_paused", {
+                    "execution_id": context.execution_id,
+                    "reason": "Human intervention required"
+                })
+                return
             
             # All tasks completed successfully
             context.status = WorkflowStatus.COMPLETED
             context.end_time = datetime.now()
             context.current_task_id = None
             
-            logger.info(f"Workflow {context.execution_id} completed successfully")
-            self._emit_event("workflow_completed", {"execution_id": context.execution_id})
+            logger.info(f"Workflow {context.execution_id} completed successfully "
+                        f"(critical path {context.critical_path_seconds:.3f}s: {' -> '.join(context.critical_path)})")
+            self._emit_event("workflow_completed", {
+                "execution_id": context.execution_id,
+                "critical_path": context.critical_path,
+                "critical_path_seconds": context.critical_path_seconds,
+                "makespan_seconds": (context.end_time - context.start_time).total_seconds()
+            })
             
             # Save debug trace
             self.debug_trace_manager.save_trace(
@@ -370,6 +390,9 @@ class WorkflowRuntime:
             )
             
         except Exception as e:
+            for future in running:
+                future.cancel()
+            
             # Handle workflow-level exceptions
             context.status = WorkflowStatus.FAILED
             context.error_message = str(e)
@@ -381,6 +404,154 @@ class WorkflowRuntime:
                 "error": str(e)
             })
     
+    def _global_task_slots(self) -> asyncio.Semaphore:
+        """Semaphore enforcing max_concurrent_tasks on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._task_slots is None or self._task_slots[0] is not loop:
+            self._task_slots = (loop, asyncio.Semaphore(self.max_concurrent_tasks))
+        return self._task_slots[1]
+    
+    @staticmethod
+    def _retry_delays(task: TaskDefinition) -> List[float]:
+        """Backoff delays before each retry of a task; empty unless on_failure is "retry"."""
+        if task.on_failure != "retry":
+            return []
+        config = {**DEFAULT_RETRY_CONFIG, **(task.retry_config or {})}
+        return [
+            min(config["initial_delay"] * config["backoff_factor"] ** attempt, config["max_delay"])
+            for attempt in range(int(config["max_retries"]))
+        ]
+    
+    async def _run_task(self, task: TaskDefinition, context: WorkflowExecutionContext,
+                        workflow_slots: asyncio.Semaphore) -> Any:
+        """
+        Run one task, retrying with backoff if its failure policy is "retry".
+        
+        A concurrency slot is held only while an attempt runs, not during backoff.
+        
+        Args:
+            task: The task to run
+            context: The execution context of the workflow
+            workflow_slots: The workflow's concurrency limit
+            
+        Returns:
+            The handler result
+            
+        Raises:
+            Exception: The error of the last attempt if the task failed
+        """
+        # Log task start
+        logger.info(f"Executing task {task.id} in workflow {context.execution_id}")
+        self._emit_event("task_started", {
+            "execution_id": context.execution_id, 
+            "task_id": task.id
+        })
+        
+        # Record in debug trace
+        trace_entry = AgentTrace(
+            agent_id=task.agent_id or "workflow_runtime",
+            input_received=True,
+            time=datetime.now().isoformat()
+        )
+        context.agent_trace.append(trace_entry)
+        
+        # Timed from when the first attempt gets a slot, so waiting for a
+        # slot does not count towards the critical path
+        timing = {"attempts": 0}
+        context.task_timings[task.id] = timing
+        began = None
+        retry_delays = self._retry_delays(task)
+        
+        try:
+            while True:
+                timing["attempts"] += 1
+                try:
+                    async with workflow_slots, self._global_task_slots():
+                        if began is None:
+                            began = time.monotonic()
+                            timing["start"] = datetime.now().isoformat()
+                        context.current_task_id = task.id
+                        result = await self._invoke_handler(task, context)
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if timing["attempts"] > len(retry_delays):
+                        raise
+                    delay = retry_delays[timing["attempts"] - 1]
+                    logger.warning(f"Task {task.id} failed in workflow {context.execution_id} "
+                                   f"(attempt {timing['attempts']}), retrying in {delay:.2f}s: {e}")
+                    self._emit_event("task_retrying", {
+                        "execution_id": context.execution_id,
+                        "task_id": task.id,
+                        "attempt": timing["attempts"],
+                        "delay_seconds": delay,
+                        "error": str(e)
+                    })
+                    await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            trace_entry.decision = "cancelled"
+            trace_entry.reason = "Workflow stopped before the task finished"
+            timing["status"] = "cancelled"
+            raise
+        except Exception as e:
+            # Update trace with failure
+            trace_entry.decision = "failed"
+            trace_entry.reason = str(e)
+            timing["status"] = "failed"
+            
+            # Log task failure
+            logger.error(f"Task {task.id} failed in workflow {context.execution_id}: {e}")
+            self._emit_event("task_failed", {
+                "execution_id": context.execution_id, 
+                "task_id": task.id,
+                "error": str(e)
+            })
+            raise
+        finally:
+            if began is not None:
+                timing["end"] = datetime.now().isoformat()
+                timing["duration_seconds"] = time.monotonic() - began
+        
+        # Update the context with the result
+        if result and isinstance(result, dict):
+            context.variables.update(result)
+        
+        # Update trace with success
+        trace_entry.decision = "completed"
+        trace_entry.reason = "Task executed successfully"
+        timing["status"] = "completed"
+        
+        # Log task completion
+        logger.info(f"Task {task.id} completed in workflow {context.execution_id}")
+        self._emit_event("task_completed", {
+            "execution_id": context.execution_id, 
+            "task_id": task.id,
+            "result": result
+        })
+        return result
+    
+    async def _invoke_handler(self, task: TaskDefinition, context: WorkflowExecutionContext) -> Any:
+        """Call the handler for a task's type, enforcing its timeout."""
+        handler = self.task_handlers.get(task.type)
+        if not handler:
+            raise ValueError(f"No handler registered for task type {task.type}")
+        if not task.timeout_seconds:
+            return await handler(task, context)
+        try:
+            return await asyncio.wait_for(handler(task, context), task.timeout_seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Task {task.id} timed out after {task.timeout_seconds}s")
+    
+    @staticmethod
+    def _record_critical_path(context: WorkflowExecutionContext, graph: TaskGraph):
+        """Store the longest duration-weighted dependency chain of the tasks run so far."""
+        durations = {
+            task_id: timing.get("duration_seconds", 0.0)
+            for task_id, timing in context.task_timings.items()
+        }
+        context.critical_path, context.critical_path_seconds = graph.critical_path(durations)
+    
     async def pause_workflow(self, execution_id: str, reason: Optional[str] = None) -> bool:
         """
         Pause a running workflow.
@@ -481,7 +652,11 @@ class WorkflowRuntime:
             "execution_mode": context.execution_mode,
             "routing_strategy": context.routing_strategy,
             "human_intervention_required": context.human_intervention_required,
-            "error_message": context.error_message
+            "error_message": context.error_message,
+            "completed_tasks": list(context.completed_tasks),
+            "task_timings": {task_id: dict(timing) for task_id, timing in context.task_timings.items()},
+            "critical_path": list(context.critical_path),
+            "critical_path_seconds": context.critical_path_seconds
         }
     
     async def list_active_workflows(self) -> List[Dict[str, Any]]:
@@ -538,7 +713,8 @@ class WorkflowRuntime:
     
     async def _handle_parallel(self, task: TaskDefinition, context: WorkflowExecutionContext) -> Dict[str, Any]:
         """Handle parallel task execution."""
-        # This is a placeholder implementation
+        # Independent tasks already run concurrently under the DAG scheduler;
+        # this remains a placeholder for explicit fan-out groups
         logger.info(f"Executing parallel tasks for {task.id}")
         return {"parallel_results": []}
     
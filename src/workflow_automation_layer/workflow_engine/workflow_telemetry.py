@@ -21,6 +21,8 @@ from collections import defaultdict
 import prometheus_client
 from pydantic import BaseModel, Field
 
+from .telemetry_store import TelemetryEventStore, SQLiteTelemetrySegments
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -84,7 +86,9 @@ class WorkflowTelemetry:
                 storage_type: TelemetryStorageType = TelemetryStorageType.MEMORY, 
                 storage_path: Optional[str] = None,
                 enable_prometheus: bool = False,
-                retention_days: int = 30):
+                retention_days: int = 30,
+                partition_minutes: int = 60,
+                hot_partitions: int = 48):
         """
         Initialize the WorkflowTelemetry.
         
@@ -93,14 +97,25 @@ class WorkflowTelemetry:
             storage_path: The path to use for file storage (if applicable)
             enable_prometheus: Whether to enable Prometheus metrics
             retention_days: Number of days to retain telemetry data
+            partition_minutes: Width of the time partitions events are stored in
+            hot_partitions: Partitions kept in memory with DATABASE storage; older
+                ones move to SQLite segments at storage_path
         """
         self.storage_type = storage_type
         self.storage_path = storage_path
         self.enable_prometheus = enable_prometheus
         self.retention_days = retention_days
         
-        # In-memory storage
-        self.events: List[TelemetryEvent] = []
+        # Time-partitioned, indexed event storage
+        segments = None
+        if storage_type == TelemetryStorageType.DATABASE and storage_path:
+            segments = SQLiteTelemetrySegments(storage_path, lambda data: TelemetryEvent(**data))
+        self.store = TelemetryEventStore(
+            partition_seconds=partition_minutes * 60,
+            retention_seconds=retention_days * 86400 if retention_days > 0 else None,
+            hot_partitions=hot_partitions,
+            segments=segments
+        )
         
         # Event listeners
         self.event_listeners: Dict[TelemetryEventType, List[Callable]] = defaultdict(list)
@@ -111,6 +126,13 @@ class WorkflowTelemetry:
         
         logger.info(f"WorkflowTelemetry initialized with {storage_type} storage")
     
+    @property
+    def events(self) -> List[TelemetryEvent]:
+        """All stored events, oldest first. Materialises the whole store; prefer get_events."""
+        events = self.store.query({})
+        events.sort(key=lambda e: e.timestamp)
+        return events
+    
     def _setup_prometheus_metrics(self):
         """Set up Prometheus metrics."""
         self.metrics = {
@@ -240,7 +262,7 @@ class WorkflowTelemetry:
         event = TelemetryEvent(type=event_type, **kwargs)
         
         # Store the event
-        self.events.append(event)
+        self.store.append(event, now=time.time())
         
         # Update Prometheus metrics (if enabled)
         if self.enable_prometheus:
@@ -413,38 +435,25 @@ class WorkflowTelemetry:
         Returns:
             A list of TelemetryEvent objects matching the criteria
         """
-        result = self.events
-        
-        # Apply filters
+        filters = {}
         if workflow_id:
-            result = [e for e in result if e.workflow_id == workflow_id]
-        
+            filters["workflow_id"] = workflow_id
         if execution_id:
-            result = [e for e in result if e.execution_id == execution_id]
-        
+            filters["execution_id"] = execution_id
         if task_id:
-            result = [e for e in result if e.task_id == task_id]
-        
+            filters["task_id"] = task_id
         if agent_id:
-            result = [e for e in result if e.agent_id == agent_id]
-        
+            filters["agent_id"] = agent_id
         if event_type:
-            result = [e for e in result if e.type == event_type]
-        
-        if start_time:
-            result = [e for e in result if e.timestamp >= start_time]
-        
-        if end_time:
-            result = [e for e in result if e.timestamp <= end_time]
-        
-        # Sort by timestamp (newest first)
-        result.sort(key=lambda e: e.timestamp, reverse=True)
-        
-        # Apply limit
-        if limit:
-            result = result[:limit]
-        
-        return result
+            filters["type"] = event_type
+        
+        # Newest first
+        return self.store.query(
+            filters,
+            start_time.timestamp() if start_time else None,
+            end_time.timestamp() if end_time else None,
+            limit
+        )
     
     def get_workflow_execution_timeline(self, execution_id: str) -> List[TelemetryEvent]:
         """
@@ -470,22 +479,8 @@ class WorkflowTelemetry:
         Returns:
             The duration in milliseconds, or None if the workflow is still running or not found
         """
-        events = self.get_workflow_execution_timeline(execution_id)
-        
-        # Find start and end events
-        start_event = next((e for e in events if e.type == TelemetryEventType.WORKFLOW_STARTED), None)
-        end_event = next((e for e in events if e.type in [
-            TelemetryEventType.WORKFLOW_COMPLETED,
-            TelemetryEventType.WORKFLOW_FAILED,
-            TelemetryEventType.WORKFLOW_CANCELLED
-        ]), None)
-        
-        if not start_event or not end_event:
-            return None
-        
-        # Calculate duration
-        duration = (end_event.timestamp - start_event.timestamp).total_seconds() * 1000
-        return int(duration)
+        # Execution start and end times are tracked as events are recorded
+        return self.store.execution_duration_ms(execution_id)
     
     def get_task_execution_duration(self, execution_id: str, task_id: str) -> Optional[int]:
         """
@@ -514,6 +509,13 @@ class WorkflowTelemetry:
         duration = (end_event.timestamp - start_event.timestamp).total_seconds() * 1000
         return int(duration)
     
+    def _window_totals(self, time_window_days: int, dimension: Optional[str] = None, value: Any = None):
+        """Rolling counters over the last time_window_days, optionally for one workflow or agent."""
+        start_time = datetime.now() - timedelta(days=time_window_days)
+        if dimension and value is None:
+            dimension = None
+        return self.store.totals(start_time.timestamp(), dimension, value)
+    
     def get_workflow_success_rate(self, workflow_id: str, time_window_days: int = 7) -> Optional[float]:
         """
         Get the success rate of a workflow over a time window.
@@ -525,23 +527,11 @@ class WorkflowTelemetry:
         Returns:
             The success rate as a percentage, or None if no executions found
         """
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=time_window_days)
+        totals = self._window_totals(time_window_days, "workflow_id", workflow_id)
         
-        # Get all completed or failed executions
-        events = self.get_events(
-            workflow_id=workflow_id,
-            event_type=TelemetryEventType.WORKFLOW_COMPLETED,
-            start_time=start_time
-        )
-        completed_count = len(events)
-        
-        events = self.get_events(
-            workflow_id=workflow_id,
-            event_type=TelemetryEventType.WORKFLOW_FAILED,
-            start_time=start_time
-        )
-        failed_count = len(events)
+        # Count completed and failed executions
+        completed_count = totals.counts[TelemetryEventType.WORKFLOW_COMPLETED.value]
+        failed_count = totals.counts[TelemetryEventType.WORKFLOW_FAILED.value]
         
         total_count = completed_count + failed_count
         if total_count == 0:
@@ -560,23 +550,11 @@ class WorkflowTelemetry:
         Returns:
             The success rate as a percentage, or None if no executions found
         """
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=time_window_days)
+        totals = self._window_totals(time_window_days, "agent_id", agent_id)
         
-        # Get all selections and failures
-        events = self.get_events(
-            agent_id=agent_id,
-            event_type=TelemetryEventType.AGENT_SELECTED,
-            start_time=start_time
-        )
-        selected_count = len(events)
-        
-        events = self.get_events(
-            agent_id=agent_id,
-            event_type=TelemetryEventType.AGENT_FAILED,
-            start_time=start_time
-        )
-        failed_count = len(events)
+        # Count selections and failures
+        selected_count = totals.counts[TelemetryEventType.AGENT_SELECTED.value]
+        failed_count = totals.counts[TelemetryEventType.AGENT_FAILED.value]
         
         if selected_count == 0:
             return None
@@ -594,25 +572,8 @@ class WorkflowTelemetry:
         Returns:
             The average duration in milliseconds, or None if no interventions found
         """
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=time_window_days)
-        
-        # Get all human intervention completed events
-        events = self.get_events(
-            workflow_id=workflow_id,
-            event_type=TelemetryEventType.HUMAN_INTERVENTION_COMPLETED,
-            start_time=start_time
-        )
-        
-        if not events:
-            return None
-        
-        # Calculate average duration
-        durations = [e.duration_ms for e in events if e.duration_ms is not None]
-        if not durations:
-            return None
-        
-        return sum(durations) / len(durations)
+        totals = self._window_totals(time_window_days, "workflow_id", workflow_id)
+        return totals.average_duration(TelemetryEventType.HUMAN_INTERVENTION_COMPLETED.value)
     
     def get_execution_mode_distribution(self, workflow_id: Optional[str] = None, time_window_days: int = 7) -> Dict[str, int]:
         """
@@ -625,23 +586,10 @@ class WorkflowTelemetry:
         Returns:
             A dictionary mapping execution modes to counts
         """
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=time_window_days)
-        
-        # Get all execution mode changed events
-        events = self.get_events(
-            workflow_id=workflow_id,
-            event_type=TelemetryEventType.EXECUTION_MODE_CHANGED,
-            start_time=start_time
-        )
-        
-        # Count by to_mode
-        result = defaultdict(int)
-        for event in events:
-            to_mode = event.metadata.get("to_mode", "unknown")
-            result[to_mode] += 1
+        totals = self._window_totals(time_window_days, "workflow_id", workflow_id)
         
-        return dict(result)
+        # Counted by to_mode
+        return dict(totals.tallies[TelemetryEventType.EXECUTION_MODE_CHANGED.value])
     
     def get_top_escalation_reasons(self, workflow_id: Optional[str] = None, time_window_days: int = 7, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -655,29 +603,13 @@ class WorkflowTelemetry:
         Returns:
             A list of dictionaries with reason and count
         """
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=time_window_days)
-        
-        # Get all escalation triggered events
-        events = self.get_events(
-            workflow_id=workflow_id,
-            event_type=TelemetryEventType.ESCALATION_TRIGGERED,
-            start_time=start_time
-        )
-        
-        # Count by reason
-        reason_counts = defaultdict(int)
-        for event in events:
-            reason = event.metadata.get("reason", "unknown")
-            reason_counts[reason] += 1
-        
-        # Sort by count (descending)
-        sorted_reasons = sorted(reason_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # Apply limit
-        sorted_reasons = sorted_reasons[:limit]
-        
-        return [{"reason": reason, "count": count} for reason, count in sorted_reasons]
+        totals = self._window_totals(time_window_days, "workflow_id", workflow_id)
+        return self._top_reasons(totals, limit)
+    
+    @staticmethod
+    def _top_reasons(totals, limit: int) -> List[Dict[str, Any]]:
+        reason_counts = totals.tallies[TelemetryEventType.ESCALATION_TRIGGERED.value]
+        return [{"reason": reason, "count": count} for reason, count in reason_counts.most_common(limit)]
     
     def get_trust_score_history(self, agent_id: str, time_window_days: int = 7) -> List[Dict[str, Any]]:
         """
@@ -723,63 +655,44 @@ class WorkflowTelemetry:
         Returns:
             A dictionary with performance metrics
         """
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=time_window_days)
-        
-        # Get all relevant events
-        all_events = self.get_events(
-            workflow_id=workflow_id,
-            start_time=start_time
-        )
+        totals = self._window_totals(time_window_days, "workflow_id", workflow_id)
+        completed = TelemetryEventType.WORKFLOW_COMPLETED.value
+        failed = TelemetryEventType.WORKFLOW_FAILED.value
         
         # Count executions by status
-        completed_events = [e for e in all_events if e.type == TelemetryEventType.WORKFLOW_COMPLETED]
-        failed_events = [e for e in all_events if e.type == TelemetryEventType.WORKFLOW_FAILED]
-        cancelled_events = [e for e in all_events if e.type == TelemetryEventType.WORKFLOW_CANCELLED]
-        
-        total_executions = len(completed_events) + len(failed_events) + len(cancelled_events)
-        success_rate = (len(completed_events) / total_executions * 100) if total_executions > 0 else 0
+        completed_count = totals.counts[completed]
+        failed_count = totals.counts[failed]
+        cancelled_count = totals.counts[TelemetryEventType.WORKFLOW_CANCELLED.value]
         
-        # Calculate average duration
-        durations = []
-        for event in completed_events + failed_events:
-            execution_id = event.execution_id
-            if execution_id:
-                duration = self.get_workflow_execution_duration(execution_id)
-                if duration is not None:
-                    durations.append(duration)
+        total_executions = completed_count + failed_count + cancelled_count
+        success_rate = (completed_count / total_executions * 100) if total_executions > 0 else 0
         
-        avg_duration_ms = sum(durations) / len(durations) if durations else 0
+        # Average duration of completed and failed executions
+        avg_duration_ms = totals.average_execution_duration(completed, failed) or 0
         
         # Count human interventions
-        human_intervention_events = [e for e in all_events if e.type == TelemetryEventType.HUMAN_INTERVENTION_REQUESTED]
-        human_intervention_rate = (len(human_intervention_events) / total_executions * 100) if total_executions > 0 else 0
+        human_interventions = totals.counts[TelemetryEventType.HUMAN_INTERVENTION_REQUESTED.value]
+        human_intervention_rate = (human_interventions / total_executions * 100) if total_executions > 0 else 0
         
         # Count escalations
-        escalation_events = [e for e in all_events if e.type == TelemetryEventType.ESCALATION_TRIGGERED]
-        escalation_rate = (len(escalation_events) / total_executions * 100) if total_executions > 0 else 0
-        
-        # Get top escalation reasons
-        top_escalation_reasons = self.get_top_escalation_reasons(workflow_id, time_window_days)
-        
-        # Get execution mode distribution
-        execution_mode_distribution = self.get_execution_mode_distribution(workflow_id, time_window_days)
+        escalations = totals.counts[TelemetryEventType.ESCALATION_TRIGGERED.value]
+        escalation_rate = (escalations / total_executions * 100) if total_executions > 0 else 0
         
         return {
             "workflow_id": workflow_id,
             "time_window_days": time_window_days,
             "total_executions": total_executions,
-            "completed_executions": len(completed_events),
-            "failed_executions": len(failed_events),
-            "cancelled_executions": len(cancelled_events),
+            "completed_executions": completed_count,
+            "failed_executions": failed_count,
+            "cancelled_executions": cancelled_count,
             "success_rate": success_rate,
             "avg_duration_ms": avg_duration_ms,
-            "human_interventions": len(human_intervention_events),
+            "human_interventions": human_interventions,
             "human_intervention_rate": human_intervention_rate,
-            "escalations": len(escalation_events),
+            "escalations": escalations,
             "escalation_rate": escalation_rate,
-            "top_escalation_reasons": top_escalation_reasons,
-            "execution_mode_distribution": execution_mode_distribution,
+            "top_escalation_reasons": self._top_reasons(totals, 5),
+            "execution_mode_distribution": dict(totals.tallies[TelemetryEventType.EXECUTION_MODE_CHANGED.value]),
             "generated_at": datetime.now()
         }
     
@@ -791,10 +704,19 @@ class WorkflowTelemetry:
             return
         
         cutoff_time = datetime.now() - timedelta(days=self.retention_days)
-        self.events = [e for e in self.events if e.timestamp >= cutoff_time]
+        self.store.evict_before(cutoff_time.timestamp())
         
         logger.info(f"Cleaned up events older than {self.retention_days} days")
     
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the telemetry event store.
+        
+        Returns:
+            A dictionary with partition and event counts
+        """
+        return self.store.stats()
+    
     def export_events_to_json(self, 
                              file_path: str,
                              workflow_id: Optional[str] = None,
@@ -847,7 +769,7 @@ class WorkflowTelemetry:
                 
                 # Create event
                 event = TelemetryEvent(**event_dict)
-                self.events.append(event)
+                self.store.append(event)
             
             logger.info(f"Imported {len(events_dict)} events from {file_path}")
         except Exception as e:
@@ -4,3 +4,9 @@ import sys
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+# ebm_lib and ebm_runtime are top-level packages under src/ (the prior registry
+# imports "ebm_lib.priors.<domain>_v1"); appended so nothing else is shadowed
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.append(SRC)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from src.overseer_system.anomaly_detection.metric_window import MetricWindow, StreamingDetector
+
+
+def _reference_z_scores(values, window_size, min_samples):
+    """The previous per-point scoring: np.mean/np.std over the window including the point."""
+    scores = []
+    for i, value in enumerate(values):
+        window = values[max(0, i + 1 - window_size):i + 1]
+        std = np.std(window)
+        if len(window) < min_samples:
+            scores.append(np.nan)
+        else:
+            scores.append(0.0 if std == 0 else abs(value - np.mean(window)) / std)
+    return np.array(scores)
+
+
+def _series(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100.0, 5.0, n)
+    values[[400, 1100, 1700]] += 60.0
+    return values
+
+
+def test_window_keeps_running_statistics_of_last_values():
+    window = MetricWindow(50)
+    values = _series()[:500]
+    for value in values:
+        window.push(value)
+    assert window.count == 50
+    np.testing.assert_allclose(window.values(), values[-50:])
+    assert abs(window.mean - values[-50:].mean()) < 1e-9
+    assert abs(window.std - values[-50:].std()) < 1e-9
+
+
+def test_single_and_batched_updates_match_full_window_scores():
+    values = _series()
+    expected = _reference_z_scores(values, 100, 20)
+
+    one_by_one = StreamingDetector("z_score", 100, 20)
+    scores = np.concatenate([one_by_one.update([value]) for value in values])
+    np.testing.assert_allclose(scores, expected, rtol=1e-9, atol=1e-9)
+
+    batched = StreamingDetector("z_score", 100, 20)
+    scores = np.concatenate([batched.update(values[i:i + 333]) for i in range(0, len(values), 333)])
+    np.testing.assert_allclose(scores, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_constant_values_score_zero():
+    scores = StreamingDetector("z_score", 10, 5).update(np.full(40, 7.5))
+    assert np.isnan(scores[:4]).all()
+    assert (scores[4:] == 0).all()
+
+
+def test_model_detectors_refit_periodically_and_flag_spikes():
+    values = _series()
+    for algorithm in ("isolation_forest", "dbscan"):
+        detector = StreamingDetector(algorithm, 200, 20, {"refit_interval": 100, "n_estimators": 25})
+        if not detector.uses_model:
+            continue
+        scores = detector.update(values)
+        assert np.isnan(scores[:19]).all() and not np.isnan(scores[19:]).any()
+        assert detector.fits == 1 + (len(values) - 20) // 100
+        assert (scores[[400, 1100, 1700]] > 3.0).all()
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_layer.src.processing_engine.chunked_processing import (
+    OnlineMoments, ReservoirSample, detect_datetime_columns
+)
+from src.data_layer.src.processing_engine.data_processing_engine import DataProcessingEngine
+
+
+def _historian_csv(path, n=2400, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h").astype(str),
+        "temp": rng.normal(50, 5, n),
+        "pressure": rng.normal(3, 0.2, n),
+        "flow": rng.integers(0, 20, n),
+        "state": rng.choice(["run", "idle", None], n),
+        "batch_id": [f"B{i % 40}" for i in range(n)],
+    })
+    df.loc[rng.choice(n, 60, replace=False), "temp"] = np.nan
+    df.to_csv(path, index=False)
+    return path
+
+
+def _process(tmp_path, csv_path, config, mode):
+    engine = DataProcessingEngine(base_dir=str(tmp_path / mode))
+    result = engine.process_dataset(str(csv_path), "historian", config=config, emit_events=False, mode=mode)
+    assert result["success"], result
+    return result
+
+
+def _compare(batch, streaming, index_col=None):
+    expected = pd.read_csv(batch["output_path"])
+    actual = pd.read_parquet(streaming["output_path"])
+    assert list(actual.columns) == list(expected.columns)
+    assert len(actual) == len(expected)
+    numeric = [col for col in expected.select_dtypes(include=["number"]).columns if col != index_col]
+    np.testing.assert_allclose(actual[numeric].to_numpy(dtype=float), expected[numeric].to_numpy(dtype=float),
+                               rtol=1e-9, atol=1e-9)
+    for col in expected.select_dtypes(include=["bool"]).columns:
+        assert actual[col].tolist() == expected[col].tolist()
+    assert streaming["statistics"]["row_count"] == batch["statistics"]["row_count"]
+    assert streaming["statistics"]["column_count"] == batch["statistics"]["column_count"]
+
+
+def test_streaming_timeseries_matches_batch(tmp_path):
+    csv_path = _historian_csv(tmp_path / "historian.csv")
+    config = {
+        "preprocessing": {"imputation_method": "mean", "scaling_method": "standard"},
+        "feature_selection": {"enable_auto_selection": False},
+        # Chunks smaller than the dataset, with lag/rolling state carried across them
+        "streaming": {"chunk_size": 500, "row_group_size": 400},
+    }
+    batch = _process(tmp_path, csv_path, config, "batch")
+    streaming = _process(tmp_path, csv_path, config, "streaming")
+
+    _compare(batch, streaming, index_col="timestamp")
+    assert streaming["statistics"]["chunk_count"] == 5
+    assert streaming["statistics"]["row_groups"] >= 6
+    assert streaming["statistics"]["time_range"] == batch["statistics"]["time_range"]
+    assert streaming["statistics"]["input_column_statistics"]["temp"]["missing"] == 60
+
+
+@pytest.mark.parametrize("preprocessing,selection", [
+    ({"imputation_method": "median", "scaling_method": "minmax"}, {"enable_auto_selection": False}),
+    ({"imputation_method": "constant", "scaling_method": "robust"},
+     {"enable_auto_selection": True, "method": "f_regression", "max_features": 6}),
+])
+def test_streaming_tabular_matches_batch(tmp_path, preprocessing, selection):
+    csv_path = tmp_path / "plates.csv"
+    pd.read_csv(_historian_csv(tmp_path / "historian.csv")).drop(columns=["timestamp"]).to_csv(csv_path, index=False)
+    config = {
+        "preprocessing": preprocessing,
+        "feature_selection": selection,
+        # A sample as large as the dataset makes medians, bins and robust scaling exact
+        "streaming": {"chunk_size": 700, "sample_size": 5000},
+    }
+    batch = _process(tmp_path, csv_path, config, "batch")
+    streaming = _process(tmp_path, csv_path, config, "streaming")
+    _compare(batch, streaming)
+
+
+def test_online_moments_and_reservoir_sample():
+    rng = np.random.default_rng(3)
+    data = pd.DataFrame(rng.normal(size=(1000, 3)) * [1, 10, 100], columns=["a", "b", "c"])
+    data.iloc[rng.choice(1000, 100, replace=False), 1] = np.nan
+    moments = OnlineMoments(["a", "b", "c"])
+    sample = ReservoirSample(["a", "c"], size=50, seed=1)
+    for start in range(0, 1000, 137):
+        moments.update(data.iloc[start:start + 137])
+        sample.update(data.iloc[start:start + 137])
+
+    np.testing.assert_allclose(moments.mean, data.mean().to_numpy())
+    np.testing.assert_allclose(moments.variance, data.var(ddof=0).to_numpy())
+    np.testing.assert_allclose(moments.min, data.min().to_numpy())
+    assert moments.missing.tolist() == [0, 100, 0]
+    assert len(sample) == 50 and sample.seen == 1000
+    assert set(map(tuple, sample.to_frame().to_numpy())) <= set(map(tuple, data[["a", "c"]].to_numpy()))
+
+
+def test_datetime_detection_samples_text_columns_only():
+    df = pd.DataFrame({
+        "ts": pd.date_range("2024-01-01", periods=500, freq="min").astype(str),
+        "reading": np.arange(500.0),
+        "label": ["ok"] * 499 + ["2024-01-01"],
+    })
+    assert detect_datetime_columns(df, sample_rows=20) == ["ts"]
+
+
+def test_sampled_datetime_column_that_fails_to_convert_stays_text():
+    engine = DataProcessingEngine()
+    df = pd.DataFrame({"when": ["2024-01-01", "not a date", "2024-01-03"], "label": ["a", "b", "c"]})
+    candidates = detect_datetime_columns(df, sample_rows=2)
+    assert candidates == ["when"]
+    assert engine._convert_datetime_columns(df, candidates) == []
+    assert df["when"].tolist() == ["2024-01-01", "not a date", "2024-01-03"]
+
+
+def test_failed_streaming_run_removes_its_staged_file(tmp_path, monkeypatch):
+    csv_path = _historian_csv(tmp_path / "historian.csv", n=600)
+    engine = DataProcessingEngine(base_dir=str(tmp_path / "streaming"))
+    calls = []
+
+    def fail_on_second_chunk(df, config, max_lag):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise RuntimeError("feature engineering failed")
+        return df
+
+    monkeypatch.setattr(engine, "_engineer_timeseries_features", fail_on_second_chunk)
+    result = engine.process_dataset(str(csv_path), "historian", config={"streaming": {"chunk_size": 200}},
+                                    emit_events=False, mode="streaming")
+
+    assert not result["success"]
+    assert len(calls) == 2
+    assert not list((tmp_path / "streaming").rglob("*_staged.parquet"))
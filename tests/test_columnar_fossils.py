@@ -0,0 +1,65 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+from src.scf.ingestion.columnar import fossil_lines, generate_ids, iter_frames
+from src.scf.ingestion.fossil_schema import Fossil
+from src.scf.ingestion.fossilizer import Fossilizer
+
+
+def test_bulk_lines_match_fossil_hash():
+    df = pd.DataFrame({"temp": [20.5, 21.0, np.nan], "unit": ["C", "C", None]})
+    meta = {"type": "raw_observation", "thermodynamics": {"entropy_rate": 1.5}}
+    lines = fossil_lines(df, "plant.csv", meta, time.time())
+
+    assert len(lines) == 3
+    for line in lines:
+        record = json.loads(line)
+        fossil = Fossil(**record)
+        assert fossil.compute_hash() == record["hash"]
+        assert record["meta"] == meta
+    assert json.loads(lines[2])["data"] == {"temp": None, "unit": None}
+
+
+def test_generated_ids_are_unique_uuid4():
+    ids = generate_ids(1000)
+    assert len(set(ids)) == 1000
+    assert all(i[14] == "4" and i[19] in "89ab" for i in ids)
+
+
+def test_csv_is_streamed_in_chunks(tmp_path):
+    path = tmp_path / "drop.csv"
+    pd.DataFrame({"x": range(25)}).to_csv(path, index=False)
+    assert [len(c) for c in iter_frames(path, chunk_rows=10)] == [10, 10, 5]
+
+
+def test_columnar_path_writes_one_batch_per_chunk(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    path = raw / "drop.csv"
+    pd.DataFrame({"x": np.arange(25, dtype=float)}).to_csv(path, index=False)
+
+    fossilizer = Fossilizer(str(raw), str(tmp_path / "vault"), caffeinate=False, chunk_rows=10)
+    batches = fossilizer._fossilize_file(path)
+
+    assert len(batches) == 3
+    values = []
+    for batch in batches:
+        with open(batch) as f:
+            values.extend(json.loads(line)["data"]["x"] for line in f)
+    assert sorted(values) == list(np.arange(25, dtype=float))
+
+
+def test_failed_chunk_removes_batches_already_written(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    path = raw / "drop.csv"
+    pd.DataFrame({"x": np.arange(25, dtype=float)}).to_csv(path, index=False)
+    with open(path, "a") as f:
+        f.write("1,2,3\n")
+
+    vault = tmp_path / "vault"
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False, chunk_rows=10)
+
+    assert fossilizer._fossilize_file(path) == []
+    assert not list(vault.glob("fossil_batch_*.ndjson"))
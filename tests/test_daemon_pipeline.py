@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.scf.daemon.pipeline import PipelineStage, StagedPipeline
+
+
+def test_sync_stage_runs_off_the_event_loop():
+    async def scenario():
+        pool = ThreadPoolExecutor(max_workers=1)
+        threads = []
+
+        def work(item):
+            threads.append(threading.get_ident())
+            time.sleep(0.05)
+            return item
+
+        stage = PipelineStage("ingest", work, pool)
+        stage.start()
+        stage.offer(1)
+        ticks = 0
+        while stage.metrics.processed == 0:
+            ticks += 1
+            await asyncio.sleep(0.005)
+        await stage.stop()
+        pool.shutdown()
+        return threads, ticks
+
+    threads, ticks = asyncio.run(scenario())
+    assert threads[0] != threading.get_ident()
+    assert ticks > 2  # loop kept spinning while work ran
+
+
+def test_offer_coalesces_when_stage_is_busy():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow(item):
+            await release.wait()
+
+        stage = PipelineStage("ingest", slow, maxsize=1)
+        stage.start()
+        accepted = [stage.offer(i) for i in range(5)]
+        await asyncio.sleep(0)
+        accepted += [stage.offer(i) for i in range(5)]
+        release.set()
+        await stage.join()
+        await stage.stop()
+        return accepted, stage.snapshot()
+
+    accepted, snap = asyncio.run(scenario())
+    assert accepted.count(True) == 2
+    assert snap["coalesced"] == 8
+    assert snap["processed"] == 2
+
+
+def test_backpressure_bounds_downstream_in_flight():
+    async def scenario():
+        running = 0
+        peak = 0
+        gate = asyncio.Event()
+
+        async def train(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await gate.wait()
+            running -= 1
+
+        train_stage = PipelineStage("train", train, maxsize=2)
+
+        async def forward(result):
+            await train_stage.put(result)
+
+        batch_stage = PipelineStage("batch", lambda item: item, on_result=forward, maxsize=100)
+        pipeline = StagedPipeline([batch_stage, train_stage])
+        pipeline.start()
+        for i in range(10):
+            await batch_stage.put(i)
+        await asyncio.sleep(0.1)
+        metrics = pipeline.metrics()
+        gate.set()
+        await pipeline.drain()
+        await pipeline.stop()
+        return peak, metrics, pipeline.metrics()
+
+    peak, during, after = asyncio.run(scenario())
+    assert peak == 1
+    assert during["train"]["queue_depth"] == 2
+    assert during["batch"]["queue_depth"] > 0
+    assert after["train"]["processed"] == 10
+    assert after["train"]["latency_p99_s"] >= after["train"]["latency_p50_s"]
@@ -0,0 +1,63 @@
+from src.protocol_layer.digital_twin.swarm_language.dsl_parser import (
+    DTSLLexer, DTSLParser, TokenType
+)
+
+SOURCE = """// Boiler line
+twin Boiler {
+    property label: string = "main \\"north\\"
+boiler";
+    sensor temp: thermocouple { unit: "C", rate: -2.5 }
+    /* states
+       follow */ state idle { transition running when temp > 40 && !(temp >= 90); }
+}
+rule guard { when temp > 95; then { alert("hot"); } }
+"""
+
+
+def _tokens(source):
+    tokens, errors = DTSLLexer(source).tokenize()
+    return [(t.type, t.value, t.line, t.column) for t in tokens], errors
+
+
+def test_lexer_positions_across_multiline_tokens():
+    tokens, errors = _tokens(SOURCE)
+    assert not errors
+    assert tokens[0] == (TokenType.KEYWORD, "twin", 2, 1)
+    assert (TokenType.STRING, '"main \\"north\\"\nboiler"', 3, 30) in tokens
+    assert (TokenType.PUNCTUATION, ";", 4, 8) in tokens
+    assert (TokenType.NUMBER, "-2.5", 5, 50) in tokens
+    assert (TokenType.KEYWORD, "state", 7, 18) in tokens
+    assert [t[1] for t in tokens if t[0] == TokenType.OPERATOR] == ["=", ">", "&&", "!", ">=", ">"]
+    assert tokens[-1] == (TokenType.EOF, "", 10, 1)
+
+
+def test_lexer_reports_unexpected_characters_and_continues():
+    tokens, errors = _tokens('a @@ b\n  # "open')
+    assert [(e.message, e.line, e.column) for e in errors] == [
+        ("Unexpected character: '@'", 1, 3),
+        ("Unexpected character: '@'", 1, 4),
+        ("Unexpected character: '#'", 2, 3),
+        ("Unexpected character: '\"'", 2, 5),
+    ]
+    assert [(t[1], t[2], t[3]) for t in tokens] == [("a", 1, 1), ("b", 1, 6), ("open", 2, 6), ("", 2, 10)]
+
+
+def test_line_comments_end_at_end_of_line():
+    tokens, errors = _tokens("x // note\ny")
+    assert not errors
+    assert [t[1] for t in tokens] == ["x", "y", ""]
+
+
+def test_parser_caches_results_by_source():
+    parser = DTSLParser(cache_size=1)
+    ast, errors = parser.parse(SOURCE)
+    assert not errors
+    assert [d["type"] for d in ast["declarations"]] == ["twin_declaration", "rule_declaration"]
+
+    again, _ = parser.parse(SOURCE)
+    assert again is ast
+    assert (parser.cache_hits, parser.cache_misses) == (1, 1)
+
+    parser.parse("event Tick;")
+    assert parser.parse(SOURCE)[0] is not ast  # evicted by the newer source
+    assert parser.cache_misses == 3
@@ -0,0 +1,93 @@
+import json
+import torch
+from src.scf.batcher.fossil_batcher import FossilBatcher
+
+
+def _append(path, start, n, partial=False):
+    with open(path, "a") as f:
+        for i in range(start, start + n):
+            f.write(json.dumps({"id": f"f{i}", "hash": f"h{i}", "entropy_gradient": float(i),
+                                "energy_signature": [float(i)] * 4}) + "\n")
+        if partial:
+            f.write('{"id": "torn", "hash": "ht", "energy_signature": [0, 0, 0, 0]')
+
+
+def _batcher(tmp_path, **kwargs):
+    return FossilBatcher(fossils_dir=str(tmp_path / "vault"), batch_dir=str(tmp_path / "batches"),
+                         batch_size=4, **kwargs)
+
+
+def test_ingest_only_reads_new_data(tmp_path):
+    batcher = _batcher(tmp_path)
+    vault_file = tmp_path / "vault" / "fossil_batch_a.ndjson"
+    _append(vault_file, 0, 10, partial=True)
+
+    assert batcher.ingest_stream() == 10
+    assert len(batcher.pending) == 2
+    assert batcher.ingest_stream() == 0
+
+    # Complete the torn line and append more; a fresh instance resumes from the cursor
+    with open(vault_file, "a") as f:
+        f.write("}\n")
+    _append(vault_file, 10, 3)
+    resumed = _batcher(tmp_path)
+    assert len(resumed.pending) == 2
+    assert resumed.ingest_stream() == 4
+    assert len(resumed.pending) == 2
+
+
+def test_duplicates_are_not_rebatched(tmp_path):
+    batcher = _batcher(tmp_path)
+    _append(tmp_path / "vault" / "fossil_batch_a.ndjson", 0, 8)
+    _append(tmp_path / "vault" / "fossil_batch_copy.ndjson", 0, 8)
+
+    assert batcher.build_batches() == 2
+    assert _batcher(tmp_path).build_batches() == 0
+
+
+def test_batches_are_tensor_files_popped_in_order(tmp_path):
+    batcher = _batcher(tmp_path)
+    _append(tmp_path / "vault" / "fossil_batch_a.ndjson", 0, 8)
+    batcher.build_batches()
+
+    files = list((tmp_path / "batches").glob("*.pt"))
+    assert len(files) == 2
+    first = batcher.build_batch()
+    assert "samples" not in first
+    assert first["num_samples"] == 4
+    assert first["fossil_ids"] == ["f0", "f1", "f2", "f3"]
+    assert torch.equal(first["tnn_ready_tensor"], torch.tensor([[0.0], [1.0], [2.0], [3.0]]))
+    assert batcher.build_batch()["fossil_ids"][0] == "f4"
+    assert batcher.build_batch() is None
+    assert not batcher.ready_for_training()
+
+
+def test_negentropy_priority_pops_highest_score_first(tmp_path):
+    batcher = _batcher(tmp_path, priority="negentropy")
+    _append(tmp_path / "vault" / "fossil_batch_a.ndjson", 0, 12)
+    batcher.build_batches()
+    assert batcher.build_batch()["fossil_ids"][0] == "f8"
+
+
+def test_target_count_bounds_a_tick(tmp_path):
+    batcher = _batcher(tmp_path)
+    _append(tmp_path / "vault" / "fossil_batch_a.ndjson", 0, 20)
+    assert batcher.ingest_stream(batch_target_count=2) == 8
+    assert batcher.ingest_stream(batch_target_count=2) == 8
+    assert batcher.ingest_stream(batch_target_count=2) == 4
+    assert len(batcher._ready) == 5
+
+
+def test_unarchived_batch_is_requeued_until_archived(tmp_path):
+    batcher = _batcher(tmp_path)
+    _append(tmp_path / "vault" / "fossil_batch_a.ndjson", 0, 4)
+    batcher.build_batches()
+
+    batch = batcher.build_batch(archive=False)
+    assert not list((tmp_path / "batches").glob("consumed/*.pt"))
+    # Training never finished: a restarted batcher offers the same batch again
+    assert _batcher(tmp_path).build_batch(archive=False)["batch_id"] == batch["batch_id"]
+
+    assert batcher.archive_batch(batch)
+    assert len(list((tmp_path / "batches").glob("consumed/*.pt"))) == 1
+    assert not _batcher(tmp_path).ready_for_training()
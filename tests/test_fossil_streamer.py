@@ -0,0 +1,77 @@
+import json
+import math
+import torch
+from torch.utils.data import DataLoader
+from src.scf.dataloading.fossil_streamer import FossilStreamer, _thermo_arrays
+
+
+def _make_vault(vault, n_files=4, per_file=10):
+    for f in range(n_files):
+        with open(vault / f"fossil_batch_{f}.ndjson", "w") as out:
+            for i in range(per_file):
+                k = f * per_file + i
+                thermo = {"temperature_c": k - 40.0, "power_w": 100.0 * k, "entropy_rate": k / 8.0}
+                if k % 7 == 0:
+                    thermo["power_w"] = None
+                out.write(json.dumps({"id": str(k), "timestamp": 600.0 * k,
+                                      "meta": {"thermodynamics": thermo}}) + "\n")
+
+
+def _rows(batches):
+    return sorted(tuple(r) for x, _ in batches for r in x.tolist())
+
+
+def test_batched_tokens_match_per_fossil_features(tmp_path):
+    _make_vault(tmp_path, n_files=2)
+    streamer = FossilStreamer(str(tmp_path), batch_size=8)
+    expected = []
+    for path in streamer.files:
+        with open(path) as f:
+            for line in f:
+                fossil = json.loads(line)
+                if fossil["meta"]["thermodynamics"]["power_w"] is None:
+                    fossil["meta"]["thermodynamics"]["power_w"] = 0.0
+                expected.append(tuple(streamer._extract_features(fossil).tolist()))
+
+    batches = list(streamer)
+    assert [len(x) for x, _ in batches] == [8, 8, 4]
+    assert _rows(batches) == sorted(expected)
+
+
+def test_workers_do_not_duplicate_samples(tmp_path):
+    _make_vault(tmp_path)
+    single = _rows(FossilStreamer(str(tmp_path), batch_size=5))
+    loader = DataLoader(FossilStreamer(str(tmp_path), batch_size=5), batch_size=None, num_workers=2)
+    assert _rows(loader) == single
+    assert len(single) == 40
+
+
+def test_rank_sharding_partitions_files(tmp_path, monkeypatch):
+    _make_vault(tmp_path)
+    seen = []
+    for rank in range(2):
+        monkeypatch.setenv("RANK", str(rank))
+        monkeypatch.setenv("WORLD_SIZE", "2")
+        seen.extend(_rows(FossilStreamer(str(tmp_path), batch_size=5)))
+    monkeypatch.delenv("RANK")
+    monkeypatch.delenv("WORLD_SIZE")
+    assert sorted(seen) == _rows(FossilStreamer(str(tmp_path), batch_size=5))
+
+
+def test_shuffle_buffer_permutes_without_loss(tmp_path):
+    _make_vault(tmp_path)
+    plain = [r for x, _ in FossilStreamer(str(tmp_path), batch_size=5) for r in x.tolist()]
+    streamer = FossilStreamer(str(tmp_path), batch_size=5, shuffle_buffer=16, seed=3)
+    shuffled = [r for x, _ in streamer for r in x.tolist()]
+    assert sorted(map(tuple, shuffled)) == sorted(map(tuple, plain))
+    assert shuffled != plain
+    streamer.set_epoch(1)
+    assert [r for x, _ in streamer for r in x.tolist()] != shuffled
+
+
+def test_malformed_meta_only_defaults_that_fossil():
+    fossils = [{"timestamp": 1.0, "meta": "corrupt"},
+               {"timestamp": 2.0, "meta": {"thermodynamics": {"temperature_c": 30.0}}}]
+    temp, power, entropy, timestamp = _thermo_arrays(fossils)
+    assert temp[1] == 30.0 and timestamp[1] == 2.0
+    assert math.isnan(temp[0])
@@ -0,0 +1,111 @@
+import json
+import os
+import numpy as np
+import torch
+from src.scf.ingestion.fossil_vault import convert_vault, open_columns, columns_path, list_batches
+from src.scf.dataloading.fossil_streamer import FossilStreamer
+from src.scf.ingestion.atlas_builder import AtlasBuilder
+
+
+def _write_batch(path, n, offset=0):
+    with open(path, "w") as f:
+        for i in range(n):
+            thermo = {"temperature_c": 10.0 * i - 60, "power_w": 400.0 * i, "entropy_rate": 0.7 * i}
+            if i % 3 == 0:
+                thermo = {}
+            f.write(json.dumps({"id": f"f-{offset + i}", "source": "plant", "timestamp": 3600.0 * i,
+                                "data": {}, "meta": {"thermodynamics": thermo}}) + "\n")
+
+
+def _stream(vault):
+    return torch.cat([x for x, _ in FossilStreamer(str(vault), batch_size=4)])
+
+
+def test_columnar_stream_matches_ndjson(tmp_path):
+    _write_batch(tmp_path / "fossil_batch_a.ndjson", 7)
+    _write_batch(tmp_path / "fossil_batch_b.ndjson", 6, offset=100)
+    (tmp_path / ".fossil_manifest.jsonl").write_text("{}\n")
+    expected = _stream(tmp_path)
+
+    assert convert_vault(str(tmp_path)) == 2
+    assert open_columns(tmp_path / "fossil_batch_a.ndjson") is not None
+    assert torch.equal(_stream(tmp_path), expected)
+    assert expected.shape == (13, 4)
+
+
+def test_stale_sidecar_falls_back_to_ndjson(tmp_path):
+    batch = tmp_path / "fossil_batch_a.ndjson"
+    _write_batch(batch, 3)
+    convert_vault(str(tmp_path))
+    sidecar_mtime = columns_path(batch).stat().st_mtime
+    os.utime(batch, (sidecar_mtime + 10, sidecar_mtime + 10))
+
+    assert open_columns(batch) is None
+    assert convert_vault(str(tmp_path)) == 1
+
+
+def test_atlas_indexes_columnar_batches(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    _write_batch(vault / "fossil_batch_a.ndjson", 5)
+    convert_vault(str(vault))
+
+    builder = AtlasBuilder(str(vault), db_path=str(tmp_path / "atlas.db"))
+    builder.build_index()
+    rows = builder.query(limit=10)
+
+    assert {r["fossil_id"] for r in rows} == {f"f-{i}" for i in range(5)}
+    assert [b.name for b in list_batches(str(vault))] == ["fossil_batch_a.ndjson"]
+
+
+def test_atlas_rebuild_is_incremental(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    _write_batch(vault / "fossil_batch_a.ndjson", 4)
+    _write_batch(vault / "fossil_batch_b.ndjson", 4, offset=100)
+    builder = AtlasBuilder(str(vault), db_path=str(tmp_path / "atlas.db"))
+
+    stats = builder.build_index(workers=2)
+    assert stats["files_indexed"] == 2
+    assert stats["fossils"] == 8
+
+    stats = builder.build_index(workers=0)
+    assert stats["files_indexed"] == 0
+    assert stats["files_skipped"] == 2
+
+    # Rewritten batch replaces its old rows
+    (vault / "fossil_batch_b.ndjson").unlink()
+    _write_batch(vault / "fossil_batch_b.ndjson", 2, offset=200)
+    os.utime(vault / "fossil_batch_b.ndjson", (1, 1))
+    stats = builder.build_index(workers=0)
+    assert stats["files_indexed"] == 1
+    ids = {r["fossil_id"] for r in builder.query(limit=100)}
+    assert ids == {"f-0", "f-1", "f-2", "f-3", "f-200", "f-201"}
+
+
+def test_atlas_source_time_query(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    _write_batch(vault / "fossil_batch_a.ndjson", 6)
+    builder = AtlasBuilder(str(vault), db_path=str(tmp_path / "atlas.db"))
+    builder.build_index(workers=0)
+
+    rows = builder.query(source="plant", start_time=3600.0, end_time=3 * 3600.0, limit=100)
+    assert {r["fossil_id"] for r in rows} == {"f-1", "f-2", "f-3"}
+    assert builder.query(source="other") == []
+
+
+def test_atlas_drops_rows_of_deleted_batches(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    for k in range(3):
+        _write_batch(vault / f"fossil_batch_{k}.ndjson", 3, offset=100 * k)
+    builder = AtlasBuilder(str(vault), db_path=str(tmp_path / "atlas.db"))
+    assert builder.build_index(workers=2)["fossils"] == 9
+
+    (vault / "fossil_batch_1.ndjson").unlink()
+    stats = builder.build_index(workers=2)
+    assert stats["files_removed"] == 1
+    assert stats["files_skipped"] == 2
+    ids = {r["fossil_id"] for r in builder.query(limit=100)}
+    assert ids == {"f-0", "f-1", "f-2", "f-200", "f-201", "f-202"}
@@ -0,0 +1,124 @@
+import os
+import pandas as pd
+from src.scf.ingestion.fossilizer import Fossilizer
+from src.scf.ingestion.ingest_manifest import IngestManifest, IngestStats
+
+
+def _write_csv(path, n, offset=0.0):
+    pd.DataFrame({"temp": [offset + i for i in range(n)], "power": [2.0 * i for i in range(n)]}).to_csv(path, index=False)
+
+
+def test_parallel_ingest_is_resumable(tmp_path):
+    raw = tmp_path / "raw"
+    vault = tmp_path / "vault"
+    raw.mkdir()
+    for i in range(4):
+        _write_csv(raw / f"sensor_{i}.csv", 5 + i)
+
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False)
+    stats = fossilizer.process_parallel(max_workers=2)
+
+    assert stats.files_processed == 4
+    assert stats.fossils_written == 5 + 6 + 7 + 8
+    assert len(list(vault.glob("fossil_batch_*.ndjson"))) == 4
+    assert not list(vault.glob(".*.tmp"))
+
+    # Second run: nothing changed, nothing re-fossilized
+    stats = fossilizer.process_parallel(max_workers=2)
+    assert stats.files_processed == 0
+    assert stats.files_skipped == 4
+    assert len(list(vault.glob("fossil_batch_*.ndjson"))) == 4
+
+
+def test_changed_file_replaces_its_batch(tmp_path):
+    raw = tmp_path / "raw"
+    vault = tmp_path / "vault"
+    raw.mkdir()
+    target = raw / "line.csv"
+    _write_csv(target, 3)
+
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False)
+    fossilizer.process_parallel(max_workers=1)
+    old_batches = set(IngestManifest(str(vault / ".fossil_manifest.jsonl")).lookup(target).batches)
+
+    _write_csv(target, 10, offset=100.0)
+    stats = fossilizer.process_parallel(max_workers=1)
+
+    assert stats.files_processed == 1
+    entry = IngestManifest(str(vault / ".fossil_manifest.jsonl")).lookup(target)
+    assert entry.fossils == 10
+    assert not old_batches & set(entry.batches)
+    assert {p.name for p in vault.glob("fossil_batch_*.ndjson")} == set(entry.batches)
+
+
+def test_touched_file_with_same_content_is_skipped(tmp_path):
+    raw = tmp_path / "raw"
+    vault = tmp_path / "vault"
+    raw.mkdir()
+    target = raw / "line.csv"
+    _write_csv(target, 3)
+
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False)
+    fossilizer.process_parallel(max_workers=1)
+    st = target.stat()
+    os.utime(target, (st.st_atime, st.st_mtime + 60))
+
+    stats = fossilizer.process_parallel(max_workers=1)
+    assert stats.files_skipped == 1
+    assert stats.files_processed == 0
+
+
+def test_failed_file_is_recorded_and_retried(tmp_path):
+    raw = tmp_path / "raw"
+    vault = tmp_path / "vault"
+    raw.mkdir()
+    target = raw / "notes.bin"
+    target.write_bytes(b"\x00\x01")
+
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False)
+    stats = fossilizer.process_parallel(max_workers=1)
+    assert stats.files_failed == 1
+    entry = IngestManifest(str(vault / ".fossil_manifest.jsonl")).lookup(target)
+    assert entry.status == "error" and entry.error
+
+    # A failure may be transient, so the unchanged file is retried
+    stats = fossilizer.process_parallel(max_workers=1)
+    assert stats.files_failed == 1
+    assert stats.files_skipped == 0
+
+
+def test_file_that_failed_is_ingested_once_it_can_be_read(tmp_path):
+    raw = tmp_path / "raw"
+    vault = tmp_path / "vault"
+    raw.mkdir()
+    target = raw / "line.csv"
+    _write_csv(target, 3)
+
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False)
+    manifest = IngestManifest(str(vault / ".fossil_manifest.jsonl"))
+    st = target.stat()
+    fossilizer._record_failure(manifest, IngestStats(), target, st.st_size, st.st_mtime, "", "flaky read")
+    manifest.close()
+
+    stats = fossilizer.process_parallel(max_workers=1)
+    assert stats.files_processed == 1
+    assert IngestManifest(str(vault / ".fossil_manifest.jsonl")).lookup(target).status == "ok"
+
+
+
+def test_batches_of_an_unrecorded_run_are_overwritten(tmp_path):
+    raw = tmp_path / "raw"
+    vault = tmp_path / "vault"
+    raw.mkdir()
+    target = raw / "line.csv"
+    _write_csv(target, 25)
+
+    # A killed run: the batches were written but the manifest never recorded them
+    fossilizer = Fossilizer(str(raw), str(vault), caffeinate=False, chunk_rows=10)
+    orphaned = {p.name for p in fossilizer._fossilize_file(target)}
+
+    stats = fossilizer.process_parallel(max_workers=1)
+    assert stats.fossils_written == 25
+    entry = IngestManifest(str(vault / ".fossil_manifest.jsonl")).lookup(target)
+    assert set(entry.batches) == orphaned
+    assert {p.name for p in vault.glob("fossil_batch_*.ndjson")} == orphaned
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import numpy as np
+from scipy.integrate import odeint
+
+from src.capsule_layer.services.microadapt_edge.incremental_engine import DriftDetector, HierarchicalWindowEngine, RingWindow, UnitPredictionCache
+
+
+def _reference_windows(stream, base, levels):
+    """Windows rebuilt from the whole stream, smoothed by an explicit centered mean."""
+    windows = {}
+    for h in range(1, levels + 1):
+        length = base * 2 ** (h - 1)
+        if len(stream) < length:
+            windows[h] = np.array(stream)
+            continue
+        data = np.array(stream[-length:])
+        if h > 1 and length >= 2 * h:
+            data = np.array([data[max(0, i - h):min(length, i + h + 1)].mean(axis=0) for i in range(length)])
+        windows[h] = data
+    return windows
+
+
+def _unit(seed, features=3, latent=2):
+    rng = np.random.default_rng(seed)
+    A = rng.normal(size=(latent, latent))
+    return SimpleNamespace(parameters={
+        "p": rng.normal(size=latent) * 0.1,
+        "Q": -np.eye(latent) * 0.2 + (A - A.T) * 0.1,
+        "u": rng.normal(size=features),
+        "V": rng.normal(size=(features, latent)),
+        "s_star": rng.normal(size=latent),
+    })
+
+
+def _odeint_predictions(unit, t):
+    params = unit.parameters
+    states = odeint(lambda s, _, p, Q: p + Q @ s, params["s_star"], t, args=(params["p"], params["Q"]))
+    return params["u"] + states @ params["V"].T
+
+
+def test_ring_window_views_are_contiguous_and_ordered():
+    ring = RingWindow(4, 1)
+    evicted = [ring.push(np.array([float(i)])) for i in range(7)]
+
+    assert evicted[:4] == [None] * 4 and [e[0] for e in evicted[4:]] == [0.0, 1.0, 2.0]
+    assert ring.view()[:, 0].tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert ring.view(2)[:, 0].tolist() == [5.0, 6.0]
+    assert ring.view().base is not None
+
+
+def test_hierarchical_windows_match_rebuilt_windows():
+    rng = np.random.default_rng(3)
+    engine = HierarchicalWindowEngine(8, 3)
+    stream = []
+    for t in range(120):
+        x = rng.normal(size=2) + np.sin(t / 5)
+        engine.push(x)
+        stream.append(x)
+        for level, window in _reference_windows(stream, 8, 3).items():
+            np.testing.assert_allclose(engine.window(level), window, atol=1e-12)
+
+        current = np.array(stream[-8:])
+        np.testing.assert_allclose(engine.current_mean(), current.mean(axis=0), atol=1e-12)
+        np.testing.assert_allclose(engine.current_sst(), np.sum((current - current.mean(axis=0)) ** 2), atol=1e-9)
+
+
+def test_unit_predictions_match_numerical_integration():
+    units = {f"u{i}": _unit(i) for i in range(4)}
+    cache = UnitPredictionCache()
+    t = np.arange(50, dtype=float)
+
+    stacked = cache.stack(units, 50)
+    for i, unit in enumerate(units.values()):
+        np.testing.assert_allclose(stacked[i], _odeint_predictions(unit, t), rtol=1e-6, atol=1e-6)
+
+    # Shorter windows are prefixes of the cached trajectories
+    np.testing.assert_allclose(cache.stack(units, 20), stacked[:, :20])
+
+    X = np.random.default_rng(0).normal(size=(50, 3))
+    expected = [np.sum((X - stacked[i]) ** 2) for i in range(4)]
+    np.testing.assert_allclose(cache.squared_errors(units, X), expected)
+
+    flat = stacked.reshape(4, -1)
+    np.testing.assert_allclose(cache.distances(units, 50)[1, 3], np.linalg.norm(flat[1] - flat[3]))
+
+    forecast = cache.forecast(units["u2"], 49, 10)
+    np.testing.assert_allclose(forecast, _odeint_predictions(units["u2"], np.arange(59, dtype=float))[49:],
+                               rtol=1e-6, atol=1e-6)
+
+
+def test_replaced_parameters_invalidate_cached_predictions():
+    units = {"u0": _unit(0), "u1": _unit(1)}
+    cache = UnitPredictionCache()
+    before = cache.stack(units, 10).copy()
+
+    units["u1"] = _unit(2)
+    after = cache.stack(units, 10)
+    np.testing.assert_allclose(after[0], before[0])
+    np.testing.assert_allclose(after[1], _odeint_predictions(units["u1"], np.arange(10.0)), rtol=1e-6, atol=1e-6)
+
+    del units["u0"]
+    cache.retain(units)
+    assert cache.stack(units, 10).shape == (1, 10, 3)
+
+
+def test_drift_detector_signals_an_upward_shift_only():
+    detector = DriftDetector(delta=0.01, threshold=0.5)
+    rng = np.random.default_rng(1)
+
+    assert not any(detector.update(0.1 + 0.02 * rng.normal()) for _ in range(500))
+    assert not any(detector.update(0.05 + 0.02 * rng.normal()) for _ in range(100))
+    assert any(detector.update(0.6 + 0.02 * rng.normal()) for _ in range(20))
+
+    detector.reset()
+    assert detector.count == 0 and not detector.update(0.6)
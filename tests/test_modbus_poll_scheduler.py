@@ -0,0 +1,161 @@
+import asyncio
+
+from src.protocol_layer.industrial.adapters.modbus.poll_scheduler import (
+    DevicePollScheduler, PollRequest, ReadBlock, plan_reads, value_changed
+)
+
+
+class FakeDevice:
+    """Holding registers and coils whose reads are recorded and take `latency` seconds."""
+
+    def __init__(self, latency=0.0):
+        self.registers = list(range(1000))
+        self.coils = [False] * 3000
+        self.latency = latency
+        self.reads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def read(self, register_type, address, count):
+        self.reads.append((register_type, address, count))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        if address + count > 1000 and register_type != "coil":
+            return {"error": "Illegal data address"}
+        source = self.coils if register_type == "coil" else self.registers
+        return {"values": source[address:address + count]}
+
+
+def _request(task_id, address, count, register_type="holding", interval=0.1, deadband=0.0):
+    return PollRequest(task_id=task_id, register_type=register_type, address=address, count=count,
+                       interval=interval, deadband=deadband)
+
+
+def test_plan_reads_merges_ranges_within_modbus_limits():
+    requests = [
+        _request("a", 0, 10), _request("b", 5, 10), _request("c", 15, 5),  # overlapping, then adjacent
+        _request("d", 40, 2),  # separated by a gap
+        _request("e", 100, 200),  # longer than one read allows
+        _request("f", 0, 2500, register_type="coil"),
+    ]
+    assert plan_reads(requests) == [
+        ReadBlock("coil", 0, 2000), ReadBlock("coil", 2000, 500),
+        ReadBlock("holding", 0, 20), ReadBlock("holding", 40, 2),
+        ReadBlock("holding", 100, 125), ReadBlock("holding", 225, 75),
+    ]
+
+
+def test_value_changed_applies_deadband():
+    assert not value_changed(10.0, 10.4, 0.5)
+    assert value_changed(10.0, 10.6, 0.5)
+    assert value_changed([1, 2], [1, 3], 0.0)
+    assert not value_changed([True, 5], [True, 5], 0.0)
+    assert value_changed(True, False, 10.0)
+    assert value_changed(float("nan"), 1.0, 0.0)
+
+
+def test_due_requests_share_reads_and_publish_on_change():
+    async def scenario():
+        device = FakeDevice()
+        published = []
+
+        async def publish(request, values, value, timestamp):
+            published.append((request.task_id, values))
+
+        scheduler = DevicePollScheduler("plc1", device.read, publish)
+        due = [_request("a", 0, 10), _request("b", 5, 10), _request("c", 110, 30, deadband=None),
+               _request("d", 990, 20)]
+        for request in due:
+            scheduler.add(request)
+
+        await scheduler._poll(due)
+        # "a" and "b" share one read; "d" fails past the last register
+        assert device.reads == [("holding", 0, 15), ("holding", 110, 30), ("holding", 990, 20)]
+        assert published == [("a", list(range(10))), ("b", list(range(5, 15))), ("c", list(range(110, 140)))]
+
+        device.reads.clear()
+        published.clear()
+        device.registers[2] = -1
+        await scheduler._poll(due)
+        # "b" is unchanged; "c" has no deadband and publishes every poll
+        assert len(device.reads) == 3
+        assert [task_id for task_id, _ in published] == ["a", "c"]
+        assert published[0][1][2] == -1
+        stats = scheduler.stats()
+        assert (stats["published"], stats["suppressed"], stats["read_errors"]) == (5, 1, 2)
+
+    asyncio.run(scenario())
+
+
+def test_polls_keep_a_fixed_rate_and_bound_reads_in_flight():
+    async def scenario():
+        device = FakeDevice(latency=0.04)
+        published = []
+
+        async def publish(request, values, value, timestamp):
+            published.append(request.task_id)
+
+        scheduler = DevicePollScheduler("plc1", device.read, publish, max_in_flight=2)
+        # Three ranges too far apart to merge, polled every 0.1 s and read in 0.04 s each
+        for task_id, address in (("a", 0), ("b", 500), ("c", 800)):
+            scheduler.add(_request(task_id, address, 4, deadband=None))
+        scheduler.start()
+        await asyncio.sleep(1.05)
+        await scheduler.stop()
+
+        # Sleeping the interval after each poll would manage about 1.05 / 0.14 = 7 polls
+        assert published.count("a") >= 10
+        assert device.max_in_flight == 2
+        stats = scheduler.stats()
+        assert stats["overruns"] == 0
+        assert stats["jitter"]["max_ms"] < 50
+
+    asyncio.run(scenario())
+
+
+def test_failing_publish_is_logged_and_polling_continues():
+    async def scenario():
+        device = FakeDevice()
+        published = []
+
+        async def publish(request, values, value, timestamp):
+            if request.task_id == "bad":
+                raise RuntimeError("broker down")
+            published.append(request.task_id)
+
+        def decode(request, values):
+            if request.task_id == "undecodable":
+                raise ValueError("bad payload")
+            return values
+
+        scheduler = DevicePollScheduler("plc1", device.read, publish, decode=decode)
+        for task_id, address in (("bad", 0), ("undecodable", 100), ("good", 200)):
+            scheduler.add(_request(task_id, address, 4, interval=0.05, deadband=None))
+        scheduler.start()
+        await asyncio.sleep(0.22)
+        assert not scheduler._task.done()
+        await scheduler.stop()
+
+        assert published.count("good") >= 3
+        stats = scheduler.stats()
+        assert stats["publish_errors"] == 2 * published.count("good")
+        assert stats["published"] == published.count("good")
+
+    asyncio.run(scenario())
+
+
+def test_stop_swallows_the_error_of_a_dead_loop():
+    async def scenario():
+        scheduler = DevicePollScheduler("plc1", FakeDevice().read, None)
+
+        async def crash():
+            raise RuntimeError("loop died")
+
+        scheduler._task = asyncio.create_task(crash())
+        await asyncio.sleep(0)
+        await scheduler.stop()
+        assert scheduler._task is None
+
+    asyncio.run(scenario())
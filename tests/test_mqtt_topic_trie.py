@@ -0,0 +1,80 @@
+import random
+
+from src.protocol_layer.industrial.adapters.mqtt.topic_trie import TopicTrie
+
+
+def _reference_matches(topic_filter, topic):
+    """MQTT filter matching, level by level."""
+    filter_levels = topic_filter.split('/')
+    topic_levels = topic.split('/')
+    for i, level in enumerate(filter_levels):
+        if level == '#':
+            return True
+        if i >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[i]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+def test_match_handles_wildcards():
+    trie = TopicTrie()
+    filters = {
+        "exact": "plant/line1/temp",
+        "single": "plant/+/temp",
+        "multi": "plant/#",
+        "all": "#",
+        "parent": "plant/line1/#",
+        "single_then_multi": "plant/+/#",
+        "other": "site/line1/temp",
+    }
+    for key, topic_filter in filters.items():
+        trie.add(topic_filter, key)
+
+    assert trie.match("plant/line1/temp") == ["exact", "single", "multi", "all", "parent", "single_then_multi"]
+    assert trie.match("plant/line2/temp") == ["single", "multi", "all", "single_then_multi"]
+    assert trie.match("plant/line1") == ["multi", "all", "parent", "single_then_multi"]
+    assert trie.match("plant") == ["multi", "all"]
+    assert trie.match("plant//temp") == ["single", "multi", "all", "single_then_multi"]
+    assert trie.match("site/line2/temp") == ["all"]
+
+
+def test_remove_and_replace_invalidate_cached_matches():
+    trie = TopicTrie()
+    trie.add("a/+/c", 1)
+    trie.add("a/b/c", 2)
+    assert trie.match("a/b/c") == [1, 2]
+
+    assert trie.remove(2)
+    assert not trie.remove(2)
+    assert trie.match("a/b/c") == [1]
+
+    trie.add("x/#", 1)  # replaces the key's filter
+    assert trie.match("a/b/c") == []
+    assert trie.match("x/y") == [1]
+    assert len(trie) == 1 and trie.filter_of(1) == "x/#"
+
+    trie.remove(1)
+    assert len(trie) == 0 and not trie._root.children
+
+
+def test_match_agrees_with_reference_on_random_filters():
+    rng = random.Random(7)
+    levels = ["a", "b", "c", ""]
+
+    def random_filter():
+        parts = [rng.choice(levels + ["+"]) for _ in range(rng.randint(1, 4))]
+        if rng.random() < 0.3:
+            parts.append("#")
+        return "/".join(parts)
+
+    filters = [random_filter() for _ in range(300)]
+    trie = TopicTrie(max_cached_topics=16)
+    for key, topic_filter in enumerate(filters):
+        trie.add(topic_filter, key)
+
+    for _ in range(500):
+        topic = "/".join(rng.choice(levels) for _ in range(rng.randint(1, 5)))
+        expected = [key for key, topic_filter in enumerate(filters) if _reference_matches(topic_filter, topic)]
+        assert trie.match(topic) == expected
+        assert trie.match(topic) == expected
@@ -0,0 +1,240 @@
+import random
+from datetime import datetime, timedelta
+
+from src.overseer_system.intelligence_market import auction_mechanisms, order_book
+from src.overseer_system.intelligence_market.auction_mechanisms import ContinuousDoubleAuction
+from src.overseer_system.intelligence_market.market_models import (
+    AuctionConfig, Bid, BidStatus, BidType, MarketRole, PriceSpecification, ResourceSpecification, ResourceType
+)
+from src.overseer_system.intelligence_market.order_book import BUY, SELL, OrderBook
+
+
+def test_incoming_order_fills_best_price_first_then_rests():
+    book = OrderBook()
+    book.submit("s1", SELL, 10.0, 5, now=0)
+    book.submit("s2", SELL, 9.0, 3, now=0)
+    book.submit("s3", SELL, 12.0, 4, now=0)
+
+    fills, resting = book.submit("b1", BUY, 11.0, 10, now=0)
+
+    assert [(f.resting.order_id, f.quantity, f.price) for f in fills] == [("s2", 3, 9.0), ("s1", 5, 10.0)]
+    assert resting.order_id == "b1" and resting.remaining == 2 and resting.filled == 8
+    assert "s1" not in book and "s2" not in book
+    assert book.best_bid(now=0).order_id == "b1"
+    assert book.best_ask(now=0).order_id == "s3"
+
+
+def test_same_price_orders_fill_in_arrival_order_with_partial_fills():
+    book = OrderBook()
+    for i in range(3):
+        book.submit(f"b{i}", BUY, 5.0, 4, now=0)
+
+    fills, resting = book.submit("s", SELL, 5.0, 6, now=0)
+
+    assert [(f.resting.order_id, f.quantity) for f in fills] == [("b0", 4), ("b1", 2)]
+    assert resting is None
+    # The partially filled order keeps its place at the front of the level
+    assert book.get("b1").remaining == 2
+    assert book.best_bid(now=0).order_id == "b1"
+    assert len(book) == 2
+
+
+def test_cancel_and_expiry_remove_orders_lazily():
+    discarded = []
+    book = OrderBook(on_discard=lambda order, reason: discarded.append((order.order_id, reason)))
+    book.submit("a", SELL, 10.0, 1, now=0)
+    book.submit("b", SELL, 11.0, 1, expires_at=50, now=0)
+    book.submit("c", SELL, 12.0, 1, now=0)
+
+    assert book.cancel("a").order_id == "a"
+    assert book.cancel("a") is None
+
+    fills, _ = book.submit("buy", BUY, 20.0, 1, now=100)
+    assert [f.resting.order_id for f in fills] == ["c"]
+    assert discarded == [("b", "expired")]
+    assert len(book) == 0
+
+
+def test_orders_that_are_no_longer_live_are_skipped():
+    cancelled = {"s1"}
+    book = OrderBook(is_live=lambda payload: payload not in cancelled)
+    book.submit("s1", SELL, 1.0, 1, payload="s1", now=0)
+    book.submit("s2", SELL, 2.0, 1, payload="s2", now=0)
+
+    fills, _ = book.submit("b", BUY, 5.0, 1, now=0)
+    assert [f.resting.order_id for f in fills] == ["s2"]
+    assert "s1" not in book
+
+
+def test_book_matches_sorted_reference_on_random_flow(monkeypatch):
+    # Compact often so the rebuilt levels are exercised too
+    monkeypatch.setattr(order_book, "COMPACT_MIN_DEAD", 8)
+    rng = random.Random(7)
+    book = OrderBook()
+    reference = {}  # order_id -> [side, price, sequence, remaining]
+    sequence = 0
+    for step in range(3000):
+        if reference and rng.random() < 0.3:
+            order_id = rng.choice(sorted(reference))
+            assert book.cancel(order_id) is not None
+            del reference[order_id]
+            continue
+
+        side = rng.choice([BUY, SELL])
+        price = float(rng.randint(90, 110))
+        quantity = float(rng.randint(1, 10))
+        order_id = f"o{step}"
+
+        # Reference: sort the opposite side by price, then time
+        opposite = [
+            (oid, o) for oid, o in reference.items()
+            if o[0] != side and (o[1] <= price if side == BUY else o[1] >= price)
+        ]
+        opposite.sort(key=lambda item: ((item[1][1] if side == BUY else -item[1][1]), item[1][2]))
+        expected = []
+        remaining = quantity
+        for oid, o in opposite:
+            if remaining <= 0:
+                break
+            qty = min(remaining, o[3])
+            expected.append((oid, qty))
+            remaining -= qty
+            o[3] -= qty
+            if o[3] <= 0:
+                del reference[oid]
+        if remaining > 0:
+            reference[order_id] = [side, price, sequence, remaining]
+        sequence += 1
+
+        fills, resting = book.submit(order_id, side, price, quantity, now=0)
+        assert [(f.resting.order_id, f.quantity) for f in fills] == expected
+        assert (resting is not None) == (order_id in reference)
+
+    assert len(book) == len(reference)
+
+
+def _auction():
+    auction = ContinuousDoubleAuction(AuctionConfig(
+        auction_id="cda", auction_type=BidType.CONTINUOUS,
+        resource_types=[ResourceType.COMPUTE, ResourceType.MEMORY],
+        start_time=datetime.now() - timedelta(minutes=1)
+    ))
+    assert auction.start_auction()
+    return auction
+
+
+def _bid(bid_id, role, price, resources, expires_at=None):
+    return Bid(
+        bid_id=bid_id, agent_id=f"agent-{bid_id}", bid_type=BidType.CONTINUOUS, role=role,
+        resources=[ResourceSpecification(resource_type=rt, quantity=q, unit="unit") for rt, q in resources],
+        price=PriceSpecification(currency="USD", amount=price, unit="unit"),
+        expires_at=expires_at
+    )
+
+
+def _advance_clock(monkeypatch, delta):
+    """Make the auction see the current time shifted by delta."""
+    later = datetime.now() + delta
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return later
+
+    monkeypatch.setattr(auction_mechanisms, "datetime", Later)
+
+
+def test_auction_partial_fills_record_filled_quantity_and_status():
+    auction = _auction()
+    sell = _bid("s", MarketRole.SELLER, 10.0, [(ResourceType.COMPUTE, 5)])
+    assert auction.add_bid(sell) == (True, None)
+    assert sell.status == BidStatus.ACTIVE
+
+    first = _bid("b1", MarketRole.BUYER, 12.0, [(ResourceType.COMPUTE, 3)])
+    auction.add_bid(first)
+    assert first.status == BidStatus.EXECUTED
+    assert sell.status == BidStatus.ACTIVE
+    assert first.metadata["filled_quantity"] == {"compute": 3}
+    assert sell.metadata["filled_quantity"] == {"compute": 3}
+    assert auction.matches[0].match_price.amount == 11.0
+    assert auction.matches[0].resources[0].quantity == 3
+
+    second = _bid("b2", MarketRole.BUYER, 10.0, [(ResourceType.COMPUTE, 4)])
+    auction.add_bid(second)
+    assert sell.status == BidStatus.EXECUTED
+    assert sell.metadata["filled_quantity"] == {"compute": 5}
+    assert second.status == BidStatus.ACTIVE
+    assert second.metadata["filled_quantity"] == {"compute": 2}
+    assert len(auction.transactions) == 2
+    assert auction.get_best_prices(ResourceType.COMPUTE, "USD") == {"buy": 10.0, "sell": None}
+
+
+def test_auction_cancel_bid_removes_its_orders():
+    auction = _auction()
+    sell = _bid("s", MarketRole.SELLER, 10.0, [(ResourceType.COMPUTE, 5)])
+    auction.add_bid(sell)
+
+    assert auction.cancel_bid("s")
+    assert sell.status == BidStatus.CANCELLED
+    assert not auction.cancel_bid("s")
+    assert not auction.cancel_bid("unknown")
+
+    buy = _bid("b", MarketRole.BUYER, 20.0, [(ResourceType.COMPUTE, 1)])
+    auction.add_bid(buy)
+    assert buy.status == BidStatus.ACTIVE
+    assert not auction.matches
+
+
+def test_auction_expired_bids_are_not_matched(monkeypatch):
+    auction = _auction()
+    sell = _bid("s", MarketRole.SELLER, 10.0, [(ResourceType.COMPUTE, 5)],
+                expires_at=datetime.now() + timedelta(seconds=30))
+    auction.add_bid(sell)
+    assert sell.status == BidStatus.ACTIVE
+
+    _advance_clock(monkeypatch, timedelta(minutes=5))
+    buy = _bid("b", MarketRole.BUYER, 20.0, [(ResourceType.COMPUTE, 1)])
+    auction.add_bid(buy)
+
+    assert sell.status == BidStatus.EXPIRED
+    assert buy.status == BidStatus.ACTIVE
+    assert not auction.matches
+
+
+def test_auction_rejects_roles_that_cannot_trade():
+    auction = _auction()
+    broker = _bid("x", MarketRole.BROKER, 10.0, [(ResourceType.COMPUTE, 1)])
+
+    accepted, error = auction.add_bid(broker)
+    assert not accepted and "broker" in error
+    assert broker.status == BidStatus.PENDING
+    assert "x" not in auction.bids_by_id and broker not in auction.bids
+    assert auction.get_best_prices(ResourceType.COMPUTE, "USD") == {"buy": None, "sell": None}
+
+
+def test_auction_multi_resource_bid_fills_each_resource_on_its_own():
+    auction = _auction()
+    buy = _bid("b", MarketRole.BUYER, 10.0, [(ResourceType.COMPUTE, 2), (ResourceType.MEMORY, 4)])
+    auction.add_bid(buy)
+
+    auction.add_bid(_bid("s1", MarketRole.SELLER, 9.0, [(ResourceType.COMPUTE, 2)]))
+    assert buy.status == BidStatus.ACTIVE
+    assert buy.metadata["filled_quantity"] == {"compute": 2}
+
+    auction.add_bid(_bid("s2", MarketRole.SELLER, 8.0, [(ResourceType.MEMORY, 4)]))
+    assert buy.status == BidStatus.EXECUTED
+    assert buy.metadata["filled_quantity"] == {"compute": 2, "memory": 4}
+    assert [m.resources[0].resource_type for m in auction.matches] == [ResourceType.COMPUTE, ResourceType.MEMORY]
+
+
+def test_auction_expired_multi_resource_bid_leaves_no_orders_behind(monkeypatch):
+    auction = _auction()
+    buy = _bid("b", MarketRole.BUYER, 10.0, [(ResourceType.COMPUTE, 2), (ResourceType.MEMORY, 4)],
+               expires_at=datetime.now() + timedelta(seconds=30))
+    auction.add_bid(buy)
+
+    _advance_clock(monkeypatch, timedelta(minutes=5))
+    auction.add_bid(_bid("s", MarketRole.SELLER, 9.0, [(ResourceType.COMPUTE, 2)]))
+
+    assert buy.status == BidStatus.EXPIRED
+    assert auction.get_best_prices(ResourceType.MEMORY, "USD")["buy"] is None
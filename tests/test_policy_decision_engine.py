@@ -0,0 +1,130 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+from src.security_compliance_layer.core.access_control.access_control_system import AccessControlSystem
+from src.security_compliance_layer.core.access_control.policy_decision_engine import JITGrantIndex
+
+logging.getLogger("src.security_compliance_layer.core.access_control.access_control_system").setLevel(logging.ERROR)
+
+
+def _system(tmp_path=None, **config):
+    config_path = None
+    if tmp_path is not None:
+        config_path = tmp_path / "access_control.json"
+        config_path.write_text(json.dumps(config))
+    acs = AccessControlSystem(str(config_path) if config_path else None)
+    policy_id = acs.create_policy(
+        "zone_policy", "Allow reads from zone a",
+        [{"action": "read", "conditions": {"context.zone": "a", "resource.level": 1}}],
+        "allow"
+    )
+    acs.register_resource("document", "doc1", {
+        "level": 1,
+        "allowed_roles": {"operator": ["read", "write"]},
+        "attribute_rules": {"read": {"department": ["engineering"]}},
+        "policies": [policy_id],
+        "context_rules": {"network": {"read": {"in": ["corporate"]}}}
+    })
+    return acs, policy_id
+
+
+def test_decisions_depend_on_the_context_the_rules_read():
+    acs, _ = _system()
+
+    allowed = acs.check_access("u1", "doc1", "read", {"zone": "a", "network": "corporate"})
+    denied = acs.check_access("u1", "doc1", "read", {"zone": "b", "network": "corporate"})
+    assert allowed["allowed"] and not allowed["cached"]
+    assert not denied["allowed"] and not denied["cached"]
+
+    # Context the rules do not read (e.g. the timestamp) reuses the cached decision
+    again = acs.check_access("u1", "doc1", "read", {"zone": "a", "network": "corporate", "device": "laptop"})
+    assert again["allowed"] and again["cached"]
+    assert again["id"] != allowed["id"]
+
+
+def test_policy_and_resource_changes_invalidate_cached_decisions():
+    acs, policy_id = _system()
+    context = {"zone": "a", "network": "corporate"}
+    assert acs.check_access("u1", "doc1", "read", dict(context))["allowed"]
+
+    acs.update_policy(policy_id, rules=[{"action": "read", "conditions": {"context.zone": "c"}}])
+    decision = acs.check_access("u1", "doc1", "read", dict(context))
+    assert not decision["allowed"] and not decision["cached"]
+
+    acs.update_policy(policy_id, rules=[{"action": "read", "conditions": {"context.zone": "a"}}])
+    registration_id = acs.get_resources_by_id("doc1")[0]["registration_id"]
+    acs.update_resource(registration_id, {"allowed_roles": {}})
+    decision = acs.check_access("u1", "doc1", "read", dict(context))
+    assert not decision["allowed"] and decision["factors"]["rbac"]["allowed"] is False
+
+    acs.unregister_resource(registration_id)
+    assert acs.check_access("u1", "doc1", "read", dict(context))["reason"] == "Resource not found"
+
+
+def test_decision_cache_is_bounded(tmp_path):
+    acs, _ = _system(tmp_path, decision_cache_size=3)
+    for zone in "abcdef":
+        acs.check_access("u1", "doc1", "read", {"zone": zone, "network": "corporate"})
+    assert len(acs.access_decisions) == 3
+
+
+def test_first_denial_decides_under_default_deny():
+    acs, _ = _system()
+    decision = acs.check_access("u1", "doc1", "admin", {"zone": "a", "network": "corporate"})
+
+    assert not decision["allowed"]
+    # The trust threshold for admin is 0.9, above the identity's trust score
+    assert decision["factors"]["trust"]["allowed"] is False
+    assert all(decision["factors"][name].get("skipped") for name in ("rbac", "abac", "context", "pbac"))
+
+
+def test_role_permission_bitsets_follow_role_and_permission_changes():
+    acs, _ = _system()
+    read_id = acs.create_permission("read", "Read documents", "document")
+    write_id = acs.create_permission("write", "Write documents", "document")
+    viewer = acs.create_role("viewer", "Viewer", [read_id])
+    editor = acs.create_role("editor", "Editor", ["write"])
+
+    assert acs.role_has_permission([viewer], "read")
+    assert acs.role_has_permission([viewer], read_id)
+    assert not acs.role_has_permission([viewer], "write")
+    assert acs.role_has_permission([viewer, editor], "write")
+
+    acs.update_role(viewer, permissions=[read_id, write_id])
+    assert acs.role_has_permission([viewer], "write")
+
+    acs.delete_permission(read_id)
+    assert not acs.role_has_permission([viewer], "read")
+
+
+def test_jit_access_is_granted_until_expiry():
+    acs, _ = _system()
+    registration_id = acs.get_resources_by_id("doc1")[0]["registration_id"]
+    acs.update_resource(registration_id, {"jit_access": {"allowed_actions": ["admin"]}})
+
+    request = acs.request_jit_access("u1", "doc1", "admin", "Maintenance", 600)
+    assert not acs.check_jit_access("u1", "doc1", "admin")
+    acs.approve_jit_request(request["id"], "approver")
+
+    assert acs.check_jit_access("u1", "doc1", "admin")
+    assert not acs.check_jit_access("u1", "doc1", "write")
+    assert not acs.check_jit_access("u2", "doc1", "admin")
+
+
+def test_jit_grant_index_expires_grants_in_expiry_order():
+    now = datetime(2025, 5, 25, 12, 0, 0)
+    index = JITGrantIndex()
+    short = {"identity_id": "u1", "resource_id": "doc1", "action": "read", "status": "approved",
+             "access_granted": True, "expires_at": (now + timedelta(minutes=5)).isoformat()}
+    long = dict(short, expires_at=(now + timedelta(hours=1)).isoformat())
+    index.add(long)
+    index.add(short)
+
+    assert index.check("u1", "doc1", "read", now)
+    assert index.check("u1", "doc1", "read", now + timedelta(minutes=10))
+    assert short["status"] == "expired" and not short["access_granted"]
+    assert long["status"] == "approved"
+
+    assert not index.check("u1", "doc1", "read", now + timedelta(hours=2))
+    assert long["status"] == "expired"
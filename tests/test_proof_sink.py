@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from src.proof_core.proof_hub.proof_sink import ProofSinkError, WriteBehindProofSink
+from src.proof_core.proof_hub.sqlite_repository import SQLiteProofRepository
+
+
+def _proof(i):
+    return {"proof_id": f"p{i}", "utid": "UTID:REAL:test", "domain": "api_request",
+            "inputs": {"i": i}, "outputs": {}, "metadata": {"energy_joules": i}}
+
+
+class _GatedRepository:
+    """Records batches; blocks the writer until the gate opens."""
+    def __init__(self):
+        self.gate = threading.Event()
+        self.batches = []
+
+    def store_many(self, proofs):
+        self.gate.wait(5)
+        self.batches.append([p["proof_id"] for p in proofs])
+
+
+def test_sink_persists_in_batches(tmp_path):
+    repo = SQLiteProofRepository(str(tmp_path / "proofs.db"))
+    sink = WriteBehindProofSink(repo, capacity=1000, batch_size=64, flush_interval_s=0.01)
+    for i in range(200):
+        assert sink.submit(_proof(i))
+    assert sink.flush(timeout=5)
+    sink.close()
+
+    stats = sink.stats()
+    assert stats["persisted"] == 200 and stats["pending"] == 0 and stats["dropped"] == 0
+    assert stats["batches"] < 200
+    assert len(repo.list(limit=500)) == 200
+    assert repo.get("p7").inputs == {"i": 7}
+
+
+def _saturate(sink, repo, n):
+    # The first record is taken by the writer, which then blocks on the gate
+    sink.submit(_proof(0))
+    while sink.stats()["pending"] != 1 or sink._ring:
+        time.sleep(0.001)
+    return [sink.submit(_proof(i)) for i in range(1, n + 1)]
+
+
+def test_drop_policy_discards_new_records():
+    repo = _GatedRepository()
+    sink = WriteBehindProofSink(repo, capacity=4, batch_size=100, flush_interval_s=0.01, overflow="drop")
+    accepted = _saturate(sink, repo, 10)
+    assert accepted == [True] * 4 + [False] * 6
+    repo.gate.set()
+    sink.close()
+    assert sum(repo.batches, []) == [f"p{i}" for i in range(5)]
+    stats = sink.stats()
+    assert stats["dropped"] == 6 and stats["persisted"] == 5
+    assert stats["submitted"] == stats["persisted"] + stats["dropped"] + stats["evicted"]
+
+
+def test_sample_policy_keeps_every_nth_overflow_record():
+    repo = _GatedRepository()
+    sink = WriteBehindProofSink(repo, capacity=4, batch_size=100, flush_interval_s=0.01,
+                                overflow="sample", sample_every=3)
+    _saturate(sink, repo, 10)
+    repo.gate.set()
+    sink.close()
+    # Overflow records p5..p10: p7 and p10 displace the two oldest queued records
+    assert sum(repo.batches, []) == ["p0", "p3", "p4", "p7", "p10"]
+    stats = sink.stats()
+    assert stats["evicted"] == 2 and stats["dropped"] == 4
+
+
+def test_block_policy_waits_for_space():
+    repo = _GatedRepository()
+    sink = WriteBehindProofSink(repo, capacity=2, batch_size=100, flush_interval_s=0.01,
+                                overflow="block", block_timeout_s=5)
+    _saturate(sink, repo, 2)
+    threading.Timer(0.1, repo.gate.set).start()
+    assert sink.submit(_proof(3))
+    sink.close()
+    assert sink.stats()["dropped"] == 0
+    assert sorted(sum(repo.batches, [])) == ["p0", "p1", "p2", "p3"]
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        WriteBehindProofSink(_GatedRepository(), overflow="spill")
+
+
+class _FlakyRepository:
+    """Fails the first `failures` store_many calls."""
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+        self.stored = []
+
+    def store_many(self, proofs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("database is locked")
+        self.stored.extend(p["proof_id"] for p in proofs)
+
+
+def test_failed_batch_is_retried_before_counting_it_failed():
+    repo = _FlakyRepository(failures=2)
+    sink = WriteBehindProofSink(repo, batch_size=10, flush_interval_s=0.01, max_retries=3, retry_backoff_s=0.001)
+    for i in range(5):
+        sink.submit(_proof(i))
+    assert sink.flush(timeout=5)
+    sink.close()
+
+    assert repo.stored == [f"p{i}" for i in range(5)]
+    stats = sink.stats()
+    assert stats["persisted"] == 5 and stats["failed"] == 0 and stats["retries"] == 2
+
+
+def test_exhausted_retries_are_raised_from_flush_and_close():
+    repo = _FlakyRepository(failures=100)
+    sink = WriteBehindProofSink(repo, batch_size=10, flush_interval_s=0.01, max_retries=2, retry_backoff_s=0.001)
+    for i in range(3):
+        sink.submit(_proof(i))
+    with pytest.raises(ProofSinkError) as raised:
+        sink.flush(timeout=5)
+    assert raised.value.failed == 3
+    assert isinstance(raised.value.error, OSError)
+    assert repo.calls == 3
+
+    # Reported once; a later failure is raised from close()
+    assert sink.flush(timeout=5)
+    sink.submit(_proof(3))
+    with pytest.raises(ProofSinkError) as raised:
+        sink.close()
+    assert raised.value.failed == 1
+    assert sink.stats()["failed"] == 4
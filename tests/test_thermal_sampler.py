@@ -0,0 +1,45 @@
+import asyncio
+
+import numpy as np
+
+from src.capsule_layer.services.thermal_sampler.thermal_sampler_service import ThermalSamplerService, ProblemType, Constraint
+
+
+def _landscape(service):
+    return service.create_landscape(
+        ProblemType.COMBINATORIAL, 4,
+        [Constraint("center", "equality", 1.0, "", {"target": 0.5}),
+         Constraint("ceiling", "inequality", 2.0, "", {"threshold": 0.3}),
+         Constraint("spacing", "distance", 1.0, "", {"points": [[0.5, 0.5], [0.1, 0.9]], "min_distance": 0.4})],
+    )
+
+
+def test_batch_energy_matches_scalar_energy():
+    service = ThermalSamplerService({"seed": 1})
+    landscape_id = _landscape(service)
+    energy_fn = service.compile_energy_function(landscape_id)
+    energy_batch = service.compile_batch_energy_function(landscape_id)
+    states = np.random.default_rng(0).random((6, 4))
+    assert np.allclose(energy_batch(states), [float(energy_fn(x)) for x in states])
+
+
+def test_sample_anneals_all_chains_within_bounds():
+    service = ThermalSamplerService({"seed": 1, "cooling_rate": 0.8, "samples_per_temp": 20})
+    landscape_id = _landscape(service)
+    solutions = asyncio.run(service.sample(landscape_id, num_samples=64))
+
+    assert len(solutions) == 64 and len(service.solutions) == 64
+    states = np.stack([s.state for s in solutions])
+    assert states.min() >= 0.0 and states.max() <= 1.0
+    assert all(0.0 <= s.acceptance_rate <= 1.0 for s in solutions)
+    assert min(s.energy for s in solutions) < 0.2
+    assert service.last_run["proposals"] == 64 * solutions[0].iterations
+
+
+def test_sample_stops_early_once_converged():
+    service = ThermalSamplerService({"seed": 1, "convergence_tol": 1.0, "convergence_patience": 2})
+    landscape_id = _landscape(service)
+    full_levels = len(service._temperature_schedule())
+    solutions = asyncio.run(service.sample(landscape_id, num_samples=8))
+    assert solutions[0].metadata["stopped_early"]
+    assert solutions[0].iterations == 2 * service.samples_per_temp < full_levels * service.samples_per_temp
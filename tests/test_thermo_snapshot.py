@@ -0,0 +1,56 @@
+import json
+import os
+from src.bridge_api.telemetry.thermo import ThermoMetrics
+
+
+def _node(node_id, resistance, gate=1e-9):
+    return {
+        "node_id": node_id, "node_type": "gpu",
+        "electrical": {"capacitance_gate": gate, "capacitance_wire": 2e-9, "voltage_min": 0.7,
+                       "voltage_max": 1.2, "leakage_current_base": 0.05, "thermal_resistance": resistance},
+    }
+
+
+def _write(path, nodes, mtime):
+    path.write_text(json.dumps({"version": "1.0", "nodes": nodes}))
+    os.utime(path, (mtime, mtime))
+
+
+def test_snapshot_tracks_manifest_changes(tmp_path, monkeypatch):
+    monkeypatch.delenv("ENERGY_ATLAS_MANIFEST", raising=False)
+    manifest = tmp_path / "manifest.json"
+    _write(manifest, [_node("a", 0.1), _node("b", 0.3)], mtime=1000)
+    thermo = ThermoMetrics(str(manifest), check_interval_s=0)
+
+    metrics = thermo.live_metrics()
+    assert metrics["node_count"] == 2
+    assert abs(metrics["avg_temperature_c"] - 0.2) < 1e-12
+    assert abs(metrics["total_capacitance"] - 6e-9) < 1e-18
+
+    _write(manifest, [_node("a", 0.5), _node("c", 0.3, gate=2e-9)], mtime=2000)
+    metrics = thermo.live_metrics()
+    assert metrics["node_count"] == 3
+    assert abs(metrics["total_thermal_resistance"] - 1.1) < 1e-12
+    assert abs(metrics["total_capacitance"] - 10e-9) < 1e-18
+    assert thermo.summarize_node("c")["electrical"]["capacitance_gate"] == 2e-9
+
+
+def test_unchanged_manifest_is_not_reparsed(tmp_path, monkeypatch):
+    monkeypatch.delenv("ENERGY_ATLAS_MANIFEST", raising=False)
+    manifest = tmp_path / "manifest.json"
+    _write(manifest, [_node("a", 0.1)], mtime=1000)
+    thermo = ThermoMetrics(str(manifest), check_interval_s=0)
+
+    calls = []
+    original = thermo.loader.load_manifest
+    monkeypatch.setattr(thermo.loader, "load_manifest", lambda p: calls.append(p) or original(p))
+    for _ in range(100):
+        thermo.live_metrics()
+    assert calls == []
+
+    # Within the check interval even a changed file is not stat'ed again
+    thermo.check_interval_s = 3600
+    thermo.refresh(force=True)
+    _write(manifest, [_node("a", 0.9)], mtime=3000)
+    assert thermo.refresh() is False
+    assert thermo.live_metrics()["avg_temperature_c"] == 0.1
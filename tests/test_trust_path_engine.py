@@ -0,0 +1,85 @@
+import importlib.util
+import os
+import random
+
+# Loaded from its file: the trust_management package __init__ imports the FastAPI service
+_spec = importlib.util.spec_from_file_location(
+    "trust_path_engine",
+    os.path.join(os.path.dirname(__file__), "..", "src", "overseer_system", "trust_management", "trust_path_engine.py"),
+)
+trust_path_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trust_path_engine)
+TrustPathEngine = trust_path_engine.TrustPathEngine
+
+
+def _random_engine(nodes=12, edges=45, seed=1):
+    rng = random.Random(seed)
+    engine = TrustPathEngine()
+    for i in range(edges):
+        u, v = rng.sample(range(nodes), 2)
+        engine.set_edge(f"n{u}", f"n{v}", f"r{i}", round(rng.uniform(0.05, 1.0), 3),
+                        rng.choice(["operational", "data"]))
+    return engine
+
+
+def _all_paths(engine, source, target, max_hops, min_trust=0.0, types=None):
+    """Every simple path by depth-first enumeration, most trusted first."""
+    paths = []
+
+    def walk(node, path, trust):
+        if node == target:
+            paths.append((trust, tuple(path)))
+            return
+        if len(path) > max_hops:
+            return
+        for next_node, edge in engine.adjacency[node].items():
+            if next_node in path or edge.trust_score < min_trust or (types and edge.relationship_type not in types):
+                continue
+            walk(next_node, path + [next_node], trust * edge.trust_score)
+
+    walk(source, [source], 1.0)
+    return sorted(paths, key=lambda p: -p[0])
+
+
+def test_top_k_paths_match_exhaustive_enumeration():
+    engine = _random_engine()
+    for source, target in [("n0", "n5"), ("n3", "n7"), ("n9", "n1")]:
+        for max_hops, min_trust, types in [(4, 0.0, None), (3, 0.3, None), (5, 0.0, {"data"})]:
+            expected = _all_paths(engine, source, target, max_hops, min_trust, types)
+            found = engine.find_paths(source, target, max_paths=8, max_hops=max_hops,
+                                      min_trust_score=min_trust, relationship_types=types)
+            assert [round(p.aggregate_trust, 9) for p in found] == [round(t, 9) for t, _ in expected[:8]]
+            for result in found:
+                assert len(set(result.path)) == len(result.path) <= max_hops + 1
+                assert result.path[0] == source and result.path[-1] == target
+
+
+def test_min_aggregate_trust_prunes_paths():
+    engine = _random_engine()
+    expected = [t for t, _ in _all_paths(engine, "n0", "n5", 5) if t >= 0.05]
+    found = engine.find_paths("n0", "n5", max_paths=100, min_aggregate_trust=0.05)
+    assert [round(p.aggregate_trust, 9) for p in found] == [round(t, 9) for t in expected]
+
+
+def test_cache_is_invalidated_only_by_expanded_nodes():
+    engine = TrustPathEngine()
+    engine.set_edge("a", "b", "r1", 0.9, "t")
+    engine.set_edge("b", "c", "r2", 0.9, "t")
+    engine.set_edge("x", "y", "r3", 0.9, "t")
+
+    assert [p.path for p in engine.find_paths("a", "c")] == [("a", "b", "c")]
+    engine.set_edge("x", "y", "r3", 0.5, "t")  # unrelated to a -> c
+    engine.find_paths("a", "c")
+    assert engine.cache_hits == 1
+
+    engine.set_edge("a", "c", "r4", 0.95, "t")
+    assert [p.path for p in engine.find_paths("a", "c")] == [("a", "c"), ("a", "b", "c")]
+    assert engine.cache_misses == 2
+
+    engine.remove_node("b")
+    assert [p.path for p in engine.find_paths("a", "c")] == [("a", "c")]
+
+    # A cached empty result is invalidated once its source gains a relationship
+    assert engine.find_paths("z", "c") == []
+    engine.set_edge("z", "c", "r5", 0.8, "t")
+    assert [p.path for p in engine.find_paths("z", "c")] == [("z", "c")]
@@ -0,0 +1,117 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.capsule_layer.services.world_model.rollout_engine import JAX_AVAILABLE, RolloutEngine
+from src.capsule_layer.services.world_model.world_model_service import DomainType, WorldModelService
+
+
+def _laplacian(field):
+    return (np.roll(field, 1, axis=0) + np.roll(field, -1, axis=0) +
+            np.roll(field, 1, axis=1) + np.roll(field, -1, axis=1) - 4 * field)
+
+
+def _gradient(field):
+    return ((np.roll(field, -1, axis=1) - np.roll(field, 1, axis=1)) / 2.0,
+            (np.roll(field, -1, axis=0) - np.roll(field, 1, axis=0)) / 2.0)
+
+
+def _resist_reference(c, temperature, dt, diffusion_coeff, reaction_rate, steps, stride):
+    """One sample stepped in a Python loop, capturing every stride steps."""
+    captured, energy = [], []
+    for step in range(steps):
+        if step % stride == 0:
+            captured.append(c.copy())
+            energy.append(float(np.sum(c ** 2)))
+        reaction = -reaction_rate * c * (1.0 + 0.1 * temperature)
+        c = np.clip(c + dt * (diffusion_coeff * _laplacian(c) + reaction), 0.0, 1.0)
+    return captured, energy, c
+
+
+def _plasma_reference(d, vx, vy, t, dt, viscosity, steps, stride):
+    captured, energy = [], []
+    for step in range(steps):
+        if step % stride == 0:
+            captured.append((d.copy(), vx.copy(), vy.copy(), t.copy()))
+            energy.append(float(0.5 * np.sum(d * (vx ** 2 + vy ** 2)) + np.sum(t)))
+        gdx, gdy = _gradient(d)
+        gtx, gty = _gradient(t)
+        d, vx, vy, t = (
+            np.clip(d + dt * -(vx * gdx + vy * gdy), 0.0, 10.0),
+            vx + dt * (viscosity * _laplacian(vx) - 0.1 * gtx),
+            vy + dt * (viscosity * _laplacian(vy) - 0.1 * gty),
+            np.clip(t + dt * 0.05 * _laplacian(t), 0.0, 10.0),
+        )
+    return captured, energy, (d, vx, vy, t)
+
+
+def test_batched_resist_rollout_matches_per_sample_loop():
+    rng = np.random.default_rng(0)
+    concentration = rng.uniform(size=(3, 12, 10))
+    temperature = rng.uniform(size=(3, 12, 10))
+    rollout = RolloutEngine(use_jax=False).resist(concentration, temperature, 0.05, 0.2, 0.01, steps=25, stride=10)
+
+    assert list(rollout.capture_steps) == [0, 10, 20]
+    assert rollout.trajectory["concentration"].shape == (3, 3, 12, 10)
+    for i in range(3):
+        captured, energy, final = _resist_reference(concentration[i], temperature[i], 0.05, 0.2, 0.01, 25, 10)
+        np.testing.assert_array_equal(rollout.trajectory["concentration"][i], np.stack(captured))
+        np.testing.assert_array_equal(rollout.final["concentration"][i], final)
+        np.testing.assert_allclose(rollout.energy[i], energy, rtol=1e-12)
+
+
+def test_batched_plasma_rollout_matches_per_sample_loop():
+    rng = np.random.default_rng(1)
+    fields = [rng.uniform(size=(2, 8, 8)), rng.normal(size=(2, 8, 8)), rng.normal(size=(2, 8, 8)),
+              rng.uniform(size=(2, 8, 8))]
+    rollout = RolloutEngine(use_jax=False).plasma(*fields, 0.05, 0.02, steps=30, stride=10)
+
+    for i in range(2):
+        captured, energy, final = _plasma_reference(*(f[i] for f in fields), 0.05, 0.02, 30, 10)
+        for k, name in enumerate(rollout.fields):
+            np.testing.assert_array_equal(rollout.trajectory[name][i], np.stack([c[k] for c in captured]))
+            np.testing.assert_array_equal(rollout.final[name][i], final[k])
+        np.testing.assert_allclose(rollout.energy[i], energy, rtol=1e-12)
+
+
+def test_rollout_without_steps_keeps_the_initial_state():
+    grid = np.random.default_rng(2).uniform(size=(1, 4, 4))
+    rollout = RolloutEngine(use_jax=False).resist(grid, np.ones_like(grid), 0.01, 0.1, 0.01, steps=0)
+
+    assert rollout.trajectory["concentration"].shape == (1, 0, 4, 4)
+    assert rollout.energy.shape == (1, 0)
+    np.testing.assert_array_equal(rollout.final["concentration"], grid)
+
+
+@pytest.mark.skipif(not JAX_AVAILABLE, reason="JAX is not installed")
+def test_compiled_rollouts_match_the_numpy_rollouts():
+    rng = np.random.default_rng(3)
+    fields = [rng.uniform(size=(3, 16, 12)).astype(np.float32) for _ in range(4)]
+    compiled, vectorized = RolloutEngine(use_jax=True), RolloutEngine(use_jax=False)
+
+    for steps in (5, 10, 37):
+        a = compiled.resist(fields[0], fields[3], 0.05, 0.2, 0.01, steps)
+        b = vectorized.resist(fields[0], fields[3], 0.05, 0.2, 0.01, steps)
+        np.testing.assert_allclose(a.trajectory["concentration"], b.trajectory["concentration"], atol=1e-5)
+        np.testing.assert_allclose(a.final["concentration"], b.final["concentration"], atol=1e-5)
+        np.testing.assert_allclose(a.energy, b.energy, rtol=1e-5)
+
+        a = compiled.plasma(*fields, 0.05, 0.02, steps)
+        b = vectorized.plasma(*fields, 0.05, 0.02, steps)
+        for name in a.fields:
+            np.testing.assert_allclose(a.trajectory[name], b.trajectory[name], atol=1e-4)
+            np.testing.assert_allclose(a.final[name], b.final[name], atol=1e-4)
+        np.testing.assert_allclose(a.energy, b.energy, rtol=1e-5)
+
+
+def test_dataset_without_time_steps_has_empty_trajectories(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    service = WorldModelService({"dataset_batch_size": 2})
+    result = asyncio.run(service.write_dataset(str(tmp_path / "dataset.h5"), DomainType.RESIST_CHEMISTRY, 3, (4, 4), 0))
+
+    assert result["datasets"]["trajectory/concentration"] == (3, 0, 4, 4)
+    assert result["datasets"]["energy"] == (3, 0)
+    with h5py.File(tmp_path / "dataset.h5", "r") as f:
+        np.testing.assert_array_equal(f["final/concentration"][:], f["initial"][:])
+        assert f["final/concentration"].chunks == (1, 4, 4)